@@ -74,6 +74,12 @@ cam: sub-package with color appearance models
                 Color Res. Appl., vol. 31, no. 4, pp. 320–330, 2006.
                 <http://onlinelibrary.wiley.com/doi/10.1002/col.20227/abstract>`_
 
+ :get_cam02_backend(): Get (and check) the backend ('numpy', 'numexpr', 'numba') for the fused forward CIECAM02 model.
+
+ :cam02_fused_white_parameters(): Pack the white point dependent CIECAM02 parameters for use with cam02_fused_forward().
+
+ :cam02_fused_forward(): Calculate CIECAM02 J,aM,bM or CAM02-UCS J',aM',bM' from xyz in a single fused pass per element.
+
  :cam16ucs(): | calculates ucs (or lcd, scd) output based on cam16 
               |  (forward + inverse available)
               | `C. Li, Z. Li, Z. Wang, Y. Xu, M. R. Luo, G. Cui, M. Melgosa, M. H. Brill, and M. Pointer, 
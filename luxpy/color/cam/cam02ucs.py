@@ -30,6 +30,7 @@ Created on Wed Sep 30 14:35:05 2020
 """
 from luxpy.utils import np, asplit, ajoin
 from luxpy.color.cam.ciecam02 import run as ciecam02
+from luxpy.color.cam.ciecam02_fused import get_cam02_backend
 
 
 __all__ = ['run','cam02ucs','_CAM_UCS_PARAMETERS', 
@@ -56,7 +57,7 @@ _DEFAULT_WHITE_POINT = np.array([[100.0,100.0,100.0]])
 def run(data, xyzw = _DEFAULT_WHITE_POINT, Yw = None, conditions = None, 
         naka_rushton_parameters = None, unique_hue_data = None, 
         ucstype = 'ucs', forward = True,
-        yellowbluepurplecorrect = False, mcat = 'cat02'):
+        yellowbluepurplecorrect = False, mcat = 'cat02', backend = None):
     """ 
     Run the CAM02-UCS[,-LCD,-SDC] color appearance difference model in forward or backward modes.
     
@@ -104,6 +105,12 @@ def run(data, xyzw = _DEFAULT_WHITE_POINT, Yw = None, conditions = None,
             |    - str: see see luxpy.cat._MCATS.keys() for options 
             |         (details on type, ?luxpy.cat)
             |    - ndarray: matrix with sensor primaries
+        :backend:
+            | None, optional
+            | Backend for the forward model:
+            | - None or 'numpy': standard stage-by-stage implementation.
+            | - 'numexpr' or 'numba': fused single pass per element 
+            |       (see luxpy.cam.ciecam02_fused).
     Returns:
         :camout:
             | ndarray with J'a'b' coordinates (forward mode) 
@@ -130,6 +137,15 @@ def run(data, xyzw = _DEFAULT_WHITE_POINT, Yw = None, conditions = None,
     
     if forward == True:
         
+        # fused single pass per element (numexpr or numba backend):
+        if get_cam02_backend(backend) != 'numpy':
+            return ciecam02(data, xyzw, outin = 'J,aM,bM', conditions = conditions, 
+                            forward = True, mcat = mcat, 
+                            naka_rushton_parameters = naka_rushton_parameters,
+                            unique_hue_data = unique_hue_data,
+                            yellowbluepurplecorrect = yellowbluepurplecorrect,
+                            ucs = ucs, backend = backend)
+        
         # run ciecam02 to get JMh:
         data = ciecam02(data, xyzw, outin = 'J,M,h', conditions = conditions, 
                         forward = True, mcat = mcat, 
@@ -183,7 +199,7 @@ def xyz_to_jab_cam02ucs(data, xyzw = _DEFAULT_WHITE_POINT, Yw = None,
                         conditions = None, naka_rushton_parameters = None,
                         unique_hue_data = None,
                         yellowbluepurplecorrect = None, 
-                        mcat = 'cat02', **kwargs):
+                        mcat = 'cat02', backend = None, **kwargs):
     """
     Wrapper function for cam02ucs forward mode with J,aM,bM output.
     
@@ -193,7 +209,8 @@ def xyz_to_jab_cam02ucs(data, xyzw = _DEFAULT_WHITE_POINT, Yw = None,
                     naka_rushton_parameters = naka_rushton_parameters,
                     unique_hue_data = unique_hue_data,
                     forward = True, ucstype = 'ucs', 
-                    yellowbluepurplecorrect = yellowbluepurplecorrect, mcat = mcat)
+                    yellowbluepurplecorrect = yellowbluepurplecorrect, mcat = mcat,
+                    backend = backend)
                 
 def jab_cam02ucs_to_xyz(data, xyzw = _DEFAULT_WHITE_POINT, Yw = None,
                         conditions = None, naka_rushton_parameters = None,
@@ -217,7 +234,7 @@ def xyz_to_jab_cam02lcd(data, xyzw = _DEFAULT_WHITE_POINT, Yw = None,
                         conditions = None, naka_rushton_parameters = None, 
                         unique_hue_data = None,
                         yellowbluepurplecorrect = None, 
-                        mcat = 'cat02', **kwargs):
+                        mcat = 'cat02', backend = None, **kwargs):
     """
     Wrapper function for cam02ucs forward mode with J,aMp,bMp output and ucstype = lcd.
     
@@ -227,7 +244,8 @@ def xyz_to_jab_cam02lcd(data, xyzw = _DEFAULT_WHITE_POINT, Yw = None,
                     naka_rushton_parameters = naka_rushton_parameters,
                     unique_hue_data = unique_hue_data,
                     forward = True, ucstype = 'lcd', 
-                    yellowbluepurplecorrect = yellowbluepurplecorrect, mcat = mcat)
+                    yellowbluepurplecorrect = yellowbluepurplecorrect, mcat = mcat,
+                    backend = backend)
                 
 def jab_cam02lcd_to_xyz(data, xyzw = _DEFAULT_WHITE_POINT, Yw = None,
                         conditions = None, naka_rushton_parameters = None,
@@ -251,7 +269,7 @@ def xyz_to_jab_cam02scd(data, xyzw = _DEFAULT_WHITE_POINT, Yw = None,
                         conditions = None, naka_rushton_parameters = None,
                         unique_hue_data = None,
                         yellowbluepurplecorrect = None, 
-                        mcat = 'cat02', **kwargs):
+                        mcat = 'cat02', backend = None, **kwargs):
     """
     Wrapper function for cam02ucs forward mode with J,aMp,bMp output and ucstype = scd.
     
@@ -261,7 +279,8 @@ def xyz_to_jab_cam02scd(data, xyzw = _DEFAULT_WHITE_POINT, Yw = None,
                     naka_rushton_parameters = naka_rushton_parameters,
                     unique_hue_data = unique_hue_data,
                     forward = True, ucstype = 'scd', 
-                    yellowbluepurplecorrect = yellowbluepurplecorrect, mcat = mcat)
+                    yellowbluepurplecorrect = yellowbluepurplecorrect, mcat = mcat,
+                    backend = backend)
                 
 def jab_cam02scd_to_xyz(data, xyzw = _DEFAULT_WHITE_POINT, Yw = None,
                         conditions = None, naka_rushton_parameters = None,
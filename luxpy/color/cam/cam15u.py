@@ -30,9 +30,10 @@ Module with CAM15u color appearance model
             Opt. Express, vol. 23, no. 10, pp. 13455–13466. 
             <https://www.osapublishing.org/oe/abstract.cfm?uri=oe-23-10-13455&origin=search>`_
 """
-from luxpy import  _CMF, _CIE_ILLUMINANTS, _MUNSELL, spd_to_xyz, cie_interp
+from luxpy import  math, _CMF, _CIE_ILLUMINANTS, _MUNSELL, spd_to_xyz, cie_interp
 from luxpy.utils import np, np2d, asplit, ajoin
 from luxpy.color.cam.colorappearancemodels import hue_angle, hue_quadrature
+from luxpy.color.cam.helpers import _spd_rows_to_xyz
 
 _CAM15U_AXES = {'qabW_cam15u' : ["Q (cam15u)", "aW (cam15u)", "bW (cam15u)"]} 
 
@@ -115,13 +116,11 @@ def cam15u(data, fov = 10.0, inputtype = 'xyz', direction = 'forward', outin = '
      #initialize data and camout:
     data = np2d(data)
     if len(data.shape)==2:
-        data = np.expand_dims(data, axis = 0) # avoid looping if not necessary
-    
-    if (data.shape[0] > data.shape[1]): # loop over shortest dim.
+        data = np.expand_dims(data, axis = 0) # add light source axis 0
+        flipaxis0and1 = False
+    else: # flip light source dim. to axis 0 (samples x light sources x 3 -> light sources x samples x 3)
         flipaxis0and1 = True
         data = np.transpose(data, axes = (1,0,2))
-    else:
-        flipaxis0and1 = False
 
     
     dshape = list(data.shape)
@@ -131,132 +130,131 @@ def cam15u(data, fov = 10.0, inputtype = 'xyz', direction = 'forward', outin = '
     
     camout = np.zeros(dshape); camout.fill(np.nan)
 
-    for i in range(data.shape[0]):
+    # apply model to all light sources (axis 0) and samples (axis 1) at once:
+    if (inputtype != 'xyz') & (direction == 'forward'):
+        xyz = _spd_rows_to_xyz(data, cieobs = '2006_10')
+        lms = math.dot23(_CMF['2006_10']['M'],xyz.T).T # convert to l,m,s
+        rgb = (lms / _CMF['2006_10']['K']) * k # convert to rho, gamma, beta
+    elif (inputtype == 'xyz') & (direction == 'forward'):
+        rgb = math.dot23(Mxyz2rgb,data.T).T
+
+    if direction == 'forward':
+        
+        # apply cube-root compression:
+        rgbc = rgb**(cp)
         
-        if (inputtype != 'xyz') & (direction == 'forward'):
-            xyz = spd_to_xyz(data[i], cieobs = '2006_10', relative = False)
-            lms = np.dot(_CMF['2006_10']['M'],xyz.T).T # convert to l,m,s
-            rgb = (lms / _CMF['2006_10']['K']) * k # convert to rho, gamma, beta
-        elif (inputtype == 'xyz') & (direction == 'forward'):
-            rgb = np.dot(Mxyz2rgb,data[i].T).T
+        # calculate achromatic and color difference signals, A, a, b:
+        Aab = math.dot23(MAab, rgbc.T).T
+        A,a,b = asplit(Aab)
+        A = cA*A
+        a = ca*a
+        b = cb*b
 
-        if direction == 'forward':
-            
-            # apply cube-root compression:
-            rgbc = rgb**(cp)
-            
-            # calculate achromatic and color difference signals, A, a, b:
-            Aab = np.dot(MAab, rgbc.T).T
-            A,a,b = asplit(Aab)
-            A = cA*A
-            a = ca*a
-            b = cb*b
+        # calculate colorfullness like signal M:
+        M = cM*((a**2.0 + b**2.0)**0.5)
 
-            # calculate colorfullness like signal M:
-            M = cM*((a**2.0 + b**2.0)**0.5)
+        # calculate brightness Q:
+        Q = A + cHK[0]*M**cHK[1] # last term is contribution of Helmholtz-Kohlrausch effect on brightness
+                  
+        # calculate saturation, s:
+        s = M / Q
+        
+        # calculate amount of white, W:
+        W = 100.0 / (1.0 + cW[0]*(s**cW[1]))
 
-            # calculate brightness Q:
-            Q = A + cHK[0]*M**cHK[1] # last term is contribution of Helmholtz-Kohlrausch effect on brightness
-                      
-            # calculate saturation, s:
-            s = M / Q
-            
-            # calculate amount of white, W:
-            W = 100.0 / (1.0 + cW[0]*(s**cW[1]))
+        #  adjust Q for size (fov) of stimulus (matter of debate whether to do this before or after calculation of s or W, there was no data on s, M or W for different sized stimuli: after)
+        Q = Q*(fov/10.0)**cfov
+        
+        # calculate hue, h and Hue quadrature, H:
+        h = hue_angle(a,b, htype = 'deg')
 
-            #  adjust Q for size (fov) of stimulus (matter of debate whether to do this before or after calculation of s or W, there was no data on s, M or W for different sized stimuli: after)
-            Q = Q*(fov/10.0)**cfov
-            
-            # calculate hue, h and Hue quadrature, H:
-            h = hue_angle(a,b, htype = 'deg')
+        if 'H' in outin:
+            H = hue_quadrature(h.ravel(), unique_hue_data = unique_hue_data).reshape(h.shape)
+        else:
+            H = None
 
-            if 'H' in outin:
-                H = hue_quadrature(h, unique_hue_data = unique_hue_data)
-            else:
-                H = None
+        # calculate cart. co.:
+        if 'aM' in outin:
+            aM = M*np.cos(h*np.pi/180.0)
+            bM = M*np.sin(h*np.pi/180.0)
+        
+        if 'aS' in outin:
+            aS = s*np.cos(h*np.pi/180.0)
+            bS = s*np.sin(h*np.pi/180.0)
+        
+        if 'aW' in outin:
+            aW = W*np.cos(h*np.pi/180.0)
+            bW = W*np.sin(h*np.pi/180.0)
+        
+
+        if (outin != ['Q','aW','bW']):
+            camout =  eval('ajoin(('+','.join(outin)+'))')
+        else:
+            camout = ajoin((Q,aW,bW))
 
-            # calculate cart. co.:
-            if 'aM' in outin:
-                aM = M*np.cos(h*np.pi/180.0)
-                bM = M*np.sin(h*np.pi/180.0)
-            
-            if 'aS' in outin:
-                aS = s*np.cos(h*np.pi/180.0)
-                bS = s*np.sin(h*np.pi/180.0)
-            
-            if 'aW' in outin:
-                aW = W*np.cos(h*np.pi/180.0)
-                bW = W*np.sin(h*np.pi/180.0)
-            
-    
-            if (outin != ['Q','aW','bW']):
-                camout[i] =  eval('ajoin(('+','.join(outin)+'))')
-            else:
-                camout[i] = ajoin((Q,aW,bW))
     
-        
-        elif direction == 'inverse':
+    elif direction == 'inverse':
 
-            # get Q, M and a, b depending on input type:        
-            if 'aW' in outin:
-                Q,a,b = asplit(data[i])
-                Q = Q / ((fov/10.0)**cfov) #adjust Q for size (fov) of stimulus back to that 10° ref
-                W = (a**2.0 + b**2.0)**0.5
-                s = (((100 / W) - 1.0)/cW[0])**(1.0/cW[1])
-                M = s*Q
-                
+        # get Q, M and a, b depending on input type:        
+        if 'aW' in outin:
+            Q,a,b = asplit(data)
+            Q = Q / ((fov/10.0)**cfov) #adjust Q for size (fov) of stimulus back to that 10° ref
+            W = (a**2.0 + b**2.0)**0.5
+            s = (((100 / W) - 1.0)/cW[0])**(1.0/cW[1])
+            M = s*Q
             
-            if 'aM' in outin:
-                Q,a,b = asplit(data[i])
-                Q = Q / ((fov/10.0)**cfov) #adjust Q for size (fov) of stimulus back to that 10° ref
-                M = (a**2.0 + b**2.0)**0.5
-            
-            if 'aS' in outin:
-                Q,a,b = asplit(data[i])
-                Q = Q / ((fov/10.0)**cfov) #adjust Q for size (fov) of stimulus back to that 10° ref
-                s = (a**2.0 + b**2.0)**0.5
-                M = s*Q
-                      
-            if 'h' in outin:
-                Q, WsM, h = asplit(data[i])
-                Q = Q / ((fov/10.0)**cfov) #adjust Q for size (fov) of stimulus back to that 10° ref
-                if 'W' in outin:
-                     s = (((100.0 / WsM) - 1.0)/cW[0])**(1.0/cW[1])
-                     M = s*Q
-                elif 's' in outin:
-                     M = WsM*Q
-                elif 'M' in outin:
-                     M = WsM
-            
-            # calculate achromatic signal, A from Q and M:
-            A = Q - cHK[0]*M**cHK[1]
-            A = A/cA
-            
-            # calculate hue angle:
-            h = hue_angle(a,b, htype = 'rad')
-            
-            # calculate a,b from M and h:
-            a = (M/cM)*np.cos(h)
-            b = (M/cM)*np.sin(h)
-            a = a/ca
-            b = b/cb
+        
+        if 'aM' in outin:
+            Q,a,b = asplit(data)
+            Q = Q / ((fov/10.0)**cfov) #adjust Q for size (fov) of stimulus back to that 10° ref
+            M = (a**2.0 + b**2.0)**0.5
+        
+        if 'aS' in outin:
+            Q,a,b = asplit(data)
+            Q = Q / ((fov/10.0)**cfov) #adjust Q for size (fov) of stimulus back to that 10° ref
+            s = (a**2.0 + b**2.0)**0.5
+            M = s*Q
+                  
+        if 'h' in outin:
+            Q, WsM, h = asplit(data)
+            Q = Q / ((fov/10.0)**cfov) #adjust Q for size (fov) of stimulus back to that 10° ref
+            if 'W' in outin:
+                 s = (((100.0 / WsM) - 1.0)/cW[0])**(1.0/cW[1])
+                 M = s*Q
+            elif 's' in outin:
+                 M = WsM*Q
+            elif 'M' in outin:
+                 M = WsM
+        
+        # calculate achromatic signal, A from Q and M:
+        A = Q - cHK[0]*M**cHK[1]
+        A = A/cA
+        
+        # calculate hue angle:
+        h = hue_angle(a,b, htype = 'rad')
+        
+        # calculate a,b from M and h:
+        a = (M/cM)*np.cos(h)
+        b = (M/cM)*np.sin(h)
+        a = a/ca
+        b = b/cb
 
-            # create Aab:
-            Aab = ajoin((A,a,b))    
-            
-            # calculate rgbc:
-            rgbc = np.dot(invMAab, Aab.T).T    
-            
-            # decompress rgbc to rgb:
-            rgb = rgbc**(1/cp)
-            
-            
-            # convert rgb to xyz:
-            xyz = np.dot(invMxyz2rgb,rgb.T).T 
-            
-            camout[i] = xyz
-    
-    if flipaxis0and1 == True: # loop over shortest dim.
+        # create Aab:
+        Aab = ajoin((A,a,b))    
+        
+        # calculate rgbc:
+        rgbc = math.dot23(invMAab, Aab.T).T    
+        
+        # decompress rgbc to rgb:
+        rgb = rgbc**(1/cp)
+        
+        
+        # convert rgb to xyz:
+        xyz = math.dot23(invMxyz2rgb,rgb.T).T 
+        
+        camout = xyz
+
+    if flipaxis0and1 == True: # flip light source dim. back to axis 1
         camout = np.transpose(camout, axes = (1,0,2))
 
     
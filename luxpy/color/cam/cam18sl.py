@@ -23,9 +23,10 @@ Module with CAM18sl color appearance model
                Journal of the Optical Society of America A, 35(12), 2000–2009. 
                <https://doi.org/10.1364/JOSAA.35.002000>`_
 """
-from luxpy import  _CMF, _CIE_ILLUMINANTS, _MUNSELL,  spd_to_xyz, cie_interp, getwlr, _WL3
+from luxpy import  math, _CMF, _CIE_ILLUMINANTS, _MUNSELL,  spd_to_xyz, cie_interp, getwlr, _WL3
 from luxpy.utils import np, np2d, np2dT, asplit, ajoin
 from luxpy.color.cam.colorappearancemodels import hue_angle, hue_quadrature, naka_rushton
+from luxpy.color.cam.helpers import _spd_rows_to_xyz
 
 _CAM18SL_WL3 = [390,830,1]
 
@@ -170,7 +171,7 @@ def cam18sl(data, datab = None, Lb = [100], fov = 10.0, inputtype = 'xyz', direc
             datab = spd_to_xyz(datar, cieobs = cieobs, relative = False)
     
  
-    # prepare data and datab for loop over backgrounds: 
+    # prepare data and datab for broadcasting over backgrounds: 
     # make axis 1 of datab have 'same' dimensions as data:       
     if (data.ndim == 2): 
         data = np.expand_dims(data, axis = 1)  # add light source axis 1     
@@ -198,160 +199,158 @@ def cam18sl(data, datab = None, Lb = [100], fov = 10.0, inputtype = 'xyz', direc
         dshape[-2] = dshape[-2] - 1 # wavelength row doesn't count & only with forward can the input data be spectral
     camout = np.zeros(dshape);camout.fill(np.nan)
     
-    for i in range(data.shape[0]):
-       
-        # get rho, gamma, beta of background and reference white:
+    # get rho, gamma, beta of background and reference white
+    # (one row per light source / background, broadcasted over samples on axis 1):
+    nb = data.shape[0]
+    if (inputtype != 'xyz'):
+        xyzb = spd_to_xyz(datab[:nb+1], cieobs = cieobs, relative = False)[:,None,:]
+        xyzr = spd_to_xyz(datar[:nb+1], cieobs = cieobs, relative = False)[:,None,:]
+    else:
+        xyzb = datab[:nb,None,:] 
+        xyzr = datar[:nb,None,:] 
+    
+    lmsb = math.dot23(_CMF[cieobs]['M'],xyzb.T).T # convert to l,m,s
+    rgbb = (lmsb / _CMF[cieobs]['K']) * k # convert to rho, gamma, beta
+    #lmsr = np.dot(_CMF[cieobs]['M'],xyzr.T).T # convert to l,m,s
+    #rgbr = (lmsr / _CMF[cieobs]['K']) * k # convert to rho, gamma, beta
+    #rgbr = rgbr/rgbr[...,1:2]*Lb[i] # calculated EEW cone excitations at same luminance values as background
+    rgbr = np.ones(xyzr.shape)*np.reshape(Lb,(-1,1))[:nb,None,:] # explicitely equal EEW cone excitations at same luminance values as background
+
+    if direction == 'forward':
+        # get rho, gamma, beta of stimulus:
         if (inputtype != 'xyz'):
-            xyzb = spd_to_xyz(np.vstack((datab[0], datab[i+1:i+2,:])), cieobs = cieobs, relative = False)
-            xyzr = spd_to_xyz(np.vstack((datar[0], datar[i+1:i+2,:])), cieobs = cieobs, relative = False)
+            xyz = _spd_rows_to_xyz(data, cieobs = cieobs)   
+        elif (inputtype == 'xyz'):
+            xyz = data
+        lms = math.dot23(_CMF[cieobs]['M'],xyz.T).T # convert to l,m,s
+        rgb = (lms / _CMF[cieobs]['K']) * k # convert to rho, gamma, beta
+
+        # apply von-kries cat with D = 1 (no adaptation for backgrounds with zero cone excitations):
+        nocat = (rgbb == 0).any(axis = -1, keepdims = True)
+        Dcat = np.where(nocat, 1.0, rgbr/np.where(nocat, 1.0, rgbb))
+        rgba = rgb*Dcat
+
+        # apply naka-rushton compression:
+        rgbc = naka_rushton(rgba, n = naka['n'], sig = naka['sig'](rgbr.mean(axis = -1, keepdims = True)), noise = naka['noise'], scaling = naka['scaling'])
+
+        #rgbc = np.ones(rgbc.shape)*rgbc.mean() # test if eew ends up at origin
+        
+        # calculate achromatic and color difference signals, A, a, b:
+        Aab = math.dot23(MAab, rgbc.T).T
+        A,a,b = asplit(Aab)
+        a = ca*a
+        b = cb*b
+
+        # calculate colorfullness like signal M:
+        M = cM*((a**2.0 + b**2.0)**0.5)
+
+        # calculate brightness Q:
+        Q = cA*(A + cHK[0]*M**cHK[1]) # last term is contribution of Helmholtz-Kohlrausch effect on brightness
+
+        # calculate saturation, s:
+        s = M / Q
+        S = s # make extra variable, jsut in case 'S' is called
+
+        # calculate amount of white, W:
+        W = 1 / (1.0 + cW[0]*(s**cW[1]))
+
+        #  adjust Q for size (fov) of stimulus (matter of debate whether to do this before or after calculation of s or W, there was no data on s, M or W for different sized stimuli: after)
+        Q = Q*(fov/10.0)**cfov
+
+        # calculate hue, h and Hue quadrature, H:
+        h = hue_angle(a,b, htype = 'deg')
+        if 'H' in outin:
+            H = hue_quadrature(h.ravel(), unique_hue_data = unique_hue_data).reshape(h.shape)
         else:
-            xyzb = datab[i:i+1,:] 
-            xyzr = datar[i:i+1,:] 
+            H = None
+
+        # calculate cart. co.:
+        if 'aM' in outin:
+            aM = M*np.cos(h*np.pi/180.0)
+            bM = M*np.sin(h*np.pi/180.0)
         
-        lmsb = np.dot(_CMF[cieobs]['M'],xyzb.T).T # convert to l,m,s
-        rgbb = (lmsb / _CMF[cieobs]['K']) * k # convert to rho, gamma, beta
-        #lmsr = np.dot(_CMF[cieobs]['M'],xyzr.T).T # convert to l,m,s
-        #rgbr = (lmsr / _CMF[cieobs]['K']) * k # convert to rho, gamma, beta
-        #rgbr = rgbr/rgbr[...,1:2]*Lb[i] # calculated EEW cone excitations at same luminance values as background
-        rgbr = np.ones(xyzr.shape)*Lb[i] # explicitely equal EEW cone excitations at same luminance values as background
-
-        if direction == 'forward':
-            # get rho, gamma, beta of stimulus:
-            if (inputtype != 'xyz'):
-                xyz = spd_to_xyz(data[i], cieobs = cieobs, relative = False)   
-            elif (inputtype == 'xyz'):
-                xyz = data[i]
-            lms = np.dot(_CMF[cieobs]['M'],xyz.T).T # convert to l,m,s
-            rgb = (lms / _CMF[cieobs]['K']) * k # convert to rho, gamma, beta
-
-            # apply von-kries cat with D = 1:
-            if (rgbb == 0).any():
-                Mcat = np.eye(3)
-            else:
-                Mcat = np.diag((rgbr/rgbb)[0])
-            rgba = np.dot(Mcat,rgb.T).T
-
-            # apply naka-rushton compression:
-            rgbc = naka_rushton(rgba, n = naka['n'], sig = naka['sig'](rgbr.mean()), noise = naka['noise'], scaling = naka['scaling'])
-
-            #rgbc = np.ones(rgbc.shape)*rgbc.mean() # test if eew ends up at origin
-            
-            # calculate achromatic and color difference signals, A, a, b:
-            Aab = np.dot(MAab, rgbc.T).T
-            A,a,b = asplit(Aab)
-            a = ca*a
-            b = cb*b
-
-            # calculate colorfullness like signal M:
-            M = cM*((a**2.0 + b**2.0)**0.5)
-
-            # calculate brightness Q:
-            Q = cA*(A + cHK[0]*M**cHK[1]) # last term is contribution of Helmholtz-Kohlrausch effect on brightness
-
-            # calculate saturation, s:
-            s = M / Q
-            S = s # make extra variable, jsut in case 'S' is called
-
-            # calculate amount of white, W:
-            W = 1 / (1.0 + cW[0]*(s**cW[1]))
-
-            #  adjust Q for size (fov) of stimulus (matter of debate whether to do this before or after calculation of s or W, there was no data on s, M or W for different sized stimuli: after)
-            Q = Q*(fov/10.0)**cfov
-
-            # calculate hue, h and Hue quadrature, H:
-            h = hue_angle(a,b, htype = 'deg')
-            if 'H' in outin:
-                H = hue_quadrature(h, unique_hue_data = unique_hue_data)
-            else:
-                H = None
-
-            # calculate cart. co.:
-            if 'aM' in outin:
-                aM = M*np.cos(h*np.pi/180.0)
-                bM = M*np.sin(h*np.pi/180.0)
-            
-            if 'aS' in outin:
-                aS = s*np.cos(h*np.pi/180.0)
-                bS = s*np.sin(h*np.pi/180.0)
-            
-            if 'aW' in outin:
-                aW = W*np.cos(h*np.pi/180.0)
-                bW = W*np.sin(h*np.pi/180.0)
-
-            if (outin != ['Q','as','bs']):
-                camout[i] =  eval('ajoin(('+','.join(outin)+'))')
-            else:
-                camout[i] = ajoin((Q,aS,bS))
-    
+        if 'aS' in outin:
+            aS = s*np.cos(h*np.pi/180.0)
+            bS = s*np.sin(h*np.pi/180.0)
         
-        elif direction == 'inverse':
-
-            # get Q, M and a, b depending on input type:        
-            if 'aW' in outin:
-                Q,a,b = asplit(data[i])
-                Q = Q / ((fov/10.0)**cfov) #adjust Q for size (fov) of stimulus back to that 10° ref
-                W = (a**2.0 + b**2.0)**0.5
-                s = (((1.0 / W) - 1.0)/cW[0])**(1.0/cW[1])
-                M = s*Q
-                
+        if 'aW' in outin:
+            aW = W*np.cos(h*np.pi/180.0)
+            bW = W*np.sin(h*np.pi/180.0)
+
+        if (outin != ['Q','as','bs']):
+            camout =  eval('ajoin(('+','.join(outin)+'))')
+        else:
+            camout = ajoin((Q,aS,bS))
+
+    
+    elif direction == 'inverse':
+
+        # get Q, M and a, b depending on input type:        
+        if 'aW' in outin:
+            Q,a,b = asplit(data)
+            Q = Q / ((fov/10.0)**cfov) #adjust Q for size (fov) of stimulus back to that 10° ref
+            W = (a**2.0 + b**2.0)**0.5
+            s = (((1.0 / W) - 1.0)/cW[0])**(1.0/cW[1])
+            M = s*Q
             
-            if 'aM' in outin:
-                Q,a,b = asplit(data[i])
-                Q = Q / ((fov/10.0)**cfov) #adjust Q for size (fov) of stimulus back to that 10° ref
-                M = (a**2.0 + b**2.0)**0.5
+        
+        if 'aM' in outin:
+            Q,a,b = asplit(data)
+            Q = Q / ((fov/10.0)**cfov) #adjust Q for size (fov) of stimulus back to that 10° ref
+            M = (a**2.0 + b**2.0)**0.5
+        
+        if 'aS' in outin:
+            Q,a,b = asplit(data)
+            Q = Q / ((fov/10.0)**cfov) #adjust Q for size (fov) of stimulus back to that 10° ref
+            s = (a**2.0 + b**2.0)**0.5
+            M = s*Q
+                  
+        if ('h' in outin) | ('H' in outin):
+            Q, WsM, h = asplit(data)
             
-            if 'aS' in outin:
-                Q,a,b = asplit(data[i])
-                Q = Q / ((fov/10.0)**cfov) #adjust Q for size (fov) of stimulus back to that 10° ref
-                s = (a**2.0 + b**2.0)**0.5
-                M = s*Q
-                      
-            if ('h' in outin) | ('H' in outin):
-                Q, WsM, h = asplit(data[i])
-                
-                if ('H' in outin):
-                    h = hue_quadrature(h, unique_hue_data = unique_hue_data, forward = False)
-                
-                Q = Q / ((fov/10.0)**cfov) #adjust Q for size (fov) of stimulus back to that 10° ref
-                if 'W' in outin:
-                     s = (((1.0 / WsM) - 1.0)/cW[0])**(1.0/cW[1])
-                     M = s*Q
-                elif 's' in outin:
-                     M = WsM*Q
-                elif 'M' in outin:
-                     M = WsM
+            if ('H' in outin):
+                h = hue_quadrature(h.ravel(), unique_hue_data = unique_hue_data, forward = False).reshape(h.shape)
             
-            # calculate achromatic signal, A from Q and M:
-            A = Q/cA - cHK[0]*M**cHK[1]
+            Q = Q / ((fov/10.0)**cfov) #adjust Q for size (fov) of stimulus back to that 10° ref
+            if 'W' in outin:
+                 s = (((1.0 / WsM) - 1.0)/cW[0])**(1.0/cW[1])
+                 M = s*Q
+            elif 's' in outin:
+                 M = WsM*Q
+            elif 'M' in outin:
+                 M = WsM
+        
+        # calculate achromatic signal, A from Q and M:
+        A = Q/cA - cHK[0]*M**cHK[1]
 
-            # calculate hue angle:
-            h = hue_angle(a,b, htype = 'rad')
-            
-            # calculate a,b from M and h:
-            a = (M/cM)*np.cos(h)
-            b = (M/cM)*np.sin(h)
+        # calculate hue angle:
+        h = hue_angle(a,b, htype = 'rad')
+        
+        # calculate a,b from M and h:
+        a = (M/cM)*np.cos(h)
+        b = (M/cM)*np.sin(h)
 
-            a = a/ca
-            b = b/cb
+        a = a/ca
+        b = b/cb
 
-            # create Aab:
-            Aab = ajoin((A,a,b))    
+        # create Aab:
+        Aab = ajoin((A,a,b))    
 
-            # calculate rgbc:
-            rgbc = np.dot(invMAab, Aab.T).T    
+        # calculate rgbc:
+        rgbc = math.dot23(invMAab, Aab.T).T    
 
-            # decompress rgbc to (adapted) rgba :
-            rgba = naka_rushton(rgbc, n = naka['n'], sig = naka['sig'](rgbr.mean()), noise = naka['noise'], scaling = naka['scaling'], forward = False)
+        # decompress rgbc to (adapted) rgba :
+        rgba = naka_rushton(rgbc, n = naka['n'], sig = naka['sig'](rgbr.mean(axis = -1, keepdims = True)), noise = naka['noise'], scaling = naka['scaling'], forward = False)
 
-            # apply inverse von-kries cat with D = 1:
-            rgb = np.dot(np.diag((rgbb/rgbr)[0]),rgba.T).T
+        # apply inverse von-kries cat with D = 1:
+        rgb = rgba*(rgbb/rgbr)
+
+        # convert rgb to lms to xyz:
+        lms = rgb/k*_CMF[cieobs]['K']  
+        xyz = math.dot23(Mlms2xyz,lms.T).T 
+        
+        camout = xyz
 
-            # convert rgb to lms to xyz:
-            lms = rgb/k*_CMF[cieobs]['K']  
-            xyz = np.dot(Mlms2xyz,lms.T).T 
-            
-            camout[i] = xyz
-    
     camout = np.transpose(camout, axes = (1,0,2))
     
     if camout.shape[1] == 1:
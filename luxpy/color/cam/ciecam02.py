@@ -37,6 +37,8 @@ from luxpy import math
 from luxpy.utils import np, asplit, ajoin
 from luxpy import cat
 from luxpy.color.cam.utils import hue_angle, hue_quadrature, naka_rushton
+from luxpy.color.cam.ciecam02_fused import (get_cam02_backend, cam02_fused_white_parameters, 
+                                            cam02_fused_forward)
 
 __all__ = ['run', 'ciecam02',
            '_AXES','_UNIQUE_HUE_DATA','_DEFAULT_WHITE_POINT',
@@ -71,7 +73,8 @@ _AXES['jabC_ciecam02'] = ["J (ciecam02)", "aC (ciecam02)", "bC (ciecam02)"]
 # Main function:
 def run(data, xyzw = _DEFAULT_WHITE_POINT, Yw = None, outin = 'J,aM,bM', 
         conditions = None, naka_rushton_parameters = None, unique_hue_data = None,
-        forward = True, yellowbluepurplecorrect = False, mcat = 'cat02'):
+        forward = True, yellowbluepurplecorrect = False, mcat = 'cat02',
+        ucs = None, backend = None):
     """ 
     Run CIECAM02 color appearance model in forward or backward modes.
     
@@ -141,6 +144,18 @@ def run(data, xyzw = _DEFAULT_WHITE_POINT, Yw = None, outin = 'J,aM,bM',
             |    - str: see see luxpy.cat._MCATS.keys() for options 
             |         (details on type, ?luxpy.cat)
             |    - ndarray: matrix with sensor primaries
+        :ucs:
+            | None, optional
+            | None or dict with CAM-UCS parameters (keys: 'c1','c2'; 
+            | see luxpy.cam._CAM_UCS_PARAMETERS). If not None, J and M 
+            | (and J, aM, bM output) are converted to J', M' (and J', aM', bM')
+            | of the corresponding CAM02 uniform color space [forward mode].
+        :backend:
+            | None, optional
+            | Backend for the forward model with 'J,aM,bM' output:
+            | - None or 'numpy': standard stage-by-stage implementation.
+            | - 'numexpr' or 'numba': fused single pass per element 
+            |       (see luxpy.cam.ciecam02_fused).
     Returns:
         :camout: 
             | ndarray with color appearance correlates (forward mode) 
@@ -259,6 +274,19 @@ def run(data, xyzw = _DEFAULT_WHITE_POINT, Yw = None, outin = 'J,aM,bM',
     # STIMULUS transformations 
     if forward:
         
+        #--------------------------------------------
+        # Fused single pass per element (only for J,aM,bM output):
+        if (outin == ['J','aM','bM']) and (get_cam02_backend(backend) != 'numpy'):
+            wpars = cam02_fused_white_parameters(((D*Yw/rgbw) + (1 - D))*(Yw/yw), 
+                                                 FL, Nbb, Aw, c*z, n, Nc, Ncb)
+            camout = cam02_fused_forward(data, wpars, mcat, mhpe_x_invmcat,
+                                         naka_rushton_parameters = naka_rushton_parameters,
+                                         ucs = ucs, brill_suss = (yellowbluepurplecorrect == 'brill-suss'),
+                                         backend = backend)
+            if (camout.shape[1] == 1) & (original_ndim < 3):
+                camout = camout[:,0,:]
+            return camout
+        
         #--------------------------------------------
         # Normalize xyz (keep transpose for matrix multiplication in next step):
         xyz = (Yw/yw)[None,...]*data
@@ -326,6 +354,12 @@ def run(data, xyzw = _DEFAULT_WHITE_POINT, Yw = None, outin = 'J,aM,bM',
         s = 100.0* (M/Q)**0.5
         S = s # make extra variable, jsut in case 'S' is called
         
+        #--------------------------------------------
+        # convert to CAM02 uniform color space J', M':
+        if ucs is not None:
+            J = (1.0 + 100.0*ucs['c1'])*J / (1.0 + ucs['c1']*J)
+            M = ((1.0/ucs['c2']) * np.log(1.0 + ucs['c2']*M)) if (ucs['c2'] != 0) else M
+        
         #--------------------------------------------            
         # calculate cartesian coordinates:
         if ('aS' in outin):
@@ -476,7 +510,7 @@ def xyz_to_jabM_ciecam02(data, xyzw = _DEFAULT_WHITE_POINT, Yw = None,
                          conditions = None, naka_rushton_parameters = None, 
                          unique_hue_data = None,
                          yellowbluepurplecorrect = False,
-                         mcat = 'cat02', **kwargs):
+                         mcat = 'cat02', backend = None, **kwargs):
     """
     Wrapper function for ciecam02 forward mode with J,aM,bM output.
     
@@ -486,7 +520,8 @@ def xyz_to_jabM_ciecam02(data, xyzw = _DEFAULT_WHITE_POINT, Yw = None,
                     naka_rushton_parameters = naka_rushton_parameters,
                     unique_hue_data = unique_hue_data,
                     forward = True, outin = 'J,aM,bM', 
-                    yellowbluepurplecorrect = yellowbluepurplecorrect, mcat = mcat)
+                    yellowbluepurplecorrect = yellowbluepurplecorrect, mcat = mcat,
+                    backend = backend)
    
 
 def jabM_ciecam02_to_xyz(data, xyzw = _DEFAULT_WHITE_POINT, Yw = None,
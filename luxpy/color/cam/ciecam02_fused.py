@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+"""
+Fused forward CIECAM02 / CAM02-UCS kernels
+==========================================
+
+ :_CAM02_FUSED_BACKENDS: list with backends for the fused forward model.
+
+ :get_cam02_backend(): Get (and check) the backend to use for the fused forward CIECAM02 model.
+
+ :cam02_fused_white_parameters(): Pack the white point dependent CIECAM02 parameters into an array for use with cam02_fused_forward().
+
+ :cam02_fused_forward(): Calculate CIECAM02 J,aM,bM or CAM02-UCS J',aM',bM' from xyz in a single fused pass per element.
+
+Notes:
+    1. The fused kernels avoid the many full-size temporaries of the
+    stage-by-stage NumPy implementation (CAT, HPE, Naka-Rushton,
+    opponent channels, hue, eccentricity, J, C, M and UCS).
+    2. numba and numexpr are optional dependencies that must be requested
+    explicitly (backend = 'numexpr' or 'numba'). The default backend is 
+    'numpy', for which the calling functions (e.g. luxpy.cam.ciecam02(), 
+    luxpy.cam.cam02ucs()) use their standard (stage-by-stage) implementation.
+    3. The 'numba' kernel is jit-compiled on its first use (not cached on disk) 
+    and releases the GIL, so blocks can be run in parallel from a thread pool.
+"""
+import math as _math
+
+from luxpy.utils import np, is_importable
+
+__all__ = ['_CAM02_FUSED_BACKENDS','get_cam02_backend',
+           'cam02_fused_white_parameters','cam02_fused_forward']
+
+_CAM02_FUSED_BACKENDS = ['numpy','numexpr','numba']
+
+_CAM02_NUMBA_KERNEL = None # jit-compiled kernel (set on first use)
+
+
+def get_cam02_backend(backend = None):
+    """
+    Get (and check) the backend to use for the fused forward CIECAM02 model.
+
+    Args:
+        :backend:
+            | None, optional
+            | Requested backend: 'numpy', 'numexpr' or 'numba'.
+            | None: 'numpy' (numexpr and numba are only used when requested).
+
+    Returns:
+        :backend:
+            | string with backend name.
+    """
+    if backend is None:
+        return 'numpy'
+    if backend not in _CAM02_FUSED_BACKENDS:
+        raise Exception("Unknown backend '{}'. Options: {}".format(backend, _CAM02_FUSED_BACKENDS))
+    if (backend != 'numpy') and (not is_importable(backend)):
+        raise Exception("Backend '{:s}' requested, but package is not installed (pip install {:s}).".format(backend, backend))
+    return backend
+
+
+def cam02_fused_white_parameters(gain, FL, Nbb, Aw, cz, n, Nc, Ncb):
+    """
+    Pack the white point dependent CIECAM02 parameters into an array
+    for use with cam02_fused_forward().
+
+    Args:
+        :gain:
+            | ndarray (Mw,3) with the von Kries gains of the CAT
+            | (including any normalization of xyz to Yw), applied to
+            | the cat sensor signals of the (unnormalized) xyz.
+        :FL:
+            | luminance adaptation factor.
+        :Nbb:
+            | background induction factor.
+        :Aw:
+            | achromatic signal of the white point.
+        :cz:
+            | exponent c*z of the lightness J.
+        :n:
+            | background factor Yb/Yw.
+        :Nc:
+            | chromatic induction factor.
+        :Ncb:
+            | chromatic induction factor of the background.
+
+    Returns:
+        :wpars:
+            | ndarray (Mw,10) with per-white-point parameters.
+            | (FL, Nbb, Aw, cz, n, Nc and Ncb can be scalars or
+            |  arrays with Mw elements)
+    """
+    gain = np.atleast_2d(gain)
+    Mw = gain.shape[0]
+    pw = lambda x: np.broadcast_to(np.asarray(x, dtype = float).reshape(-1), (Mw,))
+    FL, Nbb, Aw, cz, n, Nc, Ncb = [pw(x) for x in (FL, Nbb, Aw, cz, n, Nc, Ncb)]
+    return np.ascontiguousarray(np.vstack((gain.T,
+                                           FL/100.0,
+                                           Nbb,
+                                           Aw,
+                                           cz,
+                                           (1.64 - 0.29**n)**0.73,
+                                           (50000.0/13.0)*Nc*Ncb,
+                                           FL**0.25)).T, dtype = float)
+
+
+def _cam02_forward_loop(xyz, wpars, M1, M2, nkpars, ucspars, out):
+    """
+    Scalar loop over all elements of the forward model (jit-compiled with numba).
+    """
+    N, Md, Mw = xyz.shape[0], xyz.shape[1], wpars.shape[0]
+    M = out.shape[1]
+    n, sign, scaling, noise, clip = nkpars[0], nkpars[1], nkpars[2], nkpars[3], nkpars[4]
+    use_ucs, c1, c2 = ucspars[0], ucspars[1], ucspars[2]
+    for i in range(N):
+        for j in range(M):
+            jd = j if Md > 1 else 0
+            w = j if Mw > 1 else 0
+            x, y, z = xyz[i,jd,0], xyz[i,jd,1], xyz[i,jd,2]
+
+            # cat sensor space and von Kries cat:
+            r = (M1[0,0]*x + M1[0,1]*y + M1[0,2]*z)*wpars[w,0]
+            g = (M1[1,0]*x + M1[1,1]*y + M1[1,2]*z)*wpars[w,1]
+            b = (M1[2,0]*x + M1[2,1]*y + M1[2,2]*z)*wpars[w,2]
+
+            # hpe cone sensors and Naka-Rushton compression:
+            p0 = 0.0
+            p1 = 0.0
+            p2 = 0.0
+            for k in range(3):
+                rp = (M2[k,0]*r + M2[k,1]*g + M2[k,2]*b)*wpars[w,3]
+                if rp < 0.0:
+                    ap = 0.0 if clip > 0.0 else (-rp)**n
+                    rpa = 0.2 - noise - scaling*ap/(ap + sign)
+                else:
+                    ap = rp**n
+                    rpa = scaling*ap/(ap + sign) + noise
+                if k == 0:
+                    p0 = rpa
+                elif k == 1:
+                    p1 = rpa
+                else:
+                    p2 = rpa
+
+            # achromatic signal, opponent channels, hue and eccentricity:
+            A = (2.0*p0 + p1 + (1.0/20.0)*p2 - 0.305)*wpars[w,4]
+            a = p0 - 12.0*p1/11.0 + p2/11.0
+            bb = (1.0/9.0)*(p0 + p1 - 2.0*p2)
+            h = _math.atan2(bb, a)
+            et = (1.0/4.0)*(_math.cos(h + 2.0) + 3.8)
+
+            # lightness, chroma and colorfulness:
+            J = 100.0*(A/wpars[w,5])**wpars[w,6]
+            t = (wpars[w,8]*et*(a**2.0 + bb**2.0)**0.5)/(p0 + p1 + (21.0/20.0)*p2)
+            MC = (t**0.9)*((J/100.0)**0.5)*wpars[w,7]*wpars[w,9]
+
+            # uniform color space:
+            if use_ucs > 0.0:
+                J = (1.0 + 100.0*c1)*J/(1.0 + c1*J)
+                if c2 != 0.0:
+                    MC = (1.0/c2)*_math.log(1.0 + c2*MC)
+            out[i,j,0] = J
+            out[i,j,1] = MC*_math.cos(h)
+            out[i,j,2] = MC*_math.sin(h)
+    return out
+
+
+def _get_numba_kernel():
+    """
+    Get jit-compiled numba kernel (compiled on first use).
+    """
+    global _CAM02_NUMBA_KERNEL
+    if _CAM02_NUMBA_KERNEL is None:
+        import numba
+        _CAM02_NUMBA_KERNEL = numba.njit(nogil = True)(_cam02_forward_loop)
+    return _CAM02_NUMBA_KERNEL
+
+
+def _cam02_forward_numexpr(xyz, wpars, M1, M2, nkpars, ucspars, out):
+    """
+    Forward model with numexpr (one fused expression per stage).
+    """
+    import numexpr as ne
+    n, sign, scaling, noise, clip = nkpars
+    use_ucs, c1, c2 = ucspars
+
+    ld = {'x' : xyz[...,0], 'y' : xyz[...,1], 'z' : xyz[...,2],
+          'n' : n, 'sign' : sign, 'scaling' : scaling, 'noise' : noise}
+    for i, key in enumerate(['g0','g1','g2','FL100','Nbb','Aw','cz','Cfac','tfac','FL25']):
+        ld[key] = wpars[:,i]
+
+    # cat sensor space and von Kries cat:
+    for k in range(3):
+        ld['r{:1.0f}'.format(k)] = ne.evaluate('({:1.17g}*x + {:1.17g}*y + {:1.17g}*z)*g{:1.0f}'.format(*M1[k],k), local_dict = ld)
+
+    # hpe cone sensors and Naka-Rushton compression:
+    if clip > 0:
+        nk = 'where(rp < 0, 0.2 - noise, scaling*(rp**n)/((rp**n) + sign) + noise)'
+    else:
+        nk = 'where(rp < 0, 0.2 - noise - scaling*(abs(rp)**n)/((abs(rp)**n) + sign), scaling*(abs(rp)**n)/((abs(rp)**n) + sign) + noise)'
+    for k in range(3):
+        ld['rp'] = ne.evaluate('({:1.17g}*r0 + {:1.17g}*r1 + {:1.17g}*r2)*FL100'.format(*M2[k]), local_dict = ld)
+        ld['p{:1.0f}'.format(k)] = ne.evaluate(nk, local_dict = ld)
+    for key in ['r0','r1','r2','rp']: ld.pop(key)
+
+    # hue, lightness and colorfulness:
+    a = '(p0 - 12.0*p1/11.0 + p2/11.0)'
+    b = '((1.0/9.0)*(p0 + p1 - 2.0*p2))'
+    ld['h'] = ne.evaluate('arctan2({:s},{:s})'.format(b,a), local_dict = ld)
+    ld['J'] = ne.evaluate('100.0*(((2.0*p0 + p1 + (1.0/20.0)*p2 - 0.305)*Nbb)/Aw)**cz', local_dict = ld)
+    MC = ('((tfac*((1.0/4.0)*(cos(h + 2.0) + 3.8))*({a:s}**2.0 + {b:s}**2.0)**0.5)/(p0 + p1 + (21.0/20.0)*p2))**0.9'
+          '*((J/100.0)**0.5)*Cfac*FL25').format(a = a, b = b)
+
+    # uniform color space:
+    if use_ucs > 0:
+        ld['c1'], ld['c2'] = c1, c2
+        if c2 != 0:
+            MC = '((1.0/c2)*log(1.0 + c2*{:s}))'.format(MC)
+        out[...,0] = ne.evaluate('(1.0 + 100.0*c1)*J/(1.0 + c1*J)', local_dict = ld)
+    else:
+        out[...,0] = ld['J']
+    ld['MC'] = ne.evaluate(MC, local_dict = ld)
+    out[...,1] = ne.evaluate('MC*cos(h)', local_dict = ld)
+    out[...,2] = ne.evaluate('MC*sin(h)', local_dict = ld)
+    return out
+
+
+def _cam02_forward_numpy(xyz, wpars, M1, M2, nkpars, ucspars, out):
+    """
+    Forward model with numpy (reference implementation of the fused kernels).
+    """
+    n, sign, scaling, noise, clip = nkpars
+    use_ucs, c1, c2 = ucspars
+
+    # cat sensor space, von Kries cat and hpe cone sensors:
+    rgb = np.einsum('ij,...j->...i', M1, xyz)*wpars[:,:3]
+    rgbp = np.einsum('ij,...j->...i', M2, rgb)*wpars[:,3:4]
+
+    # Naka-Rushton compression:
+    neg = rgbp < 0
+    ap = np.abs(rgbp)**n
+    if clip > 0: ap[neg] = 0.0
+    rgbpa = scaling*ap/(ap + sign)
+    rgbpa = np.where(neg, 0.2 - noise - rgbpa, rgbpa + noise)
+    p0, p1, p2 = rgbpa[...,0], rgbpa[...,1], rgbpa[...,2]
+
+    # achromatic signal, opponent channels, hue and eccentricity:
+    A = (2.0*p0 + p1 + (1.0/20.0)*p2 - 0.305)*wpars[:,4]
+    a = p0 - 12.0*p1/11.0 + p2/11.0
+    b = (1.0/9.0)*(p0 + p1 - 2.0*p2)
+    h = np.arctan2(b, a)
+    et = (1.0/4.0)*(np.cos(h + 2.0) + 3.8)
+
+    # lightness, chroma and colorfulness:
+    J = 100.0*(A/wpars[:,5])**wpars[:,6]
+    t = (wpars[:,8]*et*(a**2.0 + b**2.0)**0.5)/(p0 + p1 + (21.0/20.0)*p2)
+    MC = (t**0.9)*((J/100.0)**0.5)*wpars[:,7]*wpars[:,9]
+
+    # uniform color space:
+    if use_ucs > 0:
+        J = (1.0 + 100.0*c1)*J/(1.0 + c1*J)
+        if c2 != 0: MC = (1.0/c2)*np.log(1.0 + c2*MC)
+    out[...,0] = J
+    out[...,1] = MC*np.cos(h)
+    out[...,2] = MC*np.sin(h)
+    return out
+
+
+def cam02_fused_forward(xyz, wpars, mcat, mhpe_x_invmcat,
+                        naka_rushton_parameters = None,
+                        ucs = None, brill_suss = False,
+                        backend = None, out = None):
+    """
+    Calculate CIECAM02 J,aM,bM or CAM02-UCS J',aM',bM' from xyz
+    in a single fused pass per element.
+
+    Args:
+        :xyz:
+            | ndarray (N,Md,3) with (unnormalized) tristimulus values.
+        :wpars:
+            | ndarray (Mw,10) with per-white-point parameters
+            | (see cam02_fused_white_parameters()).
+            | Md and Mw should be equal or 1.
+        :mcat:
+            | ndarray (3,3) with xyz to cat sensor conversion matrix.
+        :mhpe_x_invmcat:
+            | ndarray (3,3) with cat sensor to hpe sensor conversion matrix.
+        :naka_rushton_parameters:
+            | None, optional
+            | Dict with parameters n, sig, scaling and noise of
+            | the Naka-Rushton compression.
+            | None defaults to the CIECAM02 parameters:
+            |   {'n':0.42, 'sig': 27.13**(1/0.42), 'scaling': 400.0, 'noise': 0.1}
+        :ucs:
+            | None, optional
+            | None: output CIECAM02 J,aM,bM.
+            | dict with keys 'c1' and 'c2' (e.g. luxpy.cam._CAM_UCS_PARAMETERS['ucs']):
+            |   output J',aM',bM' of the corresponding CAM02 uniform color space.
+        :brill_suss:
+            | False, optional
+            | True: set negative hpe sensor signals to zero before compression
+            |   (Brill & Susstrunk yellow-blue correction).
+        :backend:
+            | None, optional
+            | 'numpy', 'numexpr' or 'numba'. None: 'numpy' (see get_cam02_backend()).
+        :out:
+            | None, optional
+            | Preallocated ndarray (N,max(Md,Mw),3) for output.
+
+    Returns:
+        :out:
+            | ndarray (N,max(Md,Mw),3) with J,aM,bM or J',aM',bM'.
+    """
+    backend = get_cam02_backend(backend)
+    xyz = np.asarray(xyz, dtype = float)
+    if out is None:
+        out = np.empty((xyz.shape[0], max(xyz.shape[1], wpars.shape[0]), 3))
+
+    if naka_rushton_parameters is None:
+        naka_rushton_parameters = {'n':0.42, 'sig': 27.13**(1/0.42), 'scaling': 400.0, 'noise': 0.1}
+    nkpars = np.array([naka_rushton_parameters['n'],
+                       naka_rushton_parameters['sig']**naka_rushton_parameters['n'],
+                       naka_rushton_parameters['scaling'],
+                       naka_rushton_parameters['noise'],
+                       1.0*(brill_suss == True)])
+    ucspars = np.array([0.0, 0.0, 0.0]) if ucs is None else np.array([1.0, ucs['c1'], ucs['c2']])
+    M1 = np.ascontiguousarray(mcat, dtype = float)
+    M2 = np.ascontiguousarray(mhpe_x_invmcat, dtype = float)
+
+    if backend == 'numba':
+        return _get_numba_kernel()(xyz, wpars, M1, M2, nkpars, ucspars, out)
+    elif backend == 'numexpr':
+        return _cam02_forward_numexpr(xyz, wpars, M1, M2, nkpars, ucspars, out)
+    else:
+        return _cam02_forward_numpy(xyz, wpars, M1, M2, nkpars, ucspars, out)
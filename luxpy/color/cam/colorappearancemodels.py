@@ -79,6 +79,12 @@ cam: sub-package with color appearance models
                  Color Res. Appl., vol. 31, no. 4, pp. 320–330, 2006.
                  <http://onlinelibrary.wiley.com/doi/10.1002/col.20227/abstract>`_
 
+ :get_cam02_backend(): Get (and check) the backend ('numpy', 'numexpr', 'numba') for the fused forward CIECAM02 model.
+
+ :cam02_fused_white_parameters(): Pack the white point dependent CIECAM02 parameters for use with cam02_fused_forward().
+
+ :cam02_fused_forward(): Calculate CIECAM02 J,aM,bM or CAM02-UCS J',aM',bM' from xyz in a single fused pass per element.
+
  :cam16ucs(): | calculates ucs (or lcd, scd) output based on cam16 
               |  (forward + inverse available)
               | `C. Li, Z. Li, Z. Wang, Y. Xu, M. R. Luo, G. Cui, M. Melgosa, M. H. Brill, and M. Pointer, 
@@ -215,6 +221,13 @@ __all__ += ['xyz_to_jab_cam02ucs', 'jab_cam02ucs_to_xyz',
             'xyz_to_jab_cam02lcd', 'jab_cam02lcd_to_xyz',
             'xyz_to_jab_cam02scd', 'jab_cam02scd_to_xyz']
 
+#------------------------------------------------------------------------------
+# fused forward ciecam02 / cam02ucs imports:
+from .ciecam02_fused import (_CAM02_FUSED_BACKENDS, get_cam02_backend, 
+                             cam02_fused_white_parameters, cam02_fused_forward)
+
+__all__ += ['get_cam02_backend', 'cam02_fused_white_parameters', 'cam02_fused_forward']
+
 
 #------------------------------------------------------------------------------
 # ciecam16 imports:
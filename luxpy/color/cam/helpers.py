@@ -151,7 +151,7 @@ def _massage_input_and_init_output(data, dataw,
     | 1. Convert data and dataw to atleast_2d ndarrays
     | 2. Make axis 1 of dataw have 'same' dimensions as data
     | 3. Make dataw have same lights source axis size as data
-    | 4. Flip light source axis to axis=0 for efficient looping
+    | 4. Flip light source axis to axis=0 (light sources x samples x 3) for broadcasting
     | 5. Initialize output array camout to 'same' shape as data but with camout.shape[-1] == n_out
     
     Args:
@@ -213,7 +213,8 @@ def _massage_input_and_init_output(data, dataw,
         if (data.shape[0] == 1) & (dataw.shape[0]>1): 
             data = np.repeat(data,dataw.shape[0],axis=0)     
     else:
-        dataw = np.array([np.vstack((dataw[:1,0,:],dataw[i+1:i+2,0,:])) for i in range(dataw.shape[0]-1)])
+        # pair the wavelength row with each spectrum: [(N+1) x 1 x wl] -> [N x 2 x wl]
+        dataw = np.concatenate((np.repeat(dataw[:1], dataw.shape[0]-1, axis = 0), dataw[1:]), axis = 1)
         if (data.shape[0] == 1) & (dataw.shape[0]>1):
             data = np.repeat(data,dataw.shape[0],axis=0) 
         
@@ -269,7 +270,11 @@ def _get_absolute_xyz_xyzw(data, dataw, i = 0, Lw= 100, direction = 'forward',
             | 0, optional
             | row number in data and dataw ndarrays 
             | (for loops across illuminant dimension after dimension reshape
-            | with _massage_output_data_to_original_shape).
+            | with _massage_input_and_init_output).
+            | If None: process all rows (light sources) at once.
+            |   The returned arrays then have shape (M x N x 3) for xyzti 
+            |   and (M x 1 x 3) for xyzwi and xyzw_abs, such that they 
+            |   broadcast against each other.
         :Lw:
             | 100.0, optional
             | Luminance (cd/m²) of white point.
@@ -302,6 +307,11 @@ def _get_absolute_xyz_xyzw(data, dataw, i = 0, Lw= 100, direction = 'forward',
     Notes:
         For an example on the use, see code _simple_cam() (type: _simple_cam??)
     """
+    if i is None:
+        return _get_absolute_xyz_xyzw_all(data, dataw, Lw = Lw, direction = direction, 
+                                          cieobs = cieobs, inputtype = inputtype, 
+                                          relative = relative)
+    
     xyzw_abs = None
     
     # Spectral input:
@@ -345,6 +355,66 @@ def _get_absolute_xyz_xyzw(data, dataw, i = 0, Lw= 100, direction = 'forward',
         
     return xyzti, xyzwi, xyzw_abs
 
+def _spd_rows_to_xyz(spds, cieobs = _CAM_DEFAULT_CIEOBS):
+    """
+    Calculate absolute xyz for all spectra in a [M x (N+1) x wl] ndarray 
+    (wavelengths in row 0 of each M) with a single call to spd_to_xyz.
+    Returns an ndarray with shape (M x N x 3).
+    """
+    M, N = spds.shape[0], spds.shape[1] - 1
+    spds2d = np.vstack((spds[0,:1,:], spds[:,1:,:].reshape(M*N, spds.shape[-1])))
+    return spd_to_xyz(spds2d, cieobs = cieobs, relative = False).reshape(M, N, 3)
+
+def _get_absolute_xyz_xyzw_all(data, dataw, Lw= 100, direction = 'forward', 
+                               cieobs = _CAM_DEFAULT_CIEOBS, inputtype = 'xyz', 
+                               relative = True):
+    """
+    Broadcasted version of _get_absolute_xyz_xyzw() for all rows (light sources)
+    at once (i = None). See _get_absolute_xyz_xyzw? for more info.
+    """
+    xyzw_abs = None
+    
+    # Spectral input:
+    if (inputtype != 'xyz'):    
+        
+        # make spectral data in `dataw` absolute:        
+        if relative == True:
+            xyzw_abs = _spd_rows_to_xyz(dataw, cieobs = cieobs)
+            dataw[:,1:,:] = Lw*dataw[:,1:,:]/xyzw_abs[...,1:2] 
+        
+        # Calculate absolute xyzw:
+        xyzwi = _spd_rows_to_xyz(dataw, cieobs = cieobs)
+
+        # make spectral data in `data` absolute:
+        if (direction == 'forward'): # no xyz data or spectra in data if == 'inverse'!!!
+            if relative == True:
+                data[:,1:,:] = Lw*data[:,1:,:]/xyzw_abs[...,1:2]
+                
+            # Calculate absolute xyz of test field:    
+            xyzti = _spd_rows_to_xyz(data, cieobs = cieobs)
+            
+        else:
+            xyzti = None
+        
+    # XYZ input:
+    elif (inputtype == 'xyz'):
+
+        # make xyz data in `dataw` absolute: 
+        if relative == True: 
+            xyzw_abs = dataw.copy()
+            dataw[...] = Lw*dataw/xyzw_abs[...,1:2]   
+        xyzwi = dataw
+
+        if (direction == 'forward'):
+            if relative == True:
+                # make xyz data in `data` absolute: 
+                data[...] = Lw*data/xyzw_abs[...,1:2] # make absolute
+            xyzti = data
+        else:
+            xyzti = None # not needed in inverse model
+        
+    return xyzti, xyzwi, xyzw_abs
+
 def _simple_cam(data, dataw = None, Lw = 100.0, relative = True, 
          inputtype = 'xyz', direction = 'forward', cie_illuminant = 'D65',
          parameters = {'cA': 1,
@@ -471,88 +541,86 @@ def _simple_cam(data, dataw = None, Lw = 100.0, relative = True,
         invMAab = np.linalg.inv(MAab) # Pre-calculate its inverse to avoid repeat in loop.
 
     #--------------------------------------------------------------------------
-    # Apply forward/inverse model by looping over each row (=light source dim.)
-    # in data:
+    # Apply forward/inverse model to all rows (=light source dim.) at once
+    # (arrays are broadcasted as: light sources x samples x 3):
     #--------------------------------------------------------------------------
-    N = data.shape[0]
-    for i in range(N):
-        #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-        #  START FORWARD MODE and common part of inverse mode
-        #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-        
-        #-----------------------------------------------------------------------------
-        # Get tristimulus values for stimulus field and white point for row i:
-        #-----------------------------------------------------------------------------
-        # Note that xyzt will contain a None in case of inverse mode !!!
-        xyzt, xyzw, xyzw_abs = _get_absolute_xyz_xyzw(data, 
-                                                      dataw,
-                                                      i = i, 
-                                                      Lw = Lw, 
-                                                      direction = direction, 
-                                                      cieobs = cieobs, 
-                                                      inputtype = inputtype, 
-                                                      relative = relative)
-        
-        #---------------------------------------------------------------------
-        # stage 1 (white point): calculate lms values of white:
-        #----------------------------------------------------------------------
-        lmsw = np.dot(Mxyz2lms, xyzw.T).T 
-        
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #  START FORWARD MODE and common part of inverse mode
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    
+    #-----------------------------------------------------------------------------
+    # Get tristimulus values for stimulus field and white point for all rows:
+    #-----------------------------------------------------------------------------
+    # Note that xyzt will contain a None in case of inverse mode !!!
+    xyzt, xyzw, xyzw_abs = _get_absolute_xyz_xyzw(data, 
+                                                  dataw,
+                                                  i = None, 
+                                                  Lw = Lw, 
+                                                  direction = direction, 
+                                                  cieobs = cieobs, 
+                                                  inputtype = inputtype, 
+                                                  relative = relative)
+    
+    #---------------------------------------------------------------------
+    # stage 1 (white point): calculate lms values of white:
+    #----------------------------------------------------------------------
+    lmsw = math.dot23(Mxyz2lms, xyzw.T).T 
+    
+    #------------------------------------------------------------------
+    # stage 2 (white): apply simple chromatic adaptation:
+    #------------------------------------------------------------------
+    lmsw_a = lmsw/lmsw
+    
+    #----------------------------------------------------------------------
+    # stage 3 (white point): apply simple compression to lms values
+    #----------------------------------------------------------------------
+    lmsw_ac = lmsw_a**n
+    
+    #----------------------------------------------------------------------
+    # stage 4 (white point): calculate achromatic A, and opponent signals a,b):
+    #----------------------------------------------------------------------
+    Aabw = math.dot23(MAab, lmsw_ac.T).T
+
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # SPLIT CALCULATION STEPS IN FORWARD AND INVERSE MODES:
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    
+    if direction == 'forward':
         #------------------------------------------------------------------
-        # stage 2 (white): apply simple chromatic adaptation:
+        # stage 1 (stimulus): calculate lms values 
         #------------------------------------------------------------------
-        lmsw_a = lmsw/lmsw
+        lms = math.dot23(Mxyz2lms, xyzt.T).T 
         
-        #----------------------------------------------------------------------
-        # stage 3 (white point): apply simple compression to lms values
-        #----------------------------------------------------------------------
-        lmsw_ac = lmsw_a**n
-        
-        #----------------------------------------------------------------------
-        # stage 4 (white point): calculate achromatic A, and opponent signals a,b):
-        #----------------------------------------------------------------------
-        Aabw = np.dot(MAab, lmsw_ac.T).T
-
-        #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-        # SPLIT CALCULATION STEPS IN FORWARD AND INVERSE MODES:
-        #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-        
-        if direction == 'forward':
-            #------------------------------------------------------------------
-            # stage 1 (stimulus): calculate lms values 
-            #------------------------------------------------------------------
-            lms = np.dot(Mxyz2lms, xyzt.T).T 
-            
-            #------------------------------------------------------------------
-            # stage 2 (stimulus): apply simple chromatic adaptation:
-            #------------------------------------------------------------------
-            lms_a = lms/lmsw
+        #------------------------------------------------------------------
+        # stage 2 (stimulus): apply simple chromatic adaptation:
+        #------------------------------------------------------------------
+        lms_a = lms/lmsw
+    
+        #------------------------------------------------------------------
+        # stage 3 (stimulus): apply simple compression to lms values 
+        #------------------------------------------------------------------
+        lms_ac = lms_a**n
         
-            #------------------------------------------------------------------
-            # stage 3 (stimulus): apply simple compression to lms values 
-            #------------------------------------------------------------------
-            lms_ac = lms_a**n
-            
-            #------------------------------------------------------------------
-            # stage 3 (stimulus): calculate achromatic A, and opponent signals a,b:
-            #------------------------------------------------------------------
-            Aab = np.dot(MAab, lms_ac.T).T
-
-            #------------------------------------------------------------------
-            # stage 4 (stimulus): calculate J, C, h
-            #------------------------------------------------------------------
-            J = Aab[...,0]/Aabw[...,0]
-            C = (Aab[...,1]**2 + Aab[...,2]**2)**0.5
-            h = math.positive_arctan(Aab[...,1],Aab[...,2])
-            
-            # # stack together:
-            camout[i] = np.vstack((J, Aab[...,1], Aab[...,2], C, h)).T 
+        #------------------------------------------------------------------
+        # stage 3 (stimulus): calculate achromatic A, and opponent signals a,b:
+        #------------------------------------------------------------------
+        Aab = math.dot23(MAab, lms_ac.T).T
+
+        #------------------------------------------------------------------
+        # stage 4 (stimulus): calculate J, C, h
+        #------------------------------------------------------------------
+        J = Aab[...,0]/Aabw[...,0]
+        C = (Aab[...,1]**2 + Aab[...,2]**2)**0.5
+        h = math.positive_arctan(Aab[...,1],Aab[...,2])
         
-        #--------------------------------------
-        # INVERSE MODE FROM PERCEPTUAL SIGNALS:
-        #--------------------------------------    
-        elif direction == 'inverse':
-            pass
+        # # stack together:
+        camout = np.stack((J, Aab[...,1], Aab[...,2], C, h), axis = -1)
+    
+    #--------------------------------------
+    # INVERSE MODE FROM PERCEPTUAL SIGNALS:
+    #--------------------------------------    
+    elif direction == 'inverse':
+        pass
         
     return _massage_output_data_to_original_shape(camout, originalshape)
     
@@ -173,188 +173,187 @@ def cam_sww16(data, dataw = None, Yb = 20.0, Lw = 400.0, Ccwb = None,
 
 
     #--------------------------------------------------------------------------
-    # Apply forward/inverse model by looping over each row (=light source dim.)
-    # in data:
+    # Apply forward/inverse model to all rows (=light source dim.) at once
+    # (arrays are broadcasted as: light sources x samples x 3):
     #--------------------------------------------------------------------------
-    N = data.shape[0]
-    for i in range(N):
-        #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-        #  START FORWARD MODE and common part of inverse mode
-        #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-        
-        #-----------------------------------------------------------------------------
-        # Get absolute tristimulus values for stimulus field and white point for row i:
-        #-----------------------------------------------------------------------------
-        xyzt, xyzw, xyzw_abs = _get_absolute_xyz_xyzw(data, 
-                                                      dataw,
-                                                      i = i, 
-                                                      Lw = Lw, 
-                                                      direction = direction, 
-                                                      cieobs = cieobs, 
-                                                      inputtype = inputtype, 
-                                                      relative = relative)
-        
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #  START FORWARD MODE and common part of inverse mode
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    
+    #-----------------------------------------------------------------------------
+    # Get absolute tristimulus values for stimulus field and white point for all rows:
+    #-----------------------------------------------------------------------------
+    xyzt, xyzw, xyzw_abs = _get_absolute_xyz_xyzw(data, 
+                                                  dataw,
+                                                  i = None, 
+                                                  Lw = Lw, 
+                                                  direction = direction, 
+                                                  cieobs = cieobs, 
+                                                  inputtype = inputtype, 
+                                                  relative = relative)
+    
 
-        #-----------------------------------------------------------------------------
-        # stage 1: calculate photon rates of stimulus and white white, and
-        # adapting field: i.e. lmst, lmsw and lmsf
-        #-----------------------------------------------------------------------------
-        # Convert to white point l,m,s:
-        lmsw = 683.0*np.dot(Mxyz2lms,xyzw.T).T /_CMF[cieobs]['K']
-        
-        # Calculate adaptation field and convert to l,m,s:
-        lmsf = (Yb/100.0)*lmsw 
-        
-        # Calculate lms of stimulus 
-        # or put adaptation lmsf in test field lmst for later use in inverse-mode (no xyz in 'inverse' mode!!!):
-        lmst = (683.0*np.dot(Mxyz2lms,xyzt.T).T /_CMF[cieobs]['K']) if (direction == 'forward') else lmsf
+    #-----------------------------------------------------------------------------
+    # stage 1: calculate photon rates of stimulus and white white, and
+    # adapting field: i.e. lmst, lmsw and lmsf
+    #-----------------------------------------------------------------------------
+    # Convert to white point l,m,s:
+    lmsw = 683.0*math.dot23(Mxyz2lms,xyzw.T).T /_CMF[cieobs]['K']
+    
+    # Calculate adaptation field and convert to l,m,s:
+    lmsf = (Yb/100.0)*lmsw 
+    
+    # Calculate lms of stimulus 
+    # or put adaptation lmsf in test field lmst for later use in inverse-mode (no xyz in 'inverse' mode!!!):
+    lmst = (683.0*math.dot23(Mxyz2lms,xyzt.T).T /_CMF[cieobs]['K']) if (direction == 'forward') else lmsf
 
 
-        #-----------------------------------------------------------------------------
-        # stage 2: calculate cone outputs of stimulus lmstp
-        #-----------------------------------------------------------------------------
-        lmstp = math.erf(Cc*(np.log(lmst/lms0) + Cf*np.log(lmsf/lms0))) # stimulus test field
-        lmsfp = math.erf(Cc*(np.log(lmsf/lms0) + Cf*np.log(lmsf/lms0))) # adaptation field
+    #-----------------------------------------------------------------------------
+    # stage 2: calculate cone outputs of stimulus lmstp
+    #-----------------------------------------------------------------------------
+    lmstp = math.erf(Cc*(np.log(lmst/lms0) + Cf*np.log(lmsf/lms0))) # stimulus test field
+    lmsfp = math.erf(Cc*(np.log(lmsf/lms0) + Cf*np.log(lmsf/lms0))) # adaptation field
 
-        
-        # add adaptation field lms temporarily to lmstp for quick calculation
-        lmstp = np.vstack((lmsfp,lmstp)) 
-        
-        
-        #-----------------------------------------------------------------------------
-        # stage 3: calculate optic nerve signals, lam*, alphp, betp:
-        #-----------------------------------------------------------------------------
-        lstar, alph, bet = asplit(np.dot(MAab, lmstp.T).T)
+    
+    # add adaptation field lms temporarily to lmstp for quick calculation
+    # (as first sample of each light source row):
+    lmstp = np.concatenate((lmsfp,lmstp), axis = 1) 
+    
+    
+    #-----------------------------------------------------------------------------
+    # stage 3: calculate optic nerve signals, lam*, alphp, betp:
+    #-----------------------------------------------------------------------------
+    lstar, alph, bet = asplit(math.dot23(MAab, lmstp.T).T)
 
-        alphp = cga1[0]*alph
-        alphp[alph<0] = cga1[1]*alph[alph<0]
-        betp = cgb1[0]*bet
-        betp[bet<0] = cgb1[1]*bet[bet<0]
+    alphp = cga1[0]*alph
+    alphp[alph<0] = cga1[1]*alph[alph<0]
+    betp = cgb1[0]*bet
+    betp[bet<0] = cgb1[1]*bet[bet<0]
+
+    
+    #-----------------------------------------------------------------------------
+    #  stage 4: calculate recoded nerve signals, alphapp, betapp:
+    #-----------------------------------------------------------------------------
+    alphpp = cga2[0]*(alphp + betp)
+    betpp = cgb2[0]*(alphp - betp)
 
-        
-        #-----------------------------------------------------------------------------
-        #  stage 4: calculate recoded nerve signals, alphapp, betapp:
-        #-----------------------------------------------------------------------------
-        alphpp = cga2[0]*(alphp + betp)
-        betpp = cgb2[0]*(alphp - betp)
 
+    #-----------------------------------------------------------------------------
+    #  stage 5: calculate conscious color perception:
+    #-----------------------------------------------------------------------------
+    lstar_int = cl_int[0]*(lstar + cl_int[1])
+    alph_int = cab_int[0]*(np.cos(cab_int[1]*np.pi/180.0)*alphpp - np.sin(cab_int[1]*np.pi/180.0)*betpp)
+    bet_int = cab_int[0]*(np.sin(cab_int[1]*np.pi/180.0)*alphpp + np.cos(cab_int[1]*np.pi/180.0)*betpp)
+    lstar_out = lstar_int
 
-        #-----------------------------------------------------------------------------
-        #  stage 5: calculate conscious color perception:
-        #-----------------------------------------------------------------------------
-        lstar_int = cl_int[0]*(lstar + cl_int[1])
-        alph_int = cab_int[0]*(np.cos(cab_int[1]*np.pi/180.0)*alphpp - np.sin(cab_int[1]*np.pi/180.0)*betpp)
-        bet_int = cab_int[0]*(np.sin(cab_int[1]*np.pi/180.0)*alphpp + np.cos(cab_int[1]*np.pi/180.0)*betpp)
-        lstar_out = lstar_int
 
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    #  stage 5 continued but SPLIT IN FORWARD AND INVERSE MODES:
+    #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    
+    #--------------------------------------
+    # FORWARD MODE TO PERCEPTUAL SIGNALS:
+    #--------------------------------------
+    if direction == 'forward':
+        if Ccwb is None:
+            alph_out = alph_int - cab_out[0]
+            bet_out = bet_int -  cab_out[1]
+            
+            
+        else:
+            Ccwb = Ccwb*np.ones((2))
+            Ccwb[Ccwb<0.0] = 0.0
+            Ccwb[Ccwb>1.0] = 1.0
+            
+            # white balance shift using adaptation gray background (Yb=20%), with Ccw: degree of adaptation:
+            alph_out = alph_int - Ccwb[0]*alph_int[:,:1] 
+            bet_out = bet_int -  Ccwb[1]*bet_int[:,:1]
 
-        #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-        #  stage 5 continued but SPLIT IN FORWARD AND INVERSE MODES:
-        #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+        # stack together and remove adaptation field from vertical stack
+        # camout is an ndarray with perceptual signals:
+        camout = np.stack((lstar_out[:,1:],alph_out[:,1:],bet_out[:,1:]), axis = -1) 
+    
+    
+    #--------------------------------------
+    # INVERSE MODE FROM PERCEPTUAL SIGNALS:
+    #--------------------------------------    
+    elif direction == 'inverse':
+         
+        # stack cognitive pre-adapted adaptation field signals (first on stack) together:
+        #labf_int = np.hstack((lstar_int[0],alph_int[0],bet_int[0]))
+        
+        # get lstar_out, alph_out & bet_out for data 
+        #(contains model perceptual signals in inverse mode!!!):
+        lstar_out, alph_out, bet_out = asplit(data)
+
+        #------------------------------------------------------------------------
+        #  Inverse stage 5: undo cortical white-balance:
+        #------------------------------------------------------------------------
+        if Ccwb is None:
+            alph_int = alph_out + cab_out[0]
+            bet_int = bet_out +  cab_out[1]
+        else:
+            Ccwb = Ccwb*np.ones((2))
+            Ccwb[Ccwb<0.0] = 0.0
+            Ccwb[Ccwb>1.0] = 1.0
+            
+            #  inverse white balance shift using adaptation gray background (Yb=20%), with Ccw: degree of adaptation
+            alph_int = alph_out + Ccwb[0]*alph_int[:,:1]
+            bet_int = bet_out +  Ccwb[1]*bet_int[:,:1]
         
-        #--------------------------------------
-        # FORWARD MODE TO PERCEPTUAL SIGNALS:
-        #--------------------------------------
-        if direction == 'forward':
-            if Ccwb is None:
-                alph_out = alph_int - cab_out[0]
-                bet_out = bet_int -  cab_out[1]
-                
-                
-            else:
-                Ccwb = Ccwb*np.ones((2))
-                Ccwb[Ccwb<0.0] = 0.0
-                Ccwb[Ccwb>1.0] = 1.0
-                
-                # white balance shift using adaptation gray background (Yb=20%), with Ccw: degree of adaptation:
-                alph_out = alph_int - Ccwb[0]*alph_int[0] 
-                bet_out = bet_int -  Ccwb[1]*bet_int[0]
 
-            # stack together and remove adaptation field from vertical stack
-            # camout is an ndarray with perceptual signals:
-            camout[i] = np.vstack((lstar_out[1:],alph_out[1:],bet_out[1:])).T 
+        alphpp = (1.0 / cab_int[0]) * (np.cos(-cab_int[1]*np.pi/180.0)*alph_int - np.sin(-cab_int[1]*np.pi/180.0)*bet_int)
+        betpp = (1.0 / cab_int[0]) * (np.sin(-cab_int[1]*np.pi/180.0)*alph_int + np.cos(-cab_int[1]*np.pi/180.0)*bet_int)
+        lstar_int = lstar_out
+        lstar = (lstar_int /cl_int[0]) - cl_int[1] 
+
         
+        #---------------------------------------------------------------------------
+        #  Inverse stage 4: pre-adapted perceptual signals to recoded nerve signals:
+        #---------------------------------------------------------------------------
+        alphp = 0.5*(alphpp/cga2[0] + betpp/cgb2[0])  # <-- alphpp = (Cga2.*(alphp+betp));
+        betp = 0.5*(alphpp/cga2[0] - betpp/cgb2[0]) # <-- betpp = (Cgb2.*(alphp-betp));
+
+
+        #---------------------------------------------------------------------------
+        #  Inverse stage 3: recoded nerve signals to optic nerve signals:
+        #---------------------------------------------------------------------------
+        alph = alphp/cga1[0]
+        bet = betp/cgb1[0]
+        sa = np.sign(cga1[1])
+        sb = np.sign(cgb1[1])
+        alph[(sa*alphp)<0.0] = alphp[(sa*alphp)<0] / cga1[1] 
+        bet[(sb*betp)<0.0] = betp[(sb*betp)<0] / cgb1[1] 
+        lab = ajoin((lstar, alph, bet))
         
-        #--------------------------------------
-        # INVERSE MODE FROM PERCEPTUAL SIGNALS:
-        #--------------------------------------    
-        elif direction == 'inverse':
-             
-            # stack cognitive pre-adapted adaptation field signals (first on stack) together:
-            #labf_int = np.hstack((lstar_int[0],alph_int[0],bet_int[0]))
-            
-            # get lstar_out, alph_out & bet_out for data 
-            #(contains model perceptual signals in inverse mode!!!):
-            lstar_out, alph_out, bet_out = asplit(data[i])
-
-            #------------------------------------------------------------------------
-            #  Inverse stage 5: undo cortical white-balance:
-            #------------------------------------------------------------------------
-            if Ccwb is None:
-                alph_int = alph_out + cab_out[0]
-                bet_int = bet_out +  cab_out[1]
-            else:
-                Ccwb = Ccwb*np.ones((2))
-                Ccwb[Ccwb<0.0] = 0.0
-                Ccwb[Ccwb>1.0] = 1.0
-                
-                #  inverse white balance shift using adaptation gray background (Yb=20%), with Ccw: degree of adaptation
-                alph_int = alph_out + Ccwb[0]*alph_int[0]
-                bet_int = bet_out +  Ccwb[1]*bet_int[0]
-            
 
-            alphpp = (1.0 / cab_int[0]) * (np.cos(-cab_int[1]*np.pi/180.0)*alph_int - np.sin(-cab_int[1]*np.pi/180.0)*bet_int)
-            betpp = (1.0 / cab_int[0]) * (np.sin(-cab_int[1]*np.pi/180.0)*alph_int + np.cos(-cab_int[1]*np.pi/180.0)*bet_int)
-            lstar_int = lstar_out
-            lstar = (lstar_int /cl_int[0]) - cl_int[1] 
+        #---------------------------------------------------------------------------
+        #  Inverse stage 2: optic nerve signals to cone outputs:
+        #---------------------------------------------------------------------------
+        lmstp = math.dot23(invMAab,lab.T).T 
+        lmstp[lmstp<-1.0] = -1.0
+        lmstp[lmstp>1.0] = 1.0
 
-            
-            #---------------------------------------------------------------------------
-            #  Inverse stage 4: pre-adapted perceptual signals to recoded nerve signals:
-            #---------------------------------------------------------------------------
-            alphp = 0.5*(alphpp/cga2[0] + betpp/cgb2[0])  # <-- alphpp = (Cga2.*(alphp+betp));
-            betp = 0.5*(alphpp/cga2[0] - betpp/cgb2[0]) # <-- betpp = (Cgb2.*(alphp-betp));
-
-
-            #---------------------------------------------------------------------------
-            #  Inverse stage 3: recoded nerve signals to optic nerve signals:
-            #---------------------------------------------------------------------------
-            alph = alphp/cga1[0]
-            bet = betp/cgb1[0]
-            sa = np.sign(cga1[1])
-            sb = np.sign(cgb1[1])
-            alph[(sa*alphp)<0.0] = alphp[(sa*alphp)<0] / cga1[1] 
-            bet[(sb*betp)<0.0] = betp[(sb*betp)<0] / cgb1[1] 
-            lab = ajoin((lstar, alph, bet))
-            
 
-            #---------------------------------------------------------------------------
-            #  Inverse stage 2: optic nerve signals to cone outputs:
-            #---------------------------------------------------------------------------
-            lmstp = np.dot(invMAab,lab.T).T 
-            lmstp[lmstp<-1.0] = -1.0
-            lmstp[lmstp>1.0] = 1.0
-
-
-            #---------------------------------------------------------------------------
-            #  Inverse stage 1: cone outputs to photon rates:
-            #---------------------------------------------------------------------------
-            lmstp = math.erfinv(lmstp) / Cc - Cf*np.log(lmsf/lms0)
-            lmst = np.exp(lmstp) * lms0
-
-            #---------------------------------------------------------------------------
-            #  Photon rates to absolute or relative tristimulus values:
-            #---------------------------------------------------------------------------
-            xyzt =  np.dot(invMxyz2lms,lmst.T).T  *(_CMF[cieobs]['K']/683.0)
-            if relative == True:
-                xyzt = (100/Lw) * xyzt
-
-            # store in same named variable as forward mode:
-            camout[i] = xyzt
-    
-            #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-            #  END inverse mode 
-            #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+        #---------------------------------------------------------------------------
+        #  Inverse stage 1: cone outputs to photon rates:
+        #---------------------------------------------------------------------------
+        lmstp = math.erfinv(lmstp) / Cc - Cf*np.log(lmsf/lms0)
+        lmst = np.exp(lmstp) * lms0
+
+        #---------------------------------------------------------------------------
+        #  Photon rates to absolute or relative tristimulus values:
+        #---------------------------------------------------------------------------
+        xyzt =  math.dot23(invMxyz2lms,lmst.T).T  *(_CMF[cieobs]['K']/683.0)
+        if relative == True:
+            xyzt = (100/Lw) * xyzt
+
+        # store in same named variable as forward mode:
+        camout = xyzt
+
+        #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+        #  END inverse mode 
+        #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
     return _massage_output_data_to_original_shape(camout, originalshape)
         
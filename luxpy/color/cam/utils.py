@@ -127,7 +127,7 @@ def hue_quadrature(h, unique_hue_data = None, forward = True):
     
     Args:
         :h: 
-            | float or ndarray [(N,) or (N,1)] with: 
+            | float or ndarray [(N,), (N,1) or (N,M)] with: 
             |   - hue angle data in degrees (!) if forward == True.
             |   - Hue quadrature data if forward = False
         :unique_hue data:
@@ -158,9 +158,9 @@ def hue_quadrature(h, unique_hue_data = None, forward = True):
     
     ndim = np.array(h).ndim
 
-    hi = unique_hue_data['hi']
-    Hi = unique_hue_data['Hi']
-    ei = unique_hue_data['ei']
+    hi = np.asarray(unique_hue_data['hi'], dtype = float)
+    Hi = np.asarray(unique_hue_data['Hi'], dtype = float)
+    ei = np.asarray(unique_hue_data['ei'], dtype = float)
     
     
     if forward == True:
@@ -170,35 +170,14 @@ def hue_quadrature(h, unique_hue_data = None, forward = True):
         if h.shape[0] == 1:
             h = h.T
         
-        H = np.zeros_like(h)
-        for j in range(h.shape[1]):
-            h_j = h[...,j:j+1]
-            h_hi = np.repeat(h_j, repeats = len(hi), axis = 1)
-            hi_h = np.repeat(np.atleast_2d(hi),repeats = h.shape[0], axis = 0)
-            d = (h_hi - hi_h)
-            d[d<0] = 100000.0
-            p = d.argmin(axis = 1)
-            p[p == (len(hi)-1)] = 0 # make sure last unique hue data is not selected
-            H_j = np.array([Hi[pi] + (100.0/(1.0 + ((hi[pi+1] - h_j[i])/ei[pi+1])/(1e-308 + ((h_j[i]-hi[pi])-360.0*((h_j[i]-hi[pi])==360.0))/ei[pi]))) for (i,pi) in enumerate(p)])
-            
-            # for (i,pi) in enumerate(p):
-            #     print('i,pi',i,pi)
-            #     print('Hi[pi]',Hi[pi])
-            #     print('h_j[i]-hi[pi]',h_j[i]-hi[pi])
-            #     print('with bool',((h_j[i]-hi[pi])-360.0*((h_j[i]-hi[pi])==360)))
-            #     print('ei[pi]',ei[pi])
-            #     print('1/ei[pi]',1/ei[pi])
-            #     print('(h_j[i]-hi[pi])/ei[pi]',(h_j[i]-hi[pi])/ei[pi])
-            #     print('ei[pi+1]',ei[pi+1])
-            #     print('1/ei[pi+1]',1/ei[pi+1])
-            #     print('(hi[pi+1] - h_j[i])',(hi[pi+1] - h_j[i]))
-            #     print('(hi[pi+1] - h_j[i])/ei[pi+1]',(hi[pi+1] - h_j[i])/ei[pi+1])
-            #     print('((h_j[i]-hi[pi])/ei[pi] + (hi[pi+1] - h_j[i])/ei[pi+1])',((h_j[i]-hi[pi])/ei[pi] + (hi[pi+1] - h_j[i])/ei[pi+1]))
-            #     print('100*...',(100.0/(1.0 + ((hi[pi+1] - h_j[i])/ei[pi+1])/((h_j[i]-hi[pi])/ei[pi]))))
-            #     print('p1',1/(1e-308+(((h_j[i]-hi[pi])-360.0*((h_j[i]-hi[pi])==360.0))/ei[pi])))
-            #     print(Hi[pi] + (100.0/(1.0 + ((hi[pi+1] - h_j[i])/ei[pi+1])/(1e-308 + ((h_j[i]-hi[pi])-360.0*((h_j[i]-hi[pi])==360.0))/ei[pi]))))
-            
-            H[...,j:j+1] = H_j
+        # find index of closest unique hue below h (for all elements at once):
+        d = h[...,None] - hi
+        d[d<0] = 100000.0
+        p = d.argmin(axis = -1)
+        p[p == (len(hi)-1)] = 0 # make sure last unique hue data is not selected
+        
+        dh = h - hi[p]
+        H = Hi[p] + (100.0/(1.0 + ((hi[p+1] - h)/ei[p+1])/(1e-308 + (dh - 360.0*(dh == 360.0))/ei[p])))
     
         if ndim == 0:
             return H[0][0]
@@ -212,17 +191,15 @@ def hue_quadrature(h, unique_hue_data = None, forward = True):
         H[H>=400] = H[H>=400] - 400
         if H.shape[0] == 1:
             H = H.T
-        h = np.zeros_like(H)
-        for j in range(H.shape[1]):
-            H_j = H[...,j:j+1]
-            H_Hi = np.repeat(H_j, repeats = len(Hi), axis = 1)
-            Hi_H = np.repeat(np.atleast_2d(Hi),repeats = H.shape[0], axis = 0)
-            d = (H_Hi - Hi_H)
-            d[d<0] = 100000.0
-            p = d.argmin(axis = 1)
-            p[p == (len(Hi)-1)] = 0 # make sure last unique hue data is not selected
-            h_j = np.array([((H_j[i] - Hi[pi])*(ei[pi+1]*hi[pi] - ei[pi]*hi[pi+1]) - 100*ei[pi+1]*hi[pi])/((H_j[i] - Hi[pi])*(ei[pi+1] - ei[pi]) - 100*ei[pi+1]) for (i,pi) in enumerate(p)])
-            h[...,j:j+1] = h_j
+        
+        # find index of closest unique Hue quadrature below H (for all elements at once):
+        d = H[...,None] - Hi
+        d[d<0] = 100000.0
+        p = d.argmin(axis = -1)
+        p[p == (len(Hi)-1)] = 0 # make sure last unique hue data is not selected
+        
+        dH = H - Hi[p]
+        h = (dH*(ei[p+1]*hi[p] - ei[p]*hi[p+1]) - 100*ei[p+1]*hi[p])/(dH*(ei[p+1] - ei[p]) - 100*ei[p+1])
         h[h > 360 - hi[0]*1] -= 360.0
     
         if ndim == 0:
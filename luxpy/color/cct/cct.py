@@ -32,9 +32,20 @@ cct: Module with functions related to correlated color temperature calculations
                  temperature calculations. 
 
  :_CCT_LUT: Dict with pre-calculated LUTs with structure LUT[mode][cspace][cieobs][lut i].
+            (LUTs of a mode are only loaded on first use)
  
  :_CCT_LUT_CALC: Boolean determining whether to force LUT calculation, even if
                  the LUT.pkl files can be found in ./data/cctluts/.
+
+ :_CCT_LUT_CACHE: Boolean determining whether LUTs generated on the fly (e.g. for 
+                  non-default wavelengths or cieobs) are cached on disk 
+                  (in _CCT_LUT_CACHE_PATH, max. size _CCT_LUT_CACHE_MAX_SIZE bytes).
+                  Default: False, unless environment variable LUXPY_CCT_LUT_CACHE = 1
+                  (the folder can be set with LUXPY_CCT_LUT_CACHE_PATH).
+
+ :_CCT_LUT_NPY_STORE: Boolean determining whether LUTs are loaded (memory-mapped) 
+                      from the uncompressed .npy store in ./data/cctluts/{mode}_luts_npy/
+                      (when present and up-to-date) instead of from the LUT.pkl files.
  
  :_CCT_LUT_RESOLUTION_REDUCTION_FACTOR: number of subdivisions when performing
                                         a cascading lut calculation to zoom-in 
@@ -52,9 +63,18 @@ cct: Module with functions related to correlated color temperature calculations
  :generate_luts(): Generate a number of luts and store them in a nested dictionary.
                     (Structure: lut[cspace][cieobs][lut type])
 
+ :regenerate_luts(): Regenerate (in parallel) the LUTs of several modes, e.g. for a new cieobs.
+
+ :convert_luts_pkl_to_npy(): Convert the LUT.pkl files to a memory-mappable store 
+                             of uncompressed .npy files (+ JSON index).
+
  :xyz_to_cct(): Calculates CCT, Duv from XYZ (wraps a variety of methods)
 
  :xyz_to_duv(): Calculates Duv, (CCT) from XYZ (wrapper around xyz_to_cct, but with Duv output.)
+
+ :xyz_to_cct_tiled(): Calculates CCT, Duv for (very) large (memory-mapped) arrays or images in tiles.
+
+ :xyz_to_duv_tiled(): Calculates Duv, (CCT) for (very) large (memory-mapped) arrays or images in tiles.
                 
  :cct_to_xyz(): Calculates xyz from CCT, Duv by estimating the line perpendicular to the planckian locus (=iso-T line).
 
@@ -115,10 +135,16 @@ cct: Module with functions related to correlated color temperature calculations
 """
 
 import os
+import time
 import copy 
+import json
+import hashlib
+import zipfile
+import threading
 import matplotlib.pyplot as plt
 import numpy as np
 from scipy.optimize import minimize
+from scipy.spatial import cKDTree
 
 # load some methods already programmed in luxpy:
 from luxpy import (math, _BB, _WL3, _CIEOBS, _CMF, 
@@ -127,17 +153,19 @@ from luxpy import (math, _BB, _WL3, _CIEOBS, _CMF,
                    xyz_to_Yxy, Yxy_to_xyz, xyz_to_Yuv60, Yuv60_to_xyz, 
                    xyz_to_Yuv, Yuv_to_xyz, cri_ref, 
                    )
-from luxpy.utils import _PKG_PATH, _SEP, np2d, np2dT, getdata, save_pkl, load_pkl
+from luxpy.utils import _PKG_PATH, _SEP, np2d, np2dT, getdata, save_pkl, load_pkl, get_output_array
 from luxpy.color.ctf.colortf import colortf
 
 __all__ = ['_CCT_MAX','_CCT_MIN','_CCT_CSPACE','_CCT_CSPACE_KWARGS',
            '_CCT_LUT_PATH','_CCT_LUT', '_CCT_LUT_RESOLUTION_REDUCTION_FACTOR',
            '_CCT_FALLBACK_N', '_CCT_FALLBACK_UNIT','_CCT_PKL_COMPRESSLEVEL',
+           '_CCT_LUT_CACHE','_CCT_LUT_CACHE_PATH','_CCT_LUT_CACHE_MAX_SIZE',
+           '_CCT_LUT_NPY_STORE','convert_luts_pkl_to_npy', 'regenerate_luts',
            'cct_to_mired','xyz_to_cct_mcamy1992', 'xyz_to_cct_hernandez1999',
            'xyz_to_cct_robertson1968','xyz_to_cct_ohno2014',
            'xyz_to_cct_li2016', 'xyz_to_cct_li2022',
            'xyz_to_cct_zhang2019', 'xyz_to_cct_fibonacci',
-           'xyz_to_cct','cct_to_xyz', 'calculate_lut', 'generate_luts', 'get_tcs4',
+           'xyz_to_cct','xyz_to_cct_tiled','xyz_to_duv_tiled','cct_to_xyz', 'calculate_lut', 'generate_luts', 'get_tcs4',
            '_get_lut', '_generate_tcs', '_generate_lut',
            '_generate_lut_ohno2014','_generate_lut_li2022']
 
@@ -158,17 +186,26 @@ _CCT_CSPACE_KWARGS = {'fwtf':{}, 'bwtf':{}}
 _CCT_FALLBACK_N = 50
 _CCT_FALLBACK_UNIT = 'K-1'
 _CCT_MAX_ITER = 10
-_CCT_SPLIT_CALC_AT_N = 25 # some tests show that this seems to be the fastest (for 1000 conversions)
+_CCT_SPLIT_CALC_AT_N = None # None: single pass (lut search and newton-raphson are O(N) in memory)
+_CCT_BB_BLOCK_N = 128 # number of Planckians whose [N x wl] spectra are calculated at once (keeps temporaries cache-sized)
 
 _CCT_LUT_PATH = _PKG_PATH + _SEP + 'data'+ _SEP + 'cctluts' + _SEP #folder with cct lut data
 
 _CCT_LUT_PATH_LX_REPO = 'https://raw.github.com/ksmet1977/luxpy/master/luxpy/data/cctluts/' # luxpy repo url where cctluts are stored 
 _CCT_LUT_CALC = False
 _CCT_LUT = {}
+_CCT_LUT_INIT_LOCK = threading.RLock() # guards first-use loading of _CCT_LUT[mode]['luts']
+_CCT_LUT_INITIALIZING = set() # modes being initialized (lut generation might re-enter _get_luts_dict)
 _CCT_UV_TO_TX_FCNS = {}
 _CCT_LUT_RESOLUTION_REDUCTION_FACTOR = 4 # for when cascading luts are used (d(Tm1,Tp1)-->divide in _CCT_LUT_RESOLUTION_REDUCTION_FACTOR segments)
 
 _CCT_FAST_DUV = True # use a fast, but slightly less accurate Duv calculation with Newton-Raphson
+
+_CCT_TO_XYZ_USE_TABLE = True # cct_to_xyz(): interpolate Planckian (u,v) and iso-T-line slope from a cached table instead of spectral integration
+_CCT_PLANCKIAN_TABLE_N = 1024 # number of nodes (uniform in 1/Tc) in a Planckian table
+_CCT_PLANCKIAN_TABLE_MAX = 1e6 # max. Tc in a Planckian table (2nd derivatives of the Planckians lose precision at higher Tc; these are calculated exactly)
+_CCT_PLANCKIAN_TABLES = {} # cache with Planckian tables (per CMF set and wavelength grid)
+_CCT_PLANCKIAN_TABLES_MAX_N = 16 # max. number of cached Planckian tables
 _CCT_VERBOSITY_LUT_GENERATION = 1
 
 # flow control parameters:
@@ -184,6 +221,13 @@ _CCT_LUT_ONE_NPY_PER_MODE = True # switch between generating one npy file per mo
 
 _CCT_PKL_COMPRESSLEVEL = 9
 
+_CCT_LUT_CACHE = os.environ.get('LUXPY_CCT_LUT_CACHE', '0').lower() not in ('', '0', 'false', 'no', 'off') # (opt-in) cache luts generated on the fly (e.g. for non-default wavelengths or cieobs) on disk
+_CCT_LUT_CACHE_PATH = os.environ.get('LUXPY_CCT_LUT_CACHE_PATH', os.path.join(os.path.expanduser('~'), '.cache', 'luxpy', 'cctluts')) # folder of on-disk lut cache
+_CCT_LUT_CACHE_MAX_SIZE = 256e6 # max. size (bytes) of the on-disk lut cache (least recently used luts are removed first)
+_CCT_LUT_CACHE_LOCK_TIMEOUT = 600 # (s) lock of a process generating a lut for the cache is considered stale after this time
+
+_CCT_LUT_NPY_STORE = True # if available (see convert_luts_pkl_to_npy()), load LUTs from memory-mappable .npy store instead of from the .pkl files
+
 #==============================================================================
 # define general helper functions:
 #==============================================================================
@@ -336,6 +380,12 @@ def _get_tristim_of_BB_BBp_BBpp(T, xyzbar, wl, dl, out = 'BB,BBp,BBpp'):
     and the spectra corresponding to the first and second derivatives to Tc 
     of the blackbody radiator.
     """
+    # process large sets of Tc in blocks (memory-bound otherwise):
+    n = np2d(T).shape[0]
+    if n > _CCT_BB_BLOCK_N:
+        blocks = [_get_tristim_of_BB_BBp_BBpp(T[i:i+_CCT_BB_BLOCK_N], xyzbar, wl, dl, out = out) for i in range(0, n, _CCT_BB_BLOCK_N)]
+        return (T,) + tuple((np.vstack([block[j] for block in blocks]) if (blocks[0][j] is not None) else None) for j in (1,2,3))
+    
     xyzp,xyzpp = None, None
     BB, BBp, BBpp =  _get_BB_BBp_BBpp(T, wl, out = out)
     #cnd = np.ones((BB.shape[-1],),dtype=bool)#((xyzbar>0).sum(0)>0).T # keep only wavelengths where not all 3 cmfs are equal (to avoid nan's for 2015 cmfs which are defined only between 390 and 830 nm)
@@ -389,6 +439,69 @@ def _get_uv_uvp_uvpp(T, uvwbar, wl, dl, out = 'BB,BBp,BBpp'):
     return T, u, v, up, vp, upp, vpp, (UVW, UVWp, UVWpp)
 
 
+def _get_planckian_table(uvwbar, wl, dl):
+    """ 
+    Get (from cache or calculate) a table with the (u,v), (u',v') and (u",v") 
+    coordinates of Planckians sampled uniformly in x = 1/Tc over 
+    [_CCT_MIN, _CCT_PLANCKIAN_TABLE_MAX] (derivatives are to x).
+    Tables are cached per CMF set (uvwbar) and wavelength grid.
+    """
+    key = (uvwbar.tobytes(), np.asarray(wl).tobytes(), np.asarray(dl).tobytes())
+    table = _CCT_PLANCKIAN_TABLES.get(key)
+    if table is None:
+        x = np.linspace(1/_CCT_PLANCKIAN_TABLE_MAX, 1/_CCT_MIN, _CCT_PLANCKIAN_TABLE_N)
+        T = 1/x[:,None]
+        _, u, v, up, vp, upp, vpp, _ = _get_uv_uvp_uvpp(T, uvwbar, wl, dl, out = 'BB,BBp,BBpp')
+        
+        # convert derivatives to Tc into derivatives to x = 1/Tc:
+        p = np.hstack((u, v))
+        px = -T**2 * np.hstack((up, vp))
+        pxx = T**4 * np.hstack((upp, vpp)) + 2 * T**3 * np.hstack((up, vp))
+        table = {'x0' : x[0], 'h' : x[1] - x[0], 'p' : p, 'px' : px, 'pxx' : pxx}
+        
+        if len(_CCT_PLANCKIAN_TABLES) >= _CCT_PLANCKIAN_TABLES_MAX_N: 
+            _CCT_PLANCKIAN_TABLES.pop(next(iter(_CCT_PLANCKIAN_TABLES))) # drop oldest
+        _CCT_PLANCKIAN_TABLES[key] = table
+    return table
+
+def _get_uv_uvp_from_planckian_table(T, uvwbar, wl, dl):
+    """ 
+    Get the (u,v) coordinates of Planckians with specified Tc and the 
+    derivatives (u',v') to x = 1/Tc by quintic Hermite interpolation 
+    of a cached Planckian table (see _get_planckian_table()).
+    Tc outside [_CCT_MIN, _CCT_PLANCKIAN_TABLE_MAX] are calculated exactly 
+    (derivatives are then to Tc; only the ratio v'/u' is of use).
+    """
+    T = np2d(T)[:,:1]
+    u, v, up, vp = (np.empty_like(T, dtype = float) for i in range(4))
+    
+    in_table = (T[:,0] >= _CCT_MIN) & (T[:,0] <= _CCT_PLANCKIAN_TABLE_MAX)
+    if in_table.any():
+        table = _get_planckian_table(uvwbar, wl, dl)
+        p, px, pxx, h = table['p'], table['px'], table['pxx'], table['h']
+        xh = (1/T[in_table] - table['x0'])/h
+        i = np.clip(np.floor(xh[:,0]).astype(int), 0, p.shape[0] - 2)
+        t = xh - i[:,None]
+        t2, t3, t4, t5 = t**2, t**3, t**4, t**5
+        
+        # quintic Hermite basis functions and their derivatives (to t):
+        H = (1 - 10*t3 + 15*t4 - 6*t5, t - 6*t3 + 8*t4 - 3*t5, 
+             0.5*t2 - 1.5*t3 + 1.5*t4 - 0.5*t5, 0.5*t3 - t4 + 0.5*t5, 
+             -4*t3 + 7*t4 - 3*t5, 10*t3 - 15*t4 + 6*t5)
+        Ht = (-30*t2 + 60*t3 - 30*t4, 1 - 18*t2 + 32*t3 - 15*t4, 
+              t - 4.5*t2 + 6*t3 - 2.5*t4, 1.5*t2 - 4*t3 + 2.5*t4, 
+              -12*t2 + 28*t3 - 15*t4, 30*t2 - 60*t3 + 30*t4)
+        nodes = (p[i], h*px[i], h**2*pxx[i], h**2*pxx[i+1], h*px[i+1], p[i+1])
+        uv = sum(Hk*nk for Hk, nk in zip(H, nodes))
+        uvp = sum(Hk*nk for Hk, nk in zip(Ht, nodes))/h 
+        u[in_table], v[in_table], up[in_table], vp[in_table] = uv[:,:1], uv[:,1:2], uvp[:,:1], uvp[:,1:2]
+    
+    if (~in_table).any():
+        _, u[~in_table], v[~in_table], up[~in_table], vp[~in_table], _, _, _ = _get_uv_uvp_uvpp(T[~in_table], uvwbar, wl, dl, out = 'BB,BBp')
+    
+    return u, v, up, vp
+
+
 #------------------------------------------------------------------------------
 # Tc list generation functions:
 #------------------------------------------------------------------------------
@@ -975,6 +1088,147 @@ def _generate_lut(tc4, uin = None, seamless_stitch = True,
         return list([lut, {}])
 
     
+#------------------------------------------------------------------------------
+# on-disk cache for luts generated on the fly:
+#------------------------------------------------------------------------------
+def _update_hash(h, x):
+    """ Update hashlib object h with the content of (nested) x """
+    if isinstance(x, np.ndarray):
+        h.update(repr((x.dtype.str, x.shape)).encode())
+        h.update(np.ascontiguousarray(x).tobytes())
+    elif isinstance(x, dict):
+        h.update(b'{')
+        for key in sorted(x.keys(), key = repr):
+            h.update(repr(key).encode())
+            _update_hash(h, x[key])
+        h.update(b'}')
+    elif isinstance(x, (list, tuple)):
+        h.update(b'(')
+        for xi in x: _update_hash(h, xi)
+        h.update(b')')
+    elif callable(x):
+        h.update('{}.{}'.format(getattr(x, '__module__', ''), getattr(x, '__qualname__', repr(x))).encode())
+    else:
+        h.update(repr(x).encode())
+
+def _get_lut_cache_key(lut, lut_generator_fcn, generator_kwargs):
+    """ 
+    Get key (hash) for the on-disk lut cache from the CMFs (converted to the cspace), 
+    the wavelengths, the cspace, the lut generator and the lut (type) specifier.
+    """
+    cspace_dict = generator_kwargs['cspace']
+    xyzbar, wl, _ = _get_xyzbar_wl_dl(generator_kwargs['cieobs'], generator_kwargs['wl'])
+    uvwbar = _convert_xyzbar_to_uvwbar(xyzbar, cspace_dict)
+    h = hashlib.sha256()
+    for x in (uvwbar, wl, cspace_dict['str'], lut_generator_fcn, lut, 
+              {k : v for k, v in generator_kwargs.items() if k not in ('cspace','cieobs','wl')}):
+        _update_hash(h, x)
+    return h.hexdigest()[:32]
+
+def _read_lut_cache_file(file_path):
+    """ Read [lut, lut_kwargs] from lut cache file (None if absent, unreadable or corrupt) """
+    if not os.path.exists(file_path): return None
+    try:
+        with np.load(file_path, allow_pickle = False) as data:
+            lut = [data['lut'], json.loads(str(data['lut_kwargs']))]
+    except OSError:
+        return None
+    except (ValueError, KeyError, zipfile.BadZipFile): # corrupt or truncated file: cache miss
+        try:
+            os.remove(file_path) 
+        except OSError:
+            pass
+        return None
+    try:
+        os.utime(file_path) # mark as recently used (LRU eviction)
+    except OSError:
+        pass
+    return lut
+
+def _write_lut_cache_file(file_path, lut):
+    """ Write [lut, lut_kwargs] to lut cache file (atomically) """
+    tmp_path = '{:s}.{:d}.tmp'.format(file_path, os.getpid())
+    try:
+        with open(tmp_path, 'wb') as fobj:
+            np.savez(fobj, lut = lut[0], lut_kwargs = np.array(json.dumps(lut[1], default = lambda x: x.tolist())))
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path): os.remove(tmp_path)
+
+def _evict_lut_cache(cache_path = None, max_size = None):
+    """ Remove least recently used luts from the on-disk cache until its size <= max_size (bytes) """
+    if cache_path is None: cache_path = _CCT_LUT_CACHE_PATH
+    if max_size is None: max_size = _CCT_LUT_CACHE_MAX_SIZE
+    files = []
+    for file in os.listdir(cache_path):
+        if file.endswith('.npz'):
+            try:
+                stat = os.stat(os.path.join(cache_path, file))
+                files.append((stat.st_mtime, stat.st_size, file))
+            except OSError: # (removed by other process)
+                pass
+    size = sum(file[1] for file in files)
+    for _, file_size, file in sorted(files):
+        if size <= max_size: break
+        try:
+            os.remove(os.path.join(cache_path, file))
+        except OSError:
+            pass
+        size -= file_size
+
+def _get_lut_from_cache(lut, lut_generator_fcn, generator_kwargs):
+    """ 
+    Get [lut, lut_kwargs] from the on-disk lut cache in _CCT_LUT_CACHE_PATH, 
+    or generate it with lut_generator_fcn and store it in the cache. 
+    A lock file ensures only one (concurrent) process generates a specific lut, 
+    the others wait for it. If the cache can't be used (e.g. read-only folder), 
+    the lut is simply generated.
+    """
+    generate = lambda: list(lut_generator_fcn(lut, **generator_kwargs))
+    cache_path = _CCT_LUT_CACHE_PATH
+    key = _get_lut_cache_key(lut, lut_generator_fcn, generator_kwargs)
+    file_path = os.path.join(cache_path, key + '.npz')
+    lock_path = os.path.join(cache_path, key + '.lock')
+    
+    cached_lut = _read_lut_cache_file(file_path)
+    if cached_lut is not None: return cached_lut
+    
+    # acquire lock:
+    try:
+        os.makedirs(cache_path, exist_ok = True)
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError: # other process is generating this lut
+                cached_lut = _read_lut_cache_file(file_path)
+                if cached_lut is not None: return cached_lut
+                try:
+                    if (time.time() - os.path.getmtime(lock_path)) > _CCT_LUT_CACHE_LOCK_TIMEOUT: 
+                        os.remove(lock_path) # stale lock (e.g. process was killed)
+                except OSError:
+                    pass
+                time.sleep(0.05)
+    except OSError:
+        return generate()
+    
+    # generate lut and store in cache:
+    try:
+        cached_lut = _read_lut_cache_file(file_path) # (might have been written while acquiring lock)
+        if cached_lut is None: 
+            cached_lut = generate()
+            try:
+                _write_lut_cache_file(file_path, cached_lut)
+                _evict_lut_cache(cache_path)
+            except OSError:
+                pass
+    finally:
+        try:
+            os.remove(lock_path)
+        except OSError:
+            pass
+    return cached_lut
+
 def _get_lut(lut, 
              uin = None, seamless_stitch = True, 
              fallback_unit = _CCT_FALLBACK_UNIT, fallback_n = _CCT_FALLBACK_N,
@@ -1152,7 +1406,10 @@ should be a dictionary 'lut_kwargs'.""")
                     
             if cieobs in luts_dict[cspace_str]:
                 if lut in luts_dict[cspace_str][cieobs]: # read from luts_dict
-                    lut, lut_kwargs = copy.deepcopy(luts_dict[cspace_str][cieobs][lut])
+                    lut, lut_kwargs = luts_dict[cspace_str][cieobs][lut]
+                    # (read-only memory-mapped luts are shared, not copied):
+                    lut = lut if isinstance(lut, np.memmap) else copy.deepcopy(lut)
+                    lut_kwargs = copy.deepcopy(lut_kwargs)
                     lut_from_tuple = False
     
     elif isinstance(lut, np.ndarray): # lut is either pre-calculated lut or a list with Tcs for which a lut needs to be generated
@@ -1178,22 +1435,26 @@ should be a dictionary 'lut_kwargs'.""")
     
         if (not lut_from_array) | (resample_ndarray):
 
-            lut, lut_kwargs = lut_generator_fcn(lut, 
-                                                uin = uin,
-                                                seamless_stitch = seamless_stitch,
-                                                fallback_unit = fallback_unit,
-                                                fallback_n = fallback_n,
-                                                resample_ndarray = resample_ndarray,
-                                                cct_max = cct_max,
-                                                cct_min = cct_min,
-                                                lut_vars = lut_vars,
-                                                wl = wl, 
-                                                cieobs = cieobs, 
-                                                cspace = cspace_dict,
-                                                cspace_kwargs = None,
-                                                **lut_kwargs)
+            generator_kwargs = dict(uin = uin,
+                                    seamless_stitch = seamless_stitch,
+                                    fallback_unit = fallback_unit,
+                                    fallback_n = fallback_n,
+                                    resample_ndarray = resample_ndarray,
+                                    cct_max = cct_max,
+                                    cct_min = cct_min,
+                                    lut_vars = lut_vars,
+                                    wl = wl, 
+                                    cieobs = cieobs, 
+                                    cspace = cspace_dict,
+                                    cspace_kwargs = None,
+                                    **lut_kwargs)
+            if _CCT_LUT_CACHE:
+                lut, lut_kwargs = _get_lut_from_cache(lut, lut_generator_fcn, generator_kwargs)
+            else:
+                lut, lut_kwargs = lut_generator_fcn(lut, **generator_kwargs)
             
-            if luts_dict is not None:
+            # (don't overwrite luts in luts_dict with ones for other wavelengths):
+            if (luts_dict is not None) & (unequal_wl == False):
                 if cieobs not in luts_dict['wl']:
                     luts_dict['wl'][cieobs] = wl
                 if cieobs not in luts_dict[cspace_str]:
@@ -1216,7 +1477,7 @@ def generate_luts(types = [None], seamless_stitch = True,
                   lut_vars = ['T','uv','uvp','uvpp','iso-T-slope'],
                   cspace = [_CCT_CSPACE], cspace_kwargs = [_CCT_CSPACE_KWARGS],
                   verbosity = 0, lut_generator_fcn = _generate_lut, 
-                  lut_generator_kwargs = {}):
+                  lut_generator_kwargs = {}, n_workers = None):
     """
     Generate a number of luts and store them in a nested dictionary.
     Structure: lut[cspace][cieobs][lut type].
@@ -1226,6 +1487,7 @@ def generate_luts(types = [None], seamless_stitch = True,
             | None, optional
             | string specifying the filename to save the lut (as .pkl) to.
             | If None: don't save anything when generated (i.e. load==False).
+            | (the file is written atomically, i.e. via a temporary file)
         :load:
             | True, optional
             | If True: load previously generated dictionary.
@@ -1289,7 +1551,7 @@ def generate_luts(types = [None], seamless_stitch = True,
             | Default is single chromaticity diagram in _CCT_CSPACE.
         :verbosity:
             | 0, optional
-            | If > 0: give some intermediate feedback while generating luts.
+            | If > 0: report progress while generating luts.
         :lut_generator_fcn:
             | _generate_lut, optional
             | Lets a user specify his own lut generation function (must output a list of 1 lut). 
@@ -1301,6 +1563,13 @@ def generate_luts(types = [None], seamless_stitch = True,
             | {}, optional
             | Dict with keyword arguments specific to the (user) lut_generator_fcn.
             |  (e.g. {'f_corr':0.9991} for _generate_lut_ohno2014())
+        :n_workers:
+            | None, optional
+            | Number of worker processes generating the luts (one job per 
+            | cspace, cieobs and lut type) in parallel.
+            | If None: generate luts sequentially.
+            | Note that lut_generator_fcn, cspace and lut_generator_kwargs 
+            | must then be picklable (e.g. module-level functions).
             
         Returns:
             :dict:
@@ -1316,67 +1585,25 @@ def generate_luts(types = [None], seamless_stitch = True,
                 | - uvpp: chromaticity coordinates of 2nd derivative of the planckians.
                 | - iso-T-slope: slope of isotemperature lines (calculated as in Robertson, 1968).
     """
-    luts = {'lut_vars' : lut_vars} 
-    # lut_units = ['%','K','%-1','K-1','au']
-
     # Calculate luts:
     if (load == False):
-        #luts['wl'] = wl
-        luts['wl'] = {} # store wavelengths of the cieobs
-        
-        for i, (cspace_i,cspace_kwargs_i) in enumerate(zip(cspace,cspace_kwargs)):
-            
-            cspace_dict_i,_ = _process_cspace(cspace_i, cspace_kwargs = cspace_kwargs_i)
-            cspace_str_i = cspace_dict_i['str']
-            luts[cspace_i] = {'cspace' : cspace_i, 'cspace_kwargs' : cspace_kwargs_i, 'cspace_dict': cspace_dict_i}
-            
-            if cieobs is None: cieobs = _CMF['types']
-            
-            for j,cieobs_j in enumerate(cieobs):
-                
-                luts['wl'][cieobs_j] = _CMF[cieobs_j]['bar'][0] if (wl is None) else getwlr(wl) # store wavelengths
-                
-                ftmp = lambda lut: lut_generator_fcn(lut, 
-                                                     seamless_stitch = seamless_stitch, 
-                                                     fallback_unit = fallback_unit, 
-                                                     fallback_n = fallback_n,
-                                                     cct_max = cct_max, 
-                                                     cct_min = cct_min,
-                                                     wl = luts['wl'][cieobs_j], 
-                                                     cieobs = cieobs_j, 
-                                                     cspace =  cspace_dict_i, 
-                                                     cspace_kwargs = None,
-                                                     lut_vars = lut_vars,
-                                                     **lut_generator_kwargs)
-                luts[cspace_i][cieobs_j] = {}
-                
-                for type_k in types:
-                    # ensure full tuple depth for use as key:
-                    if not isinstance(type_k[-1],str): # at least depth 2 (<--last element is str for depth 1)
-                        tmp = list((tuple(type_kl) for type_kl in type_k if not isinstance(type_kl,bool)))
-                        if (isinstance(type_k[-1],bool)): seamless_stitch = type_k[-1]
-                        if (len(tmp)>1): tmp = (*tmp,seamless_stitch) # 
-
-                    tmp = (tuple(tmp))
-                    if verbosity > 0:
-                        print('Generating lut with type = {} in cspace = {:s} for cieobs = {:s}'.format(type_k,cspace_str_i,cieobs_j))
-                    
-                    if (cieobs_j != 'cie_std_dev_obs_f1') & (cieobs_j != '1951_20_scotopic'):
-                        luts[cspace_i][cieobs_j][tmp] = list(ftmp(tmp))
-                    else:
-                        luts[cspace_i][cieobs_j][tmp] = []
-                    
-
-                # save to disk (do intermediate saves):
-                if (lut_file is not None) & (save_luts == True):
-                    if (i == 0) & (j == 0): 
-                        if not os.path.exists(lut_path):
-                            os.makedirs(lut_path,exist_ok=True)
-                    file_path = os.path.join(lut_path,lut_file)
-                    if verbosity > 0:
-                        print('Saving dict with luts in {:s}'.format(file_path))                                                 
-                    save_pkl(file_path,luts, compresslevel = _CCT_PKL_COMPRESSLEVEL)
-        luts = load_pkl(file_path, gzipped = _CCT_PKL_COMPRESSLEVEL > 0)
+        luts, jobs, job_keys = _get_lut_jobs(types = types, seamless_stitch = seamless_stitch,
+                                             fallback_unit = fallback_unit, fallback_n = fallback_n,
+                                             cct_min = cct_min, cct_max = cct_max, 
+                                             wl = wl, cieobs = cieobs, lut_vars = lut_vars,
+                                             cspace = cspace, cspace_kwargs = cspace_kwargs,
+                                             lut_generator_fcn = lut_generator_fcn, 
+                                             lut_generator_kwargs = lut_generator_kwargs)
+        _fill_luts(luts, job_keys, _run_lut_jobs(jobs, n_workers = n_workers, verbosity = verbosity))
+
+        # save to disk:
+        if (lut_file is not None) & (save_luts == True):
+            os.makedirs(lut_path, exist_ok = True)
+            file_path = os.path.join(lut_path,lut_file)
+            if verbosity > 0:
+                print('Saving dict with luts in {:s}'.format(file_path))                                                 
+            _save_pkl_atomic(file_path, luts)
+            luts = load_pkl(file_path, gzipped = _CCT_PKL_COMPRESSLEVEL > 0)
     else:
         if lut_file is not None:
             file_path = os.path.join(lut_path, lut_file)
@@ -1387,6 +1614,109 @@ def generate_luts(types = [None], seamless_stitch = True,
             raise Exception('Trying to load lut file but no lut_file has been supplied.')
     return luts
 
+def _get_lut_jobs(types = [None], seamless_stitch = True,
+                  fallback_unit = _CCT_FALLBACK_UNIT, fallback_n = _CCT_FALLBACK_N,
+                  cct_min = _CCT_MIN, cct_max = _CCT_MAX,
+                  wl = None, cieobs = [_CIEOBS], 
+                  lut_vars = ['T','uv','uvp','uvpp','iso-T-slope'],
+                  cspace = [_CCT_CSPACE], cspace_kwargs = [_CCT_CSPACE_KWARGS],
+                  lut_generator_fcn = _generate_lut, lut_generator_kwargs = {}):
+    """ 
+    Get the (empty) nested lut dict (see generate_luts) and a list of jobs 
+    (one per cspace, cieobs and lut type) with the keys to the dict for their output.
+    """
+    luts = {'lut_vars' : lut_vars, 'wl' : {}} # (luts['wl'] stores the wavelengths of the cieobs)
+    jobs, job_keys = [], []
+    for i, (cspace_i,cspace_kwargs_i) in enumerate(zip(cspace,cspace_kwargs)):
+        
+        cspace_dict_i,_ = _process_cspace(cspace_i, cspace_kwargs = cspace_kwargs_i)
+        luts[cspace_i] = {'cspace' : cspace_i, 'cspace_kwargs' : cspace_kwargs_i, 'cspace_dict': cspace_dict_i}
+        
+        if cieobs is None: cieobs = _CMF['types']
+        
+        for j,cieobs_j in enumerate(cieobs):
+            
+            luts['wl'][cieobs_j] = _CMF[cieobs_j]['bar'][0] if (wl is None) else getwlr(wl) # store wavelengths
+            luts[cspace_i][cieobs_j] = {}
+            
+            for type_k in types:
+                # ensure full tuple depth for use as key:
+                if not isinstance(type_k[-1],str): # at least depth 2 (<--last element is str for depth 1)
+                    tmp = list((tuple(type_kl) for type_kl in type_k if not isinstance(type_kl,bool)))
+                    if (isinstance(type_k[-1],bool)): seamless_stitch = type_k[-1]
+                    if (len(tmp)>1): tmp = (*tmp,seamless_stitch) # 
+
+                tmp = (tuple(tmp))
+                
+                if (cieobs_j != 'cie_std_dev_obs_f1') & (cieobs_j != '1951_20_scotopic'):
+                    luts[cspace_i][cieobs_j][tmp] = None # placeholder (keeps order of keys)
+                    jobs.append({'lut' : tmp, 'lut_generator_fcn' : lut_generator_fcn, 
+                                 'cspace' : cspace_i, 'cspace_kwargs' : cspace_kwargs_i,
+                                 'cspace_str' : cspace_dict_i['str'],
+                                 'kwargs' : dict(seamless_stitch = seamless_stitch, 
+                                                 fallback_unit = fallback_unit, 
+                                                 fallback_n = fallback_n,
+                                                 cct_max = cct_max, 
+                                                 cct_min = cct_min,
+                                                 wl = luts['wl'][cieobs_j], 
+                                                 cieobs = cieobs_j, 
+                                                 lut_vars = lut_vars,
+                                                 **lut_generator_kwargs)})
+                    job_keys.append((cspace_i, cieobs_j, tmp))
+                else:
+                    luts[cspace_i][cieobs_j][tmp] = []
+    return luts, jobs, job_keys
+
+def _fill_luts(luts, job_keys, results):
+    """ Put the output of the lut jobs in the nested lut dict """
+    for (cspace_i, cieobs_j, lut_type), lut in zip(job_keys, results):
+        luts[cspace_i][cieobs_j][lut_type] = lut
+    return luts
+
+def _generate_lut_job(job):
+    """ Generate a single lut (see _get_lut_jobs; module-level so it can run in a worker process) """
+    cspace_dict,_ = _process_cspace(job['cspace'], cspace_kwargs = job['cspace_kwargs'])
+    return list(job['lut_generator_fcn'](job['lut'], cspace = cspace_dict, cspace_kwargs = None, **job['kwargs']))
+
+def _run_lut_jobs(jobs, n_workers = None, verbosity = 0):
+    """ 
+    Run lut generation jobs, sequentially or (n_workers > 1) in a process pool.
+    Results are returned in the order of the jobs. If verbosity > 0: report progress.
+    """
+    results = [None]*len(jobs)
+    t0 = time.time()
+    def report(k, n_done):
+        if verbosity > 0:
+            print('[{:d}/{:d}] Generated lut with type = {} in cspace = {:s} for cieobs = {:s} ({:1.1f} s)'.format(n_done, len(jobs), 
+                  jobs[k]['lut'], jobs[k]['cspace_str'], jobs[k]['kwargs']['cieobs'], time.time() - t0))
+            
+    if (n_workers is None) or (n_workers <= 1) or (len(jobs) <= 1):
+        for k, job in enumerate(jobs):
+            results[k] = _generate_lut_job(job)
+            report(k, k + 1)
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed # lut generation is CPU-bound python (GIL) code
+        with ProcessPoolExecutor(max_workers = min(n_workers, len(jobs))) as pool:
+            futures = {pool.submit(_generate_lut_job, job) : k for k, job in enumerate(jobs)}
+            for n_done, future in enumerate(as_completed(futures)):
+                k = futures[future]
+                results[k] = future.result()
+                report(k, n_done + 1)
+    return results
+
+def _save_pkl_atomic(file_path, obj):
+    """ 
+    Save obj (see save_pkl) to a temporary file in the same folder and then 
+    move it into place, so other processes never read a partially written file.
+    """
+    ext = '.gz' if (_CCT_PKL_COMPRESSLEVEL > 0) else ''
+    tmp_path = '{:s}.{:d}.tmp'.format(file_path, os.getpid())
+    try:
+        save_pkl(tmp_path, obj, compresslevel = _CCT_PKL_COMPRESSLEVEL)
+        os.replace(tmp_path + ext, file_path + ext)
+    finally:
+        if os.path.exists(tmp_path + ext): os.remove(tmp_path + ext)
+
 def _copy_luts(mode, cspace = _CCT_CSPACE, cieobs = ['2006_2','2006_10'], 
                cieobs_src = ['2015_2', '2015_10'], lut = _CCT_LUT):
     """ Copy luts for specific cieobs keys to equivalent cieobs keys"""
@@ -1461,19 +1791,171 @@ def _download_luts_from_github(modes = None, url = _CCT_LUT_PATH_LX_REPO):
         if _CCT_PKL_COMPRESSLEVEL == 0: 
             r = requests.get(os.path.join(url,mode+'_luts.pkl'))
             lut = pickle.load(BytesIO(r.content))
-            save_pkl(os.path.join(_CCT_LUT_PATH,mode+'_luts.pkl'), lut, compresslevel = _CCT_PKL_COMPRESSLEVEL)
+            _save_pkl_atomic(os.path.join(_CCT_LUT_PATH,mode+'_luts.pkl'), lut)
         else:
             r = requests.get(os.path.join(url,mode+'_luts.pkl.gz'))
             with gzip.open(BytesIO(r.content),mode='r') as fobj:
                 lut = pickle.load(fobj)
-            save_pkl(os.path.join(_CCT_LUT_PATH,mode+'_luts.pkl'), lut, compresslevel = _CCT_PKL_COMPRESSLEVEL)
+            _save_pkl_atomic(os.path.join(_CCT_LUT_PATH,mode+'_luts.pkl'), lut)
 
             
+
+#------------------------------------------------------------------------------
+# memory-mappable .npy LUT store:
+#------------------------------------------------------------------------------
+_CCT_LUT_NPY_INDEX_FILE = 'index.json'
+_CCT_LUT_NPY_INDEX_VERSION = 1
+
+def _get_lut_npy_path(mode, lut_path = _CCT_LUT_PATH):
+    """ Get the folder of the .npy LUT store of a mode """
+    return os.path.join(lut_path, '{:s}_luts_npy'.format(mode))
+
+def _get_lut_pkl_file(mode, lut_path = _CCT_LUT_PATH):
+    """ Get the path of an existing LUT pickle file of a mode (None if there is none) """
+    file_path = os.path.join(lut_path, '{:s}_luts.pkl'.format(mode))
+    if (_CCT_PKL_COMPRESSLEVEL > 0) | (not os.path.exists(file_path)):
+        file_path = file_path + '.gz'
+    return file_path if os.path.exists(file_path) else None
+
+def _get_file_stamp(file_path):
+    """ Get dict with name, size and modification time of a file (to detect stale stores) """
+    stat = os.stat(file_path)
+    return {'file' : os.path.basename(file_path), 'size' : stat.st_size, 'mtime' : int(stat.st_mtime)}
+
+def _json_to_lut_type(x):
+    """ Convert (nested) lists of a JSON-loaded lut_type back into a (nested) tuple dict key """
+    return tuple([_json_to_lut_type(xi) for xi in x]) if isinstance(x, list) else x
+
+def _save_luts_npy(luts, mode, lut_path = _CCT_LUT_PATH, source_file = None):
+    """ 
+    Save a dict with luts (see generate_luts) as one float64 .npy file per 
+    (cspace, cieobs, lut_type) and a JSON index in lut_path/{mode}_luts_npy/.
+    (if not None, source_file is stamped in the index to detect a stale store)
+    """
+    npy_path = _get_lut_npy_path(mode, lut_path = lut_path)
+    os.makedirs(npy_path, exist_ok = True)
+    index = {'version' : _CCT_LUT_NPY_INDEX_VERSION, 'mode' : mode,
+             'source' : _get_file_stamp(source_file) if source_file is not None else None,
+             'lut_vars' : luts['lut_vars'],
+             'wl' : {cieobs_j : np.asarray(wl_j).tolist() for cieobs_j, wl_j in luts['wl'].items()},
+             'cspaces' : {}, 'luts' : []}
+    for cspace_i in luts.keys():
+        if (cspace_i == 'wl') | (cspace_i == 'lut_vars'): continue
+        if not isinstance(luts[cspace_i]['cspace'], str):
+            raise Exception('Only luts for a cspace specified by a string can be stored in the .npy LUT store.')
+        index['cspaces'][cspace_i] = {'cspace' : luts[cspace_i]['cspace'], 
+                                      'cspace_kwargs' : luts[cspace_i]['cspace_kwargs']}
+        for cieobs_j in luts[cspace_i].keys():
+            if 'cspace' in cieobs_j: continue
+            for k, (lut_type_k, lut_k) in enumerate(luts[cspace_i][cieobs_j].items()):
+                entry = {'cspace' : cspace_i, 'cieobs' : cieobs_j, 'lut_type' : lut_type_k, 
+                         'file' : None, 'lut_kwargs' : {}}
+                if len(lut_k) > 0: # (placeholder entries are stored as empty lists)
+                    entry['file'] = '{:s}_{:s}_{:d}.npy'.format(cspace_i, cieobs_j, k)
+                    entry['lut_kwargs'] = lut_k[1]
+                    np.save(os.path.join(npy_path, entry['file']), np.ascontiguousarray(lut_k[0], dtype = np.float64))
+                index['luts'].append(entry)
+    
+    # write index last (and atomically), so a partially written store is never picked up:
+    index_file = os.path.join(npy_path, _CCT_LUT_NPY_INDEX_FILE)
+    with open(index_file + '.tmp', 'w') as fobj:
+        json.dump(index, fobj, indent = 1, default = lambda x: x.tolist()) # (tolist() handles numpy scalars)
+    os.replace(index_file + '.tmp', index_file)
+
+def _load_luts_npy(mode, lut_path = _CCT_LUT_PATH, mmap_mode = 'r', check_source = True):
+    """ 
+    Load a dict with luts from the .npy LUT store in lut_path/{mode}_luts_npy/.
+    Arrays are memory-mapped (mmap_mode='r'), so processes share a single 
+    page-cache copy. Returns None when there is no (valid or up-to-date) store.
+    """
+    index_file = os.path.join(_get_lut_npy_path(mode, lut_path = lut_path), _CCT_LUT_NPY_INDEX_FILE)
+    if not os.path.exists(index_file): return None
+    try:
+        with open(index_file, 'r') as fobj:
+            index = json.load(fobj)
+        if index.get('version') != _CCT_LUT_NPY_INDEX_VERSION: return None
+        
+        # store is stale when the pickle file it was converted from has changed:
+        if check_source & (index['source'] is not None):
+            pkl_file = _get_lut_pkl_file(mode, lut_path = lut_path)
+            if (pkl_file is not None):
+                if _get_file_stamp(pkl_file) != index['source']: return None
+        
+        luts = {'lut_vars' : index['lut_vars'],
+                'wl' : {cieobs_j : np.array(wl_j) for cieobs_j, wl_j in index['wl'].items()}}
+        for cspace_i, cspace_i_dict in index['cspaces'].items():
+            cspace_dict_i, _ = _process_cspace(cspace_i_dict['cspace'], cspace_kwargs = cspace_i_dict['cspace_kwargs'])
+            luts[cspace_i] = {'cspace' : cspace_i_dict['cspace'], 'cspace_kwargs' : cspace_i_dict['cspace_kwargs'], 
+                              'cspace_dict' : cspace_dict_i}
+        npy_path = os.path.dirname(index_file)
+        for entry in index['luts']:
+            luts_ij = luts[entry['cspace']].setdefault(entry['cieobs'], {})
+            luts_ij[_json_to_lut_type(entry['lut_type'])] = [] if entry['file'] is None else \
+                [np.load(os.path.join(npy_path, entry['file']), mmap_mode = mmap_mode), entry['lut_kwargs']]
+        return luts
+    except Exception as e:
+        print("Couldn't load LUTs for mode '{:s}' from .npy store ({}). Falling back to pickle file.".format(mode, e))
+        return None
+
+def convert_luts_pkl_to_npy(modes = None, lut_path = _CCT_LUT_PATH, verbosity = 1):
+    """
+    Convert the (gzipped) LUT pickle files to a memory-mappable store of 
+    uncompressed float64 .npy files (one per mode, cspace, cieobs and lut type) 
+    with a JSON index.
+    
+    Args:
+        :modes:
+            | None, optional
+            | List of modes to convert. 
+            | If None: convert all modes in _CCT_LIST_OF_MODE_LUTS for which a pickle file exists.
+        :lut_path:
+            | _CCT_LUT_PATH, optional
+            | Folder with the LUT pickle files. The .npy store of each mode is
+            | written to the subfolder {mode}_luts_npy/.
+        :verbosity:
+            | 1, optional
+            | If > 0: print some info on the conversion.
+            
+    Returns:
+        :npy_paths:
+            | dict with (for each converted mode) the folder of the .npy store.
+            
+    Notes:
+        1. When _CCT_LUT_NPY_STORE is True, an up-to-date store is used 
+        instead of the pickle file. As the arrays are opened with 
+        np.load(mmap_mode='r'), several (worker) processes share a single 
+        page-cache copy, and no decompression is needed. 
+        2. The store is ignored (with a fallback to the pickle file) when the 
+        pickle file has changed since the conversion. 
+    """
+    if modes is None: 
+        modes = [mode for mode in _CCT_LIST_OF_MODE_LUTS if _get_lut_pkl_file(mode, lut_path = lut_path) is not None]
+    npy_paths = {}
+    for mode in modes:
+        pkl_file = _get_lut_pkl_file(mode, lut_path = lut_path)
+        if pkl_file is None:
+            raise Exception("No LUT pickle file for mode '{:s}' in {:s}.".format(mode, lut_path))
+        if verbosity > 0:
+            print('Converting {:s} to .npy LUT store in {:s}'.format(pkl_file, _get_lut_npy_path(mode, lut_path = lut_path)))
+        luts = load_pkl(pkl_file)
+        _save_luts_npy(luts, mode, lut_path = lut_path, source_file = pkl_file)
+        npy_paths[mode] = _get_lut_npy_path(mode, lut_path = lut_path)
+    return npy_paths
+
         
 def _initialize_lut(mode, lut_types, force_calc = _CCT_LUT_CALC, wl = None, lut_generator_kwargs = {}):
     """ Pre-generate / load from disk / download from github some LUTs for a specific mode """
     if (mode in _CCT_LIST_OF_MODE_LUTS) & _CCT_LUT_ONE_NPY_PER_MODE:
         lut_exists = os.path.exists(os.path.join(_CCT_LUT_PATH,'{:s}_luts.pkl'.format(mode))) | os.path.exists(os.path.join(_CCT_LUT_PATH,'{:s}_luts.pkl.gz'.format(mode)))
+        
+        # try memory-mappable .npy store first (falls back to pickle file when absent or stale):
+        if _CCT_LUT_NPY_STORE & (force_calc == False):
+            luts = _load_luts_npy(mode, lut_path = _CCT_LUT_PATH)
+            if luts is not None:
+                _CCT_LUT[mode]['luts'] = luts
+                _copy_luts(mode, lut = _CCT_LUT) # 2015_2 -> 2006_2, 2015_10 -> 2006_10
+                return None
+            
         if (not lut_exists) & (force_calc == False):
             try:
                 print("LUT pickle file for mode '{:s}' doesn't exist. Trying download from luxpy github repo.".format(mode))
@@ -1495,6 +1977,101 @@ def _initialize_lut(mode, lut_types, force_calc = _CCT_LUT_CALC, wl = None, lut_
         # _CCT_LUT[mode]['luts'] = _lut_to_float64(_CCT_LUT[mode]['luts'])
         _copy_luts(mode, lut = _CCT_LUT) # 2015_2 -> 2006_2, 2015_10 -> 2006_10
 
+def _get_luts_dict(mode):
+    """ 
+    Get the dict with pre-calculated LUTs for a specific mode. 
+    The LUTs are only loaded from disk (or downloaded / generated) on first use,
+    which keeps 'import luxpy' fast for processes that never calculate a CCT.
+    Initialization is thread-safe.
+    """
+    if _CCT_LUT[mode].get('luts') is None:
+        with _CCT_LUT_INIT_LOCK:
+            # (re-)check: other thread might have finished initialization in the meantime:
+            if (_CCT_LUT[mode].get('luts') is None) & (mode not in _CCT_LUT_INITIALIZING) & ('lut_types' in _CCT_LUT[mode]):
+                _CCT_LUT_INITIALIZING.add(mode)
+                try:
+                    if mode == 'none':
+                        _CCT_LUT[mode]['luts'] = copy.deepcopy(_get_luts_dict('robertson1968'))
+                    else:
+                        if (mode == 'fibonacci') & (not os.path.exists(os.path.join(_CCT_LUT_PATH,'{:s}_luts.pkl'.format(mode)))):
+                            print('\nInitializing (generate or download) Fibonacci LUTs on first use.')
+                        _initialize_lut(mode = mode, lut_types = _CCT_LUT[mode]['lut_types'])
+                finally:
+                    _CCT_LUT_INITIALIZING.discard(mode)
+    return _CCT_LUT[mode].get('luts')
+
+def regenerate_luts(modes = None, cieobs = None, wl = None, lut_path = _CCT_LUT_PATH,
+                    n_workers = None, verbosity = 1):
+    """
+    Regenerate the LUTs of several modes (e.g. for a new cieobs or wavelength range) 
+    and save them (atomically) as {mode}_luts.pkl in lut_path.
+    
+    Args:
+        :modes:
+            | None, optional
+            | List of modes to regenerate the luts for.
+            | If None: all modes in _CCT_LIST_OF_MODE_LUTS.
+        :cieobs:
+            | None, optional
+            | List of CMF sets (keys in _CMF) to generate luts for.
+            | If None: use _CCT_LIST_OF_CIEOBS_LUTS.
+        :wl:
+            | None, optional
+            | Wavelength for Planckian spectrum generation.
+            | If None: use same wavelengths as CMFs in :cieobs:.
+        :lut_path:
+            | _CCT_LUT_PATH, optional
+            | Folder to save the luts in.
+        :n_workers:
+            | None, optional
+            | Number of worker processes. The jobs of all modes (one per mode, 
+            | cspace, cieobs and lut type) are distributed over a single pool.
+            | If None: generate luts sequentially.
+        :verbosity:
+            | 1, optional
+            | If > 0: report progress.
+            
+    Returns:
+        :luts:
+            | dict with for each mode the dict with luts (see generate_luts).
+            
+    Note:
+        When lut_path is _CCT_LUT_PATH, the luts of the regenerated modes 
+        are reloaded on their next use.
+    """
+    if modes is None: modes = _CCT_LIST_OF_MODE_LUTS
+    if cieobs is None: cieobs = _CCT_LIST_OF_CIEOBS_LUTS
+    
+    # collect jobs of all modes (to share a single pool):
+    luts, jobs, job_keys, job_modes = {}, [], [], []
+    for mode in modes:
+        luts[mode], jobs_m, job_keys_m = _get_lut_jobs(types = _CCT_LUT[mode]['lut_types'], 
+                                                       wl = wl, cieobs = cieobs,
+                                                       cspace = [_CCT_CSPACE], cspace_kwargs = [_CCT_CSPACE_KWARGS],
+                                                       lut_vars = _CCT_LUT[mode]['lut_vars'],
+                                                       lut_generator_fcn = _CCT_LUT[mode]['_generate_lut'])
+        jobs += jobs_m
+        job_keys += job_keys_m
+        job_modes += [mode]*len(jobs_m)
+    results = _run_lut_jobs(jobs, n_workers = n_workers, verbosity = verbosity)
+    
+    os.makedirs(lut_path, exist_ok = True)
+    for mode in modes:
+        _fill_luts(luts[mode], 
+                   [key for key, mode_k in zip(job_keys, job_modes) if mode_k == mode],
+                   [result for result, mode_k in zip(results, job_modes) if mode_k == mode])
+        file_path = os.path.join(lut_path, '{:s}_luts.pkl'.format(mode))
+        if verbosity > 0:
+            print('Saving dict with luts in {:s}'.format(file_path))
+        _save_pkl_atomic(file_path, luts[mode])
+        
+        # force reload on next use:
+        if os.path.abspath(lut_path) == os.path.abspath(_CCT_LUT_PATH):
+            with _CCT_LUT_INIT_LOCK:
+                _CCT_LUT[mode]['luts'] = None
+                if mode == 'robertson1968': _CCT_LUT['none']['luts'] = None
+    return luts
+
 
 def _add_lut_endpoints(x):
     """ Replicates endpoints of lut to avoid out-of-bounds issues """
@@ -1600,6 +2177,24 @@ def _get_pns_from_x(x, idx, i = None, m0p = 'm0p'):
             return x[idx_m1,i][:,None], x[idx,i][:,None]
    
     
+def _get_closest_lut_idx(u, v, uBB, vBB):
+    """ 
+    Get the index of the lut entry closest to each test point (u,v).
+    For a lut shared by all test points a kd-tree on the lut (u,v) is used
+    (O(N.log(lut)) time and O(N) memory), for a lut with a set of columns 
+    per test point (cascading lut) a brute-force search is done.
+    Returns [N,] ndarray.
+    """
+    if (uBB.shape[-1] == 1) & np.isfinite(uBB).all() & np.isfinite(vBB).all():
+        uv = np.hstack((u, v))
+        finite = np.isfinite(uv).all(axis = -1)
+        pn = np.zeros((uv.shape[0],), dtype = np.int64) # argmin() over nan also returns 0
+        if finite.any(): 
+            pn[finite] = cKDTree(np.hstack((uBB, vBB))).query(uv[finite])[1]
+        return pn
+    else:
+        return (((v.T - vBB)**2 + (u.T - uBB)**2)).argmin(axis=0)
+    
 def _deal_with_lut_end_points(pn, TBB, out_of_lut = None):
     ce = pn == (TBB.shape[0]-1) # end point
     cb = pn<=0 # begin point
@@ -1616,7 +2211,8 @@ def _deal_with_lut_end_points(pn, TBB, out_of_lut = None):
 
 #---------------------------------------------------------------------------------------------------
 def cct_to_xyz(ccts, duv = None, cct_offset = None, cieobs = _CIEOBS, wl = None,
-               cspace = _CCT_CSPACE, cspace_kwargs = _CCT_CSPACE_KWARGS):
+               cspace = _CCT_CSPACE, cspace_kwargs = _CCT_CSPACE_KWARGS,
+               use_table = _CCT_TO_XYZ_USE_TABLE):
     """
     Convert correlated color temperature (550 K <= CCT <= 1e11 K) and 
     Duv (distance above (>0) or below (<0) the Planckian locus) to 
@@ -1631,6 +2227,8 @@ def cct_to_xyz(ccts, duv = None, cct_offset = None, cieobs = _CIEOBS, wl = None,
     |   Option 2 (slowest, about 55% slower):
     |       Calculate the slope of the iso-T-line directly using the Planckian
     |       spectrum and its derivative.
+    |       (by default, the Planckian coordinates and slope are interpolated
+    |        from a cached table, see :use_table:)
      
     Args:
         :ccts: 
@@ -1665,6 +2263,13 @@ def cct_to_xyz(ccts, duv = None, cct_offset = None, cieobs = _CIEOBS, wl = None,
         :cspace_kwargs:
             | _CCT_CSPACE_KWARGS, optional
             | Parameter nested dictionary for the forward and backward transforms.
+        :use_table:
+            | _CCT_TO_XYZ_USE_TABLE, optional
+            | If True (and :cct_offset: is None): interpolate the Planckian (u,v) 
+            |   and the slope of the locus from a cached high-resolution table 
+            |   (per CMF set and wavelength grid) instead of calculating them
+            |   by spectral integration for each cct. 
+            | If False: exact (spectral) calculation.
         
     Returns:
         :returns: 
@@ -1675,6 +2280,13 @@ def cct_to_xyz(ccts, duv = None, cct_offset = None, cieobs = _CIEOBS, wl = None,
         source is assumed to be on the Planckian locus.
         2. Minimum CCT is 550 K (lower than 550 K, some negative Duv values
         will result in coordinates outside of the Spectrum Locus !!!)
+        3. The table (_CCT_PLANCKIAN_TABLE_N = 1024 nodes, uniform in 1/CCT) 
+        covers _CCT_MIN <= CCT <= _CCT_PLANCKIAN_TABLE_MAX (= 1e6 K) and is 
+        interpolated with quintic Hermite polynomials using the first and 
+        second derivatives of the Planckian locus. The interpolation error is 
+        < 1e-12 in (u,v) and < 1e-9 rad in the direction of the iso-T-line 
+        (i.e. |error| < 1e-12 + 1e-9*|duv|). CCTs outside the table 
+        range are calculated exactly.
     """
     # make ccts a min. 2d np.array:
     if isinstance(ccts,list):
@@ -1717,20 +2329,25 @@ def cct_to_xyz(ccts, duv = None, cct_offset = None, cieobs = _CIEOBS, wl = None,
         # estimate iso-T-line from calculated slope:
         #-------------------------------------------
         uvwbar = _convert_xyzbar_to_uvwbar(xyzbar,cspace_dict)
-        _,UVW,UVWp,_ = _get_tristim_of_BB_BBp_BBpp(cct,uvwbar,wl,dl,out='BB,BBp') 
-        
-        R = UVW.sum(axis=-1, keepdims = True) 
-        Rp = UVWp.sum(axis=-1, keepdims = True) 
-        num = (UVWp[:,1:2]*R - UVW[:,1:2]*Rp) 
-        denom = (UVWp[:,:1]*R - UVW[:,:1]*Rp)
+        if use_table:
+            # interpolate from cached Planckian table (slope of locus = v'/u'):
+            uBB, vBB, denom, num = _get_uv_uvp_from_planckian_table(cct, uvwbar, wl, dl)
+        else:
+            _,UVW,UVWp,_ = _get_tristim_of_BB_BBp_BBpp(cct,uvwbar,wl,dl,out='BB,BBp') 
+            
+            R = UVW.sum(axis=-1, keepdims = True) 
+            Rp = UVWp.sum(axis=-1, keepdims = True) 
+            num = (UVWp[:,1:2]*R - UVW[:,1:2]*Rp) 
+            denom = (UVWp[:,:1]*R - UVW[:,:1]*Rp)
+            YuvBB = xyz_to_Yxy(UVW)
+            uBB, vBB = YuvBB[:,1:2], YuvBB[:,2:3]
         num[(num == 0)] += _CCT_AVOID_ZERO_DIV
         denom[(denom == 0)] += _CCT_AVOID_ZERO_DIV
         li = num/denom  
         li = li + np.sign(li)*_CCT_AVOID_ZERO_DIV # avoid division by zero
         mi = -1.0/li # slope of isotemperature lines
 
-        YuvBB = xyz_to_Yxy(UVW)
-        u, v = YuvBB[:,1:2] + np.sign(mi) * duv*(1/((1+mi**2)**0.5)), YuvBB[:,2:3] + np.sign(mi)* duv*((mi)/(1+mi**2)**0.5)
+        u, v = uBB + np.sign(mi) * duv*(1/((1+mi**2)**0.5)), vBB + np.sign(mi)* duv*((mi)/(1+mi**2)**0.5)
         
     # plt.plot(YuvBB[...,1],YuvBB[...,2],'gx')
     # lx.plotSL(cspace='Yuv60',axh=plt.gca())
@@ -1997,7 +2614,8 @@ def _get_newton_raphson_estimated_Tc(u, v, T0, wl = None, atol = 0.1, rtol = 1e-
     the maximum number of iterations (avoid potential infinite loops or cut the
     optimization short). When fast_duv is True (default) a faster method is used, but this
     only sufficiently accurate when the estimated CCT is 1 K or less than the
-    true value. 
+    true value. Convergence is checked for each test point separately; only 
+    the points that have not yet converged are updated in the next iteration.
     
     Reference:
         1. `Li, C., Cui, G., Melgosa, M., Ruan,X., Zhang, Y., Ma, L., Xiao, K., & Luo, M. R. (2016).
@@ -2024,31 +2642,36 @@ def _get_newton_raphson_estimated_Tc(u, v, T0, wl = None, atol = 0.1, rtol = 1e-
         dl = getwld(wl)
 
     
+    # Iterate only over the not yet converged test points (idx):
     i = 0
-    T = T0
-    while True & (i <= max_iter):
-           
-        T[T < _CCT_MIN] = _CCT_MIN # avoid infinities and convergence problems 
+    T = T0.copy()
+    DT, uBB, vBB = np.zeros_like(T), np.zeros_like(T), np.zeros_like(T)
+    idx = np.arange(T.shape[0])
+    while (idx.shape[0] > 0) & (i <= max_iter):
+        
+        Ti, ui, vi = T[idx], u[idx], v[idx]
+        Ti[Ti < _CCT_MIN] = _CCT_MIN # avoid infinities and convergence problems 
         
         # Get (u,v), (u',v'), (u",v"):
-        _, uBB, vBB, upBB, vpBB, uppBB, vppBB, _ = _get_uv_uvp_uvpp(T, uvwbar, wl, dl, out = 'BB,BBp,BBpp')
+        _, uBBi, vBBi, upBB, vpBB, uppBB, vppBB, _ = _get_uv_uvp_uvpp(Ti, uvwbar, wl, dl, out = 'BB,BBp,BBpp')
 
         # Calculate DT (ratio of f' and abs(f"):
-        du, dv = (u - uBB), (v - vBB) # pre-calculate for speed
+        du, dv = (ui - uBBi), (vi - vBBi) # pre-calculate for speed
 
-        # print('\n',((vpBB**2)-dv*vppBB).shape)
-        DT = -(du*upBB + dv*vpBB) / np.abs((upBB**2)-du*uppBB + (vpBB**2)-dv*vppBB)
+        DTi = -(du*upBB + dv*vpBB) / np.abs((upBB**2)-du*uppBB + (vpBB**2)-dv*vppBB)
 
         # DT[DT>T] = _CCT_MIN # avoid convergence problems
-        T = T - DT 
+        Ti = Ti - DTi 
+        T[idx], DT[idx], uBB[idx], vBB[idx] = Ti, DTi, uBBi, vBBi
 
-        if (np.abs(DT) < atol).all() | (np.abs(DT)/T < rtol).all():
-            break
+        # keep only those that haven't converged yet:
+        idx = idx[~((np.abs(DTi) < atol) | (np.abs(DTi/Ti) < rtol))[:,0]]
         i+=1
         
-    # get Duv:
-    if ~(fast_duv & (np.abs(DT)<=1.0).all()):
-        _, uBB, vBB, _, _, _, _, _ = _get_uv_uvp_uvpp(T, uvwbar, wl, dl, out = 'BB') # update one last time
+    # get Duv (update uBB, vBB one last time where needed):
+    idx = np.arange(T.shape[0]) if (not fast_duv) else np.where(~(np.abs(DT)<=1.0)[:,0])[0]
+    if idx.shape[0] > 0:
+        _, uBB[idx], vBB[idx], _, _, _, _, _ = _get_uv_uvp_uvpp(T[idx], uvwbar, wl, dl, out = 'BB') 
     
     Duv = _get_Duv_for_T_from_uvBB(u,v, uBB, vBB)
     return T, Duv
@@ -2066,22 +2689,25 @@ def _get_loop_i_lut_for_cascading_lut(Tx, TBB_m1, TBB_p1, out_of_lut,
                                       **kwargs):
     """
     Get a new updated lut with reduced min-max range for a cascading lut calculation.
+    Returns the lut (None if no test points are left), the mid-range Tx for 
+    each test point and a boolean array with the test points that have converged
+    (no new lut columns are generated for these).
     """
-
-    # cl cannot recover from out-of-lut, so if all are out-of-lut, no use continuing!
-    if (out_of_lut is not None) and (out_of_lut.all()): 
-        return None, None # ,None because expected output (from _generate_lut is 2):
-
-    # get overall min, max Ts over all xyzw test points:
+    # get min, max Ts for each xyzw test point:
     Ts_m1p1 =  np.hstack((TBB_m1,TBB_p1))  
     Ts_min, Ts_max = Ts_m1p1.min(axis=-1),Ts_m1p1.max(axis=-1)
     
     dTs = np.abs(Ts_max - Ts_min)
+    Tx_mid = ((Ts_min + Ts_max)/2)[:,None] 
+    
+    # cl cannot recover from out-of-lut, so no use continuing for those!
+    converged = (dTs <= atol) | (np.abs(dTs/Tx[:,0]) <= rtol)
+    if out_of_lut is not None: converged = converged | out_of_lut[:,0]
 
-    if (dTs<= atol).all() | (np.abs(dTs/Tx) <= rtol).all():
-        Tx =  ((Ts_min + Ts_max)/2)[:,None] 
-        return None, Tx 
+    if converged.all():
+        return None, Tx_mid, converged 
     else:
+        Ts_min, Ts_max = Ts_min[~converged], Ts_max[~converged]
         
         lut_int = lut_char[0][2]
 
@@ -2099,18 +2725,19 @@ def _get_loop_i_lut_for_cascading_lut(Tx, TBB_m1, TBB_p1, out_of_lut,
             lut_cl = [Ts_min,Ts_max,lut_int,lut_unit] if ('-1' not in lut_unit) else [1e6/Ts_max,1e6/Ts_min,lut_int,lut_unit]
             
         
-        #return (lut, lut_kwargs) tuple:
+        # lut_generator_fcn returns a (lut, lut_kwargs) tuple:
         lut_vars = lut_generator_kwargs.pop('lut_vars') if 'lut_vars' in lut_generator_kwargs else _CCT_LUT[mode]['lut_vars']
-        return lut_generator_fcn(lut_cl, seamless_stitch = True, 
-                                 fallback_unit = _CCT_FALLBACK_UNIT, 
-                                 fallback_n = _CCT_FALLBACK_N,
-                                 resample_ndarray = False, 
-                                 luts_dict = luts_dict, cieobs = cieobs, 
-                                 lut_type_def = _CCT_LUT[mode]['lut_type_def'],
-                                 cspace_str = cspace_str, wl = wl, cspace = cspace_dict, 
-                                 cspace_kwargs = None, ignore_unequal_wl = ignore_wl_diff, 
-                                 lut_vars = lut_vars,
-                                 **lut_generator_kwargs)
+        lut = lut_generator_fcn(lut_cl, seamless_stitch = True, 
+                                fallback_unit = _CCT_FALLBACK_UNIT, 
+                                fallback_n = _CCT_FALLBACK_N,
+                                resample_ndarray = False, 
+                                luts_dict = luts_dict, cieobs = cieobs, 
+                                lut_type_def = _CCT_LUT[mode]['lut_type_def'],
+                                cspace_str = cspace_str, wl = wl, cspace = cspace_dict, 
+                                cspace_kwargs = None, ignore_unequal_wl = ignore_wl_diff, 
+                                lut_vars = lut_vars,
+                                **lut_generator_kwargs)[0]
+        return lut, Tx_mid, converged
 
 def _get_cascading_lut_Tx(mode, u, v, lut, lut_n_cols, lut_char, lut_resolution_reduction_factor,
                           luts_dict, cieobs, wl, cspace_str, cspace_dict, ignore_wl_diff,
@@ -2129,7 +2756,8 @@ def _get_cascading_lut_Tx(mode, u, v, lut, lut_n_cols, lut_char, lut_resolution_
     and return the Tx,Duvx, out_of_lut and a tuple with Tleft (TBB_m1), Tright (TBB_p1). 
     Duvx can be None if method doesn't naturally provide an estimate.
     Skips first calculation of Tx when (Tx0, out_of_lut, TBB_l, TBB_r) are None
-    (i.e. already calculated).
+    (i.e. already calculated). Test points that have converged (or are out-of-lut)
+    are dropped from the next cascades.
     """
     # cascading lut:
     cascade_i = 0
@@ -2143,37 +2771,37 @@ def _get_cascading_lut_Tx(mode, u, v, lut, lut_n_cols, lut_char, lut_resolution_
     if 'wl' in lut_generator_kwargs: lut_generator_kwargs.pop('wl') # for mode == 'zhang2019': 'wl' is also part of this dict!
     # if 'lut_vars' in lut_generator_kwargs: lut_generator_kwargs.pop('lut_vars') # for mode == 'zhang2019': 'wl' is also part of this dict!
     
+    # get first Tx estimate, out_of_lut boolean array, and (TBB_m1, TBB_p1 or equivalent):
+    if ((Tx is None) & (out_of_lut is None) & (TBB_l is None) & (TBB_r is None)):
+        Tx, Duvx, out_of_lut, (TBB_l,TBB_r) = _uv_to_Tx_mode(u, v, lut_i, lut_n_cols, 
+                                                             ns = lut_n_cols, out_of_lut = out_of_lut,
+                                                             fast_duv = fast_duv,
+                                                             **{**mode_kwargs[mode],**{'max_iter':1}}) # cl takes over, so max_iter should be 1
+    Tx0 = Tx.copy() # keep copy of first estimate
+    
+    # only keep zooming-in on the test points (idx) that haven't converged yet:
+    idx = np.arange(Tx.shape[0])
     while True & (cascade_i < max_iter):
         
-        # needed to get correct columns from updated lut_i:
-        N = lut_i.shape[-1]//lut_n_cols
-        ns = lut_n_cols #np.arange(0,N*lut_n_cols,lut_n_cols,dtype=np.int32)
-
-        # get Tx estimate, out_of_lut boolean array, and (TBB_m1, TBB_p1 or equivalent):
-        if ((Tx is None) & (out_of_lut is None) & (TBB_l is None) & (TBB_r is None)) | (cascade_i > 0):
-            Tx, Duvx, out_of_lut, (TBB_l,TBB_r) = _uv_to_Tx_mode(u, v, lut_i, lut_n_cols, 
-                                                                 ns = ns, out_of_lut = out_of_lut,
-                                                                 fast_duv = fast_duv,
-                                                                 **{**mode_kwargs[mode],**{'max_iter':1}}) # cl takes over, so max_iter should be 1
-
-        if cascade_i == 0: Tx0 = Tx.copy() # keep copy of first estimate
+        if cascade_i > 0: 
+            Tx[idx], Duvx_i, _, (TBB_l,TBB_r) = _uv_to_Tx_mode(u[idx], v[idx], lut_i, lut_n_cols, 
+                                                               ns = lut_n_cols, out_of_lut = out_of_lut[idx],
+                                                               fast_duv = fast_duv,
+                                                               **{**mode_kwargs[mode],**{'max_iter':1}}) 
+            if (Duvx is not None) & (Duvx_i is not None): Duvx[idx] = Duvx_i
 
         # Update lut for next cascade (ie decrease min-max range):
-        tmp = _get_loop_i_lut_for_cascading_lut(Tx, TBB_l, TBB_r, out_of_lut,
-                                                atol, rtol, 
-                                                cascade_i, lut_char, lut_resolution_reduction_factor,
-                                                mode, luts_dict, cieobs, wl, cspace_str, cspace_dict,
-                                                ignore_wl_diff,
-                                                lut_generator_fcn = lut_generator_fcn,
-                                                lut_generator_kwargs = lut_generator_kwargs,
-                                                )
-
-        if (tmp[0] is None): 
-            if tmp[1] is not None: Tx = tmp[1]
-            break
-        else:
-            lut_i = tmp[0]
-            lut_kwargs = tmp[1]
+        lut_i, Tx_mid, converged = _get_loop_i_lut_for_cascading_lut(Tx[idx], TBB_l, TBB_r, out_of_lut[idx],
+                                                                     atol, rtol, 
+                                                                     cascade_i, lut_char, lut_resolution_reduction_factor,
+                                                                     mode, luts_dict, cieobs, wl, cspace_str, cspace_dict,
+                                                                     ignore_wl_diff,
+                                                                     lut_generator_fcn = lut_generator_fcn,
+                                                                     lut_generator_kwargs = lut_generator_kwargs,
+                                                                     )
+        Tx[idx[converged]] = Tx_mid[converged]
+        idx = idx[~converged]
+        if lut_i is None: break
 
         cascade_i+=1 # to stop cascade loop after max_iter iterations
     
@@ -2185,6 +2813,30 @@ def _get_cascading_lut_Tx(mode, u, v, lut, lut_n_cols, lut_char, lut_resolution_
 #------------------------------------------------------------------------------
 # General _xyz_to_cct structure:
 #------------------------------------------------------------------------------
+def _quantize_and_dedup_uv(uv, tol):
+    """ 
+    Get the unique uv coordinates (after quantization to a grid with spacing tol;
+    tol == 0: exact duplicates only) and the inverse index to scatter results 
+    back to all uv. Non-finite uv are left out (their inverse index is -1).
+    """
+    valid = np.isfinite(uv).all(axis = -1)
+    inverse = np.full((uv.shape[0],), -1)
+    if tol > 0:
+        q = np.round(uv[valid]/tol).astype(np.int64)
+        q_min = q.min(axis = 0) if q.shape[0] > 0 else np.zeros((2,), dtype = np.int64)
+        q -= q_min
+        span = (q[:,1].max() + 1) if q.shape[0] > 0 else 1
+        if (q.shape[0] == 0) or (q[:,0].max() < (2**62)//span):
+            # (1D unique on a single integer key is much faster than np.unique(..., axis = 0)):
+            key_u, inverse[valid] = np.unique(q[:,0]*span + q[:,1], return_inverse = True)
+            q_u = np.stack((key_u//span, key_u%span), axis = -1)
+        else:
+            q_u, inverse[valid] = np.unique(q, axis = 0, return_inverse = True)
+        uv_u = (q_u + q_min)*tol
+    else:
+        uv_u, inverse[valid] = np.unique(uv[valid], axis = 0, return_inverse = True)
+    return uv_u, inverse
+
 def _xyz_to_cct(xyzw, mode, is_uv_input = False, cieobs = _CIEOBS, wl = None, out = 'cct',
                 lut = None, luts_dict = None, ignore_wl_diff = False,
                 force_tolerance = True, tol_method = 'newton-raphson', atol = 0.1, rtol = 1e-5, 
@@ -2193,7 +2845,7 @@ def _xyz_to_cct(xyzw, mode, is_uv_input = False, cieobs = _CIEOBS, wl = None, ou
                 cspace = _CCT_CSPACE, cspace_kwargs = _CCT_CSPACE_KWARGS,
                 duv_triangular_threshold = 0.002, 
                 first_guess_mode = 'robertson1968',
-                use_fast_duv = _CCT_FAST_DUV,
+                use_fast_duv = _CCT_FAST_DUV, uv_dedup_tol = None,
                 **kwargs):
     """ 
     Convert XYZ tristimulus values to correlated color temperature (CCT) and 
@@ -2223,6 +2875,10 @@ def _xyz_to_cct(xyzw, mode, is_uv_input = False, cieobs = _CIEOBS, wl = None, ou
     # Get chromaticity coordinates u,v from xyzw:
     uvw = cspace_dict['fwtf'](xyzw)[:,1:3]  if is_uv_input == False else xyzw[:,0:2] # xyz contained uv !!! (needed to efficiently determine f_corr)
     
+    # Only calculate for unique (quantized) uv (results are scattered back at the end):
+    if uv_dedup_tol is not None:
+        uvw, uv_inverse = _quantize_and_dedup_uv(uvw, uv_dedup_tol)
+    
     # pre-calculate wl,dl,uvwbar for later use (will also determine wl if None !):
     xyzbar, wl, dl = _get_xyzbar_wl_dl(cieobs, wl)
     uvwbar = _convert_xyzbar_to_uvwbar(xyzbar, cspace_dict)
@@ -2231,7 +2887,7 @@ def _xyz_to_cct(xyzw, mode, is_uv_input = False, cieobs = _CIEOBS, wl = None, ou
     # (if wl doesn't match those in _CCT_LUT[mode] , 
     # a new recalculated lut will be generated):
     if (luts_dict is None): 
-        luts_dict = _CCT_LUT[mode]['luts']
+        luts_dict = _get_luts_dict(mode)
 
     lut, lut_kwargs = _get_lut(lut, 
                                fallback_unit = _CCT_FALLBACK_UNIT, 
@@ -2257,10 +2913,10 @@ def _xyz_to_cct(xyzw, mode, is_uv_input = False, cieobs = _CIEOBS, wl = None, ou
     lut_n_cols = lut.shape[-1] # store now, as this will change later
     
     # prepare split of input data to speed up calculation:
-    n = xyzw.shape[0]
+    n = uvw.shape[0]
     ccts = np.zeros((n,1))
     duvs = np.zeros((n,1))
-    n_ii = split_calculation_at_N if split_calculation_at_N is not None else n
+    n_ii = split_calculation_at_N if split_calculation_at_N is not None else max(n,1)
     N_ii = n//n_ii + 1*((n%n_ii)>0)
 
     lut_vars = _CCT_LUT[mode]['lut_vars']  if 'lut_vars' not in kwargs else kwargs['lut_vars'] 
@@ -2321,6 +2977,10 @@ def _xyz_to_cct(xyzw, mode, is_uv_input = False, cieobs = _CIEOBS, wl = None, ou
         else: 
             ccts[n_ii*ii:] = Tx
             duvs[n_ii*ii:] = Duvx
+    
+    # Scatter results for unique uv back to all (non-finite uv -> NaN):
+    if uv_dedup_tol is not None:
+        ccts, duvs = (np.vstack((x, [[np.nan]]))[uv_inverse] for x in (ccts, duvs)) # (index -1 -> NaN)
    
     # Regulate output:
     if (out == 'cct') | (out == 1):
@@ -2356,12 +3016,15 @@ def _uv_to_Tx_robertson1968(u, v, lut, lut_n_cols, ns = 4, out_of_lut = None,
     # get uBB, vBB, mBB from lut:
     TBB, uBB, vBB, mBB  = lut[:,0::lut_n_cols], lut[:,1::lut_n_cols], lut[:,2::lut_n_cols], lut[:,-1::lut_n_cols]
     
-    # calculate distances to coordinates in lut (Eq. 4 in Robertson, 1968):
-    di = ((v.T - vBB) - mBB * (u.T - uBB)) / ((1 + mBB**2)**(0.5))
-    pn = (((v.T - vBB)**2 + (u.T - uBB)**2)).argmin(axis=0)
+    # calculate distances to coordinates in lut (Eq. 4 in Robertson, 1968), 
+    # only for the lut entries actually needed (avoids a [lut x N] array):
+    def di_at(idx):
+        uBB_i, vBB_i, mBB_i = [_get_pns_from_x(x, idx, i = idx_sources, m0p = '0') for x in (uBB, vBB, mBB)]
+        return ((v - vBB_i) - mBB_i * (u - uBB_i)) / ((1 + mBB_i**2)**(0.5))
+    pn = _get_closest_lut_idx(u, v, uBB, vBB)
         
     # Get di_0, mBB_0 values to check sign of di_0 * mBB_0 -> if positive (right of apex): [j,j+1] -> [j-1,j]
-    di_0 = _get_pns_from_x(di, pn, i = idx_sources, m0p = '0')
+    di_0 = di_at(pn)
     mBB_0 = _get_pns_from_x(mBB, pn, i = idx_sources, m0p = '0')
     
     # Deal with positive slopes of iso-T lines
@@ -2374,7 +3037,7 @@ def _uv_to_Tx_robertson1968(u, v, lut, lut_n_cols, ns = 4, out_of_lut = None,
     # Get final values required for T calculation:
     mBB_0, mBB_p1 = _get_pns_from_x(mBB, pn, i = idx_sources, m0p = '0p')
     TBB_m1, TBB_0, TBB_p1 = _get_pns_from_x(TBB, pn, i = idx_sources, m0p = 'm0p')
-    di_0, di_p1 = _get_pns_from_x(di, pn, i = idx_sources, m0p = '0p')
+    di_0, di_p1 = di_at(pn), di_at(pn + 1)
 
 
     # Estimate Tc (Robertson, 1968): 
@@ -2460,7 +3123,8 @@ def xyz_to_cct_robertson1968(xyzw, cieobs = _CIEOBS, out = 'cct', is_uv_input =
         :split_calculation_at_N:
             | _CCT_SPLIT_CALC_AT_N, optional
             | Split calculation when xyzw.shape[0] > split_calculation_at_N. 
-            | Splitting speeds up the calculation. If None: no splitting is done.
+            | If None: no splitting is done (lut search and newton-raphson 
+            | are fully vectorized, so splitting only limits peak memory).
         :lut:
             | None, optional
             | Look-Up-Table with Ti, u,v,u',v',u",v",slope values of Planckians. 
@@ -2554,8 +3218,8 @@ def xyz_to_cct_robertson1968(xyzw, cieobs = _CIEOBS, out = 'cct', is_uv_input =
                        use_fast_duv = use_fast_duv,
                        **kwargs)
 
-# pre-generate / load from disk / load from github some LUTs for Robertson1968:
-_initialize_lut(mode = 'robertson1968',lut_types = _unique_types([_CCT_LUT['robertson1968']['lut_type_def'],((10,100,10,'K-1'),(100,625,25,'K-1'),True)] + _CCT_SHARED_LUT_TYPES))
+# LUTs to pre-generate / load from disk / load from github on first use for Robertson1968 (see _get_luts_dict()):
+_CCT_LUT['robertson1968']['lut_types'] = _unique_types([_CCT_LUT['robertson1968']['lut_type_def'],((10,100,10,'K-1'),(100,625,25,'K-1'),True)] + _CCT_SHARED_LUT_TYPES)
 
 
 #------------------------------------------------------------------------------
@@ -2583,7 +3247,7 @@ def _uv_to_Tx_zhang2019(u, v, lut, lut_n_cols, ns = 0, out_of_lut = None,
         uBB, vBB = lut[:,1::lut_n_cols], lut[:,2::lut_n_cols]
 
         # calculate distances to coordinates in lut and find minimum:
-        pn = (((v.T - vBB)**2 + (u.T - uBB)**2)).argmin(axis=0)
+        pn = _get_closest_lut_idx(u, v, uBB, vBB)
     
         # Deal with endpoints of lut + create intermediate variables 
         # to save memory:
@@ -2596,70 +3260,57 @@ def _uv_to_Tx_zhang2019(u, v, lut, lut_n_cols, ns = 0, out_of_lut = None,
 
         
     # get RTm-1 (RTl) and RTm+1 (RTr):
-    RTl = 1e6/TBB_m1
-    RTr = 1e6/TBB_p1
+    RTl = 1e6/TBB_m1*np.ones_like(u)
+    RTr = 1e6/TBB_p1*np.ones_like(u)
 
     # calculate RTa, RTb:
     RTa = RTl + (1.0 - s) * (RTr - RTl)
     RTb = RTl + s * (RTr - RTl) 
     
     Tx_a, Tx_b = 1e6/RTa, 1e6/RTb
+    Tx = 1e6/((RTa+RTb)/2)
     # # RTx = ((RTa+RTb)/2)
     # # _plot_triangular_solution(u,v,uBB,vBB,TBB,pn)
     
-      
+    # only update the test points (idx) that haven't converged yet:
+    idx = np.arange(u.shape[0])
     j = 0
-    while True & (j < max_iter): # loop part of zhang optimization process
+    while (idx.shape[0] > 0) & (j < max_iter): # loop part of zhang optimization process
         
         # calculate BBa BBb:
-        # BBab = cri_ref(np.vstack([cct_to_mired(RTa), cct_to_mired(RTx), cct_to_mired(RTb)]), ref_type = ['BB'], wl3 = wl)
-        # BBab = cri_ref(np.vstack([cct_to_mired(RTa), cct_to_mired(RTb)]), ref_type = ['BB'], wl3 = wl)
         if (uvwbar is not None) & (wl is not None) & (dl is not None):
-            TBB = np.vstack([Tx_a, Tx_b])
+            TBB = np.vstack([Tx_a[idx], Tx_b[idx]])
             _,UVWBBab,_,_ = _get_tristim_of_BB_BBp_BBpp(TBB, uvwbar, wl, dl, out='BB')
         else:
             raise Exception('uvwbar, wl & dl must all be not None !!!')
-        
-        # calculate xyzBBab:
-        # xyzBBab = spd_to_xyz(BBab, cieobs = cieobs, relative = True)
     
-        # get cspace coordinates of BB and input xyz:
-        # uvBBab_ = cspace_dict['fwtf'](XYZBBab)[...,1:]
+        # get cspace coordinates of BB:
         uvBBab = xyz_to_Yxy(UVWBBab)[...,1:]
-
-        # N = uvBBab.shape[0]//3 
-        # uBBa, vBBa = uvBBab[:N,0:1], uvBBab[:N,1:2]
-        # uBBx, vBBx = uvBBab[N:2*N,0:1], uvBBab[N:2*N,1:2]
-        # uBBb, vBBb = uvBBab[2*N:,0:1], uvBBab[2*N:,1:2]
        
         N = uvBBab.shape[0]//2 
-        # uBBa, vBBa = uvBBab[:N,0:1], uvBBab[:N,1:2]
-        # uBBb, vBBb = uvBBab[N:,0:1], uvBBab[N:,1:2]
         
         # find distance in UCD of BBab to input:
-        DEuv = ((uvBBab[...,0:1] - u.T)**2 + (uvBBab[...,1:2] - v.T)**2) # no need for **0.5
+        DEuv = ((uvBBab[...,0:1] - np.vstack((u[idx],u[idx])))**2 + (uvBBab[...,1:2] - np.vstack((v[idx],v[idx])))**2) # no need for **0.5
         DEuv_a, DEuv_b = DEuv[:N], DEuv[N:] 
 
         c = (DEuv_a < DEuv_b)[:,0]
+        ca, cb = idx[c], idx[~c]
         
         # when DEuv_a < DEuv_b:
-        RTr[c] = RTb[c]
-        RTb[c] = RTa[c]
-        #DEuv_b[c] = DEuv_a[c]
-        RTa[c] = (RTl[c] + (1.0 - s) * (RTr[c] - RTl[c]))
+        RTr[ca] = RTb[ca]
+        RTb[ca] = RTa[ca]
+        RTa[ca] = (RTl[ca] + (1.0 - s) * (RTr[ca] - RTl[ca]))
         
         # when DEuv_a >= DEuv_b:
-        RTl[~c] = RTa[~c]
-        RTa[~c] = RTb[~c]
-        #DEuv_a[~c] = DEuv_b[~c]
-        RTb[~c] = (RTl[~c] + s * (RTr[~c] - RTl[~c]))
+        RTl[cb] = RTa[cb]
+        RTa[cb] = RTb[cb]
+        RTb[cb] = (RTl[cb] + s * (RTr[cb] - RTl[cb]))
         
         # Calculate CCTs from RTa and RTb:
         Tx_a, Tx_b = 1e6/RTa, 1e6/RTb
         Tx = 1e6/((RTa+RTb)/2)
-        dTx = np.abs(Tx_a - Tx_b)
-        if (((dTx <= atol).all() | ((dTx/Tx) <= rtol).all())):
-            break
+        dTx = np.abs(Tx_a[idx] - Tx_b[idx])
+        idx = idx[~((dTx <= atol) | ((dTx/Tx[idx]) <= rtol))[:,0]]
         j+=1
 
     # uBB = np.vstack((uBBa,uBBx,uBBb))
@@ -2741,7 +3392,8 @@ def xyz_to_cct_zhang2019(xyzw, cieobs = _CIEOBS, out = 'cct', is_uv_input = Fals
         :split_calculation_at_N:
             | _CCT_SPLIT_CALC_AT_N, optional
             | Split calculation when xyzw.shape[0] > split_calculation_at_N. 
-            | Splitting speeds up the calculation. If None: no splitting is done.
+            | If None: no splitting is done (lut search and newton-raphson 
+            | are fully vectorized, so splitting only limits peak memory).
         :lut:
             | None, optional
             | Look-Up-Table with Ti, u,v,u',v',u",v",slope values of Planckians. 
@@ -2827,8 +3479,8 @@ def xyz_to_cct_zhang2019(xyzw, cieobs = _CIEOBS, out = 'cct', is_uv_input = Fals
                        **kwargs)
 
 
-# pre-generate / load from disk / load from github some LUTs for Zhang2019:
-_initialize_lut(mode = 'zhang2019',lut_types = _unique_types([_CCT_LUT['zhang2019']['lut_type_def']] + _CCT_SHARED_LUT_TYPES))
+# LUTs to pre-generate / load from disk / load from github on first use for Zhang2019 (see _get_luts_dict()):
+_CCT_LUT['zhang2019']['lut_types'] = _unique_types([_CCT_LUT['zhang2019']['lut_type_def']] + _CCT_SHARED_LUT_TYPES)
 
 
 #------------------------------------------------------------------------------
@@ -3049,18 +3701,21 @@ def _uv_to_Tx_ohno2014(u, v, lut, lut_n_cols, ns = 0, out_of_lut = None,
     TBB, uBB, vBB  = lut[:,0::lut_n_cols], lut[:,1::lut_n_cols], lut[:,2::lut_n_cols]
     idx_sources = np.arange(u.shape[0],dtype=np.int32)
     
-    # calculate distances to coordinates in lut:
-    di = ((u.T - uBB)**2 + (v.T - vBB)**2)**0.5
-    pn = di.argmin(axis=0)
+    # find closest coordinates in lut:
+    pn = _get_closest_lut_idx(u, v, uBB, vBB)
 
     # Deal with endpoints of lut + create intermediate variables 
     # to save memory:
     pn, out_of_lut = _deal_with_lut_end_points(pn, TBB, out_of_lut)
 
     TBB_m1, TBB_0, TBB_p1 = _get_pns_from_x(TBB, pn, i = idx_sources)
-    uBB_m1, uBB_p1 = _get_pns_from_x(uBB, pn, i = idx_sources, m0p = 'mp')
-    vBB_m1, vBB_p1 = _get_pns_from_x(vBB, pn, i = idx_sources, m0p = 'mp')
-    di_m1, di_0, di_p1 = _get_pns_from_x(di, pn, i = idx_sources)
+    uBB_m1, uBB_0, uBB_p1 = _get_pns_from_x(uBB, pn, i = idx_sources, m0p = 'm0p')
+    vBB_m1, vBB_0, vBB_p1 = _get_pns_from_x(vBB, pn, i = idx_sources, m0p = 'm0p')
+    
+    # calculate distances to coordinates in lut:
+    di_m1 = ((u - uBB_m1)**2 + (v - vBB_m1)**2)**0.5
+    di_0 = ((u - uBB_0)**2 + (v - vBB_0)**2)**0.5
+    di_p1 = ((u - uBB_p1)**2 + (v - vBB_p1)**2)**0.5
 
     #---------------------------------------------
     # Triangular solution:        
@@ -3177,7 +3832,8 @@ def xyz_to_cct_ohno2014(xyzw, cieobs = _CIEOBS, out = 'cct', is_uv_input = False
         :split_calculation_at_N:
             | _CCT_SPLIT_CALC_AT_N, optional
             | Split calculation when xyzw.shape[0] > split_calculation_at_N. 
-            | Splitting speeds up the calculation. If None: no splitting is done.
+            | If None: no splitting is done (lut search and newton-raphson 
+            | are fully vectorized, so splitting only limits peak memory).
         :lut:
             | None, optional
             | Look-Up-Table with Ti, u,v,u',v',u",v",slope values of Planckians. 
@@ -3262,8 +3918,8 @@ def xyz_to_cct_ohno2014(xyzw, cieobs = _CIEOBS, out = 'cct', is_uv_input = False
                        use_fast_duv = use_fast_duv,
                        **kwargs)
 
-# pre-generate / load from disk / load from github some LUTs for Ohno2014:
-_initialize_lut(mode = 'ohno2014', lut_types = _unique_types([_CCT_LUT['ohno2014']['lut_type_def'], ((_CCT_LUT_MIN, _CCT_LUT_MAX, 1.0, '%'),)] + _CCT_SHARED_LUT_TYPES))
+# LUTs to pre-generate / load from disk / load from github on first use for Ohno2014 (see _get_luts_dict()):
+_CCT_LUT['ohno2014']['lut_types'] = _unique_types([_CCT_LUT['ohno2014']['lut_type_def'], ((_CCT_LUT_MIN, _CCT_LUT_MAX, 1.0, '%'),)] + _CCT_SHARED_LUT_TYPES)
 
 
 #------------------------------------------------------------------------------
@@ -3486,9 +4142,8 @@ def _uv_to_Tx_li2022(u, v, lut, lut_n_cols, ns = 0, out_of_lut = None,
     upBB, vpBB, uppBB, vppBB = lut[:,3::lut_n_cols], lut[:,4::lut_n_cols], lut[:,5::lut_n_cols], lut[:,6::lut_n_cols]
     idx_sources = np.arange(u.shape[0],dtype=np.int32)
     
-    # calculate distances to coordinates in lut:
-    di = ((u.T - uBB)**2 + (v.T - vBB)**2)**0.5
-    pn = di.argmin(axis=0)
+    # find closest coordinates in lut:
+    pn = _get_closest_lut_idx(u, v, uBB, vBB)
 
     # Deal with endpoints of lut + create intermediate variables 
     # to save memory:
@@ -3501,7 +4156,11 @@ def _uv_to_Tx_li2022(u, v, lut, lut_n_cols, ns = 0, out_of_lut = None,
     vpBB_m1, vpBB_0, vpBB_p1 = _get_pns_from_x(vpBB, pn, i = idx_sources, m0p = 'm0p')
     uppBB_m1, uppBB_0, uppBB_p1 = _get_pns_from_x(uppBB, pn, i = idx_sources, m0p = 'm0p')
     vppBB_m1, vppBB_0, vppBB_p1 = _get_pns_from_x(vppBB, pn, i = idx_sources, m0p = 'm0p')
-    di_m1, di_0, di_p1 = _get_pns_from_x(di, pn, i = idx_sources, m0p = 'm0p')
+    
+    # calculate distances to coordinates in lut:
+    di_m1 = ((u - uBB_m1)**2 + (v - vBB_m1)**2)**0.5
+    di_0 = ((u - uBB_0)**2 + (v - vBB_0)**2)**0.5
+    di_p1 = ((u - uBB_p1)**2 + (v - vBB_p1)**2)**0.5
     
     #---------------------------------------------
     # Triangular solution:        
@@ -3650,7 +4309,8 @@ def xyz_to_cct_li2022(xyzw, cieobs = _CIEOBS, out = 'cct', is_uv_input = False,
         :split_calculation_at_N:
             | _CCT_SPLIT_CALC_AT_N, optional
             | Split calculation when xyzw.shape[0] > split_calculation_at_N. 
-            | Splitting speeds up the calculation. If None: no splitting is done.
+            | If None: no splitting is done (lut search and newton-raphson 
+            | are fully vectorized, so splitting only limits peak memory).
         :lut:
             | None, optional
             | Look-Up-Table with Ti, u,v,u',v',u",v",slope values of Planckians. 
@@ -3734,8 +4394,8 @@ def xyz_to_cct_li2022(xyzw, cieobs = _CIEOBS, out = 'cct', is_uv_input = False,
                        use_fast_duv = use_fast_duv,
                        **kwargs)
 
-# pre-generate / load from disk / load from github some LUTs for Li2022:
-_initialize_lut(mode = 'li2022', lut_types = _unique_types([_CCT_LUT['li2022']['lut_type_def'], ((_CCT_LUT_MIN, _CCT_LUT_MAX, 1.0, '%'),)] + _CCT_SHARED_LUT_TYPES))
+# LUTs to pre-generate / load from disk / load from github on first use for Li2022 (see _get_luts_dict()):
+_CCT_LUT['li2022']['lut_types'] = _unique_types([_CCT_LUT['li2022']['lut_type_def'], ((_CCT_LUT_MIN, _CCT_LUT_MAX, 1.0, '%'),)] + _CCT_SHARED_LUT_TYPES)
 
 
 
@@ -3796,7 +4456,8 @@ def xyz_to_cct_li2016(xyzw, cieobs = _CIEOBS, out = 'cct', is_uv_input = False,
         :split_calculation_at_N:
             | _CCT_SPLIT_CALC_AT_N, optional
             | Split calculation when xyzw.shape[0] > split_calculation_at_N. 
-            | Splitting speeds up the calculation. If None: no splitting is done.
+            | If None: no splitting is done (lut search and newton-raphson 
+            | are fully vectorized, so splitting only limits peak memory).
         :lut:
             | None, optional
             | Look-Up-Table with Ti, u,v,u',v',u",v",slope values of Planckians. 
@@ -4088,7 +4749,8 @@ def xyz_to_cct_fibonacci(xyzw, cieobs = _CIEOBS, out = 'cct', is_uv_input = Fals
         :split_calculation_at_N:
             | _CCT_SPLIT_CALC_AT_N, optional
             | Split calculation when xyzw.shape[0] > split_calculation_at_N. 
-            | Splitting speeds up the calculation. If None: no splitting is done.
+            | If None: no splitting is done (lut search and newton-raphson 
+            | are fully vectorized, so splitting only limits peak memory).
         :lut:
             | None, optional
             | Look-Up-Table with Ti, u,v,u',v',u",v",slope values of Planckians. 
@@ -4151,11 +4813,6 @@ def xyz_to_cct_fibonacci(xyzw, cieobs = _CIEOBS, out = 'cct', is_uv_input = Fals
         the value of the closest CCT from the lut.)
     """
     
-    if 'luts' not in _CCT_LUT['fibonacci'].keys():
-        print('\nInitializing (generate or download) Fibonacci LUTs on first use.')
-        init_fibonacci() # initialize LUTs for fibonacci
-        print('\n')
-    
     return _xyz_to_cct(xyzw, mode = 'fibonacci', cieobs = cieobs, out = out, wl = wl, is_uv_input = is_uv_input, 
                        cspace = cspace, cspace_kwargs = cspace_kwargs,
                        atol = atol, rtol = rtol, force_tolerance = force_tolerance,
@@ -4167,12 +4824,11 @@ def xyz_to_cct_fibonacci(xyzw, cieobs = _CIEOBS, out = 'cct', is_uv_input = Fals
                        use_fast_duv = use_fast_duv,
                        **kwargs)
 
-# pre-generate / load from disk / load from github some LUTs for fibonacci based search:
-# BUT: only when its pkl file exists or when _CCT_LUT_CAL is True, otherwise let user init(download the LUT manually)!!
+# LUTs to pre-generate / load from disk / load from github on first use for fibonacci based search (see _get_luts_dict()):
+_CCT_LUT['fibonacci']['lut_types'] = _unique_types([_CCT_LUT['fibonacci']['lut_type_def']] + _CCT_SHARED_LUT_TYPES)
 def init_fibonacci(force_calc = _CCT_LUT_CALC):
-    _initialize_lut(mode = 'fibonacci', force_calc = force_calc, lut_types = _unique_types([_CCT_LUT['fibonacci']['lut_type_def']] + _CCT_SHARED_LUT_TYPES))
-if os.path.exists(os.path.join(_CCT_LUT_PATH,'{:s}_luts.pkl'.format('fibonacci'))) | (_CCT_LUT_CALC):
-    init_fibonacci(force_calc = _CCT_LUT_CALC) 
+    with _CCT_LUT_INIT_LOCK:
+        _initialize_lut(mode = 'fibonacci', force_calc = force_calc, lut_types = _CCT_LUT['fibonacci']['lut_types'])
     
 #------------------------------------------------------------------------------
 # none method:
@@ -4194,7 +4850,7 @@ def _uv_to_Tx_none(u, v, lut, lut_n_cols, ns = 0, out_of_lut = None, **kwargs):
 _CCT_UV_TO_TX_FCNS['none'] = _uv_to_Tx_none
 
 if ('robertson1968' in _CCT_LIST_OF_MODE_LUTS) & _CCT_LUT_ONE_NPY_PER_MODE:
-    _CCT_LUT['none']['luts'] = copy.deepcopy(_CCT_LUT['robertson1968']['luts'])
+    _CCT_LUT['none']['lut_types'] = _CCT_LUT['robertson1968']['lut_types'] # copy of robertson1968 luts on first use (see _get_luts_dict())
     
 
 if _CCT_LUT_ONE_NPY_PER_MODE == False:
@@ -4254,7 +4910,7 @@ def xyz_to_cct(xyzw, mode = 'robertson1968',
                lut = None, luts_dict = None, ignore_wl_diff = False,
                duv_triangular_threshold = 0.002,
                first_guess_mode = 'robertson1968', fgm_kwargs = {},
-               use_fast_duv = _CCT_FAST_DUV,
+               use_fast_duv = _CCT_FAST_DUV, uv_dedup_tol = None,
                **kwargs):
     """
     Convert XYZ tristimulus values to correlated color temperature (CCT) and 
@@ -4324,7 +4980,8 @@ def xyz_to_cct(xyzw, mode = 'robertson1968',
         :split_calculation_at_N:
             | _CCT_SPLIT_CALC_AT_N, optional
             | Split calculation when xyzw.shape[0] > split_calculation_at_N. 
-            | Splitting speeds up the calculation. If None: no splitting is done.
+            | If None: no splitting is done (lut search and newton-raphson 
+            | are fully vectorized, so splitting only limits peak memory).
         :lut:
             | None, optional
             | Look-Up-Table with Ti, u,v,u',v',u",v",slope values of Planckians. 
@@ -4383,6 +5040,17 @@ def xyz_to_cct(xyzw, mode = 'robertson1968',
             |    best estimate's u,v coordinates. This method is accurate enough
             |    when the atol is small enough -> as long as abs(T-T_former)<=1K
             |    the Duv estimate should be ok.)
+        :uv_dedup_tol:
+            | None, optional
+            | If not None: quantize the uv chromaticity coordinates (in cspace) 
+            |   to a grid with spacing uv_dedup_tol and only calculate the CCT 
+            |   and Duv of the unique grid points (the results are scattered 
+            |   back to all xyzw). Speeds up the calculation for data with many 
+            |   (nearly) identical chromaticities, e.g. images (try 1e-5).
+            |   Each uv is moved by at most uv_dedup_tol/sqrt(2), which bounds 
+            |   the error in Duv. Non-finite uv result in NaN.
+            | If 0: only remove exact duplicates (no quantization error).
+            | (not for modes 'mcamy1992', 'hernandez1999')
             
     Returns:
         :returns: 
@@ -4450,13 +5118,7 @@ def xyz_to_cct(xyzw, mode = 'robertson1968',
     """  
     if (mode != 'mcamy1992') & (mode != 'hernandez1999'):
         
-        # Very large LUT for fibonacci is not part of package, and is generated or downloaded on first use
-        if (mode == 'fibonacci'):
-            if 'luts' not in _CCT_LUT['fibonacci'].keys():
-                print('\nInitializing (generate or download) Fibonacci LUTs on first use.')
-                init_fibonacci() # initialize LUTs for fibonacci
-                print('\n')
-        
+        # LUTs are loaded on first use (very large LUT for fibonacci is not part of package, and is generated or downloaded):
         return _xyz_to_cct(xyzw, mode, cieobs = cieobs, out = out, wl = wl, is_uv_input = is_uv_input, 
                            cspace = cspace, cspace_kwargs = cspace_kwargs,
                            atol = atol, rtol = rtol, force_tolerance = force_tolerance,
@@ -4468,6 +5130,7 @@ def xyz_to_cct(xyzw, mode = 'robertson1968',
                            duv_triangular_threshold = duv_triangular_threshold,
                            first_guess_mode = first_guess_mode,
                            use_fast_duv = use_fast_duv,
+                           uv_dedup_tol = uv_dedup_tol,
                            **kwargs)
     
     elif mode == 'mcamy1992':
@@ -4487,7 +5150,105 @@ def xyz_to_duv(xyzw, out = 'duv', **kwargs):
     Wraps xyz_to_cct, but with duv output. For kwargs info, see xyz_to_cct.
     """
     return xyz_to_cct(xyzw, out = out, **kwargs)
+
+#---------------------------------------------------------------------------------------------------
+def xyz_to_cct_tiled(xyzw, out = 'cct,duv', tile_size = 2**16, n_workers = None, 
+                     out_cct = None, out_duv = None, dtype = np.float64, **kwargs):
+    """
+    Calculate CCT and/or Duv for (very) large (e.g. memory-mapped) arrays or 
+    images of tristimulus values by processing them in tiles of fixed size
+    and writing the results into (preallocated or memory-mapped) output arrays.
+    
+    Args:
+        :xyzw: 
+            | ndarray (or np.memmap) with tristimulus values along the last axis,
+            | e.g. with shape (N,3) or (H,W,3) for an image.
+        :out: 
+            | 'cct,duv', optional
+            | Determines what to return. Options: 'cct', 'duv', 'cct,duv'.
+        :tile_size:
+            | 2**16, optional
+            | Number of tristimulus values processed in one tile.
+            | (peak memory scales with tile_size*max(1,n_workers), not with the size of xyzw)
+        :n_workers:
+            | None, optional
+            | Number of threads in a worker pool processing tiles concurrently.
+            | If None: process tiles sequentially.
+        :out_cct, out_duv:
+            | None, optional
+            | Arrays (e.g. np.memmap) with shape xyzw.shape[:-1] the cct and duv 
+            | values are written to.
+            | If str: filename of a .npy file that is created and memory-mapped.
+            | If None: allocate new ndarray (when requested in :out:).
+        :dtype:
+            | np.float64, optional
+            | dtype of newly allocated (or created) output arrays.
+        :kwargs:
+            | Keyword arguments for xyz_to_cct() (e.g. mode, cieobs, wl, ...)
+            
+    Returns:
+        :returns: 
+            | ndarray(s) with shape xyzw.shape[:-1]:
+            |    cct: out == 'cct'
+            |    duv: out == 'duv'
+            |    (cct, duv): out == 'cct,duv'
+    
+    Note:
+        1. xyzw is reshaped to (-1, xyzw.shape[-1]), so for a (C-contiguous) 
+        np.memmap only one tile at a time is read from disk.
+        2. Non-finite values and values with X+Y+Z <= 0 (e.g. black pixels) 
+        are skipped: their cct and duv are set to NaN.
+    """
+    outs = out.split(',')
+    shape = xyzw.shape[:-1]
+    xyzw_flat = xyzw.reshape(-1, xyzw.shape[-1])
+    cct = get_output_array(out_cct, shape, dtype, caller = 'xyz_to_cct_tiled()') if ('cct' in outs) else None
+    duv = get_output_array(out_duv, shape, dtype, caller = 'xyz_to_cct_tiled()') if ('duv' in outs) else None
+    cct_flat = cct.reshape(-1) if cct is not None else None
+    duv_flat = duv.reshape(-1) if duv is not None else None
+    if ((cct_flat is not None) and (not np.shares_memory(cct_flat, cct))) or ((duv_flat is not None) and (not np.shares_memory(duv_flat, duv))):
+        raise Exception('xyz_to_cct_tiled(): Output arrays must be C-contiguous.')
+    
+    is_uv_input = kwargs.get('is_uv_input', False)
+    def process_tile(i):
+        xyzw_i = np.array(xyzw_flat[i:i + tile_size], dtype = float) # (read tile from memmap)
+        
+        # only process valid values (e.g. skip black or saturated (nan) pixels):
+        valid = np.isfinite(xyzw_i).all(axis = -1)
+        if not is_uv_input: valid &= (xyzw_i.sum(axis = -1) > 0)
+        cct_i, duv_i = np.full((xyzw_i.shape[0],), np.nan), np.full((xyzw_i.shape[0],), np.nan)
+        if valid.any():
+            cct_i[valid], duv_i[valid] = (x[:,0] for x in xyz_to_cct(xyzw_i[valid], out = 'cct,duv', **kwargs))
         
+        if cct_flat is not None: cct_flat[i:i + tile_size] = cct_i
+        if duv_flat is not None: duv_flat[i:i + tile_size] = duv_i
+    
+    tiles = range(0, xyzw_flat.shape[0], tile_size)
+    if (n_workers is None) or (n_workers <= 1):
+        for i in tiles:
+            process_tile(i)
+    else:
+        from concurrent.futures import ThreadPoolExecutor # numpy releases the GIL in the heavy lifting
+        with ThreadPoolExecutor(max_workers = n_workers) as pool:
+            futures = []
+            for i in tiles:
+                futures.append(pool.submit(process_tile, i))
+                if len(futures) >= 2*n_workers:
+                    futures.pop(0).result()
+            for future in futures:
+                future.result()
+    
+    if (cct is not None) & (duv is not None):
+        return cct, duv
+    else:
+        return cct if (cct is not None) else duv
+
+def xyz_to_duv_tiled(xyzw, out = 'duv', **kwargs):
+    """
+    Wraps xyz_to_cct_tiled, but with duv output. For kwargs info, see xyz_to_cct_tiled.
+    """
+    return xyz_to_cct_tiled(xyzw, out = out, **kwargs)
+
 
 #------------------------------------------------------------------------------
 def cct_to_mired(data):
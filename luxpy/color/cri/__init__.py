@@ -48,6 +48,10 @@ utils/init_cri_defaults_database.py
  :process_cri_type_input(): load a cri_type dict but overwrites any keys that 
                             have a non-None input in calling function.
 
+ :CriSpec: Compiled cri_type dict with pre-resolved sample set, CAT and color space function.
+
+ :compile_cri_type(): Compile a cri_type (str or dict) into a CriSpec.
+
 
 utils/DE_scalers.py
 -------------------
@@ -73,6 +77,13 @@ utils/helpers.py
 
  :_hue_bin_data_to_rg():  Calculates gamut area index, Rg.
 
+ :set_cri_ref_cache(): Enable / disable (and configure) the cache with reference 
+                       illuminants and their sample set tristimulus values.
+
+ :clear_cri_ref_cache(): Clear the reference illuminant cache.
+
+ :get_cri_ref_cache_info(): Get statistics of the reference illuminant cache.
+
  :spd_to_jab_t_r(): Calculates jab color values for a sample set illuminated
                     with test source and its reference illuminant.
 
@@ -195,6 +206,10 @@ iestm30/metrics_fast.py
  :_xyz_to_jab_cam02ucs(): Calculate CAM02-UCS J'a'b' coordinates from xyz tristimulus values of sample and white point.
 
  :spd_to_tm30(): Calculate tm30 measures from spd.
+
+ :spd_to_tm30_iter(): Calculate tm30 measures for large sets of spds in blocks (generator).
+
+ :spd_to_tm30_batch(): Calculate tm30 measures for large sets of spds in blocks.
  
  * Created for faster spectral optimization based on ANSI/IES-TM30 measures
 
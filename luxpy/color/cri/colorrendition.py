@@ -47,6 +47,10 @@ utils/init_cri_defaults_database.py
  :process_cri_type_input(): load a cri_type dict but overwrites any keys that 
                             have a non-None input in calling function.
 
+ :CriSpec: Compiled cri_type dict with pre-resolved sample set, CAT and color space function.
+
+ :compile_cri_type(): Compile a cri_type (str or dict) into a CriSpec.
+
 
 utils/DE_scalers.py
 -------------------
@@ -72,6 +76,13 @@ utils/helpers.py
 
  :_hue_bin_data_to_rg():  Calculates gamut area index, Rg.
 
+ :set_cri_ref_cache(): Enable / disable (and configure) the cache with reference 
+                       illuminants and their sample set tristimulus values.
+
+ :clear_cri_ref_cache(): Clear the reference illuminant cache.
+
+ :get_cri_ref_cache_info(): Get statistics of the reference illuminant cache.
+
  :spd_to_jab_t_r(): Calculates jab color values for a sample set illuminated
                     with test source and its reference illuminant.
 
@@ -213,6 +224,10 @@ iestm30/metrics_fast.py
  :_xyz_to_jab_cam02ucs(): Calculate CAM02-UCS J'a'b' coordinates from xyz tristimulus values of sample and white point.
 
  :spd_tom_tm30(): Calculate tm30 measures from spd.
+
+ :spd_to_tm30_iter(): Calculate tm30 measures for large sets of spds in blocks (generator).
+
+ :spd_to_tm30_batch(): Calculate tm30 measures for large sets of spds in blocks.
  
  * Created for faster spectral optimization based on ANSI/IES-TM30 measures
 
@@ -229,10 +244,13 @@ VFPX
 """
 from .utils.DE_scalers import linear_scale, log_scale, psy_scale
 
+from .utils.init_cri_defaults_database import CriSpec, compile_cri_type
+
 from .utils.helpers import (_get_hue_bin_data, spd_to_jab_t_r, spd_to_rg,
                             spd_to_DEi, optimize_scale_factor, spd_to_cri,
                             _hue_bin_data_to_rxhj, _hue_bin_data_to_rfi, 
-                            _hue_bin_data_to_rg)
+                            _hue_bin_data_to_rg, set_cri_ref_cache,
+                            clear_cri_ref_cache, get_cri_ref_cache_info)
 
 from .indices.indices import *
 
@@ -249,6 +267,8 @@ from .iestm30.graphics import (_tm30_process_spd,plot_tm30_cvg,
                                              plot_tm30_report,spd_to_tm30_report,
                                              plot_cri_graphics)
 from .iestm30.metrics_fast import spd_to_tm30 as spd_to_tm30_fast
+from .iestm30.metrics_fast import spd_to_tm30_iter as spd_to_tm30_fast_iter
+from .iestm30.metrics_fast import spd_to_tm30_batch as spd_to_tm30_fast_batch
 from .iestm30.metrics_fast import _cri_ref as cri_ref_fast
 from .iestm30.metrics_fast import _xyz_to_jab_cam02ucs as xyz_to_jab_cam02ucs_fast
 
@@ -257,10 +277,15 @@ from .iestm30.metrics_fast import _xyz_to_jab_cam02ucs as xyz_to_jab_cam02ucs_fa
 __all__ = ['linear_scale', 'log_scale', 'psy_scale']
 
 
+# .utils/init_cri_defaults_database:
+__all__ += ['CriSpec','compile_cri_type']
+
+
 # .utils/helpers:
 __all__ += ['_get_hue_bin_data','spd_to_jab_t_r','spd_to_rg', 'spd_to_DEi', 
            'optimize_scale_factor','spd_to_cri',
-           '_hue_bin_data_to_rxhj', '_hue_bin_data_to_rfi', '_hue_bin_data_to_rg']
+           '_hue_bin_data_to_rxhj', '_hue_bin_data_to_rfi', '_hue_bin_data_to_rg',
+           'set_cri_ref_cache','clear_cri_ref_cache','get_cri_ref_cache_info']
 
 
 # .utils/indices:
@@ -297,4 +322,4 @@ __all__ += ['_tm30_process_spd','plot_tm30_cvg','plot_tm30_Rfi',
            'plot_cri_graphics']
 
 # .iestm30/metrics_fast:
-__all__ += ['spd_to_tm30_fast','cri_ref_fast','xyz_to_jab_cam02ucs_fast']
\ No newline at end of file
+__all__ += ['spd_to_tm30_fast','spd_to_tm30_fast_iter','spd_to_tm30_fast_batch','cri_ref_fast','xyz_to_jab_cam02ucs_fast']
\ No newline at end of file
@@ -9,6 +9,10 @@ Module for fast ANSI/IES-TM30 calculations
 
  :spd_to_tm30(): Calculate tm30 measures from spd.
 
+ :spd_to_tm30_iter(): Calculate tm30 measures for large sets of spds in blocks (generator).
+
+ :spd_to_tm30_batch(): Calculate tm30 measures for large sets of spds in blocks.
+
 Created on Mon Sep 28 16:34:14 2020
 
 @author: ksmet1977@gmail.com
@@ -17,70 +21,24 @@ Created on Mon Sep 28 16:34:14 2020
 
 import copy
 
-from luxpy import (math, spd_to_xyz, xyz_to_cct, getwld, getwlr, _CMF, blackbody, daylightphase, 
-                   _CRI_RFL, _CRI_REF_TYPES, _CRI_REF_TYPE,_CIEOBS, xyzbar, cie_interp)
+from luxpy import (math, spd_to_xyz, xyz_to_cct, getwld, getwlr, blackbody, daylightphase, 
+                   _CRI_RFL, _CRI_REF_TYPES, _CRI_REF_TYPE,_CIEOBS, xyzbar)
 from luxpy.utils import np, plt
 from luxpy.color.cri.utils.DE_scalers import log_scale
 from luxpy.color.cri.utils.helpers import _get_hue_bin_data 
+from luxpy.color.cam.ciecam02_fused import (get_cam02_backend, cam02_fused_white_parameters, 
+                                            cam02_fused_forward)
 
-__all__ = ['_cri_ref','_xyz_to_jab_cam02ucs','spd_to_tm30'] # new or redefined
+__all__ = ['_cri_ref','_xyz_to_jab_cam02ucs','spd_to_tm30','spd_to_tm30_iter','spd_to_tm30_batch'] # new or redefined
 
 
 _DL = 1
 _WL3 = [360,830,_DL]
 _WL = getwlr(_WL3)
-_POS_WL560 = np.where(np.abs(_WL - 560.0) == np.min(np.abs(_WL - 560.0)))[0]
 _TM30_SAMPLE_SET = _CRI_RFL['ies-tm30-18']['99']['{:1.0f}nm'.format(_DL)]
 
-# Ensure all elements in array are not-NaN:
-_CMF_ = copy.deepcopy(_CMF)
-for cmf_str in _CMF_['types']:
-    _CMF_[cmf_str]['bar'] = cie_interp(_CMF[cmf_str]['bar'],wl_new = _WL3, kind = 'cmf')
-
-
-
-def _cri_ref_i(cct, wl3 = _WL, ref_type = 'iestm30', mix_range = [4000,5000], 
-            cieobs = None, cieobs_Y_normalization = None, force_daylight_below4000K = False, n = None,
-            daylight_locus = None):
-    """
-    Calculates a reference illuminant spectrum based on cct 
-    for color rendering index calculations.
-    """   
-    if mix_range is None:
-        mix_range =  _CRI_REF_TYPES[ref_type]['mix_range']
 
-    if (cct < mix_range[0]) | (ref_type == 'BB'):
-        return blackbody(cct, wl3, n = n)
-    elif (cct > mix_range[0]) | (ref_type == 'DL'):
-        return daylightphase(cct,wl3,force_daylight_below4000K = force_daylight_below4000K, cieobs = cieobs, daylight_locus = daylight_locus)
-    else:
-        SrBB = blackbody(cct, wl3, n = n)
-        SrDL = daylightphase(cct, wl3, verbosity = None,force_daylight_below4000K = force_daylight_below4000K, cieobs = cieobs, daylight_locus = daylight_locus)
-        if cieobs_Y_normalization is None: cieobs_Y_normalization = cieobs 
-        if cieobs_Y_normalization is None: cieobs_Y_normalization = '1931_2'
-        cmf = _CMF_[cieobs_Y_normalization]['bar'] if isinstance(cieobs_Y_normalization,str) else cieobs_Y_normalization 
-        wl = SrBB[0]
-        ld = getwld(wl)
-
-        SrBB = 100.0*SrBB[1]/np.array(np.sum(SrBB[1]*cmf[2]*ld))
-        SrDL = 100.0*SrDL[1]/np.array(np.sum(SrDL[1]*cmf[2]*ld))
-        Tb, Te = float(mix_range[0]), float(mix_range[1])
-        cBB, cDL = (Te-cct)/(Te-Tb), (cct-Tb)/(Te-Tb)
-        if cBB < 0.0:
-            cBB = 0.0
-        elif cBB > 1:
-            cBB = 1.0
-        if cDL < 0.0:
-            cDL = 0.0
-        elif cDL > 1:
-            cDL = 1.0
 
-        Sr = SrBB*cBB + SrDL*cDL
-        Sr[Sr == float('NaN')] = 0.0
-        Sr = np.vstack((wl,(Sr/Sr[_POS_WL560])))
-               
-        return  Sr
-    
 def _cri_ref(ccts, wl3 = _WL, ref_type = 'iestm30', mix_range = [4000,5000], 
              cieobs = None, cieobs_Y_normalization = None, force_daylight_below4000K = False, n = None,
              daylight_locus = None, wl = [360,830,1]):
@@ -90,21 +48,45 @@ def _cri_ref(ccts, wl3 = _WL, ref_type = 'iestm30', mix_range = [4000,5000],
     """  
     if mix_range is None:
         mix_range =  _CRI_REF_TYPES[ref_type]['mix_range']
-    if isinstance(ccts,float): ccts = [ccts]
+    ccts = np.asarray(ccts, dtype = float).ravel()
     wlr = getwlr(wl3)
     Srs = np.zeros((len(ccts)+1,len(wlr)))
     Srs[0] = wlr
-    for i,cct in enumerate(ccts):
-        Srs[i+1,:] = _cri_ref_i(cct, wl3 = wl3, ref_type = ref_type, 
-                      mix_range = mix_range, cieobs = cieobs, 
-                      cieobs_Y_normalization = cieobs_Y_normalization,
-                      force_daylight_below4000K = force_daylight_below4000K, n = n,
-                      daylight_locus = daylight_locus)[1:]
+    
+    # Get masks for blackbody, daylight phase and mixed references:
+    Tb, Te = float(mix_range[0]), float(mix_range[1])
+    is_BB = (ccts < Tb) | (ref_type == 'BB')
+    is_DL = (~is_BB) & ((ccts > Te) | (ref_type == 'DL'))
+    is_mixed = ~(is_BB | is_DL)
+    
+    # Calculate all blackbody and daylight phase spectra in one go:
+    needs_BB = is_BB | is_mixed
+    needs_DL = is_DL | is_mixed
+    SrBB = blackbody(ccts[needs_BB], wl3, n = n)[1:] if needs_BB.any() else None
+    SrDL = daylightphase(ccts[needs_DL], wl3, verbosity = None, force_daylight_below4000K = force_daylight_below4000K, cieobs = cieobs, daylight_locus = daylight_locus)[1:] if needs_DL.any() else None
+    if is_BB.any(): Srs[1:][is_BB] = SrBB[is_BB[needs_BB]]
+    if is_DL.any(): Srs[1:][is_DL] = SrDL[is_DL[needs_DL]]
+    
+    if is_mixed.any():
+        SrBB, SrDL = SrBB[is_mixed[needs_BB]], SrDL[is_mixed[needs_DL]]
+        if cieobs_Y_normalization is None: cieobs_Y_normalization = cieobs 
+        if cieobs_Y_normalization is None: cieobs_Y_normalization = '1931_2'
+        cmf = xyzbar(cieobs = cieobs_Y_normalization, scr = 'dict', wl_new = wlr) if isinstance(cieobs_Y_normalization,str) else cieobs_Y_normalization 
+        cmfY = cmf[2]*getwld(wlr)
+        
+        SrBB = 100.0*SrBB/(SrBB @ cmfY)[:,None]
+        SrDL = 100.0*SrDL/(SrDL @ cmfY)[:,None]
+        cct = ccts[is_mixed,None]
+        cBB = np.clip((Te-cct)/(Te-Tb), 0.0, 1.0)
+        cDL = np.clip((cct-Tb)/(Te-Tb), 0.0, 1.0)
+
+        Sr = SrBB*cBB + SrDL*cDL
+        Srs[1:][is_mixed] = Sr/Sr[:,np.abs(wlr - 560.0).argmin()][:,None]
     
     return Srs  
 
 
-def _xyz_to_jab_cam02ucs(xyz, xyzw, ucs = True, conditions = None):
+def _xyz_to_jab_cam02ucs(xyz, xyzw, ucs = True, conditions = None, backend = None):
     """ 
     Calculate CAM02-UCS J'a'b' coordinates from xyz tristimulus values of sample and white point.
     
@@ -119,6 +101,11 @@ def _xyz_to_jab_cam02ucs(xyz, xyzw, ucs = True, conditions = None):
             | None results in:
             |   {'La':100, 'Yb':20, 'D':1, 'surround':'avg'}
             | For more info see luxpy.cam.ciecam02()?
+        :backend:
+            | None, optional
+            | None or 'numpy': stage-by-stage NumPy implementation.
+            | 'numexpr' or 'numba': fused single pass per element 
+            |       (see luxpy.cam.ciecam02_fused).
     
     Returns:
         :jab:
@@ -171,36 +158,58 @@ def _xyz_to_jab_cam02ucs(xyz, xyzw, ucs = True, conditions = None):
         D = F*(1.0-(1.0/3.6)*np.exp((-La-42.0)/92.0))
         
     #--------------------------------------------
-    # transform from xyz, xyzw to cat sensor space:
-    rgb = math.dot23(mcat, xyz.T)
+    # transform from xyzw to cat sensor space:
     rgbw = mcat @ xyzw.T
     
     #--------------------------------------------  
     # apply von Kries cat:
-    rgbc = ((D*Yw/rgbw)[...,None] + (1 - D))*rgb # factor 100 from ciecam02 is replaced with Yw[i] in ciecam16, but see 'note' in Fairchild's "Color Appearance Models" (p291 ni 3ed.)
     rgbwc = ((D*Yw/rgbw) + (1 - D))*rgbw # factor 100 from ciecam02 is replaced with Yw[i] in ciecam16, but see 'note' in Fairchild's "Color Appearance Models" (p291 ni 3ed.)
     
     #--------------------------------------------
     # convert from cat02 sensor space to cone sensors (hpe):
-    rgbp = math.dot23(mhpe_x_invmcat,rgbc).T
     rgbwp = (mhpe_x_invmcat @ rgbwc).T
     
     #--------------------------------------------
     # apply Naka_rushton repsonse compression:
     naka_rushton = lambda x: 400*x**0.42/(x**0.42 + 27.13) + 0.1
     
-    rgbpa = naka_rushton(FL*rgbp/100.0)
-    p = np.where(rgbp<0)
-    rgbpa[p] = 0.1 - (naka_rushton(FL*np.abs(rgbp[p])/100.0) - 0.1)
-    
     rgbwpa = naka_rushton(FL*rgbwp/100.0)
     pw = np.where(rgbwp<0)
     rgbwpa[pw] = 0.1 - (naka_rushton(FL*np.abs(rgbwp[pw])/100.0) - 0.1)
 
+    #--------------------------------------------
+    # Calculate achromatic signal of white:
+    Aw =  (2.0*rgbwpa[...,0] + rgbwpa[...,1] + (1.0/20.0)*rgbwpa[...,2] - 0.305)*Nbb
+    
+    #--------------------------------------------
+    # fused single pass per element for samples (numexpr or numba backend):
+    if get_cam02_backend(backend) != 'numpy':
+        wpars = cam02_fused_white_parameters(((D*Yw/rgbw) + (1 - D)).T, FL, Nbb, Aw, c*z, n, Nc, Ncb)
+        return cam02_fused_forward(xyz, wpars, mcat, mhpe_x_invmcat, 
+                                   ucs = {'c1' : 0.007, 'c2' : 0.0228} if (ucs == True) else None,
+                                   backend = backend)
+    
+    #--------------------------------------------
+    # transform from xyz to cat sensor space:
+    rgb = math.dot23(mcat, xyz.T)
+    
+    #--------------------------------------------  
+    # apply von Kries cat:
+    rgbc = ((D*Yw/rgbw)[...,None] + (1 - D))*rgb # factor 100 from ciecam02 is replaced with Yw[i] in ciecam16, but see 'note' in Fairchild's "Color Appearance Models" (p291 ni 3ed.)
+    
+    #--------------------------------------------
+    # convert from cat02 sensor space to cone sensors (hpe):
+    rgbp = math.dot23(mhpe_x_invmcat,rgbc).T
+    
+    #--------------------------------------------
+    # apply Naka_rushton repsonse compression:
+    rgbpa = naka_rushton(FL*rgbp/100.0)
+    p = np.where(rgbp<0)
+    rgbpa[p] = 0.1 - (naka_rushton(FL*np.abs(rgbp[p])/100.0) - 0.1)
+
     #--------------------------------------------
     # Calculate achromatic signal:
     A  =  (2.0*rgbpa[...,0] + rgbpa[...,1] + (1.0/20.0)*rgbpa[...,2] - 0.305)*Nbb
-    Aw =  (2.0*rgbwpa[...,0] + rgbwpa[...,1] + (1.0/20.0)*rgbwpa[...,2] - 0.305)*Nbb
     
     #--------------------------------------------
     # calculate initial opponent channels:
@@ -243,13 +252,21 @@ def _xyz_to_jab_cam02ucs(xyz, xyzw, ucs = True, conditions = None):
 def _polyarea(x,y):
     return 0.5*np.abs(np.dot(x,np.roll(y,1,axis=0))-np.dot(y,np.roll(x,1,axis=0)))
 
+def _polyareas(x,y):
+    """ Calculate areas of polygons in the columns of x, y (NaN vertices, i.e. empty hue-bins, are skipped). """
+    isnan = np.isnan(x)
+    order = np.argsort(isnan, axis = 0, kind = 'stable') # move NaN's to the end of each column
+    x, y = np.take_along_axis(x, order, axis = 0), np.take_along_axis(y, order, axis = 0)
+    n = (~isnan).sum(axis = 0, keepdims = True)
+    i = np.arange(x.shape[0])[:,None]
+    inext = np.where(i + 1 < n, i + 1, 0) # close each polygon after its last not-NaN vertex
+    cross = x*np.take_along_axis(y, inext, axis = 0) - y*np.take_along_axis(x, inext, axis = 0)
+    return 0.5*np.abs(np.where(i < n, cross, 0).sum(axis = 0))
+
 def _hue_bin_data_to_rg(hue_bin_data):
-    jabt_closed = np.vstack((hue_bin_data['jabt_hj'],hue_bin_data['jabt_hj'][:1,...]))
-    jabr_closed = np.vstack((hue_bin_data['jabr_hj'],hue_bin_data['jabr_hj'][:1,...]))
-    notnan_t = np.logical_not(np.isnan(jabt_closed[...,1])) # avoid NaN's (i.e. empty hue-bins)
-    notnan_r = np.logical_not(np.isnan(jabr_closed[...,1]))
-    Rg = np.array([[100*_polyarea(jabt_closed[notnan_t[:,i],i,1],jabt_closed[notnan_t[:,i],i,2]) / _polyarea(jabr_closed[notnan_r[:,i],i,1],jabr_closed[notnan_r[:,i],i,2]) for i in range(notnan_r.shape[-1])]])
-    return Rg
+    jabt, jabr = hue_bin_data['jabt_hj'], hue_bin_data['jabr_hj']
+    Rg = 100*_polyareas(jabt[...,1], jabt[...,2]) / _polyareas(jabr[...,1], jabr[...,2])
+    return Rg[None]
 
 def _hue_bin_data_to_Rxhj(hue_bin_data, scale_factor):
     
@@ -299,9 +316,12 @@ def _hue_bin_data_to_ellipsefit(hue_bin_data):
     return {'v':v, 'a/b':ecc,'thetad': theta}
  
 
-def spd_to_tm30(St):
+def _spd_to_tm30_data(St, backend = None, hue_bins = True):
     """
-    Calculate tm30 measures from spd.
+    Calculate the tm30 data shared by spd_to_tm30() and _spd_to_tm30_block():
+    white point, cct, duv, reference illuminant, sample xyz and CAM02-UCS 
+    coordinates, DEi, Rfi, DEa, Rf and (if hue_bins) the hue-bin data, 
+    Rg, Rfhj, Rcshj, Rhshj and DEhj (no gamut ellipse fit).
     """    
     # calculate CIE 1931 2° white point xyz:
     xyzw_cct, _ = spd_to_xyz(St, cieobs = '1931_2', relative = True, out = 2)
@@ -324,8 +344,8 @@ def spd_to_tm30(St):
     
     # calculate CAM02-UCS coordinates 
     # (standard conditions = {'La':100.0,'Yb':20.0,'surround':'avg','D':1.0):
-    jabt = _xyz_to_jab_cam02ucs(xyzt, xyzw = xyzwt)
-    jabr = _xyz_to_jab_cam02ucs(xyzr, xyzw = xyzwr)
+    jabt = _xyz_to_jab_cam02ucs(xyzt, xyzw = xyzwt, backend = backend)
+    jabr = _xyz_to_jab_cam02ucs(xyzr, xyzw = xyzwr, backend = backend)
    
     
     # calculate DEi, Rfi:
@@ -335,39 +355,172 @@ def spd_to_tm30(St):
     # calculate Rf
     DEa = DEi.mean(axis = 0,keepdims = True)
     Rf = log_scale(DEa, scale_factor = [6.73])
-        
-    # calculate hue-bin data:
-    hue_bin_data = _get_hue_bin_data(jabt, jabr, start_hue = 0, nhbins = 16)       
-
-    # calculate Rg:
-    Rg = _hue_bin_data_to_rg(hue_bin_data)                 
-        
-    # calculate local color fidelity values, Rfhj,
-    # local hue shift, Rhshj and local chroma shifts, Rcshj:
-    Rcshj, Rhshj, Rfhj, DEhj = _hue_bin_data_to_Rxhj(hue_bin_data, 
-                                                    scale_factor = [6.73])
-    
-    # Fit ellipse to gamut shape of samples under test source:
-    gamut_ellipse_fit = _hue_bin_data_to_ellipsefit(hue_bin_data)
-    hue_bin_data['gamut_ellipse_fit'] = gamut_ellipse_fit
     
-    # return output dict:
-    return {'St' : St, 'Sr' : Sr, 
+    data = {'St' : St, 'Sr' : Sr, 
             'xyzw_cct' : xyzw_cct, 'xyzwt' : xyzwt, 'xyzwr' : xyzwr,
             'xyzt' : xyzt, 'xyzr' : xyzr, 
             'cct': cct.T, 'duv': duv.T,
             'jabt' : jabt, 'jabr' : jabr, 
-            'DEi' : DEi, 'DEa' : DEa, 'Rfi' : Rfi, 'Rf' : Rf,
-            'hue_bin_data' : hue_bin_data, 'Rg' : Rg,
-            'DEhj' : DEhj, 'Rfhj' : Rfhj,
-            'Rcshj': Rcshj,'Rhshj':Rhshj,
-            'hue_bin_data' : hue_bin_data}
-
-
-
-
+            'DEi' : DEi, 'DEa' : DEa, 'Rfi' : Rfi, 'Rf' : Rf}
+    
+    if hue_bins:
+        # calculate hue-bin data:
+        hue_bin_data = _get_hue_bin_data(jabt, jabr, start_hue = 0, nhbins = 16)       
+    
+        # calculate Rg:
+        Rg = _hue_bin_data_to_rg(hue_bin_data)                 
+            
+        # calculate local color fidelity values, Rfhj,
+        # local hue shift, Rhshj and local chroma shifts, Rcshj:
+        Rcshj, Rhshj, Rfhj, DEhj = _hue_bin_data_to_Rxhj(hue_bin_data, 
+                                                        scale_factor = [6.73])
+        data.update({'hue_bin_data' : hue_bin_data, 'Rg' : Rg,
+                     'DEhj' : DEhj, 'Rfhj' : Rfhj,
+                     'Rcshj': Rcshj,'Rhshj':Rhshj})
+    return data
+
+def spd_to_tm30(St, backend = None):
+    """
+    Calculate tm30 measures from spd.
+    
+    | :backend: specifies the backend used in the CAM02-UCS calculations 
+    | (None: 'numpy'; see _xyz_to_jab_cam02ucs?).
+    """    
+    data = _spd_to_tm30_data(St, backend = backend, hue_bins = True)
+    
+    # Fit ellipse to gamut shape of samples under test source:
+    data['hue_bin_data']['gamut_ellipse_fit'] = _hue_bin_data_to_ellipsefit(data['hue_bin_data'])
+    
+    return data
 
+def _spd_to_tm30_block(St, out, backend = None):
+    """
+    Calculate tm30 measures in :out: for a block of spds (no gamut ellipse fit).
+    """
+    hue_bins = any([x in out for x in ['Rg','Rfhj','Rcshj','Rhshj']])
+    data = _spd_to_tm30_data(St, backend = backend, hue_bins = hue_bins)
+    return {x : data[x] for x in out}
 
+def _iter_spd_blocks(spds, chunk_size):
+    """
+    Get generator with blocks of at most chunk_size spds (first row: wavelengths)
+    from an ndarray (or np.memmap) or from an iterable of such ndarrays.
+    """
+    if isinstance(spds, np.ndarray):
+        for i in range(1, spds.shape[0], chunk_size):
+            yield np.vstack((spds[:1], spds[i:i + chunk_size]))
+    else:
+        wl, buffer, n = None, [], 0
+        for S in spds:
+            S = np.atleast_2d(S)
+            if (wl is not None) and (not np.array_equal(S[0], wl)) and (n > 0): # don't mix wavelength ranges in one block
+                yield np.vstack([wl] + buffer)
+                buffer, n = [], 0
+            wl, i = S[0], 1
+            while i < S.shape[0]:
+                buffer.append(S[i:i + chunk_size - n]) 
+                n += buffer[-1].shape[0]
+                i += buffer[-1].shape[0]
+                if n == chunk_size:
+                    yield np.vstack([wl] + buffer)
+                    buffer, n = [], 0
+        if n > 0:
+            yield np.vstack([wl] + buffer)
+
+def spd_to_tm30_iter(spds, chunk_size = 1000, n_workers = None, out = 'Rf,Rg,Rfhj,Rcshj,Rhshj',
+                     backend = None):
+    """
+    Calculate tm30 measures for (very) large sets of spds by processing them 
+    in blocks of fixed size.
+    
+    Args:
+        :spds:
+            | ndarray (or np.memmap) with spds (first row: wavelengths),
+            | or iterable (e.g. generator) yielding such ndarrays.
+        :chunk_size:
+            | 1000, optional
+            | Number of spds processed in one block.
+        :n_workers:
+            | None, optional
+            | Number of threads in a worker pool processing blocks concurrently.
+            | If None: process blocks sequentially.
+        :out:
+            | 'Rf,Rg,Rfhj,Rcshj,Rhshj', optional
+            | Comma separated string with requested measures.
+            | Options: 'Rf', 'Rg', 'Rfhj', 'Rcshj', 'Rhshj', 'Rfi', 'cct', 'duv'.
+        :backend:
+            | None, optional
+            | Backend for the CAM02-UCS calculations ('numpy', 'numexpr', 'numba').
+            | None: 'numpy' (see _xyz_to_jab_cam02ucs?).
+    
+    Returns:
+        :returns:
+            | generator yielding, for each block (in order), a dict with 
+            | the requested measures (shapes as in spd_to_tm30(), 
+            | i.e. with the spds along the last axis).
+            
+    Note:
+        Peak memory is determined by :chunk_size: (and :n_workers:) and does 
+        not depend on the total number of spds: at most 2*n_workers blocks 
+        are in flight at the same time.
+    """
+    out = out.split(',')
+    blocks = _iter_spd_blocks(spds, chunk_size)
+    if (n_workers is None) or (n_workers <= 1):
+        for St in blocks:
+            yield _spd_to_tm30_block(St, out, backend = backend)
+    else:
+        from concurrent.futures import ThreadPoolExecutor # numpy (and the numba kernel) release the GIL in the heavy lifting
+        with ThreadPoolExecutor(max_workers = n_workers) as pool:
+            futures = []
+            for St in blocks:
+                futures.append(pool.submit(_spd_to_tm30_block, St, out, backend = backend))
+                if len(futures) >= 2*n_workers:
+                    yield futures.pop(0).result()
+            for future in futures:
+                yield future.result()
+
+def spd_to_tm30_batch(spds, chunk_size = 1000, n_workers = None, out = 'Rf,Rg,Rfhj,Rcshj,Rhshj',
+                      backend = None):
+    """
+    Calculate tm30 measures for (very) large sets of spds by processing them 
+    in blocks of fixed size and accumulating the results.
+    
+    Args:
+        :spds:
+            | ndarray (or np.memmap) with spds (first row: wavelengths),
+            | or iterable (e.g. generator) yielding such ndarrays.
+        :chunk_size:
+            | 1000, optional
+            | Number of spds processed in one block.
+        :n_workers:
+            | None, optional
+            | Number of threads in a worker pool processing blocks concurrently.
+            | If None: process blocks sequentially.
+        :out:
+            | 'Rf,Rg,Rfhj,Rcshj,Rhshj', optional
+            | Comma separated string with requested measures.
+            | Options: 'Rf', 'Rg', 'Rfhj', 'Rcshj', 'Rhshj', 'Rfi', 'cct', 'duv'.
+        :backend:
+            | None, optional
+            | Backend for the CAM02-UCS calculations ('numpy', 'numexpr', 'numba').
+            | None: 'numpy' (see _xyz_to_jab_cam02ucs?).
+    
+    Returns:
+        :returns:
+            | dict with the requested measures for all spds 
+            | (shapes as in spd_to_tm30(), i.e. with the spds along the last axis).
+            
+    Note:
+        Only the (small) per-spd results are accumulated; intermediate arrays 
+        (sample xyz, jab, hue-bin data) only exist for the blocks being processed.
+        Use spd_to_tm30_iter() to stream the results instead.
+    """
+    results = {}
+    for block in spd_to_tm30_iter(spds, chunk_size = chunk_size, n_workers = n_workers, out = out, backend = backend):
+        for key, value in block.items():
+            results.setdefault(key, []).append(value)
+    return {key : np.concatenate(value, axis = -1) for key, value in results.items()}
 
 
 
@@ -27,6 +27,13 @@ Module with color rendition, fidelity and gamut area helper functions
 
  :_hue_bin_data_to_rg():  Calculates gamut area index, Rg.
 
+ :set_cri_ref_cache(): Enable / disable (and configure) the cache with reference 
+                       illuminants and their sample set tristimulus values.
+
+ :clear_cri_ref_cache(): Clear the reference illuminant cache.
+
+ :get_cri_ref_cache_info(): Get statistics of the reference illuminant cache.
+
  :spd_to_jab_t_r(): Calculates jab color values for a sample set illuminated
                     with test source and its reference illuminant.
 
@@ -48,19 +55,131 @@ Module with color rendition, fidelity and gamut area helper functions
 
 .. codeauthor:: Kevin A.G. Smet (ksmet1977 at gmail.com)
 """
-import copy
+import hashlib
 from luxpy import (_S_INTERP_TYPE, _CRI_RFL, _IESTM3015, math, cam, cat,
                    spd, colortf, spd_to_xyz, cie_interp, cri_ref, xyz_to_cct)
-from luxpy.utils import np, sp,plt,asplit, np2d, put_args_in_db 
+from luxpy.utils import np, sp,plt,asplit, np2d, put_args_in_db, LRUCache
+from luxpy.spectrum.basics.spectral import _wl_hash
 from luxpy.color.cri.utils.DE_scalers import linear_scale, log_scale, psy_scale
 
-from luxpy.color.cri.utils.init_cri_defaults_database import _CRI_TYPE_DEFAULT, _CRI_DEFAULTS, process_cri_type_input
+from luxpy.color.cri.utils.init_cri_defaults_database import _CRI_TYPE_DEFAULT, _CRI_DEFAULTS, process_cri_type_input, CriSpec
 
 __all__ = ['_get_hue_bin_data','spd_to_jab_t_r','spd_to_rg', 'spd_to_DEi', 
            'optimize_scale_factor','spd_to_cri',
-           '_hue_bin_data_to_rxhj', '_hue_bin_data_to_rfi', '_hue_bin_data_to_rg']
+           '_hue_bin_data_to_rxhj', '_hue_bin_data_to_rfi', '_hue_bin_data_to_rg',
+           'set_cri_ref_cache','clear_cri_ref_cache','get_cri_ref_cache_info']
 
 _CCT_MODE = 'ohno2014'
+
+_CRI_REF_CACHE = None # reference illuminant cache (None: disabled, see set_cri_ref_cache())
+_CRI_REF_CACHE_CCT_TOL = 1.0
+_SAMPLESET_KEYS = LRUCache(maxsize = 16) # memoize content hashes of sample sets by id()
+
+#------------------------------------------------------------------------------
+def set_cri_ref_cache(enable = True, cct_tol = 1.0, maxsize = 1024, maxbytes = 256*1024**2):
+    """
+    Enable / disable (and configure) the cache with reference illuminants 
+    and their sample set tristimulus values used by spd_to_jab_t_r()
+    (and hence by spd_to_DEi(), spd_to_rg(), spd_to_cri(), ...).
+    
+    Args:
+        :enable:
+            | True, optional
+            | If False: disable (and empty) the cache.
+        :cct_tol:
+            | 1.0, optional
+            | Tolerance (in K) to which the CCTs of the test sources are rounded. 
+            | Sources whose CCTs round to the same value share the reference 
+            | illuminant calculated at the rounded CCT.
+        :maxsize:
+            | 1024, optional
+            | Maximum number of reference illuminants in the cache.
+        :maxbytes:
+            | 256*1024**2, optional
+            | Maximum total size (in bytes) of the cached spectra and tristimulus values.
+            
+    Note:
+        1. The cache is keyed on (ref_type, rounded CCT, wavelengths, cieobs, sample set).
+        2. Least-recently-used entries are evicted when any of the limits is exceeded.
+        3. As the reference illuminant is calculated at the rounded CCT, 
+           results can deviate (slightly) from the ones obtained with the cache 
+           disabled (default), in particular for CCTs close to the ones where 
+           the reference switches type (e.g. 5000 K for 'ciera'). 
+           Use a small :cct_tol: for high accuracy.
+        4. User-defined sample sets are identified by their content. 
+           Do not modify them in-place between calls.
+    """
+    global _CRI_REF_CACHE, _CRI_REF_CACHE_CCT_TOL
+    if enable:
+        if cct_tol <= 0: raise Exception('set_cri_ref_cache(): cct_tol must be > 0.')
+        _CRI_REF_CACHE = LRUCache(maxsize = maxsize, maxbytes = maxbytes)
+        _CRI_REF_CACHE_CCT_TOL = float(cct_tol)
+    else:
+        _CRI_REF_CACHE = None
+        _SAMPLESET_KEYS.clear()
+
+def clear_cri_ref_cache():
+    """
+    Clear the reference illuminant cache (and reset the hit/miss counters).
+    """
+    if _CRI_REF_CACHE is not None: _CRI_REF_CACHE.clear()
+    _SAMPLESET_KEYS.clear()
+
+def get_cri_ref_cache_info():
+    """
+    Get statistics of the reference illuminant cache.
+    
+    Returns:
+        :info:
+            | None if the cache is disabled, else a dict with keys 'hits', 'misses', 
+            | 'currsize' (number of cached reference illuminants), 'nbytes', 
+            | 'maxsize', 'maxbytes' and 'cct_tol'.
+    """
+    if _CRI_REF_CACHE is None: return None
+    info = _CRI_REF_CACHE.info()
+    info['cct_tol'] = _CRI_REF_CACHE_CCT_TOL
+    return info
+
+def _array_key(x):
+    """ Get hashable key for str, None or ndarray input (e.g. cieobs or sampleset). """
+    if (x is None) | isinstance(x,str): 
+        return x
+    entry = _SAMPLESET_KEYS.get(id(x))
+    if (entry is None) or (entry[0] is not x):
+        xa = np.ascontiguousarray(x, dtype = float)
+        entry = _SAMPLESET_KEYS.put(id(x), (x, (xa.shape, hashlib.sha1(xa.tobytes()).hexdigest())))
+    return entry[1]
+
+def _get_cached_cri_ref_xyz(cct, wl, ref_type, cieobs, sampleset):
+    """
+    Get reference illuminant spectra and their sample set and white point 
+    tristimulus values for the ccts (rounded to _CRI_REF_CACHE_CCT_TOL) from 
+    the cache, calculating (and storing) those that are not yet cached.
+    
+    Returns:
+        :Sr, xyzri, xyzrw:
+            | ndarrays with reference spectra, sample and white point tristimulus 
+            | values (same shapes as from cri_ref() and spd_to_xyz(..., out = 2)).
+    """
+    cctq = np.round(cct.ravel()/_CRI_REF_CACHE_CCT_TOL)*_CRI_REF_CACHE_CCT_TOL
+    ucctq, inverse = np.unique(cctq, return_inverse = True)
+    key0 = (ref_type, _array_key(cieobs['cct']), _array_key(cieobs['xyz']), _array_key(sampleset)) + _wl_hash(wl)
+
+    values = [(_CRI_REF_CACHE.get(key0 + (T,)) if np.isfinite(T) else None) for T in ucctq]
+    missing = [i for i, v in enumerate(values) if v is None]
+    if len(missing) > 0:
+        Sr = cri_ref(ucctq[missing], ref_type = ref_type, cieobs = cieobs['cct'], wl3 = wl)
+        xyzri, xyzrw = spd_to_xyz(Sr, cieobs = cieobs['xyz'], rfl = sampleset, out = 2)
+        for j, i in enumerate(missing):
+            value = (Sr[j+1], xyzri[:,j,:], xyzrw[j])
+            for v in value: v.flags.writeable = False
+            values[i] = _CRI_REF_CACHE.put(key0 + (ucctq[i],), value) if np.isfinite(ucctq[i]) else value
+    
+    Sr = np.vstack((wl,np.array([v[0] for v in values])[inverse]))
+    xyzri = np.transpose(np.array([v[1] for v in values]), (1,0,2))[:,inverse,:]
+    xyzrw = np.array([v[2] for v in values])[inverse]
+    return Sr, xyzri, xyzrw
+
 #------------------------------------------------------------------------------
 def _get_hue_bin_data_individual_samples(jabt,jabr, normalized_chroma_ref = 100):
     """ Helper function to return dict with required keys when nhbins = None in call to _get_hue_bin_data"""
@@ -373,7 +492,7 @@ def _hue_bin_data_to_rxhj(hue_bin_data, cri_type = _CRI_TYPE_DEFAULT,
     
     if (scale_factor is None) | (scale_fcn is None) | (use_bin_avg_DEi is None):
         if isinstance(cri_type, str): 
-           args = copy.deepcopy(locals()) # get dict with keyword input arguments to function (used to overwrite non-None input arguments present in cri_type dict)
+           args = locals().copy() # get dict with keyword input arguments to function (used to overwrite non-None input arguments present in cri_type dict)
            cri_type = process_cri_type_input(cri_type, args, callerfunction = 'cri._hue_bin_data_to_Ri')
         
         # Get scale factor and function:
@@ -485,7 +604,7 @@ def _hue_bin_data_to_rfi(hue_bin_data = None, cri_type = _CRI_TYPE_DEFAULT,
     """
     if (scale_factor is None) | (scale_fcn is None):
         if isinstance(cri_type, str): 
-           args = copy.deepcopy(locals()) # get dict with keyword input arguments to function (used to overwrite non-None input arguments present in cri_type dict)
+           args = locals().copy() # get dict with keyword input arguments to function (used to overwrite non-None input arguments present in cri_type dict)
            cri_type = process_cri_type_input(cri_type, args, callerfunction = 'cri._hue_bin_data_to_Rfi')
         
         # Get scale factor and function:
@@ -541,7 +660,7 @@ def _hue_bin_data_to_rf(hue_bin_data = None, cri_type = _CRI_TYPE_DEFAULT,
     """
     if (scale_factor is None) | (scale_fcn is None) | (avg is None):
         if isinstance(cri_type, str): 
-           args = copy.deepcopy(locals()) # get dict with keyword input arguments to function (used to overwrite non-None input arguments present in cri_type dict)
+           args = locals().copy() # get dict with keyword input arguments to function (used to overwrite non-None input arguments present in cri_type dict)
            cri_type = process_cri_type_input(cri_type, args, callerfunction = 'cri._hue_bin_data_to_Rfi')
         
         # Get scale factor and function:
@@ -592,6 +711,8 @@ def spd_to_jab_t_r(St, cri_type = _CRI_TYPE_DEFAULT, out = 'jabt,jabr',
             |   - dict: user defined model parameters 
             |     (see e.g. luxpy.cri._CRI_DEFAULTS['cierf'] 
             |     for required structure)
+            |   - CriSpec: compiled cri model parameters (see compile_cri_type()) 
+            |     for minimal per-call overhead.
             | Note that any non-None input arguments to the function will 
             |  override default values in cri_type dict.
             
@@ -659,10 +780,15 @@ def spd_to_jab_t_r(St, cri_type = _CRI_TYPE_DEFAULT, out = 'jabt,jabr',
             | with jabt and jabr data for :out: 'jabt,jabr'
             | 
             | Other output is also possible by changing the :out: str value.
+            
+    Note:
+        When enabled with set_cri_ref_cache(), reference illuminants (and their 
+        sample set tristimulus values) are taken from a cache keyed on the CCT 
+        rounded to the cache tolerance (only for str :ref_type:).
     """
    
     #Override input parameters with data specified in cri_type:
-    args = copy.deepcopy(locals()) # get dict with keyword input arguments to function (used to overwrite non-None input arguments present in cri_type dict)
+    args = locals().copy() # get dict with keyword input arguments to function (used to overwrite non-None input arguments present in cri_type dict)
     cri_type = process_cri_type_input(cri_type, args, callerfunction = 'cri.spd_to_jab_t_r')
 
     # unpack and update dict with parameters:
@@ -687,17 +813,25 @@ def spd_to_jab_t_r(St, cri_type = _CRI_TYPE_DEFAULT, out = 'jabt,jabr',
     cct = np.abs(cct) # out-of-lut ccts are encoded as negative
     
     # A.c. get reference ill.:
-    if isinstance(ref_type,np.ndarray):
-        Sr = cri_ref(ref_type, ref_type = 'spd', cieobs = cieobs['cct'], wl3 = St[0])
+    if (_CRI_REF_CACHE is not None) & isinstance(ref_type,str):
+        # get reference ill. (and its xyz and xyzw) from cache:
+        Sr, xyzri, xyzrw = _get_cached_cri_ref_xyz(cct, St[0], ref_type, cieobs, sampleset)
+        
+        # B. calculate xyz and xyzw of SPD:
+        xyzti, xyztw = spd_to_xyz(St, cieobs = cieobs['xyz'], rfl = sampleset, out = 2)
+        
     else:
-        Sr = cri_ref(cct, ref_type = ref_type, cieobs = cieobs['cct'], wl3 = St[0])
-
-    # B. calculate xyz and xyzw of SPD and Sr (stack for speed):
-    xyzi, xyzw = spd_to_xyz(np.vstack((St,Sr[1:])), cieobs = cieobs['xyz'], rfl = sampleset, out = 2)
-    #xyzri, xyzrw = spd_to_xyz(Sr, cieobs = cieobs['xyz'], rfl = sampleset, out = 2)
-    N = St.shape[0]-1
-    xyzti, xyzri =  xyzi[:,:N,:], xyzi[:,N:,:]
-    xyztw, xyzrw =  xyzw[:N,:], xyzw[N:,:]
+        if isinstance(ref_type,np.ndarray):
+            Sr = cri_ref(ref_type, ref_type = 'spd', cieobs = cieobs['cct'], wl3 = St[0])
+        else:
+            Sr = cri_ref(cct, ref_type = ref_type, cieobs = cieobs['cct'], wl3 = St[0])
+    
+        # B. calculate xyz and xyzw of SPD and Sr (stack for speed):
+        xyzi, xyzw = spd_to_xyz(np.vstack((St,Sr[1:])), cieobs = cieobs['xyz'], rfl = sampleset, out = 2)
+        #xyzri, xyzrw = spd_to_xyz(Sr, cieobs = cieobs['xyz'], rfl = sampleset, out = 2)
+        N = St.shape[0]-1
+        xyzti, xyzri =  xyzi[:,:N,:], xyzi[:,N:,:]
+        xyztw, xyzrw =  xyzw[:N,:], xyzw[N:,:]
     
     # C. apply chromatic adaptation for non-cam/lab cspaces:
     if catf is not None:
@@ -721,19 +855,24 @@ def spd_to_jab_t_r(St, cri_type = _CRI_TYPE_DEFAULT, out = 'jabt,jabr',
     # xyztw = xyztw[None] 
     # xyzrw = xyzrw[None] 
 
-    cspace_pars = cspace.copy()
-    cspace_pars.pop('type')
+    if isinstance(cri_type, CriSpec): # use pre-resolved color space function
+        cspace_fcn, cspace_pars0 = cri_type.cspace_fcn, cri_type.cspace_pars
+    else:
+        cspace_fcn = lambda xyz, **kwargs: colortf(xyz, tf = cspace['type'], fwtf = kwargs)
+        cspace_pars0 = cspace.copy()
+        cspace_pars0.pop('type')
+        
+    cspace_pars = cspace_pars0.copy()
     if 'xyzw' in cspace_pars.keys(): 
         if cspace_pars['xyzw'] is None: 
             cspace_pars['xyzw'] = xyztw # enter test whitepoint
-    jabt = colortf(xyzti, tf = cspace['type'], fwtf = cspace_pars)
+    jabt = cspace_fcn(xyzti, **cspace_pars)
     
-    cspace_pars = cspace.copy()
-    cspace_pars.pop('type')
+    cspace_pars = cspace_pars0.copy()
     if 'xyzw' in cspace_pars.keys(): 
         if cspace_pars['xyzw'] is None: 
             cspace_pars['xyzw'] = xyzrw # enter ref. whitepoint
-    jabr = colortf(xyzri, tf = cspace['type'], fwtf = cspace_pars)    
+    jabr = cspace_fcn(xyzri, **cspace_pars)    
     del cspace_pars
 
 
@@ -775,6 +914,8 @@ def spd_to_DEi(St, cri_type = _CRI_TYPE_DEFAULT, out = 'DEi', wl = None, \
             |   - dict: user defined model parameters 
             |     (see e.g. luxpy.cri._CRI_DEFAULTS['cierf'] 
             |     for required structure)
+            |   - CriSpec: compiled cri model parameters (see compile_cri_type()) 
+            |     for minimal per-call overhead.
             | Note that any non-None input arguments to the function will 
               override default values in cri_type dict.
         :sampleset:
@@ -843,7 +984,7 @@ def spd_to_DEi(St, cri_type = _CRI_TYPE_DEFAULT, out = 'DEi', wl = None, \
 
     """
     #Override input parameters with data specified in cri_type:
-    args = copy.deepcopy(locals()) # get dict with keyword input arguments to function (used to overwrite non-None input arguments present in cri_type dict)
+    args = locals().copy() # get dict with keyword input arguments to function (used to overwrite non-None input arguments present in cri_type dict)
     
     cri_type = process_cri_type_input(cri_type, args, callerfunction = 'cri.spd_to_DEi')
 
@@ -1020,6 +1161,8 @@ def spd_to_rg(St, cri_type = _CRI_TYPE_DEFAULT, out = 'Rg', wl = None, \
             |   - dict: user defined model parameters 
             |     (see e.g. luxpy.cri._CRI_DEFAULTS['cierf'] 
             |     for required structure)
+            |   - CriSpec: compiled cri model parameters (see compile_cri_type()) 
+            |     for minimal per-call overhead.
             | Note that any non-None input arguments to the function will 
             | override default values in cri_type dict.
         :sampleset:
@@ -1156,7 +1299,7 @@ def spd_to_rg(St, cri_type = _CRI_TYPE_DEFAULT, out = 'Rg', wl = None, \
         <https://www.osapublishing.org/oe/abstract.cfm?uri=oe-23-12-15888>`_
     """
     #Override input parameters with data specified in cri_type:
-    args = copy.deepcopy(locals()) # get dict with keyword input arguments to function (used to overwrite non-None input arguments present in cri_type dict)
+    args = locals().copy() # get dict with keyword input arguments to function (used to overwrite non-None input arguments present in cri_type dict)
     cri_type = process_cri_type_input(cri_type, args, callerfunction = 'cri.spd_to_rg')
 
     #avg, catf, cieobs, cieobs_cct, cri_specific_pars, cspace, cspace_pars, ref_type, rf_from_avg_rounded_rfi, rg_pars, sampleset, scale_factor, scale_fcn = [cri_type[x] for x in sorted(cri_type.keys())] 
@@ -1235,6 +1378,8 @@ def spd_to_cri(St, cri_type = _CRI_TYPE_DEFAULT, out = 'Rf', wl = None, \
             |   - dict: user defined model parameters 
             |     (see e.g. luxpy.cri._CRI_DEFAULTS['cierf'] 
             |     for required structure)
+            |   - CriSpec: compiled cri model parameters (see compile_cri_type()) 
+            |     for minimal per-call overhead.
             | Note that any non-None input arguments to the function will 
             | override default values in cri_type dict.
         :sampleset:
@@ -1415,7 +1560,7 @@ def spd_to_cri(St, cri_type = _CRI_TYPE_DEFAULT, out = 'Rf', wl = None, \
     outlist = out.split(',')
     
     #Override input parameters with data specified in cri_type:
-    args = copy.deepcopy(locals()) # get dict with keyword input arguments to function (used to overwrite non-None input arguments present in cri_type dict)
+    args = locals().copy() # get dict with keyword input arguments to function (used to overwrite non-None input arguments present in cri_type dict)
 
     cri_type = process_cri_type_input(cri_type, args, callerfunction = 'cri.spd_to_cri')
     
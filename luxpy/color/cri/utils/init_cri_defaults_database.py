@@ -21,15 +21,20 @@ Module with color fidelity and color gamut area parameter dicts
  :process_cri_type_input(): load a cri_type dict but overwrites any keys that 
                             have a non-None input in calling function
 
+ :CriSpec: Compiled cri_type dict with pre-resolved sample set, CAT and color space function.
+
+ :compile_cri_type(): Compile a cri_type (str or dict) into a CriSpec.
+
 
 .. codeauthor:: Kevin A.G. Smet (ksmet1977 at gmail.com)
 """
 import copy
-from luxpy import math
+from luxpy import math, cat, colortf, _CRI_RFL
 from luxpy.utils import np, put_args_in_db
 from .DE_scalers import linear_scale, log_scale, psy_scale
 
-__all__ = ['_CRI_TYPE_DEFAULT', '_CRI_DEFAULTS', 'process_cri_type_input']
+__all__ = ['_CRI_TYPE_DEFAULT', '_CRI_DEFAULTS', 'process_cri_type_input',
+           'CriSpec', 'compile_cri_type']
 
 #------------------------------------------------------------------------------
 # create default settings for different color rendition indices: (major dict has 9 keys (04-Jul-2017): sampleset [str/dict], ref_type [str], cieobs [str], avg [fcn handle], scale [dict], cspace [dict], catf [dict], rg_pars [dict], cri_specific_pars [dict])
@@ -168,7 +173,10 @@ def process_cri_type_input(cri_type, args, callerfunction = ''):
         :cri_type: 
             | dict with database of CRI model parameters.
     """
-    if isinstance(cri_type,str):
+    if isinstance(cri_type,CriSpec):
+        if not any([(args[x] is not None) for x in cri_type.keys() if x in args]):
+            return cri_type # compiled, nothing to overwrite
+    elif isinstance(cri_type,str):
         if (cri_type in _CRI_DEFAULTS['cri_types']):
             cri_type = _CRI_DEFAULTS[cri_type].copy()
         else:
@@ -179,3 +187,77 @@ def process_cri_type_input(cri_type, args, callerfunction = ''):
     cri_type = put_args_in_db(cri_type,args)
     return cri_type    
 
+
+#------------------------------------------------------------------------------
+class CriSpec(dict):
+    """
+    Compiled cri_type: dict with CRI model parameters (same keys as the 
+    entries in _CRI_DEFAULTS) with the sample set, CAT sensor matrix and 
+    color space function resolved once (use compile_cri_type() to create one).
+    
+    | Passing a CriSpec as :cri_type: to spd_to_jab_t_r(), spd_to_DEi(), 
+    | spd_to_rg(), spd_to_cri() (or the wrappers) skips the (re-)processing 
+    | of the cri_type dict, unless other non-None model parameters are given.
+    
+    Attributes:
+        :cspace_fcn:
+            | function handle: xyz_to_cspace(xyz, \*\*cspace_pars)
+        :cspace_pars:
+            | dict with color space parameters (cri_type['cspace'] without 'type')
+    """
+    def __init__(self, cri_type):
+        super().__init__(cri_type)
+        
+        # resolve sample set:
+        if isinstance(self['sampleset'],str):
+            self['sampleset'] = eval(self['sampleset'], {'_CRI_RFL' : _CRI_RFL})
+        
+        # resolve CAT sensor matrix:
+        if (self['catf'] is not None) and isinstance(self['catf'].get('mcat',None),str):
+            self['catf'] = dict(self['catf']) # don't write into the (shared) input dict
+            self['catf']['mcat'] = cat._MCATS[self['catf']['mcat']]
+        
+        # resolve color space function:
+        self.cspace_pars = self['cspace'].copy()
+        tf = self.cspace_pars.pop('type')
+        if ('>' not in tf) and ('xyz_to_' + tf in colortf.__globals__):
+            self.cspace_fcn = colortf.__globals__['xyz_to_' + tf]
+        else:
+            self.cspace_fcn = lambda xyz, **kwargs: colortf(xyz, tf = tf, fwtf = kwargs)
+            
+def compile_cri_type(cri_type = _CRI_TYPE_DEFAULT, sampleset = None, ref_type = None, 
+                     cieobs = None, avg = None, rf_from_avg_rounded_rfi = None, 
+                     scale = None, cspace = None, catf = None, rg_pars = None, 
+                     cri_specific_pars = None):
+    """
+    Compile a cri_type into a CriSpec with pre-resolved sample set, CAT 
+    sensor matrix and color space function, to minimize the per-call overhead 
+    of the cri functions (e.g. when calculating metrics for one spd at a time).
+    
+    Args:
+        :cri_type:
+            | _CRI_TYPE_DEFAULT or str or dict, optional
+            |   -'str: specifies dict with default cri model parameters 
+            |     (for supported types, see luxpy.cri._CRI_DEFAULTS['cri_types'])
+            |   - dict: user defined model parameters 
+            |     (see e.g. luxpy.cri._CRI_DEFAULTS['cierf'] 
+            |     for required structure)
+        :sampleset, ref_type, ..., cri_specific_pars:
+            | None, optional
+            | Non-None values override the corresponding keys in :cri_type:.
+            | (see e.g. luxpy.cri.spd_to_cri? for more info)
+            
+    Returns:
+        :cri_spec:
+            | CriSpec (dict) with compiled cri model parameters.
+            
+    Note:
+        The CriSpec holds a (deep) copy of the cri_type parameters, 
+        so later changes to _CRI_DEFAULTS do not affect it.
+    """
+    args = locals().copy()
+    cri_type = process_cri_type_input(cri_type, args, callerfunction = 'cri.compile_cri_type')
+    sampleset = cri_type['sampleset']
+    cri_type = copy.deepcopy({k : v for k, v in cri_type.items() if k != 'sampleset'}) 
+    cri_type['sampleset'] = sampleset # don't copy (large) sample set arrays
+    return CriSpec(cri_type)
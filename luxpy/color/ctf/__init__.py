@@ -47,6 +47,11 @@ Supported chromaticity / colorspace functions:
   |                   Y, dominant wavelength (dl) and excitation purity (ep)
   | * xyz_to_srgb(), srgb_to_xyz(): (X,Y,Z) <-> sRGB; (IEC:61966 sRGB)
 
+Direct chromaticity conversions (without going through XYZ; used by colortf()):
+  | * Yxy_to_Yuv(), Yuv_to_Yxy(): (Y,x,y) <-> CIE 1976 (Y,u',v')
+  | * Yxy_to_Yuv60(), Yuv60_to_Yxy(): (Y,x,y) <-> CIE 1960 (Y,u,v)
+  | * Yuv_to_Yuv60(), Yuv60_to_Yuv(): CIE 1976 (Y,u',v') <-> CIE 1960 (Y,u,v)
+
 colortf.py
 ----------
     
@@ -57,6 +62,10 @@ colortf.py
  :colortf(): Calculates conversion between any two color spaces (cspace)
              for which functions xyz_to_cspace() and cspace_to_xyz() are defined.
 
+ :compile_colortf(): Compile (and cache) the color transformation chain 
+                     used by colortf() into a single callable 
+                     (direct paths, folded linear 3x3 stages).
+
 
 
 References
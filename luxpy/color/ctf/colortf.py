@@ -26,20 +26,187 @@ Global internal variables:
                                 (equi-energy white) for color transformation 
                                 if none is supplied.
 
+ :_COLORTF_DIRECT_TFS: dict with direct transforms ('a','b') -> 'a_to_b' 
+                        that bypass the conversion to xyz in colortf().
+ 
+ :_COLORTF_MATRIX_TFS: dict with transforms that are linear (3x3 matrix) or 
+                       that start ('input') or end ('output') with a 3x3 matrix 
+                       (can be folded with neighbouring linear transforms).
+
 Functions:
 
  :colortf(): Calculates conversion between any two color spaces ('cspace')
               for which functions xyz_to_cspace() and cspace_to_xyz() are defined.
+              
+ :compile_colortf(): Compile (and cache) the color transformation chain 
+                     used by colortf() into a single callable.
 
 ===============================================================================
 """
+import copy
+import types
+import functools
 from luxpy import *
-from luxpy.utils import np
-__all__ = ['_COLORTF_DEFAULT_WHITE_POINT','colortf']
+from luxpy.utils import np, np2d
+__all__ = ['_COLORTF_DEFAULT_WHITE_POINT','colortf','compile_colortf']
 
 
 _COLORTF_DEFAULT_WHITE_POINT = np.array([100.0, 100.0, 100.0]) # ill. E white point
 
+_COLORTF_CACHE = {} # cache with compiled transformation chains (key: (tf, frozen fwtf, frozen bwtf))
+_COLORTF_CACHE_MAX_N = 256 # max. number of compiled transformation chains kept in cache
+_COLORTF_CACHE_MAX_ARRAY_SIZE = 4096 # kwargs with larger arrays are not hashed (chain is compiled, but not cached)
+
+# Direct transforms (bypass conversion to xyz):
+_COLORTF_DIRECT_TFS = {('Yxy','Yuv') : 'Yxy_to_Yuv', ('Yxy','Yuv76') : 'Yxy_to_Yuv',
+                       ('Yuv','Yxy') : 'Yuv_to_Yxy', ('Yuv76','Yxy') : 'Yuv_to_Yxy',
+                       ('Yxy','Yuv60') : 'Yxy_to_Yuv60', ('Yuv60','Yxy') : 'Yuv60_to_Yxy',
+                       ('Yuv','Yuv60') : 'Yuv_to_Yuv60', ('Yuv76','Yuv60') : 'Yuv_to_Yuv60',
+                       ('Yuv60','Yuv') : 'Yuv60_to_Yuv', ('Yuv60','Yuv76') : 'Yuv60_to_Yuv'}
+
+def _get_cmf_M(kw):
+    return kw['M'] if kw.get('M') is not None else _CMF[kw.get('cieobs', _CIEOBS)]['M']
+
+# Transforms with a 3x3 matrix that can be folded with that of a neighbouring linear transform: 
+#   name: (type, fcn returning effective matrix from kwargs, fcn returning kwargs that set the effective matrix)
+#   type: 'linear' (matrix only; None = identity), 'input' (matrix is applied first), 'output' (matrix is applied last)
+_COLORTF_MATRIX_TFS = {'xyz_to_xyz' : ('linear', lambda kw: None, None),
+                       'xyz_to_lms' : ('linear', lambda kw: _get_cmf_M(kw), None),
+                       'lms_to_xyz' : ('linear', lambda kw: np.linalg.inv(_get_cmf_M(kw)), None),
+                       'xyz_to_srgb' : ('input', lambda kw: kw['M'] if kw.get('M') is not None else _SRGB_M['xyz2rgb'], 
+                                        lambda kw, M: {**kw, 'M' : M}),
+                       'srgb_to_xyz' : ('output', lambda kw: np.linalg.inv(kw['M']) if kw.get('M') is not None else _SRGB_M['rgb2xyz'], 
+                                        lambda kw, M: {**kw, 'M' : np.linalg.inv(M)}),
+                       'xyz_to_Vrb_mb' : ('input', lambda kw: _get_cmf_M(kw), 
+                                          lambda kw, M: {**kw, 'M' : M}),
+                       'Vrb_mb_to_xyz' : ('output', lambda kw: _get_cmf_M(kw) if kw.get('Minverted', False) else np.linalg.inv(_get_cmf_M(kw)), 
+                                          lambda kw, M: {**kw, 'M' : M, 'Minverted' : True})}
+
+#------------------------------------------------------------------------------------------------
+def _freeze_kwargs(obj):
+    """
+    Convert (nested) kwargs into a hashable key. 
+    Raises TypeError for objects that can not be (safely) hashed by value.
+    """
+    if isinstance(obj, dict):
+        return ('__dict__',) + tuple(sorted((k, _freeze_kwargs(v)) for k, v in obj.items()))
+    elif isinstance(obj, (list, tuple)):
+        return ('__' + type(obj).__name__ + '__',) + tuple(_freeze_kwargs(v) for v in obj)
+    elif isinstance(obj, np.ndarray):
+        if (obj.dtype == object) | (obj.size > _COLORTF_CACHE_MAX_ARRAY_SIZE):
+            raise TypeError('Array can not be hashed by value.')
+        return ('__ndarray__', obj.dtype.str, obj.shape, obj.tobytes())
+    elif isinstance(obj, (str, bytes, int, float, complex, type(None), np.generic, 
+                          types.FunctionType, types.BuiltinFunctionType, type)):
+        return obj
+    else:
+        raise TypeError('Object of type {} can not be hashed by value.'.format(type(obj)))
+
+def _matmul3x3(M2, M1):
+    """ Matrix product M2 @ M1 (None = identity). """
+    if M1 is None: return M2
+    if M2 is None: return M1
+    return M2 @ M1
+
+def _apply_3x3(data, M = None):
+    """ Apply 3x3 matrix M (None = identity) to data (last axis). """
+    data = np2d(data)
+    return data if M is None else np.einsum('ij,...j->...i', M, data)
+
+def _compile_colortf(tf, fwtf, bwtf):
+    """
+    Compile color transformation chain specified by tf into a single callable:
+        1. direct transform if registered in _COLORTF_DIRECT_TFS,
+        2. else: cspace_to_xyz() followed by xyz_to_cspace(), with 
+        linear 3x3 stages folded into a single matrix (_COLORTF_MATRIX_TFS).
+    """
+    tf = tf.split('>')
+    if len(tf) == 1:
+        return functools.partial(globals()['{}_to_{}'.format('xyz', tf[0])], **fwtf)
+    
+    if (tf[0], tf[1]) in _COLORTF_DIRECT_TFS:
+        return functools.partial(globals()[_COLORTF_DIRECT_TFS[(tf[0], tf[1])]], **fwtf)
+    
+    bwname, fwname = '{}_to_{}'.format(tf[0], 'xyz'), '{}_to_{}'.format('xyz', tf[1])
+    bwfcn, fwfcn = globals()[bwname], globals()[fwname]
+    
+    # fold linear stages:
+    if (bwname in _COLORTF_MATRIX_TFS) & (fwname in _COLORTF_MATRIX_TFS):
+        bwtype, bwget, bwset = _COLORTF_MATRIX_TFS[bwname]
+        fwtype, fwget, fwset = _COLORTF_MATRIX_TFS[fwname]
+        if (bwtype == 'linear') & (fwtype == 'linear'):
+            return functools.partial(_apply_3x3, M = _matmul3x3(fwget(fwtf), bwget(bwtf)))
+        elif (bwtype == 'output') & (fwtype == 'linear'):
+            Mfw = fwget(fwtf)
+            if Mfw is None: 
+                return functools.partial(bwfcn, **bwtf)
+            return functools.partial(bwfcn, **bwset(bwtf, Mfw @ bwget(bwtf)))
+        elif (bwtype == 'linear') & (fwtype == 'input'):
+            Mbw = bwget(bwtf)
+            if Mbw is None: 
+                return functools.partial(fwfcn, **fwtf)
+            return functools.partial(fwfcn, **fwset(fwtf, fwget(fwtf) @ Mbw))
+    
+    return lambda data: fwfcn(bwfcn(data, **bwtf), **fwtf)
+
+def compile_colortf(tf = _CSPACE, fwtf = {}, bwtf = {}, cache = True, **kwargs):
+    """
+    Compile the color transformation chain specified by tf into a single callable.
+    
+    Args:
+        :tf: 
+            | _CSPACE or str specifying transform type, optional
+            |  (see colortf())
+        :fwtf: 
+            | dict with parameters (keys) and values required 
+            | by some color transformations for the forward transform: 
+            |  i.e. 'xyz>...'
+        :bwtf:
+            | dict with parameters (keys) and values required 
+            | by some color transformations for the backward transform: 
+            |  i.e. '...>xyz'
+        :cache:
+            | True, optional
+            | If True: cache the compiled callable by (tf, fwtf, bwtf).
+            
+    Returns:
+        :tf_fcn:
+            | callable: tf_fcn(data) returns data transformed to new color space
+    
+    Notes:
+        1. Transforms registered in _COLORTF_DIRECT_TFS (e.g. 'Yuv>Yxy') are
+        performed directly, without going through xyz.
+        2. Consecutive linear 3x3 stages (e.g. 'lms>xyz' followed by 'xyz>srgb')
+        are folded into a single matrix (see _COLORTF_MATRIX_TFS).
+        3. Parameters in fwtf and bwtf are bound (copied) at compile time. 
+        Parameters that can not be hashed by value (e.g. large arrays) 
+        disable caching for that call.
+        4. For the forward transform ('xyz>...'), one can input the keyword 
+        arguments directly without having to use the dict :fwtf: (should be empty!)
+    """
+    if not bool(fwtf):
+        fwtf = kwargs
+    
+    key = None
+    if cache:
+        try:
+            key = (tf, _freeze_kwargs(fwtf), _freeze_kwargs(bwtf))
+        except TypeError:
+            key = None
+        if key is not None:
+            tf_fcn = _COLORTF_CACHE.get(key)
+            if tf_fcn is not None:
+                return tf_fcn
+            fwtf, bwtf = copy.deepcopy(fwtf), copy.deepcopy(bwtf)
+    
+    tf_fcn = _compile_colortf(tf, fwtf, bwtf)
+    
+    if key is not None:
+        if len(_COLORTF_CACHE) >= _COLORTF_CACHE_MAX_N: 
+            _COLORTF_CACHE.pop(next(iter(_COLORTF_CACHE)))
+        _COLORTF_CACHE[key] = tf_fcn
+    return tf_fcn
+
 #------------------------------------------------------------------------------------------------
 def colortf(data, tf = _CSPACE, fwtf = {}, bwtf = {}, **kwargs):
     """
@@ -68,19 +235,12 @@ def colortf(data, tf = _CSPACE, fwtf = {}, bwtf = {}, **kwargs):
             | ndarray with data transformed to new color space
         
     Note:
-        For the forward transform ('xyz>...'), one can input the keyword 
+        1. For the forward transform ('xyz>...'), one can input the keyword 
         arguments specifying the transform parameters directly without having 
         to use the dict :fwtf: (should be empty!) 
         [i.e. kwargs overwrites empty fwtf dict]
+        2. The transformation chain is compiled (direct paths, folded linear
+        stages) and cached by compile_colortf(). Repeated calls with the same
+        tf and parameters only require a cache lookup.
     """
-    tf = tf.split('>')
-    if len(tf) == 1:
-        if not bool(fwtf):
-            fwtf = kwargs
-        return globals()['{}_to_{}'.format('xyz', tf[0])](data,**fwtf)
-    else:
-        if not bool(fwtf):
-            fwtf = kwargs
-        bwfcn = globals()['{}_to_{}'.format(tf[0], 'xyz')]
-        fwfcn = globals()['{}_to_{}'.format('xyz', tf[1])]
-        return fwfcn(bwfcn(data,**bwtf),**fwtf)   
+    return compile_colortf(tf, fwtf = fwtf, bwtf = bwtf, **kwargs)(data)
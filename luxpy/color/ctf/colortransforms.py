@@ -52,6 +52,11 @@ Supported chromaticity / colorspace functions:
   |                   Y, dominant wavelength (dl) and excitation purity (ep)
   | * xyz_to_srgb(), srgb_to_xyz(): (X,Y,Z) <-> sRGB; (IEC:61966 sRGB)
 
+Direct chromaticity conversions (without going through XYZ; used by colortf()):
+  | * Yxy_to_Yuv(), Yuv_to_Yxy(): (Y,x,y) <-> CIE 1976 (Y,u',v')
+  | * Yxy_to_Yuv60(), Yuv60_to_Yxy(): (Y,x,y) <-> CIE 1960 (Y,u,v)
+  | * Yuv_to_Yuv60(), Yuv60_to_Yuv(): CIE 1976 (Y,u',v') <-> CIE 1960 (Y,u,v)
+
 
 References
 ----------
@@ -76,7 +81,8 @@ from luxpy.utils import np, np2d, np2dT, np3d, todim, asplit, ajoin
 __all__ = ['_CSPACE_AXES', '_IPT_M','xyz_to_Yxy','Yxy_to_xyz','xyz_to_Yuv','Yuv_to_xyz',
            'xyz_to_Yuv76','Yuv76_to_xyz', 'xyz_to_Yuv60','Yuv60_to_xyz',
            'xyz_to_wuv','wuv_to_xyz','xyz_to_xyz','xyz_to_lms', 'lms_to_xyz','xyz_to_lab','lab_to_xyz','xyz_to_luv','luv_to_xyz',
-           'xyz_to_Vrb_mb','Vrb_mb_to_xyz','xyz_to_ipt','ipt_to_xyz','xyz_to_Ydlep','Ydlep_to_xyz','xyz_to_srgb','srgb_to_xyz']
+           'xyz_to_Vrb_mb','Vrb_mb_to_xyz','xyz_to_ipt','ipt_to_xyz','xyz_to_Ydlep','Ydlep_to_xyz','xyz_to_srgb','srgb_to_xyz',
+           '_SRGB_M','Yxy_to_Yuv','Yuv_to_Yxy','Yxy_to_Yuv60','Yuv60_to_Yxy','Yuv_to_Yuv60','Yuv60_to_Yuv']
 
 #------------------------------------------------------------------------------
 # Database with cspace-axis strings (for plotting):
@@ -97,6 +103,15 @@ _CSPACE_AXES['srgb'] = ['sR', 'sG','sB']
 # pre-calculate matrices for conversion of xyz to lms and back for use in xyz_to_ipt() and ipt_to_xyz():
 _IPT_M = {'lms2ipt': np.array([[0.4000,0.4000,0.2000],[4.4550,-4.8510,0.3960],[0.8056,0.3572,-1.1628]]),
                               'xyz2lms' : {x : math.normalize_3x3_matrix(_CMF[x]['M'],spd_to_xyz(_CIE_ILLUMINANTS['D65'],cieobs = x)) for x in sorted(_CMF['types'])}}
+
+# matrices for conversion of xyz to linear srgb and back for use in xyz_to_srgb() and srgb_to_xyz():
+_SRGB_M = {'xyz2rgb': np.array([[3.2404542, -1.5371385, -0.4985314],
+                                [-0.9692660,  1.8760108,  0.0415560],
+                                [0.0556434, -0.2040259,  1.0572252]]),
+           'rgb2xyz': np.array([[0.4124564,  0.3575761,  0.1804375],
+                                [0.2126729,  0.7151522,  0.0721750],
+                                [0.0193339,  0.1191920,  0.9503041]])} # pre-defined inverse for efficiency
+
 _COLORTF_DEFAULT_WHITE_POINT = np.array([[100.0, 100.0, 100.0]]) # ill. E white point
 
 #------------------------------------------------------------------------------
@@ -226,6 +241,117 @@ def Yuv60_to_xyz(Yuv60, **kwargs):
     return Yuv_to_xyz(Yuv,**kwargs)
 
 
+def Yxy_to_Yuv(Yxy, **kwargs):
+    """
+    Convert CIE Yxy chromaticity values to CIE 1976 Y,u',v' chromaticity values
+    (direct conversion, without going through XYZ).
+
+    Args:
+        :Yxy: 
+            | ndarray with Yxy chromaticity values
+            |  (Y value refers to luminance or luminance factor)
+
+    Returns:
+        :Yuv: 
+            | ndarray with CIE 1976 Y,u',v' chromaticity values
+    """
+    Yxy = np2d(Yxy)
+    Yuv = np.empty(Yxy.shape)
+    denom = -2.0*Yxy[...,1] + 12.0*Yxy[...,2] + 3.0
+    Yuv[...,0] = Yxy[...,0]
+    Yuv[...,1] = 4.0*Yxy[...,1] / denom
+    Yuv[...,2] = 9.0*Yxy[...,2] / denom
+    return Yuv
+
+def Yuv_to_Yxy(Yuv, **kwargs):
+    """
+    Convert CIE 1976 Y,u',v' chromaticity values to CIE Yxy chromaticity values
+    (direct conversion, without going through XYZ).
+
+    Args:
+        :Yuv: 
+            | ndarray with CIE 1976 Y,u',v' chromaticity values
+            |  (Y value refers to luminance or luminance factor)
+
+    Returns:
+        :Yxy: 
+            | ndarray with Yxy chromaticity values
+    """
+    Yuv = np2d(Yuv)
+    Yxy = np.empty(Yuv.shape)
+    denom = 6.0*Yuv[...,1] - 16.0*Yuv[...,2] + 12.0
+    Yxy[...,0] = Yuv[...,0]
+    Yxy[...,1] = 9.0*Yuv[...,1] / denom
+    Yxy[...,2] = 4.0*Yuv[...,2] / denom
+    return Yxy
+
+def Yxy_to_Yuv60(Yxy, **kwargs):
+    """
+    Convert CIE Yxy chromaticity values to CIE 1960 Y,u,v chromaticity values
+    (direct conversion, without going through XYZ).
+
+    Args:
+        :Yxy: 
+            | ndarray with Yxy chromaticity values
+            |  (Y value refers to luminance or luminance factor)
+
+    Returns:
+        :Yuv60: 
+            | ndarray with CIE 1960 Y,u,v chromaticity values
+    """
+    Yuv = Yxy_to_Yuv(Yxy)
+    Yuv[...,2] *= 2/3 
+    return Yuv
+
+def Yuv60_to_Yxy(Yuv60, **kwargs):
+    """
+    Convert CIE 1960 Y,u,v chromaticity values to CIE Yxy chromaticity values
+    (direct conversion, without going through XYZ).
+
+    Args:
+        :Yuv60: 
+            | ndarray with CIE 1960 Y,u,v chromaticity values
+            |  (Y value refers to luminance or luminance factor)
+
+    Returns:
+        :Yxy: 
+            | ndarray with Yxy chromaticity values
+    """
+    return Yuv_to_Yxy(Yuv60_to_Yuv(Yuv60))
+
+def Yuv_to_Yuv60(Yuv, **kwargs):
+    """
+    Convert CIE 1976 Y,u',v' chromaticity values to CIE 1960 Y,u,v chromaticity values.
+
+    Args:
+        :Yuv: 
+            | ndarray with CIE 1976 Y,u',v' chromaticity values
+
+    Returns:
+        :Yuv60: 
+            | ndarray with CIE 1960 Y,u,v chromaticity values
+    """
+    Yuv = np2d(Yuv).copy()
+    Yuv[...,2] *= 2/3 
+    return Yuv
+
+def Yuv60_to_Yuv(Yuv60, **kwargs):
+    """
+    Convert CIE 1960 Y,u,v chromaticity values to CIE 1976 Y,u',v' chromaticity values.
+
+    Args:
+        :Yuv60: 
+            | ndarray with CIE 1960 Y,u,v chromaticity values
+
+    Returns:
+        :Yuv: 
+            | ndarray with CIE 1976 Y,u',v' chromaticity values
+    """
+    Yuv = np2d(Yuv60).copy()
+    Yuv[...,2] *= 3/2 
+    return Yuv
+
+
 def xyz_to_wuv(xyz, xyzw = _COLORTF_DEFAULT_WHITE_POINT, **kwargs):
     """
     Convert XYZ tristimulus values CIE 1964 U*V*W* color space.
@@ -895,141 +1021,178 @@ def xyz_to_Ydlep_(xyz, cieobs = _CIEOBS, xyzw = _COLORTF_DEFAULT_WHITE_POINT, fl
         Ydlep = Ydlep.transpose((0,1,2))
     return Ydlep.reshape(xyz.shape)
 
-def xyz_to_Ydlep(xyz, cieobs = _CIEOBS, xyzw = _COLORTF_DEFAULT_WHITE_POINT, flip_axes = False, SL_max_lambda = None, **kwargs):
-    """
-    Convert XYZ tristimulus values to Y, dominant (complementary) wavelength
-    and excitation purity.
+_YDLEP_SL_CACHE = {} # cache with spectrum locus hue tables for xyz_to_Ydlep() and Ydlep_to_xyz()
+_YDLEP_SL_CACHE_MAX_N = 16 # max. number of (cieobs, xyzw, SL_max_lambda) combinations kept in cache
 
+def _get_Ydlep_spectrum_locus(cieobs = _CIEOBS, xyzw = _COLORTF_DEFAULT_WHITE_POINT, SL_max_lambda = None):
+    """
+    Get (cached) spectrum locus table, centered on the white point, 
+    for use in xyz_to_Ydlep() and Ydlep_to_xyz().
+    
     Args:
-        :xyz:
-            | ndarray with tristimulus values
-        :xyzw:
-            | None or ndarray with tristimulus values of a single (!) native white point, optional
-            | None defaults to xyz of CIE D65 using the :cieobs: observer.
         :cieobs:
             | luxpy._CIEOBS, optional
             | CMF set to use when calculating spectrum locus coordinates.
-        :flip_axes:
-            | False, optional
-            | If True: flip axis 0 and axis 1 in Ydelep to increase speed of loop in function.
-            |          (single xyzw with is not flipped!)
+        :xyzw:
+            | ndarray with tristimulus values of a single (!) white point, optional
         :SL_max_lambda:
             | None or float, optional
             | Maximum wavelength of spectrum locus before it turns back on itelf in the high wavelength range (~700 nm)
+    
     Returns:
-        :Ydlep: 
-            | ndarray with Y, dominant (complementary) wavelength
-            |  and excitation purity
+        :sl:
+            | dict with keys:
+            |  - 'wl': wavelengths of spectrum locus (monotonically increasing)
+            |  - 'x', 'y': chromaticity coordinates of spectrum locus, centered on white point
+            |  - 'h0': hue angle (°) of the shortest wavelength of the spectrum locus
+            |  - 'k': monotonically increasing hue key (°) of the spectrum locus: (h0 - h) % 360
+            |  - 'xypl1', 'xypl2': end points of purple line (centered on white point)
+            |  - 'Yxyw': Yxy of white point
+            
+    Notes:
+        1. The hue angle of the spectrum locus decreases with wavelength and 
+        wraps around 0°/360° in the orange-red region. The key (h0 - h) % 360
+        unwraps this into a monotone array that can be searched with
+        np.searchsorted(). Hues requiring a complementary wavelength 
+        (purple line) have a key larger than that of the longest wavelength.
+        2. Tables for string cieobs are cached per (cieobs, xyzw, SL_max_lambda).
     """
+    Yxyw = xyz_to_Yxy(np2d(np.asarray(xyzw, dtype = float)))
+    if Yxyw.shape[0] > 1:
+        raise Exception('xyz_to_Ydlep() / Ydlep_to_xyz(): xyzw must contain a single white point.')
     
-    xyz3 = np3d(xyz).copy().astype(float)
-
-    # flip axis so that shortest dim is on axis0 (save time in looping):
-    if (xyz3.shape[0] < xyz3.shape[1]) & (flip_axes == True):
-        axes12flipped = True
-        xyz3 = xyz3.transpose((1,0,2))
+    if isinstance(cieobs, str):
+        key = (cieobs, Yxyw.tobytes(), SL_max_lambda)
+        if key in _YDLEP_SL_CACHE: 
+            return _YDLEP_SL_CACHE[key]
     else:
-        axes12flipped = False
-
-    # convert xyz to Yxy:
-    Yxy = xyz_to_Yxy(xyz3)
-    Yxyw = xyz_to_Yxy(xyzw)
-
+        key = None
+    
     # get spectrum locus Y,x,y and wavelengths:
-    SL = _CMF[cieobs]['bar']
+    SL = _CMF[cieobs]['bar'] if isinstance(cieobs, str) else cieobs
     if np.isnan(SL).any(): SL = cie_interp(SL,SL[0],kind = 'cmf')
     SL = SL[:,SL[1:].sum(axis=0)>0] # avoid div by zero in xyz-to-Yxy conversion
     wlsl = SL[0]
-    Yxysl = xyz_to_Yxy(SL[1:4].T)[:,None]
+    Yxysl = xyz_to_Yxy(SL[1:4].T)
     
     # Get maximum wavelength of spectrum locus (before it turns back on itself)
     if SL_max_lambda is None:
-        pmaxlambda = Yxysl[...,1].argmax() # lambda with largest x value
-        dwl = np.diff(Yxysl[:,0,1]) # spectrumlocus in that range should have increasing x
+        dwl = np.diff(Yxysl[:,1]) # spectrumlocus in that range should have increasing x
         dwl[wlsl[:-1]<600] = 10000
-        pmaxlambda = np.where(dwl<=0)[0][0]  # Take first element with zero or <zero slope
+        pmaxlambda = np.where(dwl<=0)[0]
+        pmaxlambda = pmaxlambda[0] if pmaxlambda.size > 0 else (wlsl.shape[0] - 1) # Take first element with zero or <zero slope
     else:
         pmaxlambda = np.abs(wlsl - SL_max_lambda).argmin()
     Yxysl = Yxysl[:(pmaxlambda + 1),:]
     wlsl = wlsl[:(pmaxlambda + 1)]
 
     # center on xyzw:
-    Yxy = Yxy - Yxyw
-    Yxysl = Yxysl - Yxyw
-    Yxyw = Yxyw - Yxyw
-
-    #split:
-    Y, x, y = asplit(Yxy)
-    Yw,xw,yw = asplit(Yxyw)
-    Ysl,xsl,ysl = asplit(Yxysl)
-
-    # calculate hue:
-    h = math.positive_arctan(x,y, htype = 'deg')
-
+    xsl = Yxysl[:,1] - Yxyw[0,1]
+    ysl = Yxysl[:,2] - Yxyw[0,2]
+    
+    # unwrapped, monotone hue key:
     hsl = math.positive_arctan(xsl,ysl, htype = 'deg')
+    h0 = hsl[0] # max hue angle at min wavelength
+    ksl = np.maximum.accumulate((h0 - hsl) % 360.0) # guard against small loops in the locus at the spectrum ends
+    
+    sl = {'wl' : wlsl, 'x' : xsl, 'y' : ysl, 'h0' : h0, 'k' : ksl,
+          'xypl1' : np.array([xsl[0], ysl[0]]), 'xypl2' : np.array([xsl[-1], ysl[-1]]),
+          'Yxyw' : Yxyw}
+    
+    if key is not None:
+        if len(_YDLEP_SL_CACHE) >= _YDLEP_SL_CACHE_MAX_N: 
+            _YDLEP_SL_CACHE.pop(next(iter(_YDLEP_SL_CACHE)))
+        _YDLEP_SL_CACHE[key] = sl
+    return sl
 
-    hsl_max = hsl[0] # max hue angle at min wavelength
-    hsl_min = hsl[-1] # min hue angle at max wavelength
-    if hsl_min < hsl_max: hsl_min += 360
-
-    dominantwavelength = np.empty(Y.shape)
-    purity = np.empty(Y.shape)
-
-    for i in range(xyz3.shape[1]):
+def _get_purple_line_distance(x, y, xypl1, xypl2):
+    """
+    Get distance from white point (origin) to the intersection of 
+    the line through the white point and (x,y) with the purple line.
+    """
+    db = xypl2 - xypl1
+    denom = y*db[0] - x*db[1]
+    num = - (y*xypl1[0] - x*xypl1[1])
+    xy_linecross_x = (num/denom)*db[0] + xypl1[0]
+    xy_linecross_y = (num/denom)*db[1] + xypl1[1]
+    return (xy_linecross_x**2.0 + xy_linecross_y**2.0)**0.5
+
+def _get_enclosing_indices(a, v):
+    """
+    Get indices q1, q2 = q1 + 1 of elements in monotone array a enclosing values v 
+    (clipped to [0, a.shape[0]-1] for values outside of the range of a).
+    """
+    q1 = np.clip(np.searchsorted(a, v, side = 'right') - 1, 0, a.shape[0] - 2)
+    return q1, q1 + 1
 
-            # find index of complementary wavelengths/hues:
-            pc = np.where((h[:,i] > hsl_max) & (h[:,i] < hsl_min)) # hue's requiring complementary wavelength (purple line)
-            h[:,i][pc] = h[:,i][pc] - np.sign(h[:,i][pc] - 180.0)*180.0 # add/subtract 180° to get positive complementary wavelength
+def xyz_to_Ydlep(xyz, cieobs = _CIEOBS, xyzw = _COLORTF_DEFAULT_WHITE_POINT, flip_axes = False, SL_max_lambda = None, **kwargs):
+    """
+    Convert XYZ tristimulus values to Y, dominant (complementary) wavelength
+    and excitation purity.
 
-            # find 2 closest enclosing hues in sl:
-            #hslb,hib = meshblock(hsl,h[:,i:i+1])
-            hib,hslb = np.meshgrid(h[:,i:i+1],hsl)
-            dh = (hslb-hib)
-            q1 = np.abs(dh).argmin(axis=0) # index of closest hue
-            sign_q1 = np.sign(dh[q1])[0]
-            dh[np.sign(dh)== sign_q1] = 1000000 # set all dh on the same side as q1 to a very large value
-            q2 = np.abs(dh).argmin(axis=0) # index of second  closest (enclosing) hue
-           
-            # # Test changes to code:
-            # print('wls',i, wlsl[q1],wlsl[q2])
-            # import matplotlib.pyplot as plt
-            # plt.figure()
-            # plt.plot(wlsl[:-1],np.diff(xsl[:,0]),'k.-')
-            # plt.figure()
-            # plt.plot(x[0,i],y[0,i],'k.'); plt.plot(xsl,ysl,'r.-');plt.plot(xsl[q1],ysl[q1],'b.');plt.plot(xsl[q2],ysl[q2],'g.');plt.plot(xsl[-1],ysl[-1],'c+')
+    Args:
+        :xyz:
+            | ndarray with tristimulus values
+        :xyzw:
+            | None or ndarray with tristimulus values of a single (!) native white point, optional
+            | None defaults to xyz of CIE D65 using the :cieobs: observer.
+        :cieobs:
+            | luxpy._CIEOBS, optional
+            | CMF set to use when calculating spectrum locus coordinates.
+        :flip_axes:
+            | False, optional
+            | Kept for backward compatibility (calculation is fully vectorized, 
+            | so flipping axes no longer affects speed).
+        :SL_max_lambda:
+            | None or float, optional
+            | Maximum wavelength of spectrum locus before it turns back on itelf in the high wavelength range (~700 nm)
+    Returns:
+        :Ydlep: 
+            | ndarray with Y, dominant (complementary) wavelength
+            |  and excitation purity
             
-            dominantwavelength[:,i] = wlsl[q1] + np.multiply((h[:,i] - hsl[q1,0]),np.divide((wlsl[q2] - wlsl[q1]),(hsl[q2,0] - hsl[q1,0]))) # calculate wl corresponding to h: y = y1 + (x-x1)*(y2-y1)/(x2-x1)
-            dominantwavelength[:,i][pc] = - dominantwavelength[:,i][pc] #complementary wavelengths are specified by '-' sign
+    Note:
+        The spectrum locus hue table is cached per (cieobs, xyzw, SL_max_lambda)
+        and the enclosing spectrum locus wavelengths are found using np.searchsorted().
+    """
+    xyz = np.asarray(xyz, dtype = float)
+    xyz2 = xyz.reshape(-1,3)
+    
+    sl = _get_Ydlep_spectrum_locus(cieobs = cieobs, xyzw = xyzw, SL_max_lambda = SL_max_lambda)
+    wlsl, xsl, ysl, ksl = sl['wl'], sl['x'], sl['y'], sl['k']
 
-            # calculate excitation purity:
-            x_dom_wl = xsl[q1,0] + (xsl[q2,0] - xsl[q1,0])*(h[:,i] - hsl[q1,0])/(hsl[q2,0] - hsl[q1,0]) # calculate x of dom. wl
-            y_dom_wl = ysl[q1,0] + (ysl[q2,0] - ysl[q1,0])*(h[:,i] - hsl[q1,0])/(hsl[q2,0] - hsl[q1,0]) # calculate y of dom. wl
-            d_wl = (x_dom_wl**2.0 + y_dom_wl**2.0)**0.5 # distance from white point to sl
-            d = (x[:,i]**2.0 + y[:,i]**2.0)**0.5 # distance from white point to test point
-            purity[:,i] = d/d_wl
+    # convert xyz to Yxy and center on xyzw:
+    Yxy = xyz_to_Yxy(xyz2)
+    x = Yxy[:,1] - sl['Yxyw'][0,1]
+    y = Yxy[:,2] - sl['Yxyw'][0,2]
 
-            # correct for those test points that have a complementary wavelength
-            # calculate intersection of line through white point and test point and purple line:
-            xy = np.vstack((x[:,i],y[:,i])).T
-            xyw = np.hstack((xw,yw))
-            xypl1 = np.hstack((xsl[0,None],ysl[0,None]))
-            xypl2 = np.hstack((xsl[-1,None],ysl[-1,None]))
-            da = (xy-xyw)
-            db = (xypl2-xypl1)
-            dp = (xyw - xypl1)
-            T = np.array([[0.0, -1.0], [1.0, 0.0]])
-            dap = np.dot(da,T)
-            denom = np.sum(dap * db,axis=1,keepdims=True)
-            num = np.sum(dap * dp,axis=1,keepdims=True)
-            xy_linecross = (num/denom) *db + xypl1
-            d_linecross = np.atleast_2d((xy_linecross[:,0]**2.0 + xy_linecross[:,1]**2.0)**0.5).T#[0]
-            purity[:,i][pc] = d[pc]/d_linecross[pc][:,0]
-    Ydlep = np.dstack((xyz3[:,:,1],dominantwavelength,purity))
-
-    if axes12flipped == True:
-        Ydlep = Ydlep.transpose((1,0,2))
-    else:
-        Ydlep = Ydlep.transpose((0,1,2))
+    # calculate hue key:
+    h = math.positive_arctan(x,y, htype = 'deg')
+    k = (sl['h0'] - h) % 360.0
+    
+    # find complementary wavelengths/hues (purple line) and add/subtract 180° to get positive complementary wavelength:
+    pc = k > ksl[-1] 
+    h[pc] = h[pc] - np.sign(h[pc] - 180.0)*180.0 
+    k[pc] = (sl['h0'] - h[pc]) % 360.0
+
+    # find 2 enclosing hues in sl and calculate wl corresponding to h: y = y1 + (x-x1)*(y2-y1)/(x2-x1)
+    q1, q2 = _get_enclosing_indices(ksl, k)
+    f = (k - ksl[q1])/(ksl[q2] - ksl[q1])
+    dominantwavelength = wlsl[q1] + f*(wlsl[q2] - wlsl[q1])
+    dominantwavelength[pc] = - dominantwavelength[pc] #complementary wavelengths are specified by '-' sign
+
+    # calculate excitation purity:
+    x_dom_wl = xsl[q1] + f*(xsl[q2] - xsl[q1]) # calculate x of dom. wl
+    y_dom_wl = ysl[q1] + f*(ysl[q2] - ysl[q1]) # calculate y of dom. wl
+    d_wl = (x_dom_wl**2.0 + y_dom_wl**2.0)**0.5 # distance from white point to sl
+    d = (x**2.0 + y**2.0)**0.5 # distance from white point to test point
+    purity = d/d_wl
+
+    # correct for those test points that have a complementary wavelength
+    # (intersection of line through white point and test point with purple line):
+    purity[pc] = d[pc]/_get_purple_line_distance(x[pc], y[pc], sl['xypl1'], sl['xypl2'])
+    
+    Ydlep = np.hstack((xyz2[:,1:2], dominantwavelength[:,None], purity[:,None]))
     return Ydlep.reshape(xyz.shape)
 
 
@@ -1050,8 +1213,8 @@ def Ydlep_to_xyz(Ydlep, cieobs = _CIEOBS, xyzw = _COLORTF_DEFAULT_WHITE_POINT, f
             | CMF set to use when calculating spectrum locus coordinates.
         :flip_axes:
             | False, optional
-            | If True: flip axis 0 and axis 1 in Ydelep to increase speed of loop in function.
-            |          (single xyzw with is not flipped!)
+            | Kept for backward compatibility (calculation is fully vectorized, 
+            | so flipping axes no longer affects speed).
         :SL_max_lambda:
             | None or float, optional
             | Maximum wavelength of spectrum locus before it turns back on itelf in the high wavelength range (~700 nm)
@@ -1059,100 +1222,45 @@ def Ydlep_to_xyz(Ydlep, cieobs = _CIEOBS, xyzw = _COLORTF_DEFAULT_WHITE_POINT, f
     Returns:
         :xyz: 
             | ndarray with tristimulus values
+            
+    Note:
+        The spectrum locus table is cached per (cieobs, xyzw, SL_max_lambda)
+        and the enclosing spectrum locus wavelengths are found using np.searchsorted().
     """
-
-    Ydlep3 = np3d(Ydlep).copy().astype(float)
-
-    # flip axis so that longest dim is on first axis  (save time in looping):
-    if (Ydlep3.shape[0] < Ydlep3.shape[1]) & (flip_axes == True):
-        axes12flipped = True
-        Ydlep3 = Ydlep3.transpose((1,0,2))
-    else:
-        axes12flipped = False
-
-    # convert xyzw to Yxyw:
-    Yxyw = xyz_to_Yxy(xyzw)
-    Yxywo = Yxyw.copy()
-
-    # get spectrum locus Y,x,y and wavelengths:
-    SL = _CMF[cieobs]['bar']
-    if np.isnan(SL).any(): SL = cie_interp(SL,SL[0],kind = 'cmf')
-    SL = SL[:,SL[1:].sum(axis=0)>0] # avoid div by zero in xyz-to-Yxy conversion
-    wlsl = SL[0,None].T
-    Yxysl = xyz_to_Yxy(SL[1:4].T)[:,None]
+    Ydlep = np.asarray(Ydlep, dtype = float)
+    Ydlep2 = Ydlep.reshape(-1,3)
     
-    # Get maximum wavelength of spectrum locus (before it turns back on itself)
-    if SL_max_lambda is None:
-        pmaxlambda = Yxysl[...,1].argmax() # lambda with largest x value
-        dwl = np.diff(Yxysl[:,0,1]) # spectrumlocus in that range should have increasing x
-        dwl[wlsl[:-1,0]<600] = 10000
-        pmaxlambda = np.where(dwl<=0)[0][0]  # Take first element with zero or <zero slope
-    else:
-        pmaxlambda = np.abs(wlsl - SL_max_lambda).argmin()
-    Yxysl = Yxysl[:(pmaxlambda+1),:]
-    wlsl = wlsl[:(pmaxlambda+1),:1]
-
-    # center on xyzw:
-    Yxysl = Yxysl - Yxyw
-    Yxyw = Yxyw - Yxyw
+    sl = _get_Ydlep_spectrum_locus(cieobs = cieobs, xyzw = xyzw, SL_max_lambda = SL_max_lambda)
+    wlsl, xsl, ysl = sl['wl'], sl['x'], sl['y']
 
     #split:
-    Y, dom, pur = asplit(Ydlep3)
-    Yw,xw,yw = asplit(Yxyw)
-    Ywo,xwo,ywo = asplit(Yxywo)
-    Ysl,xsl,ysl = asplit(Yxysl)
-
-    # loop over longest dim:
-    x = np.empty(Y.shape)
-    y = np.empty(Y.shape)
-    for i in range(Ydlep3.shape[1]):
-
-        # find closest wl's to dom:
-        #wlslb,wlib = meshblock(wlsl,np.abs(dom[i,:])) #abs because dom<0--> complemtary wl
-        wlib,wlslb = np.meshgrid(np.abs(dom[:,i]),wlsl)
-
-        dwl = wlslb-wlib
-        q1 = np.abs(dwl).argmin(axis=0) # index of closest wl
-        sign_q1 = np.sign(dwl[q1])
-        dwl[np.sign(dwl) == sign_q1] = 1000000 # set all dwl on the same side as q1 to a very large value
-        q2 = np.abs(dwl).argmin(axis=0) # index of second closest (enclosing) wl
+    Y, dom, pur = Ydlep2[:,0], Ydlep2[:,1], Ydlep2[:,2]
+    
+    # find enclosing wl's of dom (abs because dom<0 --> complementary wl):
+    adom = np.abs(dom)
+    q1, q2 = _get_enclosing_indices(wlsl, adom)
         
-        # calculate x,y of dom:
-        x_dom_wl = xsl[q1,0] + (xsl[q2,0] - xsl[q1,0])*(np.abs(dom[:,i]) - wlsl[q1,0])/(wlsl[q2,0] - wlsl[q1,0]) # calculate x of dom. wl
-        y_dom_wl = ysl[q1,0] + (ysl[q2,0] - ysl[q1,0])*(np.abs(dom[:,i]) - wlsl[q1,0])/(wlsl[q2,0] - wlsl[q1,0]) # calculate y of dom. wl
-
-        # calculate x,y of test:
-        d_wl = (x_dom_wl**2.0 + y_dom_wl**2.0)**0.5 # distance from white point to dom
-        d = pur[:,i]*d_wl
-        hdom = math.positive_arctan(x_dom_wl,y_dom_wl,htype = 'deg')
-        x[:,i] = d*np.cos(hdom*np.pi/180.0)
-        y[:,i] = d*np.sin(hdom*np.pi/180.0)
-
-        # complementary:
-        pc = np.where(dom[:,i] < 0.0)
-        hdom[pc] = hdom[pc] - np.sign(dom[:,i][pc] - 180.0)*180.0 # get positive hue angle
-
-        # calculate intersection of line through white point and test point and purple line:
-        xy = np.vstack((x_dom_wl,y_dom_wl)).T
-        xyw = np.vstack((xw,yw)).T
-        xypl1 = np.vstack((xsl[0,None],ysl[0,None])).T
-        xypl2 = np.vstack((xsl[-1,None],ysl[-1,None])).T
-        da = (xy-xyw)
-        db = (xypl2-xypl1)
-        dp = (xyw - xypl1)
-        T = np.array([[0.0, -1.0], [1.0, 0.0]])
-        dap = np.dot(da,T)
-        denom = np.sum(dap * db,axis=1,keepdims=True)
-        num = np.sum(dap * dp,axis=1,keepdims=True)
-        xy_linecross = (num/denom) *db + xypl1
-        d_linecross = np.atleast_2d((xy_linecross[:,0]**2.0 + xy_linecross[:,1]**2.0)**0.5).T[:,0]
-        x[:,i][pc] = pur[:,i][pc]*d_linecross[pc]*np.cos(hdom[pc]*np.pi/180)
-        y[:,i][pc] = pur[:,i][pc]*d_linecross[pc]*np.sin(hdom[pc]*np.pi/180)
-    Yxy = np.dstack((Ydlep3[:,:,0],x + xwo, y + ywo))
-    if axes12flipped == True:
-        Yxy = Yxy.transpose((1,0,2))
-    else:
-        Yxy = Yxy.transpose((0,1,2))
+    # calculate x,y of dom:
+    f = (adom - wlsl[q1])/(wlsl[q2] - wlsl[q1])
+    x_dom_wl = xsl[q1] + f*(xsl[q2] - xsl[q1]) # calculate x of dom. wl
+    y_dom_wl = ysl[q1] + f*(ysl[q2] - ysl[q1]) # calculate y of dom. wl
+
+    # calculate x,y of test:
+    d_wl = (x_dom_wl**2.0 + y_dom_wl**2.0)**0.5 # distance from white point to dom
+    hdom = math.positive_arctan(x_dom_wl,y_dom_wl,htype = 'deg')
+    
+    # complementary: get hue angle opposite to that of dom:
+    pc = dom < 0.0
+    hdom[pc] = hdom[pc] + 180.0
+    
+    # distance from white point to test point 
+    # (complementary: along line through white point and dom to the purple line):
+    d = pur*d_wl
+    d[pc] = pur[pc]*_get_purple_line_distance(x_dom_wl[pc], y_dom_wl[pc], sl['xypl1'], sl['xypl2'])
+    x = d*np.cos(hdom*np.pi/180.0)
+    y = d*np.sin(hdom*np.pi/180.0)
+
+    Yxy = np.hstack((Y[:,None], x[:,None] + sl['Yxyw'][:,1:2], y[:,None] + sl['Yxyw'][:,2:3]))
     return Yxy_to_xyz(Yxy).reshape(Ydlep.shape)
 
 
@@ -1190,9 +1298,7 @@ def xyz_to_srgb(xyz, gamma = 2.4, offset = -0.055, use_linear_part = True, M = N
 
     # define 3x3 matrix
     if M is None:
-        M = np.array([[3.2404542, -1.5371385, -0.4985314],
-                      [-0.9692660,  1.8760108,  0.0415560],
-                      [0.0556434, -0.2040259,  1.0572252]])
+        M = _SRGB_M['xyz2rgb']
 
     if len(xyz.shape) == 3:
         srgb = np.einsum('ij,klj->kli', M, xyz/100)
@@ -1263,9 +1369,7 @@ def srgb_to_xyz(rgb, gamma = 2.4, offset = -0.055, use_linear_part = True, M = N
     if M is not None:
         M = np.linalg.inv(M)
     else:
-        M = np.array([[0.4124564,  0.3575761,  0.1804375],
-                      [0.2126729,  0.7151522,  0.0721750],
-                      [0.0193339,  0.1191920,  0.9503041]]) # use pre-defined inverse for efficiency
+        M = _SRGB_M['rgb2xyz'] # use pre-defined inverse for efficiency
         
         
     # scale device coordinates:
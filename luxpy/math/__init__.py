@@ -93,6 +93,10 @@ Module with useful math functions
  
  :fit_cov_ellipse(): Fit an covariance ellipse to supplied data points.
  
+ :interp1_sprague5(): Perform a 1-dimensional 5th order Sprague interpolation.
+ 
+ :interp1_sprague5_weights(): Get the (cached) weight matrix of a 1-dimensional 5th order Sprague interpolation.
+ 
  :interp1(): Perform a 1-dimensional linear interpolation (wrapper around scipy.interpolate.InterpolatedUnivariateSpline).
  
  :ndinterp1(): Perform n-dimensional interpolation using Delaunay triangulation.
@@ -87,6 +87,8 @@ Module with useful basic math functions
  
  :interp1_sprague5(): Perform a 1-dimensional 5th order Sprague interpolation.
  
+ :interp1_sprague5_weights(): Get the (cached) weight matrix of a 1-dimensional 5th order Sprague interpolation.
+ 
  :interp1(): Perform a 1-dimensional linear interpolation (wrapper around scipy.interpolate.InterpolatedUnivariateSpline).
  
  :ndinterp1(): Perform n-dimensional interpolation using Delaunay triangulation.
@@ -107,7 +109,8 @@ Module with useful basic math functions
 ===============================================================================
 """
 
-from luxpy.utils import np, sp, np2d, _EPS, asplit
+import hashlib
+from luxpy.utils import np, sp, np2d, _EPS, asplit, LRUCache
 from scipy.special import erf, erfinv
 from scipy import stats
 from scipy.interpolate import interp1d 
@@ -118,7 +121,7 @@ __all__  = ['normalize_3x3_matrix','symmM_to_posdefM','check_symmetric',
 __all__ += ['bvgpdf','mahalanobis2','dot23', 'rms','geomean','polyarea']
 __all__ += ['magnitude_v','angle_v1v2']
 __all__ += ['v_to_cik', 'cik_to_v', 'fmod', 'remove_outliers','fit_ellipse','fit_cov_ellipse']
-__all__ += ['in_hull','interp1_sprague5','interp1', 'ndinterp1','ndinterp1_scipy']
+__all__ += ['in_hull','interp1_sprague5','interp1_sprague5_weights','interp1', 'ndinterp1','ndinterp1_scipy']
 __all__ += ['box_m','pitman_morgan', 'stress','stress_F_test','mean_distance_weighted']
 
 
@@ -1058,6 +1061,73 @@ _SPRAGUE_COEFFICIENTS = np.array([
                                  [-24, 144, -367, 488, -540, 508],
                                  [-180, 1080, -2648, 3033, -1960, 884],
                                  ]).T / 209.0
+_SPRAGUE_POLYNOMIAL_COEFFICIENTS = np.array([ # rows: polynomial coefficients a0...a5; columns: weights of y[i-2]...y[i+3]
+                                            [0, 0, 24, 0, 0, 0],
+                                            [2, -16, 0, 16, -2, 0],
+                                            [-1, 16, -30, 16, -1, 0],
+                                            [-9, 39, -70, 66, -33, 7],
+                                            [13, -64, 126, -124, 61, -12],
+                                            [-5, 25, -50, 50, -25, 5],
+                                            ]) / 24.0
+_SPRAGUE5_WEIGHTS_CACHE = LRUCache(maxsize = 64, maxbytes = 64*1024**2)
+
+def interp1_sprague5_weights(x, xn):
+    """ 
+    Get the (cached) weight matrix of a 1-dimensional 5th order Sprague 
+    interpolation from equally spaced coordinates x to xn.
+    
+    Args:
+        :x:
+            | ndarray with equally spaced coordinates.
+        :xn:
+            | ndarray of new coordinates.
+            
+    Returns:
+        :W:
+            | read-only ndarray (.shape = (x.shape[0], xn.shape[0])) with the 
+            | interpolation weights: yn = y @ W (for y.shape = (..., x.shape[0])).
+            | Columns of W for xn outside [x[0], x[-1]] are zero.
+            
+    Note:
+        1. The weight matrix for a (x, xn) pair is calculated only once and cached,
+        | making the Sprague interpolation of a block of spectra a single matrix multiplication.
+    """
+    x = np.asarray(x, dtype = float)
+    xn = np.asarray(xn, dtype = float)
+    key = (x.shape[0], hashlib.sha1(np.ascontiguousarray(x).tobytes()).hexdigest(),
+           xn.shape[0], hashlib.sha1(np.ascontiguousarray(xn).tobytes()).hexdigest())
+    W = _SPRAGUE5_WEIGHTS_CACHE.get(key)
+    if W is None:
+        # Check equal x-spacing:
+        dx = np.diff(x)
+        if np.all(dx == dx[0]):
+            dx = dx[0] 
+        else:
+            raise Exception('Elements in x are not equally spaced!')
+        n = x.shape[0]
+        
+        # Matrix to extend y with the 2 additional elements (on each side) required for Sprague to work:
+        E = np.zeros((n + 4, n))
+        E[0,:6] = _SPRAGUE_COEFFICIENTS[:,0]
+        E[1,:6] = _SPRAGUE_COEFFICIENTS[:,1]
+        E[2:-2] = np.eye(n)
+        E[-2,-6:] = _SPRAGUE_COEFFICIENTS[:,2]
+        E[-1,-6:] = _SPRAGUE_COEFFICIENTS[:,3]
+        xe = np.hstack((x[0] - 2*dx, x[0] - dx, x, x[-1] + dx, x[-1] + 2*dx))
+        
+        # Weights of ye[i-2]...ye[i+3] for each xn in [x[0], x[-1]]:
+        inside = np.where((xn >= x[0]) & (xn <= x[-1]))[0]
+        i = np.searchsorted(xe, xn[inside]) - 1
+        X = (xn[inside] - xe[i]) / (xe[i + 1] - xe[i])
+        C = (X[:,None]**np.arange(6)) @ _SPRAGUE_POLYNOMIAL_COEFFICIENTS
+        
+        We = np.zeros((xn.shape[0], n + 4))
+        np.add.at(We, (np.repeat(inside, 6), ((i[:,None] + np.arange(-2,4)) % (n + 4)).ravel()), C.ravel())
+        W = (We @ E).T
+        W.flags.writeable = False
+        _SPRAGUE5_WEIGHTS_CACHE.put(key, W)
+    return W
+    
 def interp1_sprague5(x, y, xn, extrap = (np.nan, np.nan)):
     """ 
     Perform a 1-dimensional 5th order Sprague interpolation.
@@ -1077,9 +1147,16 @@ def interp1_sprague5(x, y, xn, extrap = (np.nan, np.nan)):
     Returns:
         :yn:
             | ndarray with values at new coordinates in xn.
+            
+    Note:
+        1. Interpolation is done by a matrix multiplication with the cached 
+        | weights of interp1_sprague5_weights(x, xn).
     """
+    y = np.atleast_2d(y)
+    inside = (xn>=x[0]) & (xn<=x[-1])
+    
     # Do extrapolation:
-    if ((xn<x[0]) | (xn>x[-1])).any(): # extrapolation needed !
+    if (~inside).any(): # extrapolation needed !
         if isinstance(extrap,tuple):
             if extrap[0] == extrap[1]: 
                 yne = np.ones((y.shape[0],len(xn)))*extrap[0]
@@ -1091,46 +1168,16 @@ def interp1_sprague5(x, y, xn, extrap = (np.nan, np.nan)):
             yne = interp1d(x, y, kind = extrap, bounds_error = False, fill_value = 'extrapolate')(xn)
         else:
             raise Exception('Invalid option for extrap argument. Only tuple and string allowed.')
-        xn_x = xn[(xn>=x[0]) & (xn<=x[-1])]
     else:
-        xn_x = xn
         yne = None
      
-    # Check equal x-spacing:
-    dx = np.diff(x)
-    if np.all(dx == dx[0]):
-        dx = dx[0] 
-    else:
-        raise Exception('Elements in x are not equally spaced!')
-        
-    # Extrapolate x, y with required additional elements for Sprague to work:
-    xe = np.hstack((x[0] - 2*dx, x[0] - dx, x, x[-1] + dx, x[-1] + 2*dx))
-    
-    y = np.atleast_2d(y)
-    ye1 = (y[:, :6] @ _SPRAGUE_COEFFICIENTS[:,0])[:,None]
-    ye2 = (y[:, :6] @ _SPRAGUE_COEFFICIENTS[:,1])[:,None]
-    ye3 = (y[:,-6:] @ _SPRAGUE_COEFFICIENTS[:,2])[:,None]
-    ye4 = (y[:,-6:] @ _SPRAGUE_COEFFICIENTS[:,3])[:,None]
-    ye = np.hstack((ye1,ye2,y,ye3,ye4)).T
-    
-    
-    # Evaluate at xn_x (no extrapolation!!):
-    i = np.searchsorted(xe, xn_x) - 1
-    X = np.atleast_2d((xn_x - xe[i]) / (xe[i + 1] - xe[i])).T
-
-    a0 = ye[i]
-    a1 = ((2 * ye[i - 2] - 16 * ye[i - 1] + 16 * ye[i + 1] - 2 * ye[i + 2]) / 24)  
-    a2 = ((-ye[i - 2] + 16 * ye[i - 1] - 30 * ye[i] + 16 * ye[i + 1] - ye[i + 2]) / 24) 
-    a3 = ((-9 * ye[i - 2] + 39 * ye[i - 1] - 70 * ye[i] + 66 * ye[i + 1] - 33 * ye[i + 2] + 7 * ye[i + 3]) / 24)
-    a4 = ((13 * ye[i - 2] - 64 * ye[i - 1] + 126 * ye[i] - 124 * ye[i + 1] + 61 * ye[i + 2] - 12 * ye[i + 3]) / 24)
-    a5 = ((-5 * ye[i - 2] + 25 * ye[i - 1] - 50 * ye[i] + 50 * ye[i + 1] - 25 * ye[i + 2] + 5 * ye[i + 3]) / 24)
-
-    yn = (a0 + a1*X + a2*X**2 + a3*X**3 + a4*X**4 + a5*X**5).T
+    # Evaluate at xn (no extrapolation!!):
+    yn = y @ interp1_sprague5_weights(x, xn)
     
     if yne is None:
         return yn
     else:
-        yne[:,(xn>=x[0]) & (xn<=x[-1])] = yn
+        yne[:,inside] = yn[:,inside]
         return yne
 
 #------------------------------------------------------------------------------
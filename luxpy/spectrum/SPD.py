@@ -347,7 +347,7 @@ class SPD:
                 | If :kind: is None, return original data.
                 | If :kind: is a spectrum type (see _INTERP_TYPES), the correct 
                 |     interpolation type if automatically chosen.
-                |       (The use of the slow(er) 'sprague5' can be toggled on using :sprague5_allowed:).
+                |       (The use of 'sprague5' can be toggled on using :sprague5_allowed:).
                 | If kind = 'auto': use self.dtype
                 | Or :kind: can be any interpolation type supported by 
                 |     scipy.interpolate.interp1d (luxpy.math.interp1 if nan's are present!!)
@@ -358,8 +358,7 @@ class SPD:
                 |    then a cubic spline interpolation will be used in case of 
                 |    unequal wavelength spacings, otherwise a 5th order Sprague will be used.
                 | If False: always use 'cubic', don't use 'sprague5'. 
-                |           This is the default, as differences are minimal and 
-                |           use of the 'sprague5' function is a lot slower!
+                |           This is the default, as differences are minimal.
             :negative_values_allowed:
                 | False, optional
                 | If False: negative values are clipped to zero
@@ -103,11 +103,18 @@ spectrum/spectral.py
         
  :vlbar(): Get Vlambda function.
  
+ :clear_cmf_cache(): Clear the cache with interpolated CMF and Vlambda sets.
+ 
+ :get_cmf_cache_info(): Get hit/miss statistics of the cache with interpolated CMF and Vlambda sets.
+ 
  :vlbar_cie_mesopic(): Get CIE mesopic luminous efficiency function Vmesm according to CIE191:2010
 
  :get_cie_mesopic_adaptation(): Get the mesopic adaptation state according to CIE191:2010
 
  :spd_to_xyz(): Calculates xyz tristimulus values from spectral data. 
+
+ :SpectralIntegrator: Class for fast repeated calculation of xyz tristimulus values 
+                      of spectral data on a fixed wavelength grid.
             
  :spd_to_ler():  Calculates Luminous efficacy of radiation (LER) 
                  from spectral data.
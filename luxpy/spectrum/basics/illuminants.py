@@ -112,8 +112,7 @@ def blackbody(cct, wl3 = None, n = None, relative = True):
     
     Args:
         :cct: 
-            | int or float 
-            | (for list of cct values, use cri_ref() with ref_type = 'BB')
+            | int or float or list of int/floats or ndarray (.shape = (N,))
         :wl3: 
             | None, optional
             | New wavelength range for interpolation. 
@@ -130,13 +129,13 @@ def blackbody(cct, wl3 = None, n = None, relative = True):
 
     Returns:
         :returns:
-            | ndarray with blackbody radiator spectrum
-            | (:returns:[0] contains wavelengths)
+            | ndarray with blackbody radiator spectra
+            | (.shape = (N + 1, number of wavelengths); :returns:[0] contains wavelengths)
             
     References:
         1. `CIE15:2018, “Colorimetry,” CIE, Vienna, Austria, 2018. <https://doi.org/10.25039/TR.015.2018>`_
     """
-    cct = float(cct)
+    cct = np.asarray(cct, dtype = float).reshape(-1,1)
     if wl3 is None: wl3 = _WL3 
     if n is None: n = _BB['n']
     wl = getwlr(wl3)
@@ -361,8 +360,7 @@ def daylightphase(cct, wl3 = None, nominal_cct = False, force_daylight_below4000
         
     Args:
         :cct: 
-            | int or float 
-            | (for list of cct values, use cri_ref() with ref_type = 'DL')
+            | int or float or list of int/floats or ndarray (.shape = (N,))
         :wl3: 
             | None, optional
             | New wavelength range for interpolation. 
@@ -402,8 +400,10 @@ def daylightphase(cct, wl3 = None, nominal_cct = False, force_daylight_below4000
 
     Returns:
         :returns: 
-            | ndarray with daylight phase spectrum
-            | (:returns:[0] contains wavelengths)
+            | ndarray with daylight phase spectra
+            | (.shape = (N + 1, number of wavelengths); :returns:[0] contains wavelengths)
+            | Spectra for cct < 4000 K are blackbody radiators, 
+            | unless :force_daylight_below4000K: is True.
 
     References:
         1. `CIE15:2018, “Colorimetry,” CIE, Vienna, Austria, 2018. <https://doi.org/10.25039/TR.015.2018>`_
@@ -413,43 +413,51 @@ def daylightphase(cct, wl3 = None, nominal_cct = False, force_daylight_below4000
         J. Opt. Soc. Am., 54(8), 1031–1040. 
         <https://doi.org/10.1364/JOSA.54.001031>`_
     """
-    cct = float(cct)
+    cct = np.asarray(cct, dtype = float).ravel()
     if wl3 is None: wl3 = _WL3 
-    if (cct < (4000.0)) & (force_daylight_below4000K == False):
+    wl = getwlr(wl3) 
+    
+    # daylight phase not defined below 4000 K: use blackbody radiator instead:
+    bb = (cct < (4000.0)) & (force_daylight_below4000K == False)
+    if bb.any():
         if verbosity is not None:
             print('Warning daylightphase spd not defined below 4000 K. Using blackbody radiator instead.')
-        return blackbody(cct,wl3, n = n)
+        if bb.all(): 
+            return blackbody(cct, wl3, n = n)
+        Sr = np.empty((cct.shape[0],wl.shape[0]))
+        Sr[bb] = blackbody(cct[bb], wl3, n = n)[1:]
+        Sr[~bb] = daylightphase(cct[~bb], wl3 = wl3, nominal_cct = nominal_cct, force_daylight_below4000K = force_daylight_below4000K, 
+                                n = n, cieobs = cieobs, daylight_locus = daylight_locus, daylight_Mi_coeffs = daylight_Mi_coeffs)[1:]
+        return np.vstack((wl,Sr))
+    
+    if nominal_cct: cct = cct*(1.4388/1.4380) # account for change in c2 in def. of Planckian
+    
+    #interpolate _S012_DAYLIGHTPHASE first to wl range:
+    if  not np.array_equal(_S012_DAYLIGHTPHASE[0],wl):
+        S012_daylightphase = cie_interp(data = _S012_DAYLIGHTPHASE, wl_new = wl, kind = 'linear',negative_values_allowed = True)
     else:
-        if nominal_cct: cct*=(1.4388/1.4380) # account for change in c2 in def. of Planckian
-
-        wl = getwlr(wl3) 
-        
-        #interpolate _S012_DAYLIGHTPHASE first to wl range:
-        if  not np.array_equal(_S012_DAYLIGHTPHASE[0],wl):
-            S012_daylightphase = cie_interp(data = _S012_DAYLIGHTPHASE, wl_new = wl, kind = 'linear',negative_values_allowed = True)
-        else:
-            S012_daylightphase = _S012_DAYLIGHTPHASE
+        S012_daylightphase = _S012_DAYLIGHTPHASE
 
-        # Get coordinates of daylight locus corresponding to cct:
-        xD, yD = daylightlocus(cct, force_daylight_below4000K = force_daylight_below4000K, cieobs = cieobs, daylight_locus = daylight_locus)
-        
-        # Get M1 & M2 component weights:
-        if (cieobs is None): # original M1,M2 for Si at 10 nm spacing and CIE 1931 xy
-            Mcoeffs = {'i':0.0241,'j':0.2562,'k':-0.7341,
-            'i1':-1.3515,'j1':-1.7703,'k1':5.9114,
-            'i2':0.0300,'j2':-31.4424,'k2':30.0717}
-        else:
-            Mcoeffs = daylight_Mi_coeffs
-        M1, M2, _ = _get_daylightphase_Mi_values(xD, yD, Mcoeffs = Mcoeffs, cieobs = cieobs, S012_daylightphase = S012_daylightphase) 
-        
-        # Calculate weigthed combination of S0, S1 & S2 components:
-        Sr = S012_daylightphase[1,:] + M1*S012_daylightphase[2,:] + M2*S012_daylightphase[3,:]
-        
-        # Normalize to 1 at (or near) 560 nm:
-        Sr560 = Sr[:,np.where(np.abs(S012_daylightphase[0,:] - 560.0) == np.min(np.abs(S012_daylightphase[0,:] - 560)))[0]]
-        Sr /= Sr560
-        Sr[Sr==float('NaN')] = 0
-        return np.vstack((wl,Sr))
+    # Get coordinates of daylight locus corresponding to cct:
+    xD, yD = daylightlocus(cct, force_daylight_below4000K = force_daylight_below4000K, cieobs = cieobs, daylight_locus = daylight_locus)
+    
+    # Get M1 & M2 component weights:
+    if (cieobs is None): # original M1,M2 for Si at 10 nm spacing and CIE 1931 xy
+        Mcoeffs = {'i':0.0241,'j':0.2562,'k':-0.7341,
+        'i1':-1.3515,'j1':-1.7703,'k1':5.9114,
+        'i2':0.0300,'j2':-31.4424,'k2':30.0717}
+    else:
+        Mcoeffs = daylight_Mi_coeffs
+    M1, M2, _ = _get_daylightphase_Mi_values(xD, yD, Mcoeffs = Mcoeffs, cieobs = cieobs, S012_daylightphase = S012_daylightphase) 
+    
+    # Calculate weigthed combination of S0, S1 & S2 components:
+    Sr = S012_daylightphase[1,:] + M1.T*S012_daylightphase[2,:] + M2.T*S012_daylightphase[3,:]
+    
+    # Normalize to 1 at (or near) 560 nm:
+    Sr560 = Sr[:,np.abs(S012_daylightphase[0,:] - 560.0).argmin()][:,None]
+    Sr /= Sr560
+    Sr[Sr==float('NaN')] = 0
+    return np.vstack((wl,Sr))
 
 def get_daylightloci_parameters(ccts = None, cieobs = None, wl3 = [300,830,10], verbosity = 0):
     """
@@ -483,12 +491,7 @@ def get_daylightloci_parameters(ccts = None, cieobs = None, wl3 = [300,830,10],
         
     # Get daylight phase spds using cieobs '1931_2':
     # wl3 = [300,830,10] # results in Judd's (1964) coefficients for the function yD(xD)x; other show slight deviations
-    for i, cct  in enumerate(ccts):
-        spd = daylightphase(cct, cieobs = None, wl3 = wl3, force_daylight_below4000K = False)
-        if i == 0:
-            spds = spd
-        else:
-            spds = np.vstack((spds,spd[1:]))
+    spds = daylightphase(ccts, cieobs = None, wl3 = wl3, force_daylight_below4000K = False)
             
     if verbosity > 0:
         fig,axs = plt.subplots(nrows = 2, ncols = len(_CMF['types']) - 2)   # -2: don't include scoptopic and dev observers     
@@ -546,6 +549,22 @@ _DAYLIGHT_LOCI_PARAMETERS = get_daylightloci_parameters(ccts = None, cieobs = No
 _DAYLIGHT_M12_COEFFS = get_daylightphase_Mi_coeffs(cieobs = None, wl3 = wl3)
 
 #------------------------------------------------------------------------------
+def _get_unique_params(params, index = None, N = None):
+    """
+    Get list of unique parameter values (strings, None or ndarrays) and 
+    an index array into that list (of size N, one for each cct in cri_ref()).
+    """
+    uparams, keys, iparams = [], {}, np.empty((len(params),), dtype = int)
+    for i, x in enumerate(params):
+        key = x if (x is None) | isinstance(x,str) else '__{:1.0f}'.format(i) # ndarrays are kept separate
+        if key not in keys:
+            keys[key] = len(uparams)
+            uparams.append(x)
+        iparams[i] = keys[key]
+    if index is None: 
+        index = np.zeros((N,), dtype = int) if (len(params) == 1) else np.arange(N)
+    return uparams, iparams[index]
+
 def cri_ref(ccts, wl3 = None, ref_type = _CRI_REF_TYPE, mix_range = None, 
             cieobs = None, cieobs_Y_normalization = None, 
             norm_type = None, norm_f = None, 
@@ -639,79 +658,78 @@ def cri_ref(ccts, wl3 = None, ref_type = _CRI_REF_TYPE, mix_range = None,
         return spd(ccts, wl = wl3, norm_type = norm_type, norm_f = norm_f)
 
     else:
-        if mix_range is not None: mix_range = np2d(mix_range)
-        if cieobs is not None: cieobs = np.atleast_1d(cieobs)
-        if cieobs_Y_normalization is not None: cieobs_Y_normalization = np.atleast_1d(cieobs_Y_normalization)
-
-        if not (isinstance(ref_type,list) | isinstance(ref_type,dict)): ref_type = [ref_type]
-   
-        for i in range(len(ccts)):
-            cct = ccts[i]
-
-            # get ref_type and mix_range:
-            if isinstance(ref_type,dict):
-                raise Exception("cri_ref(): dictionary ref_type: Not yet implemented")
-            else:
+        if isinstance(ref_type,dict):
+            raise Exception("cri_ref(): dictionary ref_type: Not yet implemented")
+            
+        ccts = np.asarray(ccts, dtype = float).ravel()
+        N = ccts.shape[0]
+        if wl3 is None: wl3 = _WL3 
+        wl = getwlr(wl3)
+        
+        # get ref_type, mix_range, cieobs and cieobs_Y_normalization for each cct:
+        ref_types = np.atleast_1d(ref_type)
+        ref_types, i_ref_types = np.unique(np.broadcast_to(ref_types, (N,)) if ref_types.shape[0] == 1 else ref_types[:N], return_inverse = True)
+        ref_types = [str(x) for x in ref_types]
 
-                ref_type_ = ref_type[i] if (len(ref_type)>1) else ref_type[0]
-
-                if mix_range is None:
-                    mix_range_ =  _CRI_REF_TYPES[ref_type_]['mix_range']
-                else:
-                    mix_range_ = mix_range[i] if (mix_range.shape[0]>1) else mix_range[0]  #must be np2d !!!            
-      
-                if cieobs is None:
-                    cieobs_ = _CRI_REF_TYPES[ref_type_]['cieobs']
-                else:
-                    cieobs_ = cieobs[i] if (cieobs.shape[0]>1) else cieobs[0]
-                    
-                if cieobs_Y_normalization is None:
-                    cieobs_Y_normalization_ = _CRI_REF_TYPES[ref_type_]['cieobs_Y_normalization']
-                else:
-                    cieobs_Y_normalization_ = cieobs_Y_normalization[i] if (cieobs_Y_normalization.shape[0]>1) else cieobs_Y_normalization[0]
-                    
-                if cieobs_Y_normalization_ is None: cieobs_Y_normalization_ = cieobs_
-                if cieobs_Y_normalization_ is None: cieobs_Y_normalization_ = _CIEOBS # cieobs_Y_normalization_ might still be None as cieobs_ == None results in specific use of fixed published coeff. in the calculation of the daylight phase, while a string will result in calculation of these coeff.
-                
-            if (mix_range_[0] == mix_range_[1]) | (ref_type_[0:2] == 'BB') | (ref_type_[0:2] == 'DL'):
-                if ((cct < mix_range_[0]) & (not (ref_type_[0:2] == 'DL'))) | (ref_type_[0:2] == 'BB'):
-                    Sr = blackbody(cct, wl3, n = n)
-                elif ((cct >= mix_range_[0]) & (not (ref_type_[0:2] == 'BB'))) | (ref_type_[0:2] == 'DL') :
-                    Sr = daylightphase(cct,wl3,force_daylight_below4000K = force_daylight_below4000K, cieobs = cieobs_, daylight_locus = daylight_locus)
-            else:
-                SrBB = blackbody(cct, wl3, n = n)
-                SrDL = daylightphase(cct,wl3,verbosity = None,force_daylight_below4000K = force_daylight_below4000K, cieobs = cieobs_, daylight_locus = daylight_locus)
-                
-                #cieobs_ = _CIEOBS if cieobs_ is None else cieobs_ # cieobs_ might still be None as that results in specific use of fixed published coeff. in the calculation of the daylight phase, while a string will result in calculation of these coeff.
-                
-                cmf = xyzbar(cieobs = cieobs_Y_normalization_, scr = 'dict', wl_new = wl3)
-                wl = SrBB[0]
-                ld = getwld(wl)
-
-                SrBB = 100.0*SrBB[1]/np.array(np.sum(SrBB[1]*cmf[2]*ld))
-                SrDL = 100.0*SrDL[1]/np.array(np.sum(SrDL[1]*cmf[2]*ld))
-                Tb, Te = float(mix_range_[0]), float(mix_range_[1])
-                cBB, cDL = (Te-cct)/(Te-Tb), (cct-Tb)/(Te-Tb)
-                if cBB < 0.0:
-                    cBB = 0.0
-                elif cBB > 1:
-                    cBB = 1.0
-                if cDL < 0.0:
-                    cDL = 0.0
-                elif cDL > 1:
-                    cDL = 1.0
-
-                Sr = SrBB*cBB + SrDL*cDL
-                Sr[Sr==float('NaN')] = 0.0
-                Sr560 = Sr[np.where(np.abs(wl - 560.0) == np.min(np.abs(wl - 560.0)))[0]]
-                Sr = np.vstack((wl,(Sr/Sr560)))
-                     
-            if i == 0:
-                Srs = Sr[1]
-            else:
-                Srs = np.vstack((Srs,Sr[1]))
+        if mix_range is None:
+            mix_range = np.array([_CRI_REF_TYPES[x]['mix_range'] for x in ref_types], dtype = float)[i_ref_types]
+        else:
+            mix_range = np2d(mix_range).astype(float)
+            mix_range = np.broadcast_to(mix_range, (N,2)) if (mix_range.shape[0] == 1) else mix_range[:N]
+        Tb, Te = mix_range[:,0], mix_range[:,1]
+        
+        if cieobs is None:
+            cieobs_, i_cieobs = _get_unique_params([_CRI_REF_TYPES[x]['cieobs'] for x in ref_types], i_ref_types)
+        else:
+            cieobs_, i_cieobs = _get_unique_params(np.atleast_1d(cieobs), N = N)
+            
+        if cieobs_Y_normalization is None:
+            cieobs_Y_normalization_, i_cieobs_Y = _get_unique_params([_CRI_REF_TYPES[x]['cieobs_Y_normalization'] for x in ref_types], i_ref_types)
+        else:
+            cieobs_Y_normalization_, i_cieobs_Y = _get_unique_params(np.atleast_1d(cieobs_Y_normalization), N = N)
+        
+        # cieobs_Y_normalization_ might still be None as cieobs_ == None results in specific use of fixed published coeff. in the calculation of the daylight phase, while a string will result in calculation of these coeff.
+        # -> fall back on cieobs_, or on _CIEOBS if that is also None:
+        is_None_Y = np.array([x is None for x in cieobs_Y_normalization_])[i_cieobs_Y]
+        i_cieobs_Y = np.where(is_None_Y, i_cieobs + len(cieobs_Y_normalization_), i_cieobs_Y)
+        cieobs_Y_normalization_ = list(cieobs_Y_normalization_) + [(_CIEOBS if x is None else x) for x in cieobs_]
+        
+        # Determine which ccts need a blackbody, a daylight phase or a mixed reference:
+        is_BB = np.array([x[0:2] == 'BB' for x in ref_types])[i_ref_types]
+        is_DL = np.array([x[0:2] == 'DL' for x in ref_types])[i_ref_types]
+        is_mixed = ~((Tb == Te) | is_BB | is_DL)
+        is_BB = (~is_mixed) & ((((ccts < Tb) & (~is_DL)) | is_BB))
+        is_DL = (~is_mixed) & (~is_BB)
+        
+        # Calculate all required blackbody and daylight phase spectra in one go:
+        Srs = np.empty((N, wl.shape[0]))
+        SrBB = np.empty((N, wl.shape[0]))
+        SrDL = np.empty((N, wl.shape[0]))
+        needs_BB = is_BB | is_mixed
+        if needs_BB.any(): 
+            SrBB[needs_BB] = blackbody(ccts[needs_BB], wl3, n = n)[1:]
+        needs_DL = is_DL | is_mixed
+        for i in np.unique(i_cieobs[needs_DL]):
+            c = needs_DL & (i_cieobs == i)
+            SrDL[c] = daylightphase(ccts[c], wl3, verbosity = None, force_daylight_below4000K = force_daylight_below4000K, cieobs = cieobs_[i], daylight_locus = daylight_locus)[1:]
+        Srs[is_BB] = SrBB[is_BB]
+        Srs[is_DL] = SrDL[is_DL]
+        
+        # Mix blackbody and daylight phase spectra after normalization to equal luminance:
+        if is_mixed.any():
+            ld = getwld(wl)
+            for i in np.unique(i_cieobs_Y[is_mixed]):
+                c = is_mixed & (i_cieobs_Y == i)
+                cmf = xyzbar(cieobs = cieobs_Y_normalization_[i], scr = 'dict', wl_new = wl)
+                SrBB[c] = 100.0*SrBB[c]/(SrBB[c] @ (cmf[2]*ld))[:,None]
+                SrDL[c] = 100.0*SrDL[c]/(SrDL[c] @ (cmf[2]*ld))[:,None]
+            T, Tb, Te = ccts[is_mixed,None], Tb[is_mixed,None], Te[is_mixed,None]
+            cBB = np.clip((Te - T)/(Te - Tb), 0.0, 1.0)
+            cDL = np.clip((T - Tb)/(Te - Tb), 0.0, 1.0)
+            Sr = SrBB[is_mixed]*cBB + SrDL[is_mixed]*cDL
+            Srs[is_mixed] = Sr/Sr[:,np.abs(wl - 560.0).argmin()][:,None]
                     
-        Srs = np.vstack((Sr[0],Srs))
+        Srs = np.vstack((wl,Srs))
 
         return  spd(Srs, wl = None, norm_type = norm_type, norm_f = norm_f)
     
@@ -56,11 +56,18 @@ Module supporting basic spectral calculations.
         
  :vlbar(): Get Vlambda function.
  
+ :clear_cmf_cache(): Clear the cache with interpolated CMF and Vlambda sets.
+ 
+ :get_cmf_cache_info(): Get hit/miss statistics of the cache with interpolated CMF and Vlambda sets.
+ 
  :vlbar_cie_mesopic(): Get CIE mesopic luminous efficiency function Vmesm according to CIE191:2010
 
  :get_cie_mesopic_adaptation(): Get the mesopic adaptation state according to CIE191:2010
 
  :spd_to_xyz(): Calculates xyz tristimulus values from spectral data. 
+ 
+ :SpectralIntegrator: Class for fast repeated calculation of xyz tristimulus values 
+                      of spectral data on a fixed wavelength grid.
             
  :spd_to_ler():  Calculates Luminous efficacy of radiation (LER) 
                  from spectral data.
@@ -85,15 +92,16 @@ References
 """
 
 #--------------------------------------------------------------------------------------------------
+import hashlib
 from luxpy import  _CIEOBS, math
-from luxpy.utils import np, pd, sp, plt, _PKG_PATH, _SEP, np2d, getdata, _EPS
+from luxpy.utils import np, pd, sp, plt, _PKG_PATH, _SEP, np2d, getdata, _EPS, LRUCache
 
 from .cmf import _CMF
-from scipy import signal
+from scipy import signal, sparse
 __all__ = ['_BB','_WL3','_INTERP_TYPES','_S_INTERP_TYPE', '_R_INTERP_TYPE','_C_INTERP_TYPE',
            'getwlr','getwld','spd_normalize','cie_interp','spd','xyzbar', 'vlbar', 
-           'vlbar_cie_mesopic', 'get_cie_mesopic_adaptation',
-           'spd_to_xyz', 'spd_to_ler', 'spd_to_power', 'detect_peakwl',
+           'clear_cmf_cache', 'get_cmf_cache_info', 'vlbar_cie_mesopic', 'get_cie_mesopic_adaptation',
+           'spd_to_xyz', 'SpectralIntegrator', 'spd_to_ler', 'spd_to_power', 'detect_peakwl',
            'create_spectral_interpolator','wls_shift']
 
 
@@ -114,6 +122,13 @@ _S_INTERP_TYPE = 'cubic' # -> cie_interp(): changeds this to Sprague5 for equal
 _R_INTERP_TYPE = 'cubic' # -> cie_interp(): changeds this to Sprague5 for equal wavelength spacings !
 _C_INTERP_TYPE = 'linear'
 
+#--------------------------------------------------------------------------------------------------
+# Cache with CMF and Vlambda sets interpolated to specific wavelength grids (see xyzbar(), vlbar()):
+_CMF_CACHE = LRUCache(maxsize = 64, maxbytes = 32*1024**2)
+
+# Cache with interpolation/extrapolation weight matrices for pairs of wavelength grids (see cie_interp()):
+_INTERP_WEIGHTS_CACHE = LRUCache(maxsize = 128, maxbytes = 64*1024**2)
+_INTERP_WEIGHTS_MAX_SIZE = 2**18 # max. number of elements of (dense) weight matrices built by interpolating an identity matrix (larger: interpolate directly)
 
 #--------------------------------------------------------------------------------------------------
 def getwlr(wl3 = None):
@@ -233,6 +248,176 @@ def spd_normalize(data, norm_type = None, norm_f = 1, wl = True, cieobs = _CIEOB
     return data
 
 
+#--------------------------------------------------------------------------------------------------
+def _wl_hash(wl):
+    """ Get a hashable key (size, sha1-digest) for a wavelength array. """
+    wl = np.ascontiguousarray(wl, dtype = float)
+    return (wl.shape[0], hashlib.sha1(wl.tobytes()).hexdigest())
+
+def _get_linear_interp_nodes(wl, wl_new, kind, extrap_kind):
+    """
+    Get the nodes (2 per wavelength in wl_new, found with np.searchsorted) 
+    and weights for a 'linear' or 'nearest' interpolation of spectra at 
+    wavelengths :wl: to :wl_new: (Si = S[:,i]*w_i + S[:,j]*w_j).
+    
+    | Wavelengths outside [wl[0], wl[-1]] get the 'linear' or 'nearest' 
+    | extrapolation weights (or zero weights when :extrap_kind: is None).
+    
+    Returns:
+        :i, j, w_i, w_j, outside:
+    """
+    n, n_new = wl.shape[0], wl_new.shape[0]
+    outside = (wl_new < wl[0]) | (wl_new > wl[-1])
+    
+    # index of lower node of segment for each wl_new (end segments for extrapolation):
+    i = np.clip(np.searchsorted(wl, wl_new, side = 'right') - 1, 0, max(n - 2, 0))
+    j = np.minimum(i + 1, n - 1)
+    w_j = np.divide(wl_new - wl[i], wl[j] - wl[i], out = np.zeros(n_new), where = (j != i))
+    if kind == 'nearest': # (ties go to the lower node, as in scipy.interpolate.interp1d)
+        w_j[~outside] = (w_j[~outside] > 0.5)*1.0
+    
+    # extrapolation weights:
+    if extrap_kind == 'nearest':
+        w_j[wl_new < wl[0]], w_j[wl_new > wl[-1]] = 0.0, 1.0
+    w_i = 1.0 - w_j
+    if extrap_kind is None:
+        w_i[outside], w_j[outside] = 0.0, 0.0
+    return i, j, w_i, w_j, outside
+
+def _get_sparse_interp_weights(wl, wl_new, kind, extrap_kind):
+    """
+    Build a sparse matrix (.shape = (wl.shape[0], wl_new.shape[0])) with 'linear' 
+    or 'nearest' interpolation weights (Si = S @ W). See _get_linear_interp_nodes().
+    """
+    i, j, w_i, w_j, outside = _get_linear_interp_nodes(wl, wl_new, kind, extrap_kind)
+    cols = np.arange(wl_new.shape[0])
+    W = sparse.csr_matrix((np.hstack((w_i, w_j)), (np.hstack((i, j)), np.hstack((cols, cols)))), shape = (wl.shape[0], wl_new.shape[0]))
+    W.eliminate_zeros()
+    return W, outside
+
+def _get_interp_weights(wl, wl_new, kind, extrap_kind, extrap_log = False):
+    """
+    Get cached interpolation and extrapolation weights to interpolate 
+    spectra at wavelengths :wl: to :wl_new:.
+    
+    | 'linear' and 'nearest' weights (with None, 'linear' or 'nearest' extrapolation)  
+    | are built directly as a sparse matrix. Weights for other kinds are 
+    | obtained by interpolating the columns of an identity matrix, but only 
+    | when the matrices are small (see _INTERP_WEIGHTS_MAX_SIZE).
+    
+    Args:
+        :wl, wl_new:
+            | ndarrays with old and new wavelengths.
+        :kind:
+            | Interpolation kind (for 'sprague5' the weights are obtained from luxpy.math.interp1_sprague5_weights()).
+        :extrap_kind:
+            | None or extrapolation kind.
+            | If None: no extrapolation weights are calculated.
+        :extrap_log:
+            | False, optional
+            | If True: extrapolation weights are kept separately in W_ext 
+            | (they are to be applied to the log of the spectral values).
+        
+    Returns:
+        :weights:
+            | None (weights too expensive to build: interpolate directly) 
+            | or tuple (W, W_ext, outside) with:
+            |   - W: ndarray or scipy.sparse.csr_matrix (.shape = (wl.shape[0], wl_new.shape[0]))
+            |        with weights (Si = S @ W). Columns of wavelengths outside [wl[0], wl[-1]] 
+            |        contain the extrapolation weights (or zeros when W_ext is not None). 
+            |   - W_ext: None or ndarray or scipy.sparse.csr_matrix 
+            |        (.shape = (wl.shape[0], number of wl_new outside [wl[0], wl[-1]]))
+            |        with extrapolation weights for the log of the spectral values.
+            |   - outside: ndarray with bools marking the wavelengths in wl_new outside [wl[0], wl[-1]].
+    """
+    key = ('cie_interp', kind, extrap_kind, extrap_log) + _wl_hash(wl) + _wl_hash(wl_new)
+    weights = _INTERP_WEIGHTS_CACHE.get(key)
+    if weights is None:
+        n = wl.shape[0]
+        if (kind in ('linear','nearest')) & (extrap_kind in (None, 'linear', 'nearest')) & (n > 1):
+            W, outside = _get_sparse_interp_weights(wl, wl_new, kind, None if extrap_log else extrap_kind)
+            W_ext = None
+            if extrap_log & (extrap_kind is not None) & outside.any():
+                W_ext = _get_sparse_interp_weights(wl, wl_new[outside], extrap_kind, extrap_kind)[0]
+        elif (n*max(n, wl_new.shape[0]) <= _INTERP_WEIGHTS_MAX_SIZE):
+            I = np.eye(n)
+            outside = (wl_new < wl[0]) | (wl_new > wl[-1])
+            if kind == 'sprague5':
+                W = math.interp1_sprague5_weights(wl, wl_new).copy()
+            else:
+                W = sp.interpolate.interp1d(wl, I, kind = kind, bounds_error = False, fill_value = (0,0))(wl_new)
+            W_ext = None
+            if (extrap_kind is not None) & outside.any():
+                W_ext = sp.interpolate.interp1d(wl, I, kind = extrap_kind, bounds_error = False, fill_value = 'extrapolate')(wl_new[outside])
+            W[:,outside] = 0.0 if ((W_ext is None) | extrap_log) else W_ext
+            if not extrap_log: W_ext = None
+        else:
+            return None
+        weights = _INTERP_WEIGHTS_CACHE.put(key, (W, W_ext, outside))
+    return weights
+
+def _interp_direct(S, wl, wl_new, kind, method = 'interp1d'):
+    """
+    Interpolate spectra S (no NaN's) at wavelengths wl to wl_new without weight 
+    matrices (values outside [wl[0], wl[-1]] are set to zero).
+    """
+    if kind in ('linear', 'nearest'):
+        i, j, w_i, w_j, _ = _get_linear_interp_nodes(wl, wl_new, kind, None)
+        return S[:,i]*w_i + S[:,j]*w_j
+    elif kind == 'sprague5':
+        return math.interp1_sprague5(wl, S, wl_new, extrap = (0,0))
+    elif method == 'interp1d':
+        return sp.interpolate.interp1d(wl, S, kind = kind, bounds_error = False, fill_value = (0,0))(wl_new)
+    else:
+        Si = np.array([math.interp1(wl, S_i, wl_new, kind = kind, ext = 'extrapolate') for S_i in S])
+        Si[:,(wl_new < wl[0]) | (wl_new > wl[-1])] = 0.0
+        return Si
+
+def _extrap_direct(S, wl, wl_out, extrap_kind, method = 'interp1d'):
+    """
+    Extrapolate spectra S (no NaN's) at wavelengths wl to wl_out 
+    (outside [wl[0], wl[-1]]) without weight matrices.
+    """
+    if extrap_kind in ('linear', 'nearest'):
+        i, j, w_i, w_j, _ = _get_linear_interp_nodes(wl, wl_out, extrap_kind, extrap_kind)
+        return S[:,i]*w_i + S[:,j]*w_j
+    elif method == 'interp1d':
+        return sp.interpolate.interp1d(wl, S, kind = extrap_kind, bounds_error = False, fill_value = 'extrapolate')(wl_out)
+    else:
+        return np.array([math.interp1(wl, S_i, wl_out, kind = extrap_kind, ext = 'extrapolate') for S_i in S])
+
+def _interp_block(S, wl, wl_new, kind, extrap_kind, extrap_values, extrap_log, method = 'interp1d', use_weights = True):
+    """
+    Interpolate a block of spectra S (no NaN's) at wavelengths wl to wl_new
+    (extrapolate using :extrap_kind: or, if None, fill with :extrap_values:).
+    
+    | If :use_weights: and the weights are cheap to build, the block is interpolated 
+    | with cached weight matrices (see _get_interp_weights()), otherwise it is 
+    | interpolated directly using :method: ('interp1d': scipy.interpolate.interp1d,
+    | 'interp1': luxpy.math.interp1; 'linear' and 'nearest' are always done with numpy).
+    """
+    weights = _get_interp_weights(wl, wl_new, kind, extrap_kind, extrap_log = extrap_log) if use_weights else None
+    if weights is not None:
+        W, W_ext, outside = weights
+        Si = (W.T @ S.T).T if sparse.issparse(W) else S @ W
+        if W_ext is not None: 
+            S_log = np.log(S + _EPS)
+            Si[:,outside] = np.exp((W_ext.T @ S_log.T).T if sparse.issparse(W_ext) else S_log @ W_ext)
+    else:
+        outside = (wl_new < wl[0]) | (wl_new > wl[-1])
+        Si = _interp_direct(S, wl, wl_new, kind, method = method)
+        if (extrap_kind is not None) & outside.any():
+            if extrap_log:
+                Si[:,outside] = np.exp(_extrap_direct(np.log(S + _EPS), wl, wl_new[outside], extrap_kind, method = method))
+            else:
+                Si[:,outside] = _extrap_direct(S, wl, wl_new[outside], extrap_kind, method = method)
+    
+    # fill:
+    if extrap_kind is None:
+        Si[:,wl_new < wl[0]] = extrap_values[0]
+        Si[:,wl_new > wl[-1]] = extrap_values[-1]
+    return Si
+
 #--------------------------------------------------------------------------------------------------
 def cie_interp(data, wl_new, kind = None, sprague5_allowed = False, negative_values_allowed = False,
                extrap_values = 'ext', extrap_kind = 'linear', extrap_log = False):
@@ -252,18 +437,19 @@ def cie_interp(data, wl_new, kind = None, sprague5_allowed = False, negative_val
             |   - If :kind: is None, return original data.
             |   - If :kind: is a spectrum type (see _INTERP_TYPES), the correct 
             |     interpolation type is automatically chosen 
-            |       (The use of the slow(er) 'sprague5' can be toggled on using :sprague5_allowed:).
+            |       (The use of 'sprague5' can be toggled on using :sprague5_allowed:).
             |   - Or :kind: can be any interpolation type supported by 
             |     scipy.interpolate.interp1d (or luxpy.math.interp1 if nan's are present!!)
-            |     or can be 'sprague5' (uses luxpy.math.interp1_sprague5).  
+            |     or can be 'sprague5' (uses luxpy.math.interp1_sprague5_weights).  
         :sprague5_allowed:
             | False, optional
             | If True: When kind is a spectral data type from _INTERP_TYPES['cubic'],
             |    then a cubic spline interpolation will be used in case of 
             |    unequal wavelength spacings, otherwise a 5th order Sprague will be used.
             | If False: always use 'cubic', don't use 'sprague5'. 
-            |           This is the default, as differences are minimal and 
-            |           use of the 'sprague5' function is a lot slower!
+            |           This is the default, as differences are minimal. 
+            |           ('sprague5' uses the cached weight matrices of 
+            |           luxpy.math.interp1_sprague5_weights().)
         :negative_values_allowed: 
             | False, optional
             | If False: negative values are clipped to zero.
@@ -309,6 +495,12 @@ def cie_interp(data, wl_new, kind = None, sprague5_allowed = False, negative_val
         |       is likely a more suitable recommendation. When using a 1 nm spacing
         |       'linear' is more similar to 'quadratic' when :extrap_log: is False, otherwise 'linear'
         |       remains the 'best'. Hence the choice to use the CIE167:2005 recommended linear extrapolation as default!
+        | 2. For 'linear' and 'nearest' interpolation (and for other kinds when 
+        |       the wavelength grids are small) the interpolation and extrapolation 
+        |       weights for a (wl, wl_new, kind, extrap_kind) combination are calculated 
+        |       once and cached. All spectra (or all spectra with the same NaN-mask) are 
+        |       then interpolated with a single matrix multiplication. Otherwise 
+        |       spectra are interpolated directly.
     """
     if (kind is not None):
         # Wavelength definition:
@@ -346,85 +538,42 @@ def cie_interp(data, wl_new, kind = None, sprague5_allowed = False, negative_val
             # Interpolate each spectrum in S: 
             N = S.shape[0]
             nan_indices = np.isnan(S)
+            do_ext = (extrap_values[0] is None) | (((type(extrap_values[0])==np.str_)|(type(extrap_values[0])==str)) and (extrap_values[0][:3]=='ext'))
             
             # Interpolate all spectra:
-            all_rows = np.arange(S.shape[0])
-            rows_with_nans = np.where(nan_indices.sum(axis=1))[0]
-            rows_with_no_nans = np.setdiff1d(all_rows,rows_with_nans)
-            # rows_with_no_nans = np.where(~np.isnan(S.sum(axis=1)))
-
-            Si = np.zeros([N,wl_new.shape[0]])
-            Si.fill(np.nan)
-            if (rows_with_no_nans.size>0): 
-
-                S_no_nans = S[rows_with_no_nans]
-
-                # prepare + do 'ext' extrapolation:
-                if (extrap_values[0] is None) | (((type(extrap_values[0])==np.str_)|(type(extrap_values[0])==str)) and (extrap_values[0][:3]=='ext')): 
-                    fill_value = (0,0)
-                    if extrap_log:
-                        Si_ext_no_nans = np.exp(np.atleast_2d(sp.interpolate.interp1d(wl, np.log(S_no_nans + _EPS), kind = extrapolation_kind, bounds_error = False, fill_value = 'extrapolate')(wl_new)))
-                    else:
-                        Si_ext_no_nans = np.atleast_2d(sp.interpolate.interp1d(wl, S_no_nans, kind = extrapolation_kind, bounds_error = False, fill_value = 'extrapolate')(wl_new))
-                else:
-                    fill_value, Si_ext_no_nans = (extrap_values[0],extrap_values[-1]), None
-
-                # interpolate:
-                if kind != 'sprague5':
-                    Si_no_nans = sp.interpolate.interp1d(wl, S_no_nans, kind = kind, bounds_error = False, fill_value = fill_value)(wl_new)
-                else:
-                    Si_no_nans = math.interp1_sprague5(wl, S_no_nans, wl_new, extrap = fill_value)
-
-                # Add extrapolated part to the interpolate part (which had extrapolated fill values set to zero)
-                if Si_ext_no_nans is not None: 
-                    Si_ext_no_nans[:,(wl_new >= wl[0]) & (wl_new <= wl[-1])] = 0
-                    Si_no_nans += Si_ext_no_nans
-                
-                Si[rows_with_no_nans] = Si_no_nans
+            rows_with_nans = np.where(nan_indices.any(axis=1))[0]
+
+            if (rows_with_nans.size == 0):
+                Si = _interp_block(S, wl, wl_new, kind, extrapolation_kind if do_ext else None, 
+                                   None if do_ext else extrap_values, extrap_log, method = 'interp1d')
+            else:
+                Si = np.full([N,wl_new.shape[0]], np.nan)
+            if (rows_with_nans.size > 0) & (rows_with_nans.size < N):
+                rows_with_no_nans = np.where(~nan_indices.any(axis=1))[0]
+                Si[rows_with_no_nans] = _interp_block(S[rows_with_no_nans], wl, wl_new, kind, extrapolation_kind if do_ext else None, 
+                                                      None if do_ext else extrap_values, extrap_log, method = 'interp1d')
                 
             # In case there are NaN's:
             if rows_with_nans.size > 0:
-
-                # looping required as some values are NaN's:
-                for i in rows_with_nans:
-
-                    nonan_indices = np.logical_not(nan_indices[i])
+                
+                # process rows with identical nan-masks together:
+                nan_masks, group_indices = np.unique(nan_indices[rows_with_nans], axis = 0, return_inverse = True)
+                for j in range(nan_masks.shape[0]):
+                    
+                    nonan_indices = np.logical_not(nan_masks[j])
+                    if not nonan_indices.any(): continue # keep all-NaN spectra as NaN
+                    rows = rows_with_nans[group_indices.ravel() == j]
                     wl_nonan = wl[nonan_indices]
-                    S_i_nonan = S[i][nonan_indices]
                     
-                    if (kind != 'sprague5'): 
-                        Si_nonan = math.interp1(wl_nonan, S_i_nonan, wl_new, kind = kind, ext = 'extrapolate')
-#                       Si_nonan = sp.interpolate.interp1d(wl_nonan, S_i_nonan, kind = kind, bounds_error = False, fill_value = 'extrapolate')(wl_new)
-                    else:
+                    kind_nonan = kind
+                    if (kind == 'sprague5'): 
                         # check wavelength spacing constancy:
                         dwl_nonan = np.diff(wl_nonan)
-                        if np.all(dwl_nonan == dwl_nonan[0]):
-                            Si_nonan = math.interp1_sprague5(wl_nonan, S_i_nonan, wl_new, extrap = (0,0))
-                        else:
-                            # fall back to 'cubic interpolation!:
-                            Si_nonan = math.interp1(wl_nonan, S_i_nonan, wl_new, kind = 'cubic', ext = 'extrapolate')
-  
-                    # Do extrapolation:
-                    if (extrap_values[0] is None) | (((type(extrap_values[0])==np.str_)|(type(extrap_values[0])==str)) and (extrap_values[0][:3]=='ext')): 
-                        if extrapolation_kind != 'nearest':
-                            if extrap_log:
-                                Si_nonan_ext = np.exp(math.interp1(wl_nonan,np.log(S_i_nonan + _EPS), wl_new, kind = extrapolation_kind, ext = 'extrapolate'))
-                            else:
-                                Si_nonan_ext = math.interp1(wl_nonan,S_i_nonan, wl_new, kind = extrapolation_kind, ext = 'extrapolate')
-                        else: # do nearest neighbour extrapolation
-                            Si_nonan_ext = np.zeros((wl_new.size))
-                            Si_nonan_ext[wl_new<wl_nonan[0]] = S_i_nonan[0]
-                            Si_nonan_ext[wl_new>wl_nonan[-1]] = S_i_nonan[-1]
-                        Si_nonan_ext[(wl_new >= wl_nonan[0]) & (wl_new <= wl_nonan[-1])] = 0
-                        Si_nonan[(wl_new<wl_nonan[0]) | (wl_new>wl_nonan[-1])] = 0
-                        Si_nonan = Si_nonan + Si_nonan_ext
-
-                    else:
-                        Si_nonan[wl_new<wl_nonan[0]] = extrap_values[0]
-                        Si_nonan[wl_new>wl_nonan[-1]] = extrap_values[-1]  
+                        if not np.all(dwl_nonan == dwl_nonan[0]):
+                            kind_nonan = 'cubic' # fall back to 'cubic interpolation!
                     
-                    # add to array:
-                    Si[i] = Si_nonan              
+                    Si[rows] = _interp_block(S[rows][:,nonan_indices], wl_nonan, wl_new, kind_nonan, extrapolation_kind if do_ext else None, 
+                                             None if do_ext else extrap_values, extrap_log, method = 'interp1', use_weights = False)
                 
             # No negative values allowed for spectra:    
             if negative_values_allowed == False:
@@ -562,6 +711,12 @@ def xyzbar(cieobs = _CIEOBS, scr = 'dict', wl_new = None, kind = 'np', extrap_va
     Returns:
         :returns: 
             | ndarray or pandas.dataframe with CMFs 
+            
+    Note:
+        1. For :scr: == 'dict' and :kind: == 'np', the interpolated CMFs are 
+        | cached (see clear_cmf_cache() and get_cmf_cache_info()) 
+        | and returned as a read-only ndarray. Use .copy() when 
+        | the CMFs need to be modified.
         
             
     References:
@@ -574,6 +729,8 @@ def xyzbar(cieobs = _CIEOBS, scr = 'dict', wl_new = None, kind = 'np', extrap_va
     elif scr == 'cieobs':
         dict_or_file = cieobs #can be file or data itselfµ
     if extrap_values is None: extrap_values = (np.nan, np.nan)
+    if (scr == 'dict') & (kind == 'np'):
+        return _get_cached_cmf('xyzbar', cieobs, dict_or_file, wl_new, extrap_values)
     return spd(data = dict_or_file, wl = wl_new, interpolation = 'cmf', kind = kind, extrap_values = extrap_values, columns = ['wl','xb','yb','zb'])
 
 #--------------------------------------------------------------------------------------------------
@@ -612,24 +769,73 @@ def vlbar(cieobs = _CIEOBS, scr = 'dict', wl_new = None, kind = 'np', extrap_val
     Returns:
         :returns: 
             | dataframe or ndarray with Vlambda of type :cieobs: 
+            
+    Note:
+        1. For :scr: == 'dict' and :kind: == 'np', the interpolated Vlambda is 
+        | cached (see clear_cmf_cache() and get_cmf_cache_info()) 
+        | and returned as a read-only ndarray. 
         
             
     References:
         1. `CIE15:2018, “Colorimetry,” CIE, Vienna, Austria, 2018. <https://doi.org/10.25039/TR.015.2018>`_
     """
     if scr == 'dict':
-        dict_or_file = _CMF[cieobs]['bar'][[0,2],:] 
+        dict_or_file = _CMF[cieobs]['bar'] if (kind == 'np') else _CMF[cieobs]['bar'][[0,2],:] 
         K = _CMF[cieobs]['K']
     elif scr == 'vltype':
         dict_or_file = cieobs #can be file or data itself
         K = 1
     if extrap_values is None: extrap_values = (np.nan, np.nan)
-    Vl = spd(data = dict_or_file, wl = wl_new, interpolation = 'cmf', kind = kind, extrap_values = extrap_values, columns = ['wl','Vl'])
+    if (scr == 'dict') & (kind == 'np'):
+        Vl = _get_cached_cmf('vlbar', cieobs, dict_or_file, wl_new, extrap_values)
+    else:
+        Vl = spd(data = dict_or_file, wl = wl_new, interpolation = 'cmf', kind = kind, extrap_values = extrap_values, columns = ['wl','Vl'])
     if out == 2:
         return Vl, K
     else:
         return Vl
 
+#--------------------------------------------------------------------------------------------------
+def _get_cached_cmf(bartype, cieobs, bar, wl_new, extrap_values):
+    """
+    Get (read-only) CMF set ('xyzbar') or Vlambda ('vlbar') in :bar: interpolated
+    to wavelengths :wl_new: from cache (interpolate and store on cache miss).
+    
+    | Cache key: (bartype, cieobs, content fingerprint of bar, extrap_values, hash of wl_new), 
+    | so replacing _CMF[cieobs]['bar'] by a new array, or changing it in place, 
+    | invalidates previous entries.
+    """
+    wl_new = np.asarray(getwlr(wl_new), dtype = float)
+    bar = np.asarray(bar)
+    bar_fingerprint = (bar.shape, bar.dtype.str, hashlib.sha1(np.ascontiguousarray(bar).tobytes()).hexdigest())
+    key = (bartype, cieobs, bar_fingerprint, str(np.atleast_1d(extrap_values).tolist())) + _wl_hash(wl_new)
+    cmf = _CMF_CACHE.get(key)
+    if cmf is None:
+        if bartype == 'vlbar': bar = bar[[0,2],:]
+        cmf = spd(data = bar, wl = wl_new, interpolation = 'cmf', kind = 'np', extrap_values = extrap_values)
+        cmf.flags.writeable = False
+        _CMF_CACHE.put(key, cmf)
+    return cmf
+
+def clear_cmf_cache():
+    """
+    Clear the cache with CMF and Vlambda sets interpolated by xyzbar() and vlbar()
+    (and reset the hit/miss counters).
+    """
+    _CMF_CACHE.clear()
+
+def get_cmf_cache_info():
+    """
+    Get statistics of the cache with CMF and Vlambda sets interpolated by xyzbar() and vlbar().
+    
+    Returns:
+        :info:
+            | dict with keys 'hits', 'misses', 'currsize' (number of cached sets), 
+            | 'nbytes' (total size of cached sets), 'maxsize' and 'maxbytes'.
+            | The size limits can be changed through luxpy.spectrum.basics.spectral._CMF_CACHE.
+    """
+    return _CMF_CACHE.info()
+
 #--------------------------------------------------------------------------------------------------
 def vlbar_cie_mesopic(m = [1], wl_new = None, kind = 'np', out = 1,
                       Lp = None, Ls = None, SP = None):
@@ -830,7 +1036,7 @@ def spd_to_xyz(data,  relative = True, rfl = None, cieobs = _CIEOBS, K = None, o
     # Add CIE standard deviate observer function to cmf if requested:
     if cie_std_dev_obs is not None:
         cmf_cie_std_dev_obs = xyzbar(cieobs = 'cie_std_dev_obs_' + cie_std_dev_obs.lower(), scr = scr, wl_new = data[0], kind = 'np')
-        cmf[1:] = cmf[1:] + cmf_cie_std_dev_obs[1:] 
+        cmf = np.vstack((cmf[:1], cmf[1:] + cmf_cie_std_dev_obs[1:])) # cached cmfs are read-only
     
     # Rescale xyz using k or 100/Yw:
     if relative == True: K = 100.0/np.dot(data[1:],cmf[2,:]*dl)
@@ -861,6 +1067,125 @@ def spd_to_xyz(data,  relative = True, rfl = None, cieobs = _CIEOBS, K = None, o
         if rflwasnotnone == 0: xyz = np.squeeze(xyz,axis = 0)
         return xyz
     
+#------------------------------------------------------------------------------
+class SpectralIntegrator:
+    """
+    Class for fast repeated calculation of xyz tristimulus values of spectral 
+    data on a fixed wavelength grid.
+    
+    | All setup work of spd_to_xyz() (CMF interpolation, addition of the 
+    | CIE standard deviate observer, reflectance interpolation, wavelength
+    | spacing, ...) is done once on initialization. The weights (cmf*dl) and,
+    | if :rfl: is not None, (rfl*cmf*dl) are precomputed and stored in a single
+    | (number of wavelengths, (number of rfls + 1)*3) matrix, so a call 
+    | reduces to a single matrix multiplication.
+    
+    Args:
+        :wl:
+            | ndarray with wavelengths or 3-vector [start, stop, spacing]
+            | Wavelength grid of the spectral data that will be integrated.
+        :cieobs:
+            | luxpy._CIEOBS or str or ndarray, optional
+            | Determines the color matching functions to be used in the 
+            | calculation of XYZ.
+        :rfl: 
+            | None or ndarray with spectral reflectance functions, optional
+            | Will be interpolated to :wl:.
+        :relative: 
+            | True or False, optional
+            | Calculate relative XYZ (Yw = 100) or absolute XYZ (Y = Luminance)
+        :K: 
+            | None, optional
+            |   e.g.  K  = 683 lm/W for '1931_2' (relative == False) 
+            |   or K = 100/sum(spd*dl)        (relative == True)
+        :cie_std_dev_obs: 
+            | None or str, optional
+            | - None: don't use CIE Standard Deviate Observer function.
+            | - 'f1': use F1 function.
+            
+    Example:
+        | integrator = SpectralIntegrator([380,780,1], cieobs = '1964_10', rfl = rfls)
+        | xyz, xyzw = integrator(spds, out = 2) # same output as spd_to_xyz(spds, rfl = rfls, cieobs = '1964_10', out = 2)
+    """
+    def __init__(self, wl, cieobs = _CIEOBS, rfl = None, relative = True, K = None, cie_std_dev_obs = None):
+        self.wl = np.asarray(getwlr(wl), dtype = float)
+        self.dl = getwld(self.wl)
+        self.cieobs = cieobs
+        self.relative = relative
+        
+        # get cmf,k for cieobs (see spd_to_xyz):
+        if isinstance(cieobs,str):
+            if K is None: K = _CMF[cieobs]['K']
+            scr = 'dict'
+        else:
+            scr = 'cieobs'
+            if (K is None) & (relative == False): K = 1
+        self.K = K
+        cmf = xyzbar(cieobs = cieobs, scr = scr, wl_new = self.wl, kind = 'np') 
+        if cie_std_dev_obs is not None:
+            cmf_cie_std_dev_obs = xyzbar(cieobs = 'cie_std_dev_obs_' + cie_std_dev_obs.lower(), scr = scr, wl_new = self.wl, kind = 'np')
+            cmf = np.vstack((cmf[:1], cmf[1:] + cmf_cie_std_dev_obs[1:]))
+        self.cmfdl = (cmf[1:]*self.dl).T # (n_wl, 3)
+
+        # Interpolate rfls to wl and build (n_wl, (n_rfl+1)*3) weight matrix:
+        if rfl is not None:
+            rfl = cie_interp(data = np2d(rfl), wl_new = self.wl, kind = 'rfl')[1:]
+            self.N_rfl = rfl.shape[0]
+            rfl = np.vstack((np.ones((1,self.wl.shape[0])), rfl)) # add rfl = 1 for light source spectrum
+            self.W = np.ascontiguousarray((rfl.T[:,:,None]*self.cmfdl[:,None,:]).reshape(self.wl.shape[0],-1))
+        else:
+            self.N_rfl = 0
+            self.W = np.ascontiguousarray(self.cmfdl)
+    
+    def __call__(self, data, out = None, ax0iswl = True):
+        """
+        Calculate xyz tristimulus values from spectral data.
+        
+        Args:
+            :data:
+                | ndarray with spectral data on the wavelength grid of the integrator. 
+                | (.shape = (number of spectra + 1, number of wavelengths) if :ax0iswl:
+                | else .shape = (number of spectra, number of wavelengths))
+            :out:
+                | None or 1 or 2, optional
+                | Determines number and shape of output (see spd_to_xyz()).
+            :ax0iswl:
+                | True, optional
+                | Signals that the first row of :data: contains wavelengths.
+                
+        Returns:
+            :returns:
+                | xyz (and xyzw) with the same shapes as the output of spd_to_xyz().
+        """
+        data = np2d(data)
+        if ax0iswl:
+            if (data.shape[1] != self.wl.shape[0]) or (not np.array_equal(data[0], self.wl)):
+                raise Exception('SpectralIntegrator: wavelengths of data do not match those of the integrator. Create a new integrator or use spd_to_xyz().')
+            data = data[1:]
+        elif data.shape[1] != self.wl.shape[0]:
+            raise Exception('SpectralIntegrator: number of wavelengths in data does not match that of the integrator.')
+            
+        xyz = (data @ self.W).reshape(data.shape[0], self.N_rfl + 1, 3)
+        
+        # Rescale xyz using k or 100/Yw:
+        K = (100.0/xyz[:,0,1])[:,None,None] if (self.relative == True) else self.K
+        xyz = np.transpose(K*xyz,[1,0,2]) #order [rfl,spd,xyz]
+        
+        # Setup output:
+        rflwasnotnone = int(self.N_rfl > 0)
+        if out == 2:
+            xyzw = xyz[0,...]
+            xyz = xyz[rflwasnotnone:,...]
+            if rflwasnotnone == 0: xyz = np.squeeze(xyz,axis = 0)
+            return xyz,xyzw
+        elif out == 1:
+            if rflwasnotnone == 0: xyz = np.squeeze(xyz,axis = 0)
+            return xyz
+        else: 
+            xyz = xyz[rflwasnotnone:,...]
+            if rflwasnotnone == 0: xyz = np.squeeze(xyz,axis = 0)
+            return xyz
+    
 #------------------------------------------------------------------------------
 def spd_to_ler(data, cieobs = _CIEOBS, K = None):
     """
@@ -11,9 +11,16 @@ Module for hyper spectral image simulation
  
  :_ROUNDING: rounding of input to xyz_to_rfl() search algorithm for improved speed
 
+ :_HYPSPCIM_TILE_SIZE: maximum number of unique rgbs per batch and of pixels 
+                       per tile in render_image()
+
  :xyz_to_rfl(): approximate spectral reflectance of xyz based on k nearest 
                 neighbour interpolation of samples from a standard reflectance 
                 set.
+                
+ :RflEstimator: reusable (and picklable) reflectance estimator for xyz_to_rfl() 
+                with color coordinates, KD-tree and Delaunay triangulation of 
+                the reflectance set under a reference spectrum.
 
  :render_image(): Render image under specified light source spd.
 
@@ -27,13 +34,14 @@ Module for hyper spectral image simulation
 """
 
 from luxpy import (cat, colortf, _CIEOBS, _CIE_ILLUMINANTS, _CRI_RFL, _CIE_D65,_CIE_E,
-                   spd_to_xyz, plot_color_data, math, cie_interp, getwlr, xyz_to_srgb)
-from luxpy.utils import np, plt, sp, _PKG_PATH, _SEP, _EPS 
+                   spd_to_xyz, plot_color_data, cie_interp, getwlr, xyz_to_srgb)
+from luxpy.utils import np, plt, sp, _PKG_PATH, _SEP, _EPS, get_output_array
 
 import warnings
+import pickle
 from imageio import imsave
 
-__all__ =['_HYPSPCIM_PATH','_HYPSPCIM_DEFAULT_IMAGE','render_image','xyz_to_rfl',
+__all__ =['_HYPSPCIM_PATH','_HYPSPCIM_DEFAULT_IMAGE','render_image','xyz_to_rfl','RflEstimator',
           'get_superresolution_hsi','hsi_to_rgb','rfl_to_rgb','_CSF_NIKON_D700']             
 
 _HYPSPCIM_PATH = _PKG_PATH + _SEP + 'hypspcim' + _SEP
@@ -42,6 +50,8 @@ _HYPSPCIM_DEFAULT_IMAGE = _PKG_PATH + _SEP + 'toolboxes' + _SEP + 'hypspcim' +
 
 _ROUNDING = 6 # to speed up xyz_to_rfl search algorithm, increase if kernel dies!!!
 
+_HYPSPCIM_TILE_SIZE = 2**16 # maximum number of unique rgbs per batch and of pixels per tile in render_image()
+
 # Nikon D700 camera sensitivity functions:
 _CSF_NIKON_D700 = np.vstack((np.arange(400,710,10),
                              np.array([[0.005, 0.007, 0.012, 0.015, 0.023, 0.025, 0.030, 0.026, 0.024, 0.019, 0.010, 0.004, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000,  0.000,  0.000,  0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000], 
@@ -49,12 +59,208 @@ _CSF_NIKON_D700 = np.vstack((np.arange(400,710,10),
                                        [0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.001, 0.003, 0.010, 0.012,  0.013,  0.022,  0.020, 0.020, 0.018, 0.017, 0.016, 0.016, 0.014, 0.014, 0.013]])[::-1]))
 
 
+class RflEstimator:
+    
+    def __init__(self, rfl = None, refspd = None, cieobs = _CIEOBS, 
+                 cspace = 'xyz', cspace_tf = {}, CSF = None,
+                 csf_based_rgb_rounding = _ROUNDING):
+        """
+        Initialize a reusable reflectance estimator for xyz_to_rfl().
+        
+        The color coordinates of the reflectance set under the reference 
+        spectrum are calculated once. The KD-tree (for 'nearest' interpolation) 
+        and the Delaunay triangulation based interpolator (for 'nd' interpolation) 
+        are built on first use and then reused for all subsequent queries.
+        
+        Args:
+            :rfl: 
+                | ndarray, optional
+                | Reflectance set for color coordinate to rfl mapping.
+                | If None: use IES TM30 4880 set.
+            :refspd: 
+                | None, optional
+                | Reference spectrum for color coordinate to rfl mapping.
+                | None defaults to D65.
+            :cieobs:
+                | _CIEOBS, optional
+                | CMF set used for calculation of xyz from spectral data.
+            :cspace:
+                | 'xyz',  optional
+                | Color space for color coordinate to rfl mapping.
+            :cspace_tf:
+                | {}, optional
+                | Dict with parameters for xyz_to_cspace and cspace_to_xyz transform.
+            :CSF:
+                | None, optional
+                | RGB camera response functions.
+                | If not None: estimation is performed directly in raw rgb space.
+            :csf_based_rgb_rounding:
+                | _ROUNDING, optional
+                | Int representing the number of decimals to round the RGB values 
+                | (obtained from not-None CSF input) to before applying the search algorithm.
+        
+        Note:
+            | The estimator can be pickled or saved to / loaded from disk 
+            | (see RflEstimator.save() and RflEstimator.load()), e.g. to reuse it
+            | for rendering many images or video frames under the same reference conditions.
+        """
+        # get rfl set:
+        if rfl is None: # use IESTM30['4880'] set 
+            rfl = _CRI_RFL['ies-tm30']['4880']['1nm']
+        self.rfl = rfl
+        self.wlr = rfl[0] # spectral reflectance set determines wavelength range for estimation
+        
+        # get Ref spd:
+        if refspd is None:
+            refspd = _CIE_ILLUMINANTS['D65'].copy()
+        self.refspd = cie_interp(refspd, self.wlr, kind = 'linear') # force spd to same wavelength range as rfl
+        
+        self.cieobs = cieobs
+        self.cspace = cspace
+        self.CSF = CSF
+        self.csf_based_rgb_rounding = csf_based_rgb_rounding
+        
+        # Calculate color coordinates of standard rfl set under refspd:
+        if CSF is None:
+            # Calculate lab coordinates:
+            xyz_rr, self.xyz_wr = spd_to_xyz(self.refspd, relative = True, rfl = rfl, cieobs = cieobs, out = 2)
+            self.cspace_tf = cspace_tf.copy()
+            self.cspace_tf['xyzw'] = self.xyz_wr # put correct white point in param. dict
+            self.lab_rr = colortf(xyz_rr, tf = cspace, fwtf = self.cspace_tf, bwtf = self.cspace_tf)[:,0,:]
+        else:
+            # Calculate rgb coordinates from camera sensitivity functions
+            self.xyz_wr = None
+            self.cspace_tf = cspace_tf
+            rgb_rr = rfl_to_rgb(rfl, spd = self.refspd, CSF = CSF, wl = None)   
+            self.lab_rr = np.round(rgb_rr,csf_based_rgb_rounding) # speed up search
+        
+        self._tree = None
+        self._interpolator = None
+    
+    @property
+    def tree(self):
+        """ scipy.spatial.cKDTree of the reflectance set color coordinates (built on first use). """
+        if self._tree is None:
+            self._tree = sp.spatial.cKDTree(self.lab_rr, copy_data = True)
+        return self._tree
+    
+    @property
+    def interpolator(self):
+        """ scipy.interpolate.LinearNDInterpolator (Delaunay) of the reflectance set (built on first use). """
+        if self._interpolator is None:
+            self._interpolator = sp.interpolate.LinearNDInterpolator(self.lab_rr, self.rfl[1:], fill_value = np.nan, rescale = False)
+        return self._interpolator
+    
+    def build(self, interp_type = 'nd'):
+        """ 
+        Build KD-tree (and Delaunay triangulation when interp_type == 'nd') now 
+        instead of on first query (e.g. before saving the estimator to disk).
+        """
+        self.tree
+        if interp_type == 'nd': self.interpolator
+        return self
+    
+    def to_cspace(self, xyz):
+        """
+        Convert xyz (or raw rgb when CSF is not None) to the color coordinates 
+        used for the search in the reflectance set.
+        """
+        if self.CSF is None:
+            return colortf(xyz, tf = self.cspace, fwtf = self.cspace_tf, bwtf = self.cspace_tf)
+        else:
+            return np.round(xyz,self.csf_based_rgb_rounding) # xyz contains rgb values !!! (round to speed up search)
+    
+    def query(self, xyz, interp_type = 'nd', k_neighbours = 4, k_neighbours_nd = 1):
+        """
+        Estimate spectral reflectance of xyz values (or raw rgb values when CSF is not None).
+        
+        Args:
+            :xyz:
+                | ndarray with xyz values (or raw rgb values) of target points.
+            :interp_type:
+                | 'nd', optional
+                | Options:
+                | - 'nd': perform n-dimensional linear interpolation using Delaunay triangulation.
+                | - 'nearest': perform nearest neighbour interpolation. 
+            :k_neighbours:
+                | 4 or int, optional
+                | Number of nearest neighbours for reflectance spectrum interpolation.
+            :k_neighbours_nd:
+                | 1, optional
+                | Number of nearest neighbours for reflectance spectrum interpolation when interp_type 'nd' fails.
+                | If None: use the value set in :k_neighbours:
+        
+        Returns:
+            :rfl_est:
+                | ndarray with estimated reflectance spectra (first row are wavelengths).
+        """
+        return self._query_cspace(self.to_cspace(xyz), interp_type = interp_type, 
+                                  k_neighbours = k_neighbours, k_neighbours_nd = k_neighbours_nd)
+    
+    def _query_cspace(self, lab, interp_type = 'nd', k_neighbours = 4, k_neighbours_nd = 1):
+        """ Estimate spectral reflectance from color coordinates lab (see query()). """
+        rfl = self.rfl
+        if interp_type == 'nearest':
+            # Find rfl (cfr. lab_rr) from rfl set that results in 'near' metameric 
+            # color coordinates for each value in lab_ur (i.e. smallest DE):
+            # Interpolate rfls using k nearest neightbours and inverse distance weigthing:
+            d, inds = self.tree.query(lab, k = k_neighbours )
+            if k_neighbours  > 1:
+                d += _EPS
+                w = (1.0 / d**2)[:,:,None] # inverse distance weigthing
+                rfl_est = np.sum(w * rfl[inds+1,:], axis=1) / np.sum(w, axis=1)
+            else:
+                rfl_est = rfl[inds+1,:].copy()
+        elif interp_type == 'nd':
+    
+            rfl_est = self.interpolator(lab)
+                
+            _isnan = np.isnan(rfl_est[:,0]) 
+    
+            if (_isnan.any()): #do nearest neigbour method for those that fail using Delaunay (i.e. ndinterp1_scipy)
+                if k_neighbours_nd is None: k_neighbours_nd = k_neighbours 
+                
+                # Find rfl (cfr. lab_rr) from rfl set that results in 'near' metameric 
+                # color coordinates for each value in lab_ur (i.e. smallest DE):
+                # Interpolate rfls using k nearest neightbours and inverse distance weigthing:
+                d, inds = self.tree.query(lab[_isnan,...], k = k_neighbours_nd)
+    
+                if k_neighbours_nd > 1:
+                    d += _EPS
+                    w = (1.0 / d**2)[:,:,None] # inverse distance weigthing
+                    rfl_est_isnan = np.sum(w * rfl[inds+1,:], axis=1) / np.sum(w, axis=1)
+                else:
+                    rfl_est_isnan = rfl[inds+1,:].copy()
+                rfl_est[_isnan, :] = rfl_est_isnan
+    
+        else:
+            raise Exception('xyz_to_rfl(): unsupported interp_type!')
+        
+        rfl_est[rfl_est<0] = 0 #can occur for points outside convexhull of standard rfl set.
+    
+        return np.vstack((rfl[0],rfl_est))
+    
+    def save(self, file):
+        """ Save (pickle) estimator (incl. KD-tree and triangulation when built) to file. """
+        with open(file, 'wb') as f:
+            pickle.dump(self, f, protocol = pickle.HIGHEST_PROTOCOL)
+    
+    @staticmethod
+    def load(file):
+        """ Load estimator from file (see RflEstimator.save()). """
+        with open(file, 'rb') as f:
+            estimator = pickle.load(f)
+        if not isinstance(estimator, RflEstimator):
+            raise Exception('RflEstimator.load(): file does not contain an RflEstimator.')
+        return estimator
+
+
 def xyz_to_rfl(xyz, CSF = None, rfl = None, out = 'rfl_est', \
                  refspd = None, D = None, cieobs = _CIEOBS, \
                  cspace = 'xyz', cspace_tf = {},\
                  interp_type = 'nd', k_neighbours_nd = 1,
                  k_neighbours = 4, verbosity = 0,
-                 csf_based_rgb_rounding = _ROUNDING):
+                 csf_based_rgb_rounding = _ROUNDING, estimator = None):
     """
     Approximate spectral reflectance of xyz values based on nd-dimensional linear interpolation 
     or k nearest neighbour interpolation of samples from a standard reflectance set.
@@ -108,6 +314,12 @@ def xyz_to_rfl(xyz, CSF = None, rfl = None, out = 'rfl_est', \
             | _ROUNDING, optional
             | Int representing the number of decimals to round the RGB values (obtained from not-None CSF input) to before applying the search algorithm.
             | Smaller values increase the search speed, but could cause fatal error that causes python kernel to die. If this happens increase the rounding int value.
+        :estimator:
+            | None, optional
+            | RflEstimator instance to reuse (color coordinates, KD-tree and 
+            | triangulation of the reflectance set are then not recalculated).
+            | If not None: :rfl:, :refspd:, :cieobs:, :cspace:, :cspace_tf:, :CSF: 
+            | and :csf_based_rgb_rounding: are taken from the estimator.
 
     Returns:
         :returns: 
@@ -115,87 +327,23 @@ def xyz_to_rfl(xyz, CSF = None, rfl = None, out = 'rfl_est', \
             | ndarrays with estimated reflectance spectra.
     """
 
-    # get rfl set:
-    if rfl is None: # use IESTM30['4880'] set 
-        rfl = _CRI_RFL['ies-tm30']['4880']['1nm']
-    
-    wlr = rfl[0]
-    
-    # get Ref spd:
-    if refspd is None:
-        refspd = _CIE_ILLUMINANTS['D65'].copy()
-    refspd = cie_interp(refspd, wlr, kind = 'linear') # force spd to same wavelength range as rfl
-        
-    # Calculate rgb values of standard rfl set under refspd:
-    if CSF is None:
-        # Calculate lab coordinates:
-        xyz_rr, xyz_wr = spd_to_xyz(refspd, relative = True, rfl = rfl, cieobs = cieobs, out = 2)
-        cspace_tf_copy = cspace_tf.copy()
-        cspace_tf_copy['xyzw'] = xyz_wr # put correct white point in param. dict
-        lab_rr = colortf(xyz_rr, tf = cspace, fwtf = cspace_tf_copy, bwtf = cspace_tf_copy)[:,0,:]
-    else:
-        # Calculate rgb coordinates from camera sensitivity functions
-        rgb_rr = rfl_to_rgb(rfl, spd = refspd, CSF = CSF, wl = None)   
-        lab_rr = rgb_rr
-        xyz = xyz
-        lab_rr = np.round(lab_rr,csf_based_rgb_rounding) # speed up search
+    # get (reusable) estimator with color coordinates of rfl set under refspd:
+    if estimator is None:
+        estimator = RflEstimator(rfl = rfl, refspd = refspd, cieobs = cieobs, 
+                                 cspace = cspace, cspace_tf = cspace_tf, CSF = CSF,
+                                 csf_based_rgb_rounding = csf_based_rgb_rounding)
+    rfl, wlr, refspd, cieobs = estimator.rfl, estimator.wlr, estimator.refspd, estimator.cieobs
+    cspace, cspace_tf, CSF, xyz_wr = estimator.cspace, estimator.cspace_tf, estimator.CSF, estimator.xyz_wr
         
     # Convert xyz to lab-type values under refspd:
-    if CSF is None:
-        lab = colortf(xyz, tf = cspace, fwtf = cspace_tf_copy, bwtf = cspace_tf_copy)
-    else:
-        lab = xyz # xyz contained rgb values !!!
-        rgb = xyz
-        lab = np.round(lab,csf_based_rgb_rounding) # speed up search
-    
-    
-    
-    if interp_type == 'nearest':
-        # Find rfl (cfr. lab_rr) from rfl set that results in 'near' metameric 
-        # color coordinates for each value in lab_ur (i.e. smallest DE):
-        # Construct cKDTree:
-        tree = sp.spatial.cKDTree(lab_rr, copy_data = True)
-        
-        # Interpolate rfls using k nearest neightbours and inverse distance weigthing:
-        d, inds = tree.query(lab, k = k_neighbours )
-        if k_neighbours  > 1:
-            d += _EPS
-            w = (1.0 / d**2)[:,:,None] # inverse distance weigthing
-            rfl_est = np.sum(w * rfl[inds+1,:], axis=1) / np.sum(w, axis=1)
-        else:
-            rfl_est = rfl[inds+1,:].copy()
-    elif interp_type == 'nd':
-
-        rfl_est = math.ndinterp1_scipy(lab_rr, rfl[1:], lab)
-            
-        _isnan = np.isnan(rfl_est[:,0]) 
-
-        if (_isnan.any()): #do nearest neigbour method for those that fail using Delaunay (i.e. ndinterp1_scipy)
-            if k_neighbours_nd is None: k_neighbours_nd = k_neighbours 
-            
-            # Find rfl (cfr. lab_rr) from rfl set that results in 'near' metameric 
-            # color coordinates for each value in lab_ur (i.e. smallest DE):
-            # Construct cKDTree:
-            tree = sp.spatial.cKDTree(lab_rr, copy_data = True)
-
-            # Interpolate rfls using k nearest neightbours and inverse distance weigthing:
-            d, inds = tree.query(lab[_isnan,...], k = k_neighbours_nd)
-
-            if k_neighbours  > 1:
-                d += _EPS
-                d = np.atleast_2d(d)
-                w = (1.0 / d**2)[:,:,None] # inverse distance weigthing
-                rfl_est_isnan = np.sum(w * rfl[inds+1,:], axis=1) / np.sum(w, axis=1)
-            else:
-                rfl_est_isnan = rfl[inds+1,:].copy()
-            rfl_est[_isnan, :] = rfl_est_isnan
-
-    else:
-        raise Exception('xyz_to_rfl(): unsupported interp_type!')
-    
-    rfl_est[rfl_est<0] = 0 #can occur for points outside convexhull of standard rfl set.
-
-    rfl_est = np.vstack((rfl[0],rfl_est))
+    lab = estimator.to_cspace(xyz)
+    if CSF is not None: 
+        rgb = xyz # xyz contained rgb values !!!
+    
+    # Estimate rfls:
+    rfl_est = estimator._query_cspace(lab, interp_type = interp_type, 
+                                      k_neighbours = k_neighbours, 
+                                      k_neighbours_nd = k_neighbours_nd)
         
     if ((verbosity > 0) | ('xyz_est' in out.split(',')) | ('lab_est' in out.split(',')) | ('DEi_ab' in out.split(',')) | ('DEa_ab' in out.split(','))) & (CSF is None):
         xyz_est, _ = spd_to_xyz(refspd, rfl = rfl_est, relative = True, cieobs = cieobs, out = 2)
@@ -252,7 +400,9 @@ def render_image(img = None, spd = None, rfl = None, out = 'img_hyp', \
                  verbosity = 0, show_ref_img = True,\
                  stack_test_ref = 12,\
                  write_to_file = None,\
-                 csf_based_rgb_rounding = _ROUNDING):
+                 csf_based_rgb_rounding = _ROUNDING,
+                 hyp_out = None, hyp_dtype = np.float64, tile_size = _HYPSPCIM_TILE_SIZE,
+                 estimator = None):
     """
     Render image under specified light source spd.
     
@@ -327,12 +477,37 @@ def render_image(img = None, spd = None, rfl = None, out = 'img_hyp', \
             | _ROUNDING, optional
             | Int representing the number of decimals to round the RGB values (obtained from not-None CSF input) to before applying the search algorithm.
             | Smaller values increase the search speed, but could cause fatal error that causes python kernel to die. If this happens increase the rounding int value.
+        :hyp_out:
+            | None, optional
+            | Output array for the hyperspectral image (only used when 'img_hyp' in :out:):
+            |   - None: allocate a new array in memory.
+            |   - str: filename of a .npy file to which the hyperspectral image 
+            |          is written as a memory-mapped array (np.lib.format.open_memmap).
+            |   - ndarray (or np.memmap): preallocated array with shape 
+            |          (img.shape[0], img.shape[1], number of wavelengths).
+        :hyp_dtype:
+            | np.float64, optional
+            | Data type of the hyperspectral image when :hyp_out: is None or str
+            | (e.g. np.float32 to halve the memory / disk use).
+        :tile_size:
+            | _HYPSPCIM_TILE_SIZE, optional
+            | Maximum number of unique rgbs per batch (rfl estimation and spectral 
+            | calculations) and of pixels per tile when filling the hyperspectral image.
+            | (peak memory for the rfl estimates and the hyperspectral image scales 
+            |  with the tile size when :hyp_out: is a file, not with the image size or content)
+        :estimator:
+            | None, optional
+            | RflEstimator instance to reuse for the color coordinate to rfl mapping 
+            | (e.g. when rendering many images or video frames under the same reference conditions).
+            | If not None: :rfl:, :refspd:, :cieobs:, :cspace:, :cspace_tf:, :CSF: 
+            | and :csf_based_rgb_rounding: are taken from the estimator.
 
 
     Returns:
         :returns: 
             | img_hyp, img_ren, 
             | ndarrays with float hyperspectral image and rendered images 
+            | (img_hyp is an np.memmap when :hyp_out: is a filename)
     """
     
     # Get image:
@@ -364,64 +539,88 @@ def render_image(img = None, spd = None, rfl = None, out = 'img_hyp', \
     rgb_u, rgb_indices = np.unique(rgb, return_inverse=True, axis = 0)
 
     
-    # get rfl set:
-    if rfl is None: # use IESTM30['4880'] set 
-        rfl = _CRI_RFL['ies-tm30']['4880']['1nm']
-    wlr = rfl[0] # spectral reflectance set determines wavelength range for estimation (xyz_to_rfl())
-        
-    # get Ref spd:
-    if refspd is None:
-        refspd = _CIE_ILLUMINANTS['D65'].copy()
-    refspd = cie_interp(refspd, wlr, kind = 'linear') # force spd to same wavelength range as rfl
-
+    # get (reusable) estimator with rfl set and Ref spd (forced to same wavelength range as rfl):
+    if estimator is None:
+        estimator = RflEstimator(rfl = rfl, refspd = refspd, cieobs = cieobs, 
+                                 cspace = cspace, cspace_tf = cspace_tf, CSF = CSF,
+                                 csf_based_rgb_rounding = csf_based_rgb_rounding)
+    rfl, refspd, cieobs, CSF = estimator.rfl, estimator.refspd, estimator.cieobs, estimator.CSF
 
-    # Convert rgb_u to xyz and lab-type values under assumed refspd:
-    if CSF is None:
-        xyz_wr = spd_to_xyz(refspd, cieobs = cieobs, relative = True)
-        xyz_ur = colortf(rgb_u*255, tf = 'srgb>xyz')
-    else:
-        xyz_ur = rgb_u # for input in xyz_to_rfl (when CSF is not None: this functions assumes input is indeed rgb !!!)
-    
-    # Estimate rfl's for xyz_ur:
-    rfl_est, xyzri = xyz_to_rfl(xyz_ur, rfl = rfl, out = 'rfl_est,xyz_est', \
-                 refspd = refspd, D = D, cieobs = cieobs, \
-                 cspace = cspace, cspace_tf = cspace_tf, CSF = CSF,\
-                 interp_type = interp_type, k_neighbours = k_neighbours, 
-                 verbosity = verbosity,
-                 csf_based_rgb_rounding = csf_based_rgb_rounding)
-    
 
     # Get default test spd if none supplied:
     if spd is None:
         spd = _CIE_ILLUMINANTS['F4']
-        
-    if CSF is None:
-        # calculate xyz values under test spd:
-        xyzti, xyztw = spd_to_xyz(spd, rfl = rfl_est, cieobs = cieobs, out = 2)
-    
-        # Chromatic adaptation from test spd to refspd:
-        if D is not None:
-            xyzti = cat.apply(xyzti, xyzw1 = xyztw, xyzw2 = xyz_wr, D = D)
     
-        # Convert xyzti under test spd to srgb:
-        rgbti = colortf(xyzti, tf = 'srgb')/255
-    else:
-        # Calculate rgb coordinates from camera sensitivity functions under spd:
-        rgbti = rfl_to_rgb(rfl_est, spd = spd, CSF = CSF, wl = None) 
+    # White points under refspd and test spd:
+    if CSF is None:
+        xyz_wr = spd_to_xyz(refspd, cieobs = cieobs, relative = True)
+        xyztw = spd_to_xyz(spd, cieobs = cieobs)
+    elif D is not None:
+        white = np.ones_like(spd)
+        white[0] = spd[0]
+        rgbwr = rfl_to_rgb(white, spd = refspd, CSF = CSF, wl = None)
+        rgbwt = rfl_to_rgb(white, spd = spd, CSF = CSF, wl = None)
+    
+    # Prepare output arrays:
+    n_u = rgb_u.shape[0]
+    rgbti = np.empty((n_u, 3))
+    xyzri = np.empty((n_u, 3))
+    do_hyp = 'img_hyp' in out.split(',')
+    if do_hyp:
+        img_hyp = get_output_array(hyp_out, (img.shape[0],img.shape[1],rfl.shape[1]), hyp_dtype, caller = 'render_image()')
+        pixels_sorted = np.argsort(rgb_indices, kind = 'stable') # pixels grouped per unique rgb
+        rgb_indices_sorted = rgb_indices[pixels_sorted]
+    
+    # Process unique rgbs in batches of at most tile_size 
+    # (peak memory of the rfl estimates and spectral calculations scales with tile_size, not with the image content): 
+    tile_size = max(1, int(tile_size))
+    for k0 in range(0, n_u, tile_size):
+        k1 = min(k0 + tile_size, n_u)
+        
+        # Convert rgb_u to xyz and lab-type values under assumed refspd:
+        if CSF is None:
+            xyz_ur = colortf(rgb_u[k0:k1]*255, tf = 'srgb>xyz')
+        else:
+            xyz_ur = rgb_u[k0:k1] # for input in xyz_to_rfl (when CSF is not None: this functions assumes input is indeed rgb !!!)
         
-         # Chromatic adaptation from test spd to refspd:
-        if D is not None:
-            white = np.ones_like(spd)
-            white[0] = spd[0]
-            rgbwr = rfl_to_rgb(white, spd = refspd, CSF = CSF, wl = None)
-            rgbwt = rfl_to_rgb(white, spd = spd, CSF = CSF, wl = None)
-            rgbti = cat.apply_vonkries2(rgbti,rgbwt,rgbwr,xyzw0=np.array([[1.0,1.0,1.0]]), in_type='rgb',out_type= 'rgb',D=1)
+        # Estimate rfl's for xyz_ur (only plot first batch when verbosity > 0):
+        rfl_est, xyzri_k = xyz_to_rfl(xyz_ur, out = 'rfl_est,xyz_est', D = D, \
+                     interp_type = interp_type, k_neighbours = k_neighbours, 
+                     verbosity = verbosity if (k0 == 0) else 0, estimator = estimator)
+        xyzri[k0:k1] = xyzri_k.reshape(-1,3)
+            
+        if CSF is None:
+            # calculate xyz values under test spd:
+            xyzti = spd_to_xyz(spd, rfl = rfl_est, cieobs = cieobs)
+        
+            # Chromatic adaptation from test spd to refspd:
+            if D is not None:
+                xyzti = cat.apply(xyzti, xyzw1 = xyztw, xyzw2 = xyz_wr, D = D)
+        
+            # Convert xyzti under test spd to srgb:
+            rgbti_k = colortf(xyzti, tf = 'srgb')/255
+        else:
+            # Calculate rgb coordinates from camera sensitivity functions under spd:
+            rgbti_k = rfl_to_rgb(rfl_est, spd = spd, CSF = CSF, wl = None) 
+            
+             # Chromatic adaptation from test spd to refspd:
+            if D is not None:
+                rgbti_k = cat.apply_vonkries2(rgbti_k,rgbwt,rgbwr,xyzw0=np.array([[1.0,1.0,1.0]]), in_type='rgb',out_type= 'rgb',D=1)
+        rgbti[k0:k1] = rgbti_k.reshape(-1,3)
         
+        if do_hyp:
+            # Fill hyperspectral image pixels of this batch of unique rgbs (in tiles of at most tile_size pixels):
+            p0, p1 = np.searchsorted(rgb_indices_sorted, [k0, k1])
+            for p in range(p0, p1, tile_size):
+                pixels = pixels_sorted[p:min(p + tile_size, p1)]
+                img_hyp[pixels // img.shape[1], pixels % img.shape[1]] = rfl_est[rgb_indices[pixels] - k0 + 1,:]
+        
+    if do_hyp & isinstance(img_hyp, np.memmap): 
+        img_hyp.flush()
     
     # Reconstruct original locations for rendered image rgbs:
     img_ren = rgbti[rgb_indices]
     img_ren.shape = img.shape # reshape back to 3D size of original
-    img_ren = img_ren
     
     # For output:
     if show_ref_img == True:
@@ -474,12 +673,6 @@ def render_image(img = None, spd = None, rfl = None, out = 'img_hyp', \
             plt.title(img_str)
             plt.axis('off')
       
-    if 'img_hyp' in out.split(','):
-        # Create hyper_spectral image:
-        rfl_image_2D = rfl_est[rgb_indices+1,:] # create array with all rfls required for each pixel
-        img_hyp = rfl_image_2D.reshape(img.shape[0],img.shape[1],rfl_image_2D.shape[1])
-
-
     # Setup output:
     if out == 'img_hyp':
         return img_hyp
@@ -585,7 +778,7 @@ def hsi_to_rgb(hsi, spd = None, cieobs = _CIEOBS, srgb = False,
     return np.reshape(rgb,(hsi.shape[0],hsi.shape[1],3))
        
 def get_superresolution_hsi(lrhsi, hrci, CSF, wl = [380,780,1], csf_based_rgb_rounding = _ROUNDING,
-                            interp_type = 'nd', k_neighbours = 4, verbosity = 0):
+                            interp_type = 'nd', k_neighbours = 4, verbosity = 0, estimator = None):
     """ 
     Get a HighResolution HyperSpectral Image (super-resolution HSI) based on a LowResolution HSI and a HighResolution Color Image.
     
@@ -619,6 +812,12 @@ def get_superresolution_hsi(lrhsi, hrci, CSF, wl = [380,780,1], csf_based_rgb_ro
             | _ROUNDING, optional
             | Int representing the number of decimals to round the RGB values (obtained from not-None CSF input) to before applying the search algorithm.
             | Smaller values increase the search speed, but could cause fatal error that causes python kernel to die. If this happens increase the rounding int value.
+        :estimator:
+            | None, optional
+            | RflEstimator instance to reuse (e.g. for several high-resolution color 
+            | images with the same low-resolution HSI). If None: build one for lrhsi.
+            | (build one with RflEstimator(rfl = lrhsi_2d, refspd = eew, CSF = CSF),
+            |  with lrhsi_2d = [wl; lrhsi reshaped to 2D] and eew an equal-energy spectrum)
 
     Returns:
         :hrhsi:
@@ -633,13 +832,15 @@ def get_superresolution_hsi(lrhsi, hrci, CSF, wl = [380,780,1], csf_based_rgb_ro
     """
     wlr = getwlr(wl)
     eew = np.vstack((wlr,np.ones_like(wlr)))
-    lrhsi_2d = np.vstack((wlr,np.reshape(lrhsi,(lrhsi.shape[0]*lrhsi.shape[1],lrhsi.shape[2])))) # create 2D rfl database
-    if CSF is None: CSF = _CSF_NIKON_D700
-    hrhsi = render_image(hrci, spd = eew,
-                         refspd = eew, rfl = lrhsi_2d, D = None,
+    if estimator is None:
+        lrhsi_2d = np.vstack((wlr,np.reshape(lrhsi,(lrhsi.shape[0]*lrhsi.shape[1],lrhsi.shape[2])))) # create 2D rfl database
+        if CSF is None: CSF = _CSF_NIKON_D700
+        estimator = RflEstimator(rfl = lrhsi_2d, refspd = eew, CSF = CSF, 
+                                 csf_based_rgb_rounding = csf_based_rgb_rounding)
+    hrhsi = render_image(hrci, spd = eew, D = None,
                          interp_type = interp_type, k_neighbours = k_neighbours,
                          verbosity = verbosity, show = bool(verbosity),
-                         CSF = CSF, csf_based_rgb_rounding = csf_based_rgb_rounding) # render HR-hsi from HR-ci using LR-HSI rfls as database        
+                         estimator = estimator) # render HR-hsi from HR-ci using LR-HSI rfls as database        
     return hrhsi
 
 if __name__ == '__main__':
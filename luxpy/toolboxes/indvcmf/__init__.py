@@ -63,6 +63,10 @@ Module for Individual Observer lms-CMFs (Asano, 2016 and CIE TC1-97)
                       color matching functions (cone fundamentals) for a
                       certain age and field size.
  
+ :genMonteCarloObsChunks(): Monte-Carlo generation of individual observer 
+                            color matching functions (cone fundamentals), 
+                            yielded in chunks of observers (for large populations).
+ 
  :getCatObs(): Generate cone fundamentals for categorical observers.
  
  :get_lms_to_xyz_matrix(): Calculate lms to xyz conversion matrix for a specific field 
@@ -47,6 +47,10 @@ Module for Individual Observer lms-CMFs (Asano, 2016 and CIE TC1-97)
                       color matching functions (cone fundamentals) for a
                       certain age and field size.
  
+ :genMonteCarloObsChunks(): Monte-Carlo generation of individual observer 
+                            color matching functions (cone fundamentals), 
+                            yielded in chunks of observers (for large populations).
+ 
  :getCatObs(): Generate cone fundamentals for categorical observers.
  
  :get_lms_to_xyz_matrix(): Calculate lms to xyz conversion matrix for a specific field 
@@ -99,7 +103,7 @@ import warnings
 
 __all__ = ['_DATA','_DSRC_STD_DEF', '_DSRC_LMS_ODENS_DEF','_LMS_TO_XYZ_METHOD']
 __all__ += ['load_database','init','query_state']
-__all__ += ['cie2006cmfsEx','getMonteCarloParam','genMonteCarloObs','getCatObs']
+__all__ += ['cie2006cmfsEx','getMonteCarloParam','genMonteCarloObs','genMonteCarloObsChunks','getCatObs']
 __all__ += ['compute_cmfs','add_to_cmf_dict','plot_cmfs']
 
 
@@ -174,10 +178,10 @@ def sign_figs(x, n=0):
             else:
                 exponent = np.ceil(np.log10(x))
                 return 10**exponent * my_round(x / 10**exponent, n)
-        exponent = x.copy()
-        exponent[x == 0] = 0
-        exponent[x != 0] = np.ceil(np.log10(np.abs(x[x != 0])))
-        return 10**exponent * my_round(x / 10**exponent, n)
+        exponent = np.zeros(x.shape)
+        np.log10(np.abs(x), out = exponent, where = (x != 0))
+        p10 = 10**np.ceil(exponent, out = exponent)
+        return p10 * my_round(x / p10, n)
     else:
         return x
 
@@ -1031,6 +1035,84 @@ def _LMS_energy(fieldsize = 10, age = 32, var_od_lens = 0, var_od_mac = 0,
     else:
         return eval(out)
 
+def _LMS_energy_batch(fieldsize = 10, age = 32, var_od_lens = 0, var_od_mac = 0,
+                      var_shft_LMS = [[0,0,0]], var_od_LMS = [[0, 0, 0]],
+                      odata0 = None):
+    """
+    Calculate the energy based LMS-base cone fundamentals (9 sign. figs.,
+    max-normalized) for a batch of N observers in one go.
+
+    Args:
+        :fieldsize:
+            | Field size (same for all observers).
+        :age, var_od_lens, var_od_mac:
+            | scalars or (N,) ndarrays with the observer ages and variations
+            | (see _d_ocular, _d_mac).
+        :var_shft_LMS, var_od_LMS:
+            | (N,3) ndarrays with the LMS peak shifts and optical density variations
+            | (see _LMS_absorptance).
+        :odata0:
+            | None, optional
+            | Dict with uncorrected ocular media and macula density functions and LMS absorptance functions
+            | None defaults to the ones stored in _DATA
+
+    Returns:
+        :LMSe:
+            | ndarray (N,4,n_wl) with for each observer the same values as
+            | _LMS_energy(..., norm_type = 'max', base = True);
+            | row 0 are wavelengths.
+    """
+    if odata0 is None:
+        odata = _DATA['odata']
+    else:
+        odata = odata0
+    var_shft_LMS = np.atleast_2d(var_shft_LMS)
+    var_od_LMS = np.maximum(np.atleast_2d(var_od_LMS), -100)
+    N = var_shft_LMS.shape[0]
+    age = np.broadcast_to(age, (N,))[:,None]
+    var_od_lens = np.maximum(np.broadcast_to(var_od_lens, (N,)), -100)[:,None]
+    var_od_mac = np.maximum(np.broadcast_to(var_od_mac, (N,)), -100)[:,None]
+
+    # field size corrected macular density (_d_mac):
+    rmd = odata['rmd'][1] * my_round((0.485*np.exp(-fieldsize/6.132)) * (1 + var_od_mac/100), 3)
+
+    # age corrected lens/ocular media density (_d_ocular):
+    docul = odata['docul']
+    corrected_lomd = docul[1] * np.where(age <= 60, 1 + 0.02*(age-32), 1.56 + 0.0667*(age-60)) + docul[2]
+    corrected_lomd = corrected_lomd * (1 + var_od_lens/100)
+
+    # corrected LMS (no age correction, _LMS_absorptance):
+    wls = odata['LMSa'][0]
+    LMSa = odata['LMSa'][1:]
+    alpha_lms = np.empty((N,3,wls.shape[0]))
+    for i in range(3):
+        _peak_shft = np.repeat(LMSa[i][None], N, axis = 0)
+        shifted = (var_shft_LMS[:,i] != 0)
+        if shifted.any():
+            _peak_shft_s = odata['LMSa_interps'][i](wls - var_shft_LMS[shifted,i:i+1])
+            if i == 2:
+                # S: Detect poor interpolation (sign switch due to instability):
+                ssw = np.hstack((np.zeros((_peak_shft_s.shape[0],1)),np.sign(np.diff(_peak_shft_s, axis = 1))))
+                cond = ((ssw >= 0) & (wls > 560))
+                wl_min = np.where(cond, wls, np.inf).min(axis = 1, keepdims = True)
+                _peak_shft_s[wls >= wl_min] = np.nan
+            _peak_shft[shifted] = _peak_shft_s
+        _d_max = (0.38 + 0.54*np.exp(-fieldsize/1.333)) if (i < 2) else (0.30 + 0.45*np.exp(-fieldsize/1.333))
+        _pkOd = my_round(_d_max * (1 + var_od_LMS[:,i:i+1]/100), 3)
+        alpha_lms[:,i] = 1 - 10**(-_pkOd*(10**_peak_shft))
+
+    # Corrected to Corneal Incidence (_LMS_quantal, max-normalized):
+    LMSq = alpha_lms * (10**(-rmd - corrected_lomd))[:,None,:]
+    LMSq = LMSq / np.nanmax(LMSq, axis = -1, keepdims = True)
+
+    # Energy based (_LMS_energy):
+    LMSe = np.empty((N,4,wls.shape[0]))
+    LMSe[:,0] = wls
+    LMSe[:,1:] = LMSq*wls
+    LMSe[np.isnan(LMSe)] = 0
+    LMSe[:,1:] = LMSe[:,1:] / np.nanmax(LMSe[:,1:], axis = -1, keepdims = True)
+    return sign_figs(LMSe, 9)
+
 
 def _relative_L_cone_weight_Vl_quantal(fieldsize = 10, age = 32, strategy_2 = True,
                                       LMSa = None, LMSq = None, 
@@ -1978,10 +2060,169 @@ def getUSCensusAgeDist():
 
     return list_Age    
 
+_MC_CHUNK_SIZE = 32 # number of observers evaluated at once in genMonteCarloObs(Chunks)()
+
+def _getMonteCarloObsParam(n_obs = 1, list_Age = [32]):
+    """
+    Get normally-distributed physiological factors and randomly drawn ages 
+    for a population of observers (see genMonteCarloObs).
+    """
+    # Get Normally-distributed Physiological Factors:
+    vAll = getMonteCarloParam(n_obs = n_obs) 
+     
+    if isinstance(list_Age,str): 
+        if list_Age == 'us_census':
+            list_Age = getUSCensusAgeDist()
+    
+    # Generate Random Ages with the same probability density distribution 
+    # as color matching experiment:
+    sz_interval = 1 
+    list_AgeRound = np.round(np.array(list_Age)/sz_interval ) * sz_interval
+    ages, h = np.unique(list_AgeRound, return_counts = True)
+    p = h/h.sum() # probability density distribution
+
+    var_age = np.random.choice(ages, size = n_obs, replace = True, p = p)
+    return var_age, vAll
+
+def _genMonteCarloObs_chunk(job):
+    """
+    Generate the cone fundamentals [and lms to xyz conversion matrices] for a 
+    chunk of observers (module-level so it can run in a worker process).
+    
+    Note:
+        When no observer specific spline interpolation or lms to xyz matrix 
+        optimization is required (wavelengths equal to those in the database 
+        and 'lms' output or lms_to_xyz_method == 'asano'), the observers are 
+        evaluated as a batch, otherwise cie2006cmfsEx() is called per observer.
+    
+    Returns:
+        :LMS, M:
+            | ndarray (n,3+1,n_wl) with cone fundamentals (row 0: wavelengths) 
+            | and ndarray (n,3,3) with conversion matrices (None if not in job['kwargs']['out']).
+    """
+    var_age, vAll, kwargs = job['var_age'], job['vAll'], job['kwargs']
+    odata, wl, out_list = kwargs['odata0'], kwargs['wl'], kwargs['out'].split(',')
+    n = var_age.shape[0]
+    
+    # TC1-97 ciefunctions rounds fieldsize:
+    fieldsize = kwargs['fieldsize']
+    fieldsize_tmp = np.round(fieldsize,1)
+    if (fieldsize_tmp == 2) | (fieldsize_tmp == 10):
+        fieldsize = fieldsize_tmp
+
+    wl_equal_to_all = np.array_equal(my_round(wl,1), my_round(odata['wls'],1))
+    if wl_equal_to_all & ((('xyz' not in out_list) & ('M' not in out_list)) | (kwargs['lms_to_xyz_method'] == 'asano')):
+        LMS = chop(_LMS_energy_batch(fieldsize = fieldsize, age = var_age, 
+                                     var_od_lens = vAll['od_lens'], var_od_mac = vAll['od_macula'], 
+                                     var_shft_LMS = np.stack((vAll['shft_L'], vAll['shft_M'], vAll['shft_S']), axis = 1),
+                                     var_od_LMS = np.stack((vAll['od_L'], vAll['od_M'], vAll['od_S']), axis = 1),
+                                     odata0 = odata))
+        M = get_lms_to_xyz_matrix(fieldsize = fieldsize)
+        if 'xyz' in out_list:
+            LMS[:,1:] = M @ LMS[:,1:]
+            if kwargs['allow_negative_values'] == False:
+                LMS[LMS < 0] = 0
+        M = np.repeat(M[None], n, axis = 0) if ('M' in out_list) else None
+        
+        if kwargs['norm_type'] is not None:
+            LMS[:,1:] = spd_normalize(np.vstack((LMS[0,:1], LMS[:,1:].reshape(3*n,-1))), 
+                                      norm_type = kwargs['norm_type'])[1:].reshape(n,3,-1)
+        if kwargs['base'] == False:
+            LMS = sign_figs(LMS, 6)
+    else:
+        LMS = np.empty((n, 3+1, wl.shape[0]))
+        M = np.empty((n, 3, 3)) if ('M' in out_list) else None
+        for k in range(n):
+            returned = cie2006cmfsEx(age = var_age[k], fieldsize = kwargs['fieldsize'], wl = wl,\
+                                    var_od_lens = vAll['od_lens'][k], var_od_macula = vAll['od_macula'][k], \
+                                    var_od_L = vAll['od_L'][k], var_od_M = vAll['od_M'][k], var_od_S = vAll['od_S'][k],\
+                                    var_shft_L = vAll['shft_L'][k], var_shft_M = vAll['shft_M'][k], var_shft_S = vAll['shft_S'][k],\
+                                    out = kwargs['out'], norm_type = kwargs['norm_type'], base = kwargs['base'], \
+                                    strategy_2 = kwargs['strategy_2'], odata0 = odata,\
+                                    lms_to_xyz_method = kwargs['lms_to_xyz_method'], 
+                                    allow_negative_values = kwargs['allow_negative_values'])
+            if M is None:
+                LMS[k] = returned
+            else:
+                LMS[k], M[k] = returned
+    return LMS, M
+
+def _run_MonteCarloObs_jobs(jobs, n_workers = None):
+    """ 
+    Run Monte-Carlo observer jobs, sequentially or (n_workers > 1) in a process pool.
+    Results are yielded in the order of the jobs; to bound memory use, 
+    at most 2*n_workers jobs are submitted ahead of the consumer.
+    """
+    if (n_workers is None) or (n_workers <= 1) or (len(jobs) <= 1):
+        for job in jobs:
+            yield _genMonteCarloObs_chunk(job)
+    else:
+        from collections import deque
+        from concurrent.futures import ProcessPoolExecutor # observer generation is CPU-bound python (GIL) code
+        with ProcessPoolExecutor(max_workers = min(n_workers, len(jobs))) as pool:
+            futures = deque()
+            for job in jobs:
+                futures.append(pool.submit(_genMonteCarloObs_chunk, job))
+                if len(futures) >= 2*n_workers:
+                    yield futures.popleft().result()
+            while futures:
+                yield futures.popleft().result()
+
+def _get_MonteCarloObs_jobs(n_obs = 1, fieldsize = 10, list_Age = [32], wl = None, 
+                            norm_type = None, out = 'lms', base = False, 
+                            strategy_2 = True, odata0 = None,
+                            lms_to_xyz_method = None, allow_negative_values = False,
+                            n_chunk = _MC_CHUNK_SIZE):
+    """
+    Draw a population of observers and split it in jobs of n_chunk observers 
+    (see _genMonteCarloObs_chunk).
+    
+    Returns:
+        :var_age, vAll, slices, jobs:
+            | population ages and physiological factors, list with the slice 
+            | of the population in each job and list of jobs.
+    """
+    if 'lms' in out.lower().split(','):
+        out_ = 'lms'
+    elif 'xyz' in out.lower().split(','):
+        out_ = 'xyz'
+    else:
+        raise Exception("Must request either 'lms' or 'xyz' in :out:.")
+    if 'M' in out.split(','):
+        out_ = out_+',M'
+        
+    var_age, vAll = _getMonteCarloObsParam(n_obs = n_obs, list_Age = list_Age)
+
+    if odata0 is None:
+        odata = _DATA['odata']
+    else:
+        odata = odata0
+    
+    # Set requested wavelength range:
+    if wl is None:
+        wl = odata['wls']
+    else:
+        wl = getwlr(wl3 = wl)
+    
+    # resolve globals here, so worker processes use the same settings:
+    if lms_to_xyz_method is None:
+        lms_to_xyz_method = _LMS_TO_XYZ_METHOD
+    
+    kwargs = dict(fieldsize = fieldsize, wl = wl, norm_type = norm_type, out = out_, 
+                  base = base, strategy_2 = strategy_2, odata0 = odata, 
+                  lms_to_xyz_method = lms_to_xyz_method, 
+                  allow_negative_values = allow_negative_values)
+    n_chunk = n_obs if (n_chunk is None) else max(int(n_chunk), 1)
+    slices = [slice(i, min(i + n_chunk, n_obs)) for i in range(0, n_obs, n_chunk)]
+    jobs = [{'var_age' : var_age[sl], 'vAll' : {k : v[sl] for k, v in vAll.items()}, 
+             'kwargs' : kwargs} for sl in slices]
+    return var_age, vAll, slices, jobs
+
 def genMonteCarloObs(n_obs = 1, fieldsize = 10, list_Age = [32], wl = None, 
                      norm_type = None, out = 'lms', base = False, 
                      strategy_2 = True, odata0 = None,
-                     lms_to_xyz_method = None, allow_negative_values = False):
+                     lms_to_xyz_method = None, allow_negative_values = False,
+                     n_chunk = _MC_CHUNK_SIZE, n_workers = None):
     """
     Monte-Carlo generation of individual observer cone fundamentals.
     
@@ -2029,6 +2270,13 @@ def genMonteCarloObs(n_obs = 1, fieldsize = 10, list_Age = [32], wl = None,
             | False, optional
             | Cone fundamentals or color matching functions should not have negative values.
             |     If False: X[X<0] = 0.
+        :n_chunk:
+            | _MC_CHUNK_SIZE, optional
+            | Number of observers evaluated at once (limits memory use).
+            | None: all observers at once.
+        :n_workers:
+            | None, optional
+            | If > 1: number of worker processes generating chunks in parallel.
     
     Returns:
         :returns: 
@@ -2056,61 +2304,22 @@ def genMonteCarloObs(n_obs = 1, fieldsize = 10, list_Age = [32], wl = None,
          4. `Asano's Individual Colorimetric Observer Model 
          <https://www.rit.edu/cos/colorscience/re_AsanoObserverFunctions.php>`_
     """
-    # Get Normally-distributed Physiological Factors:
-    vAll = getMonteCarloParam(n_obs = n_obs) 
-     
-    if isinstance(list_Age,str): 
-        if list_Age == 'us_census':
-            list_Age = getUSCensusAgeDist()
-    
-    # Generate Random Ages with the same probability density distribution 
-    # as color matching experiment:
-    sz_interval = 1 
-    list_AgeRound = np.round(np.array(list_Age)/sz_interval ) * sz_interval
-    h = math.histogram(list_AgeRound, bins = np.unique(list_AgeRound), bin_center = True)[0]
-    p = h/h.sum() # probability density distribution
-
-    var_age = np.random.choice(np.unique(list_AgeRound), \
-                               size = n_obs, replace = True,\
-                               p = p)
 
-    if odata0 is None:
-        odata = _DATA['odata']
-    else:
-        odata = odata0
+    var_age, vAll, slices, jobs = _get_MonteCarloObs_jobs(n_obs = n_obs, fieldsize = fieldsize, list_Age = list_Age, 
+                                                          wl = wl, norm_type = norm_type, out = out, base = base, 
+                                                          strategy_2 = strategy_2, odata0 = odata0,
+                                                          lms_to_xyz_method = lms_to_xyz_method, 
+                                                          allow_negative_values = allow_negative_values,
+                                                          n_chunk = n_chunk)
+    n_wl = jobs[0]['kwargs']['wl'].shape[0]
     
-    # Set requested wavelength range:
-    if wl is None:
-        wl = odata['wls']
-    else:
-        wl = getwlr(wl3 = wl)
-     
-    if 'lms' in out.lower().split(','):
-        out_ = 'lms'
-    elif 'xyz' in out.lower().split(','):
-        out_ = 'xyz'
-    else:
-        raise Exception("Must request either 'lms' or 'xyz' in :out:.")
-        
-    LMS_All = np.zeros((3+1, wl.shape[0],n_obs)); LMS_All.fill(np.nan)
+    LMS_All = np.zeros((3+1, n_wl, n_obs)); LMS_All.fill(np.nan)
     if 'M' in out.split(','):
-        out_ = out_+',M'
         M_All = np.zeros((3, 3,n_obs)); M_All.fill(np.nan)
-    for k in range(n_obs):
-        returned = cie2006cmfsEx(age = var_age[k], fieldsize = fieldsize, wl = wl,\
-                                var_od_lens = vAll['od_lens'][k], var_od_macula = vAll['od_macula'][k], \
-                                var_od_L = vAll['od_L'][k], var_od_M = vAll['od_M'][k], var_od_S = vAll['od_S'][k],\
-                                var_shft_L = vAll['shft_L'][k], var_shft_M = vAll['shft_M'][k], var_shft_S = vAll['shft_S'][k],\
-                                out = out_+',trans_lens,trans_macula,sens_photopig',
-                                norm_type = norm_type,  base = base, \
-                                strategy_2 = strategy_2, odata0 = odata,\
-                                lms_to_xyz_method = lms_to_xyz_method, allow_negative_values = allow_negative_values)
-        if 'M' not in out.split(','):
-            t_LMS, t_trans_lens, t_trans_macula, t_sens_photopig = returned
-        else:
-            t_LMS, t_M, t_trans_lens, t_trans_macula, t_sens_photopig = returned
-            M_All[:,:,k] = t_M
-        LMS_All[:,:,k] = t_LMS
+    for sl, (t_LMS, t_M) in zip(slices, _run_MonteCarloObs_jobs(jobs, n_workers = n_workers)):
+        LMS_All[:,:,sl] = t_LMS.transpose(1,2,0)
+        if t_M is not None:
+            M_All[:,:,sl] = t_M.transpose(1,2,0)
         
     if n_obs == 1:
         LMS_All = np.squeeze(LMS_All, axis = 2)
@@ -2134,6 +2343,58 @@ def genMonteCarloObs(n_obs = 1, fieldsize = 10, list_Age = [32], wl = None,
         return eval(out)
 
         
+def genMonteCarloObsChunks(n_obs = 1, fieldsize = 10, list_Age = [32], wl = None, 
+                           norm_type = None, out = 'lms', base = False, 
+                           strategy_2 = True, odata0 = None,
+                           lms_to_xyz_method = None, allow_negative_values = False,
+                           n_chunk = _MC_CHUNK_SIZE, n_workers = None):
+    """
+    Monte-Carlo generation of individual observer cone fundamentals, 
+    yielded in chunks of n_chunk observers (for large populations).
+    
+    Args: 
+        :n_obs, ..., n_workers:
+            | See genMonteCarloObs().
+    
+    Returns:
+        :returns: 
+            | generator yielding per chunk: LMS [,M] [,var_age, vAll] 
+            |   - LMS: ndarray (n_chunk,3,n_wl) with LMS functions (or XYZ CMFs) 
+            |          of the observers in the chunk (without wavelengths).
+            |   - M: ndarray (n_chunk,3,3) with lms to xyz conversion matrices.
+            |   - var_age: ndarray with observer ages.
+            |   - vAll: dict with physiological factors (see .keys()) 
+            
+    Note:
+        Population parameters are drawn in the same way as in genMonteCarloObs, 
+        i.e. for the same random seed the same observers are generated.
+    """
+    var_age_All, vAll_All, slices, jobs = _get_MonteCarloObs_jobs(n_obs = n_obs, fieldsize = fieldsize, list_Age = list_Age, 
+                                                                  wl = wl, norm_type = norm_type, out = out, base = base, 
+                                                                  strategy_2 = strategy_2, odata0 = odata0,
+                                                                  lms_to_xyz_method = lms_to_xyz_method, 
+                                                                  allow_negative_values = allow_negative_values,
+                                                                  n_chunk = n_chunk)
+    if ('xyz' in out.lower().split(',')):
+        out = out.replace('xyz','LMS').replace('XYZ','LMS')
+    if ('lms' in out.lower().split(',')):
+        out = out.replace('lms','LMS')
+
+    for sl, (LMS, M) in zip(slices, _run_MonteCarloObs_jobs(jobs, n_workers = n_workers)):
+        LMS = LMS[:,1:]
+        var_age, vAll = var_age_All[sl], {k : v[sl] for k, v in vAll_All.items()}
+        if (out == 'LMS'):
+            yield LMS
+        elif (out == 'LMS,M'):
+            yield LMS, M
+        elif (out == 'LMS,var_age,vAll'):
+            yield LMS, var_age, vAll 
+        elif (out == 'LMS,M,var_age,vAll'):
+            yield LMS, M, var_age, vAll 
+        else:
+            yield eval(out)
+
+        
 def getCatObs(n_cat = 10, fieldsize = 2,  wl = None, 
              norm_type = None, out = 'lms', base = False, 
              strategy_2 = True, odata0 = None,
@@ -25,11 +25,14 @@ Module for RGB to spectrum conversions
 .. codeauthor:: Kevin A.G. Smet (ksmet1977 at gmail.com)
 """
 from luxpy import _WL3
+from luxpy.utils import np
 from .smits_mitsuba import *
+from .smits_mitsuba import _SMITS_TILE_SIZE
 __all__ = smits_mitsuba.__all__
 __all__ += ['convert']
 
-def convert(rgb, linearized_rgb = True, method = 'smits_mtsb', intent = 'rfl',  bitdepth = 8, wlr = _WL3, rgb2spec = None):
+def convert(rgb, linearized_rgb = True, method = 'smits_mtsb', intent = 'rfl',  bitdepth = 8, wlr = _WL3, rgb2spec = None,
+            tile_size = _SMITS_TILE_SIZE, dtype = np.float64, unique = False):
     """
     Convert an array of RGB values to a spectrum.
     
@@ -58,11 +61,22 @@ def convert(rgb, linearized_rgb = True, method = 'smits_mtsb', intent = 'rfl',
             | None, optional
             | Dict with base spectra for white, cyan, magenta, yellow, blue, green and red for each intent.
             | If None: use _BASESPEC_SMITS.
+        :tile_size:
+            | _SMITS_TILE_SIZE, optional
+            | Number of rgb values processed per tile.
+        :dtype:
+            | np.float64, optional
+            | Data type of output array (e.g. np.float32 for large images).
+        :unique:
+            | False, optional
+            | If True: convert only the unique rgb values 
+            | (faster for images with many repeated colors).
         
     Returns:
         :spec: 
             | ndarray with spectrum or spectra (one for each rgb value, first row are the wavelengths)
     """
-    return rgb_to_spec_smits(rgb, intent = intent,  linearized_rgb = linearized_rgb, bitdepth = bitdepth, wlr = wlr, rgb2spec = rgb2spec)
+    return rgb_to_spec_smits(rgb, intent = intent,  linearized_rgb = linearized_rgb, bitdepth = bitdepth, wlr = wlr, rgb2spec = rgb2spec,
+                             tile_size = tile_size, dtype = dtype, unique = unique)
 
 
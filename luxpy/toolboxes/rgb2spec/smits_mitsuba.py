@@ -20,6 +20,10 @@ Module for Smits-style RGB to Spectrum conversion
 
  :_BASESPEC_SMITS: Default dict with base spectra for white, cyan, magenta, yellow, blue, green and red for each intent ('rfl' or 'spd')
  
+ :_SMITS_BASIS_ORDER: order of the base spectra in the (7 x n_wl) basis matrix used by rgb_to_spec_smits()
+ 
+ :_SMITS_TILE_SIZE: default number of rgb values processed per tile by rgb_to_spec_smits()
+ 
  :rgb_to_spec_smits(): Convert an array of RGB values to a spectrum using a Smits like method as implemented in Mitsuba.
  
  based on https://github.com/mitsuba-renderer/mitsuba/blob/1fd0f671dfcb77f813c0d6a36f2aa4e480b5ca8e/src/libcore/spectrum.cpp
@@ -355,7 +359,59 @@ def _fromLinearRGB(rgb, intent = 'rfl', rgb2spec = _BASESPEC_SMITS, wlr = _WL3):
         
     return np.clip(result, 0, None) # no negative values allowed
 
-def rgb_to_spec_smits(rgb, intent = 'rfl',  linearized_rgb = True, bitdepth = 8, wlr = _WL3, rgb2spec = None):
+_SMITS_BASIS_ORDER = ('white', 'cyan', 'magenta', 'yellow', 'blue', 'green', 'red')
+_SMITS_TILE_SIZE = 2**16 # default number of rgb values processed per tile 
+
+def _get_smits_basis(rgb2spec, intent = 'rfl'):
+    """ Get (7 x n_wl) matrix with base spectra (order: _SMITS_BASIS_ORDER) """
+    return np.array([rgb2spec[intent][x] for x in _SMITS_BASIS_ORDER])
+
+def _get_smits_weights(rgb):
+    """ 
+    Get (N x 7) matrix with weights of the base spectra (order: _SMITS_BASIS_ORDER)
+    for an (N x 3) array of linearized rgb values (vectorized version of the 
+    case distinctions in _fromLinearRGB()).
+    """
+    r, g, b = rgb[:,0], rgb[:,1], rgb[:,2]
+    
+    # min-channel cases:
+    rmin = (r <= g) & (r <= b)
+    gmin = ~rmin & (g <= r) & (g <= b)
+    bmin = ~rmin & ~gmin
+    
+    w = np.zeros((rgb.shape[0], 7))
+    
+    # 'r' as minimum:
+    c1, c2 = rmin & (g <= b), rmin & ~(g <= b)
+    w[rmin,0] = r[rmin]
+    w[c1,1], w[c1,4] = (g - r)[c1], (b - g)[c1] # cyan, blue
+    w[c2,1], w[c2,5] = (b - r)[c2], (g - b)[c2] # cyan, green
+    
+    # 'g' as minimum:
+    c1, c2 = gmin & (r <= b), gmin & ~(r <= b)
+    w[gmin,0] = g[gmin]
+    w[c1,2], w[c1,4] = (r - g)[c1], (b - r)[c1] # magenta, blue
+    w[c2,2], w[c2,6] = (b - g)[c2], (r - b)[c2] # magenta, red
+    
+    # 'b' as minimum:
+    c1, c2 = bmin & (r <= g), bmin & ~(r <= g)
+    w[bmin,0] = b[bmin]
+    w[c1,3], w[c1,5] = (r - b)[c1], (g - r)[c1] # yellow, green
+    w[c2,3], w[c2,6] = (g - b)[c2], (r - g)[c2] # yellow, red
+    return w
+
+def _unique_rgb(rgb):
+    """ Get unique rgb values and inverse indices (fast path for integer rgb values < 2**16) """
+    if np.issubdtype(rgb.dtype, np.integer) and (rgb.size > 0) and (rgb.min() >= 0) and (rgb.max() < 2**16):
+        key = (rgb[:,0].astype(np.int64) << 32) | (rgb[:,1].astype(np.int64) << 16) | rgb[:,2].astype(np.int64)
+        key_u, inverse = np.unique(key, return_inverse = True)
+        rgb_u = np.stack(((key_u >> 32), (key_u >> 16) & 0xFFFF, key_u & 0xFFFF), axis = 1).astype(rgb.dtype)
+    else:
+        rgb_u, inverse = np.unique(rgb, return_inverse = True, axis = 0)
+    return rgb_u, inverse.reshape(-1)
+
+def rgb_to_spec_smits(rgb, intent = 'rfl',  linearized_rgb = True, bitdepth = 8, wlr = _WL3, rgb2spec = None,
+                      tile_size = _SMITS_TILE_SIZE, dtype = np.float64, unique = False):
     """
     Convert an array of (linearized) RGB values to a spectrum using a Smits like conversion as implemented in Mitsuba.
     
@@ -380,25 +436,70 @@ def rgb_to_spec_smits(rgb, intent = 'rfl',  linearized_rgb = True, bitdepth = 8,
             | None, optional
             | Dict with base spectra for white, cyan, magenta, yellow, blue, green and red for each intent.
             | If None: use _BASESPEC_SMITS.
+        :tile_size:
+            | _SMITS_TILE_SIZE, optional
+            | Number of rgb values processed per tile (bounds the size of the 
+            | temporary arrays; the output array still contains all spectra).
+        :dtype:
+            | np.float64, optional
+            | Data type of output array (e.g. np.float32 to halve the memory use for large images).
+        :unique:
+            | False, optional
+            | If True: convert only the unique rgb values and scatter the 
+            | spectra back to all rgb values (faster for images with many repeated colors).
         
     Returns:
         :spec: 
             | ndarray with spectrum or spectra (one for each rgb value, first row are the wavelengths)
+            
+    Note:
+        | The conversion is vectorized: for each tile the min-channel cases are
+        | determined for all rgb values at once and the spectra are obtained as an 
+        | (N x 7) weight matrix times the (7 x n_wl) matrix with base spectra.
+        | The matrix product may accumulate in a different order than a 
+        | per-value sum of weighted base spectra, so results can differ 
+        | at the ~1e-15 level (float64); with dtype = np.float32 the spectra 
+        | are only accurate to float32 precision (~6e-8).
+        | rgb can also be an image-like array of shape (..., 3).
     """
-    if isinstance(rgb,list):
-        rgb = np.atleast_2d(rgb)
-    if rgb.max() > 1:
-        rgb = rgb/(2**bitdepth - 1)
-    if linearized_rgb == False:
-        rgb = xyz_to_srgb(srgb_to_xyz(rgb*255), gamma = 1.0, use_linear_part = False)/255.0
+    rgb = np.asarray(rgb)
+    rgb = rgb.reshape(-1,3) if rgb.ndim != 1 else np.atleast_2d(rgb)
     if rgb2spec is None:
         rgb2spec = _BASESPEC_SMITS 
     if not np.array_equal(rgb2spec['wlr'], getwlr(wlr)):
         rgb2spec = _convert_to_wlr(entries=copy.deepcopy(rgb2spec), wlr = wlr)
-    spec = np.zeros((rgb.shape[0],rgb2spec['wlr'].shape[0]))
-    for i in range(rgb.shape[0]):
-        spec[i,:] = _fromLinearRGB(rgb[i,:], intent = intent, rgb2spec = rgb2spec, wlr = wlr)
-    return np.vstack((rgb2spec['wlr'],spec))
+    basis = _get_smits_basis(rgb2spec, intent = intent)
+    scalefactor = rgb2spec[intent]['scalefactor']
+    
+    scale = (2**bitdepth - 1) if (rgb.size > 0) and (rgb.max() > 1) else None
+    if unique == True:
+        rgb, inverse = _unique_rgb(rgb)
+        spec_u = np.empty((rgb.shape[0], basis.shape[1]), dtype = dtype)
+    else:
+        inverse = None
+    
+    spec = np.empty((rgb.shape[0] + 1 if inverse is None else inverse.shape[0] + 1, basis.shape[1]), dtype = dtype)
+    spec[0] = rgb2spec['wlr']
+    spec_ = spec[1:] if inverse is None else spec_u
+    
+    tile_size = max(1, int(tile_size))
+    for i in range(0, rgb.shape[0], tile_size):
+        rgb_i = rgb[i:i + tile_size]
+        if scale is not None:
+            rgb_i = rgb_i/scale
+        if linearized_rgb == False:
+            rgb_i = xyz_to_srgb(srgb_to_xyz(rgb_i*255), gamma = 1.0, use_linear_part = False)/255.0
+        if spec_.dtype == basis.dtype:
+            spec_i = np.matmul(_get_smits_weights(rgb_i), basis, out = spec_[i:i + tile_size]) # assemble directly in output
+        else:
+            spec_i = _get_smits_weights(rgb_i) @ basis
+        spec_i *= scalefactor
+        np.maximum(spec_i, 0, out = spec_[i:i + tile_size]) # no negative values allowed
+    
+    if inverse is not None:
+        for i in range(0, inverse.shape[0], tile_size):
+            spec[1 + i:1 + i + tile_size] = spec_u[inverse[i:i + tile_size]]
+    return spec
 
 
 if __name__ == '__main__':
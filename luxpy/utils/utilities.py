@@ -82,6 +82,11 @@ Module with utility functions and parameters
  
  :load_pkl(): load object in pickle file
  
+ :get_output_array(): Get output array: allocate, open a .npy memmap or check a preallocated one.
+ 
+ :LRUCache: Bounded (number of items and/or bytes) least-recently-used cache
+            with hit/miss statistics.
+ 
  :imread(): read image file using imageio 
  
  :imsave(): save image file using imageio
@@ -102,6 +107,7 @@ import pstats
 import io
 import pickle
 import gzip
+import threading
 from collections import OrderedDict as odict
 from mpl_toolkits.mplot3d import Axes3D
 __all__ = ['odict','Axes3D']
@@ -137,7 +143,7 @@ __all__ += ['np2d','np3d','np2dT','np3dT',
            'dictkv','OD','meshblock','asplit','ajoin',
            'broadcast_shape','todim','read_excel','write_excel','show_luxpy_tree',
            'is_importable','get_function_kwargs','profile_fcn','unique',
-           'save_pkl', 'load_pkl','imread','imsave']
+           'save_pkl', 'load_pkl','get_output_array','imread','imsave','LRUCache']
 
 ##############################################################################
 # Start function definitions
@@ -1174,6 +1180,127 @@ def load_pkl(filename, gzipped = False):
         obj = pickle.load(handle)
     return obj
 
+
+#------------------------------------------------------------------------------
+def get_output_array(array, shape, dtype = np.float64, caller = 'get_output_array()'):
+    """
+    Get an output array (e.g. for tiled processing of large data).
+    
+    Args:
+        :array:
+            | None, str or ndarray
+            |   - None: allocate a new array.
+            |   - str: open (create) a .npy memmap with this filename.
+            |   - ndarray (or np.memmap): preallocated array, shape is checked.
+        :shape:
+            | tuple with required shape.
+        :dtype:
+            | np.float64, optional
+            | dtype of the array (when allocated or opened).
+        :caller:
+            | 'get_output_array()', optional
+            | Name of the calling function (used in the error message).
+            
+    Returns:
+        :array:
+            | ndarray (or np.memmap) with the requested shape.
+    """
+    if array is None:
+        return np.empty(shape, dtype = dtype)
+    elif isinstance(array, str):
+        return np.lib.format.open_memmap(array, mode = 'w+', dtype = dtype, shape = shape)
+    elif array.shape != shape:
+        raise Exception('{:s}: Output array has shape {} instead of {}.'.format(caller, array.shape, shape))
+    return array
+
+#------------------------------------------------------------------------------
+class LRUCache:
+    """ 
+    Bounded least-recently-used (LRU) cache with hit/miss statistics.
+    
+    Args:
+        :maxsize:
+            | 128, optional
+            | Maximum number of items in the cache. If None: no limit.
+        :maxbytes:
+            | None, optional
+            | Maximum total size (in bytes) of the cached values.
+            | Sizes of values are determined by their .nbytes attribute
+            | (or by the sum of the .nbytes of the elements of a tuple or list,
+            | or of the data arrays of a scipy.sparse matrix).
+            | If None: no limit.
+            
+    Note:
+        1. Access is protected by a lock so the cache can be shared between threads.
+        2. Items larger than :maxbytes: are never stored.
+    """
+    def __init__(self, maxsize = 128, maxbytes = None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self._data = odict()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        
+    @staticmethod
+    def _sizeof(value):
+        if isinstance(value, (tuple, list)):
+            return sum([LRUCache._sizeof(v) for v in value])
+        if hasattr(value, 'nbytes'):
+            return value.nbytes
+        if hasattr(value, 'indptr'): # scipy.sparse matrices
+            return value.data.nbytes + value.indices.nbytes + value.indptr.nbytes
+        return 0
+        
+    def __len__(self):
+        return len(self._data)
+    
+    def __contains__(self, key):
+        return key in self._data
+        
+    def get(self, key, default = None):
+        """ Get value for key (or default if key is not in cache) and update statistics. """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+    
+    def put(self, key, value):
+        """ Store value under key and evict least-recently-used items if any of the limits are exceeded. """
+        nbytes = self._sizeof(value)
+        with self._lock:
+            if key in self._data: 
+                self._nbytes -= self._sizeof(self._data.pop(key))
+            if (self.maxbytes is not None) and (nbytes > self.maxbytes): 
+                return value
+            self._data[key] = value
+            self._nbytes += nbytes
+            while (len(self._data) > 0) and \
+                  (((self.maxsize is not None) and (len(self._data) > self.maxsize)) or \
+                   ((self.maxbytes is not None) and (self._nbytes > self.maxbytes))):
+                _, v = self._data.popitem(last = False)
+                self._nbytes -= self._sizeof(v)
+        return value
+        
+    def clear(self, reset_stats = True):
+        """ Remove all items from the cache (and reset hit/miss counters). """
+        with self._lock:
+            self._data.clear()
+            self._nbytes = 0
+            if reset_stats: 
+                self.hits, self.misses = 0, 0
+            
+    def info(self):
+        """ Get dict with cache statistics ('hits', 'misses', 'currsize', 'nbytes', 'maxsize', 'maxbytes'). """
+        with self._lock:
+            return {'hits' : self.hits, 'misses' : self.misses, 
+                    'currsize' : len(self._data), 'nbytes' : self._nbytes,
+                    'maxsize' : self.maxsize, 'maxbytes' : self.maxbytes}
+
 #------------------------------------------------------------------------------
 def _try_imageio_import(use_freeimage=True): # lazy import
     success = is_importable('imageio')